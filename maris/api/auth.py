@@ -4,7 +4,8 @@ Provides:
 - Bearer token authentication via ``MARIS_API_KEY``
 - Per-key in-memory sliding-window rate limiting
 - ``X-Request-ID`` response header for tracing
-- Request logging with hashed client IP
+- Request logging with hashed client IP and per-route latency metrics
+- An ``http.request`` root span per request when tracing is enabled
 """
 
 import hashlib
@@ -18,7 +19,10 @@ from collections import defaultdict
 from fastapi import Depends, HTTPException, Request, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from maris.api.models import BatchQueryRequest
 from maris.config import get_config
+from maris.observability.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+from maris.observability.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -93,14 +97,16 @@ def require_api_key(
 # Rate limiting (in-memory sliding window)
 # ---------------------------------------------------------------------------
 
+QUERY_RATE_LIMIT = 30  # Questions per key per minute, single or batched
+
 _rate_buckets: dict[str, list[float]] = defaultdict(list)
 _rate_lock = threading.Lock()
 
-def _check_rate_limit(key: str, max_requests: int, window_seconds: int = 60):
+def _check_rate_limit(key: str, max_requests: int, window_seconds: int = 60, cost: int = 1):
     """Enforce a sliding-window rate limit per key.
 
-    Raises 429 if the caller has exceeded ``max_requests`` within the
-    rolling ``window_seconds`` window.
+    Raises 429 if charging ``cost`` requests would exceed ``max_requests``
+    within the rolling ``window_seconds`` window; nothing is charged then.
     """
     with _rate_lock:
         now = time.monotonic()
@@ -109,17 +115,26 @@ def _check_rate_limit(key: str, max_requests: int, window_seconds: int = 60):
         _rate_buckets[key] = [ts for ts in bucket if now - ts < window_seconds]
         bucket = _rate_buckets[key]
 
-        if len(bucket) >= max_requests:
+        if len(bucket) + cost > max_requests:
             raise HTTPException(
                 status_code=429,
                 detail=f"Rate limit exceeded. Max {max_requests} requests per {window_seconds}s.",
             )
-        bucket.append(now)
+        bucket.extend([now] * cost)
 
 
 def rate_limit_query(request: Request, api_key: str = Depends(require_api_key)):
     """Rate limit for /api/query: 30 requests per minute."""
-    _check_rate_limit(f"query:{api_key}", max_requests=30)
+    _check_rate_limit(f"query:{api_key}", max_requests=QUERY_RATE_LIMIT)
+
+
+def rate_limit_batch(batch: BatchQueryRequest, api_key: str = Depends(require_api_key)):
+    """Rate limit for /api/query/batch: each distinct question is charged to the /api/query budget.
+
+    Duplicates (same normalized question and options) are answered once, so
+    they are not charged again.
+    """
+    _check_rate_limit(f"query:{api_key}", max_requests=QUERY_RATE_LIMIT, cost=len(batch.distinct_queries()))
 
 
 def rate_limit_default(request: Request, api_key: str = Depends(require_api_key)):
@@ -143,10 +158,23 @@ async def request_logging_middleware(request: Request, call_next):
     request_id = str(uuid.uuid4())
     start = time.monotonic()
 
-    response: Response = await call_next(request)
-
-    elapsed_ms = int((time.monotonic() - start) * 1000)
-    response.headers["X-Request-ID"] = request_id
+    with span("http.request", **{"http.method": request.method, "http.request_id": request_id}) as http_span:
+        response: Response = await call_next(request)
+
+        elapsed = time.monotonic() - start
+        elapsed_ms = int(elapsed * 1000)
+        response.headers["X-Request-ID"] = request_id
+
+        # Label by route template, not raw path, to keep series cardinality bounded
+        route = request.scope.get("route")
+        labels = {
+            "method": request.method,
+            "route": getattr(route, "path", "unmatched"),
+            "status": str(response.status_code),
+        }
+        http_span.set_attributes({"http.route": labels["route"], "http.status_code": response.status_code})
+    HTTP_REQUEST_SECONDS.observe(elapsed, **labels)
+    HTTP_REQUESTS.inc(**labels)
 
     logger.info(
         "request_id=%s ip=%s method=%s path=%s status=%d duration_ms=%d",
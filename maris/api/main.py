@@ -1,5 +1,6 @@
 """MARIS FastAPI application."""
 
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -10,7 +11,10 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from maris.api.auth import request_logging_middleware
 from maris.config import get_config
+from maris.graph.async_connection import close_async_driver
 from maris.graph.connection import close_driver
+from maris.observability.tracing import get_tracer
+from maris.query.template_registry import validate_templates
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +33,12 @@ async def lifespan(app: FastAPI):
         sys.exit(1)
 
     logger.info("MARIS API starting - Neo4j=%s, LLM=%s", config.neo4j_uri, config.llm_provider)
+    # EXPLAIN every pre-rendered Cypher template variant once, off the startup path
+    app.state.template_validation = asyncio.create_task(asyncio.to_thread(validate_templates))
     yield
     close_driver()
+    await close_async_driver()
+    get_tracer().shutdown()  # Flush buffered spans
     logger.info("MARIS API shutdown - Neo4j driver closed")
 
 
@@ -63,12 +71,14 @@ def create_app() -> FastAPI:
     from maris.api.routes.health import router as health_router
     from maris.api.routes.provenance import router as provenance_router
     from maris.api.routes.disclosure import router as disclosure_router
+    from maris.api.routes.metrics import router as metrics_router
 
     app.include_router(query_router)
     app.include_router(graph_router)
     app.include_router(health_router)
     app.include_router(provenance_router)
     app.include_router(disclosure_router)
+    app.include_router(metrics_router)
 
     return app
 
@@ -1,9 +1,12 @@
 """Pydantic request/response models for the MARIS API."""
 
+import json
 import re
 
 from pydantic import BaseModel, Field, field_validator
 
+from maris.query.response_cache import normalize_question
+
 
 # ---------------------------------------------------------------------------
 # Evidence
@@ -47,6 +50,7 @@ class QueryRequest(BaseModel):
     site: str | None = Field(default=None, max_length=100)
     include_graph_path: bool = True
     max_evidence_sources: int = Field(default=5, ge=1, le=20)
+    include_timings: bool = False  # Attach per-stage latencies to query_metadata
 
     @field_validator("site")
     @classmethod
@@ -61,6 +65,9 @@ class QueryMetadata(BaseModel):
     classification_confidence: float = 0.0
     template_used: str = ""
     response_time_ms: int = 0
+    cache_status: str = ""  # hit | stale | miss | bypass
+    degraded: bool = False  # LLM synthesis failed or returned no answer; never cached
+    stage_timings_ms: dict[str, float] | None = None  # Set when include_timings is requested
 
 
 class QueryResponse(BaseModel):
@@ -84,6 +91,54 @@ class QueryResponse(BaseModel):
     revenue_range: dict | None = None        # {"low": float, "high": float}
 
 
+class BatchQueryRequest(BaseModel):
+    # Each distinct question is charged to the per-key /api/query rate limit (30/min)
+    queries: list[QueryRequest] = Field(..., min_length=1, max_length=30)
+
+    def distinct_queries(self) -> dict[str, list[int]]:
+        """Indices of ``queries`` grouped by normalized question and options.
+
+        Each group is answered once, so this is also what the batch is charged.
+        """
+        distinct: dict[str, list[int]] = {}
+        for index, item in enumerate(self.queries):
+            key = json.dumps([
+                normalize_question(item.question),
+                item.site,
+                item.include_graph_path,
+                item.max_evidence_sources,
+                item.include_timings,
+            ])
+            distinct.setdefault(key, []).append(index)
+        return distinct
+
+
+class BatchQueryError(BaseModel):
+    status_code: int
+    detail: str
+
+
+class BatchQueryItem(BaseModel):
+    index: int
+    question: str
+    response: QueryResponse | None = None
+    error: BatchQueryError | None = None
+
+
+class BatchQueryMetadata(BaseModel):
+    total: int = 0
+    distinct_questions: int = 0
+    groups: int = 0          # distinct (category, site) pairs
+    graph_reads: int = 0     # template executions actually sent to Neo4j
+    provenance_reads: int = 0
+    response_time_ms: int = 0
+
+
+class BatchQueryResponse(BaseModel):
+    results: list[BatchQueryItem] = []
+    batch_metadata: BatchQueryMetadata = BatchQueryMetadata()
+
+
 # ---------------------------------------------------------------------------
 # Graph / Site / Axiom
 # ---------------------------------------------------------------------------
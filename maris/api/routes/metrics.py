@@ -0,0 +1,18 @@
+"""Prometheus text-format metrics endpoint."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from maris.api.auth import require_api_key
+from maris.config import get_config
+from maris.observability.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_api_key)])
+def metrics():
+    """Query stage, query latency and HTTP request histograms in text exposition format."""
+    if not get_config().metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -2,25 +2,57 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import inspect
+import json
 import logging
 import re
 import time
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException
-
-from maris.api.auth import rate_limit_query
-from maris.api.models import QueryRequest, QueryResponse, QueryMetadata, EvidenceItem
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from maris.api.auth import rate_limit_batch, rate_limit_query
+from maris.api.models import (
+    BatchQueryError,
+    BatchQueryItem,
+    BatchQueryMetadata,
+    BatchQueryRequest,
+    BatchQueryResponse,
+    EvidenceItem,
+    QueryMetadata,
+    QueryRequest,
+    QueryResponse,
+)
 from maris.axioms.confidence import calculate_response_confidence
 from maris.config import get_config
-from maris.llm.adapter import LLMAdapter
-from maris.provenance.bridge_axiom_registry import BridgeAxiomRegistry
+from maris.graph.epoch import get_graph_epoch
+from maris.llm.adapter import AsyncLLMAdapter, LLMAdapter
+from maris.observability.timing import StageTimings, stage
+from maris.observability.tracing import current_span, span
+from maris.query.batch import SharedGraphReads
 from maris.query.classifier import QueryClassifier, register_dynamic_sites
 from maris.query.executor import QueryExecutor
 from maris.query.generator import ResponseGenerator
+from maris.query.response_cache import (
+    CACHE_BYPASS,
+    CACHE_MISS,
+    CACHE_STALE,
+    ResponseCache,
+    make_cache_key,
+)
 from maris.query.formatter import format_response
-from maris.query.validators import build_provenance_summary, extract_numerical_claims
-from maris.reasoning.inference_engine import InferenceEngine
+from maris.query.scheduler import Stage, StageScheduler, StageTimeoutError, run_stage
+from maris.query.validators import (
+    NumericEvidenceIndex,
+    build_provenance_summary,
+    extract_numerical_claims,
+)
+from maris.reasoning.rule_base import CompiledRuleBase, get_rule_base
 from maris.services.ingestion.discovery import discover_case_study_paths, discover_site_names
 
 logger = logging.getLogger(__name__)
@@ -29,11 +61,11 @@ router = APIRouter(prefix="/api", tags=["query"])
 
 # Lazy singletons initialised on first request
 _llm: LLMAdapter | None = None
+_async_llm: AsyncLLMAdapter | None = None
 _classifier: QueryClassifier | None = None
 _executor: QueryExecutor | None = None
 _generator: ResponseGenerator | None = None
-_axiom_registry: BridgeAxiomRegistry | None = None
-_inference_engine: InferenceEngine | None = None
+_response_cache: ResponseCache | None = None
 _dynamic_sites_registered = False
 
 _AXIOM_ID_RE = re.compile(r"\bBA-\d{3}\b", re.IGNORECASE)
@@ -206,27 +238,50 @@ def _is_portfolio_scope_question(question: str) -> bool:
     return any(term in q for term in _PORTFOLIO_SCOPE_TERMS)
 
 
+def _rule_base() -> CompiledRuleBase:
+    """Shared compiled rule base; recompiled only when the axiom files change."""
+    cfg = get_config()
+    return get_rule_base(
+        cfg.schemas_dir / "bridge_axiom_templates.json",
+        cfg.export_dir / "bridge_axioms.json",
+    )
+
+
 def _build_inference_trace(
     axiom_ids: set[str],
     site: str | None,
 ) -> tuple[list[dict[str, Any]], str, list[str]]:
-    """Build a deterministic inference trace from resolved axiom IDs."""
-    assert _axiom_registry is not None
+    """Build a deterministic inference trace from resolved axiom IDs.
+
+    The trace depends only on the site and the axiom set, so it is memoized
+    on the rule base under that key and dropped when the rule base rebuilds.
+    """
+    rule_base = _rule_base()
+    return rule_base.memoize_trace(
+        (site or "", frozenset(axiom_ids)),
+        lambda: _compute_inference_trace(rule_base, axiom_ids, site),
+    )
+
 
+def _compute_inference_trace(
+    rule_base: CompiledRuleBase,
+    axiom_ids: set[str],
+    site: str | None,
+) -> tuple[list[dict[str, Any]], str, list[str]]:
+    registry = rule_base.registry
     axioms = [
         axiom
         for aid in sorted(axiom_ids)
-        if (axiom := _axiom_registry.get(aid)) is not None
+        if (axiom := registry.get(aid)) is not None
     ]
     if not axioms:
         return [], "", []
 
-    temp_engine = InferenceEngine()
-    temp_engine.register_axioms(axioms)
+    engine = rule_base.engine_for(axioms)
 
     start_domain = next((a.input_domain for a in axioms if a.input_domain), "ecological")
     facts = {start_domain: {"site": site or "unspecified"}}
-    steps = temp_engine.forward_chain(facts, max_steps=max(len(axioms), 1))
+    steps = engine.forward_chain(facts, max_steps=max(len(axioms), 1))
 
     if not steps:
         return [], "", []
@@ -235,7 +290,7 @@ def _build_inference_trace(
     lines: list[str] = []
     provisional_axioms: set[str] = set()
     for idx, step in enumerate(steps, start=1):
-        axiom = _axiom_registry.get(step.axiom_id)
+        axiom = registry.get(step.axiom_id)
         source_count = len(axiom.evidence_sources) if axiom else 0
         provisional = source_count < 2
         if provisional:
@@ -261,35 +316,390 @@ def _build_inference_trace(
 
 
 def _init_components():
-    global _llm, _classifier, _executor, _generator, _axiom_registry, _inference_engine
+    """Build the shared components on first use.
+
+    Opens SQLite caches, walks the project tree and compiles the rule base,
+    so the async handlers call it through ``run_in_threadpool``.
+    """
+    global _llm, _async_llm, _classifier, _executor, _generator, _response_cache
     if _llm is None:
         _llm = LLMAdapter(get_config())
-        _classifier = QueryClassifier(llm=_llm)
+        _async_llm = AsyncLLMAdapter(get_config(), cache=_llm.cache)
+        _classifier = QueryClassifier(llm=_llm, async_llm=_async_llm)
         _executor = QueryExecutor()
-        _generator = ResponseGenerator(llm=_llm)
+        _generator = ResponseGenerator(llm=_llm, async_llm=_async_llm)
+        _response_cache = ResponseCache.from_config()
+        # Compile up front; the inference stage re-checks freshness in the threadpool
+        _rule_base()
 
     _register_runtime_sites()
 
-    if _axiom_registry is None or _inference_engine is None:
-        cfg = get_config()
-        _axiom_registry = BridgeAxiomRegistry(
-            templates_path=cfg.schemas_dir / "bridge_axiom_templates.json",
-            evidence_path=cfg.export_dir / "bridge_axioms.json",
-        )
-        _inference_engine = InferenceEngine()
-        _inference_engine.register_axioms(_axiom_registry.get_all())
-
 
 @router.post("/query", response_model=QueryResponse, dependencies=[Depends(rate_limit_query)])
-def query(request: QueryRequest):
+async def query(request: QueryRequest):
     """Classify a natural-language question, run Cypher, and return a grounded answer."""
-    _init_components()
-    assert _classifier and _executor and _generator and _axiom_registry and _inference_engine  # narrowing for type checker
+    await run_in_threadpool(_init_components)
+    assert _classifier and _executor and _generator  # narrowing for type checker
 
     start = time.monotonic()
+    timings = StageTimings()
+    with timings.activate():
+        # 1. Classify
+        with stage("classify"):
+            classification = await run_stage(_classifier, "classify", request.question)
+
+        # Response cache: keyed on the graph epoch, bypassed when it is unknown
+        epoch = await run_in_threadpool(get_graph_epoch) if _response_cache is not None else None
+        response = await _respond(request, classification, start, epoch)
+    _record_timings(request, response, timings, start)
+    return response
+
+
+def _record_timings(
+    request: QueryRequest,
+    response: QueryResponse,
+    timings: StageTimings,
+    start: float,
+) -> None:
+    """Publish a finished request's stage timings; attach them when asked to."""
+    metadata = response.query_metadata
+    current_span().set_attributes({
+        "query.category": metadata.category,
+        "query.template": metadata.template_used,
+        "query.cache_status": metadata.cache_status,
+    })
+    timings.publish(
+        metadata.category, metadata.template_used, metadata.cache_status, time.monotonic() - start,
+    )
+    if request.include_timings:
+        metadata.stage_timings_ms = timings.as_ms()
+
+
+async def _respond(
+    request: QueryRequest,
+    classification: dict[str, Any],
+    start: float,
+    epoch: int | None,
+    *,
+    executor: Any = None,
+    generation_slots: asyncio.Semaphore | None = None,
+) -> QueryResponse:
+    """Answer a classified request through the response cache."""
+    cache = _response_cache
+    if cache is None or epoch is None:
+        response = await _answer_query(
+            request, classification, start,
+            executor=executor, generation_slots=generation_slots,
+        )
+        response.query_metadata.cache_status = CACHE_BYPASS
+        return response
+
+    cache_key = _response_cache_key(request, classification, epoch)
+    # The cache may be SQLite-backed; keep its I/O off the event loop
+    status, payload = await run_in_threadpool(cache.lookup, cache_key)
+    if payload is not None:
+        if status == CACHE_STALE:
+            async def _refresh() -> dict[str, Any] | None:
+                # Background work must not record into the caller's timings
+                with StageTimings().activate():
+                    return _cacheable_payload(await _answer_query(request, classification, time.monotonic()))
+
+            cache.revalidate_async(cache_key, epoch, _refresh)
+        response = QueryResponse.model_validate(payload)
+        response.query_metadata.cache_status = status
+        response.query_metadata.response_time_ms = int((time.monotonic() - start) * 1000)
+        return response
+
+    response = await _answer_query(
+        request, classification, start,
+        executor=executor, generation_slots=generation_slots,
+    )
+    cacheable = _cacheable_payload(response)
+    if cacheable is not None:
+        await run_in_threadpool(cache.store, cache_key, cacheable, epoch)
+    response.query_metadata.cache_status = CACHE_MISS
+    return response
+
+
+def _response_cache_key(request: QueryRequest, classification: dict[str, Any], epoch: int) -> str:
+    return make_cache_key(
+        request.question,
+        request.site or classification.get("site"),
+        classification.get("category", ""),
+        epoch,
+        sites=classification.get("sites", []),
+        include_graph_path=request.include_graph_path,
+        max_evidence_sources=request.max_evidence_sources,
+    )
+
+
+def _cacheable_payload(response: QueryResponse) -> dict[str, Any] | None:
+    """Serialize a response for caching, or None if it must not be cached."""
+    metadata = response.query_metadata
+    if metadata.degraded or metadata.template_used.endswith(":unavailable"):
+        return None
+    return response.model_dump(mode="json")
+
+
+def _answer_scenario(
+    request: QueryRequest,
+    classification: dict[str, Any],
+    site: str | None,
+    start: float,
+) -> QueryResponse:
+    """Answer a scenario_analysis query via the scenario engines (no graph execution)."""
+    # Scenario analysis uses its own engine pipeline, bypassing graph execution.
+    # Lazy imports to avoid circular dependencies and allow incremental build.
+    try:
+        from maris.scenario.scenario_parser import parse_scenario_request
+        from maris.scenario.counterfactual_engine import run_counterfactual
+        from maris.scenario.climate_scenarios import run_climate_scenario
+        from maris.scenario.tipping_point_analyzer import get_tipping_point_site_report
+        from maris.scenario.blue_carbon_revenue import compute_blue_carbon_revenue
+        from maris.scenario.counterfactual_engine import _load_site_data as _load_cf_data
+    except ImportError:
+        logger.warning("Scenario modules not yet available")
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+        return QueryResponse(
+            answer="Scenario analysis module is not yet initialized. Please try again later.",
+            confidence=0.0,
+            evidence=[],
+            axioms_used=[],
+            graph_path=[],
+            caveats=["Scenario module not available"],
+            verified_claims=[],
+            unverified_claims=[],
+            evidence_count=0,
+            doi_citation_count=0,
+            evidence_completeness_score=0.0,
+            provenance_warnings=["Scenario module import failed"],
+            provenance_risk="high",
+            query_metadata=QueryMetadata(
+                category="scenario_analysis",
+                classification_confidence=classification.get("confidence", 0.0),
+                template_used="scenario_analysis:unavailable",
+                response_time_ms=elapsed_ms,
+            ),
+        )
+
+    scenario_req = parse_scenario_request(request.question, site, classification)
+
+    if scenario_req.scenario_type == "counterfactual":
+        result = run_counterfactual(scenario_req)
+    elif scenario_req.scenario_type == "climate":
+        result = run_climate_scenario(scenario_req)
+    elif scenario_req.scenario_type == "tipping_point":
+        site_name = scenario_req.site_scope[0] if scenario_req.site_scope else ""
+        site_data = _load_cf_data(site_name) if site_name else None
+        if site_data is None:
+            result = {
+                "answer": "No site data available for tipping point analysis. Please specify a site.",
+                "confidence": 0.0, "caveats": ["Site not found"],
+                "axioms_used": [], "provenance_risk": "high",
+            }
+        else:
+            report = get_tipping_point_site_report(site_data)
+            if report.get("applicable"):
+                answer = (
+                    f"{report['site_name']} current fish biomass: {report['current_biomass_kg_ha']:.0f} kg/ha "
+                    f"(reef function: {report['reef_function_current']:.1%}, {report['nearest_threshold']['name']} zone). "
+                    f"{report['proximity_description']} "
+                    f"ESV at collapse threshold (150 kg/ha): ${report['esv_at_collapse']:,.0f}/yr "
+                    f"vs current ${report['esv_current']:,.0f}/yr. "
+                    f"Source: McClanahan et al. 2011 (doi:{report['source_doi']})"
+                )
+                result = {
+                    "answer": answer, "confidence": 0.80,
+                    "caveats": ["McClanahan piecewise function calibrated on Indo-Pacific reefs",
+                                "Biomass derived from recovery_ratio * 200 kg/ha pre-protection baseline (Aburto-Oropeza et al. 2011)"],
+                    "axioms_used": ["BA-036", "BA-037", "BA-038", "BA-039"],
+                    "provenance_risk": "medium",
+                    "scenario_request": scenario_req.model_dump(),
+                }
+            else:
+                answer = (
+                    f"Tipping point analysis for {report['site_name']}: {report.get('reason', 'Not applicable')}. "
+                    f"Habitat type: {report.get('habitat_type', 'unknown')}. "
+                    f"The McClanahan et al. 2011 piecewise function (doi:10.1073/pnas.1106861108) applies to coral reef "
+                    f"fish biomass. For mangrove habitats, deforestation thresholds apply; for seagrass, heatwave-driven "
+                    f"dieback thresholds per Arias-Ortiz et al. 2018 (doi:10.1038/s41558-018-0096-y)."
+                )
+                result = {
+                    "answer": answer, "confidence": 0.60,
+                    "caveats": ["Tipping point analysis requires site-specific biomass survey data"],
+                    "axioms_used": ["BA-036", "BA-040"], "provenance_risk": "medium",
+                    "scenario_request": scenario_req.model_dump(),
+                }
+    elif scenario_req.scenario_type == "market":
+        site_name = scenario_req.site_scope[0] if scenario_req.site_scope else ""
+        site_data = _load_cf_data(site_name) if site_name else None
+        if site_data is None:
+            result = {
+                "answer": "No site data available for blue carbon revenue analysis.",
+                "confidence": 0.0, "caveats": ["Site not found"],
+                "axioms_used": [], "provenance_risk": "high",
+            }
+        else:
+            # Map requested carbon price to nearest price scenario key
+            carbon_price = scenario_req.assumptions.get("carbon_price_usd", 25.25)
+            from maris.scenario.constants import CARBON_PRICE_SCENARIOS
+            price_scenario = min(
+                CARBON_PRICE_SCENARIOS,
+                key=lambda k: abs(CARBON_PRICE_SCENARIOS[k]["price_usd"] - carbon_price),
+            )
+            rev = compute_blue_carbon_revenue(
+                site_name, site_data,
+                price_scenario=price_scenario,
+                target_year=scenario_req.target_year or 2030,
+            )
+            if "error" in rev:
+                answer = (
+                    f"{site_name} does not have blue carbon habitat eligible for voluntary carbon market credits "
+                    f"in the current knowledge base ({rev['error']}). "
+                    f"Blue carbon credits require mangrove forest or seagrass meadow habitat with verified area data. "
+                    f"Reference: Blue Carbon Initiative (bluecarboninitiative.org)."
+                )
+                result = {
+                    "answer": answer, "confidence": 0.70,
+                    "caveats": ["No eligible blue carbon habitat detected for this site"],
+                    "axioms_used": [], "provenance_risk": "medium",
+                }
+            else:
+                answer = (
+                    f"{site_name} could generate approximately ${rev['annual_revenue_usd']:,.0f}/yr in blue carbon credits "
+                    f"at ${rev['price_usd']}/tCO2e ({price_scenario} price scenario). "
+                    f"Based on {rev['habitat_area_ha']:,.0f} ha of {rev['habitat_type'].replace('_', ' ')} "
+                    f"at {rev['seq_rate_tco2_ha_yr']:.1f} tCO2/ha/yr (mid estimate, 60% Verra-verified). "
+                    f"Range: ${rev['annual_revenue_range']['low']:,.0f} to ${rev['annual_revenue_range']['high']:,.0f}/yr. "
+                    f"Source: {rev.get('source', 'Blue Carbon Initiative')}."
+                )
+                result = {
+                    "answer": answer,
+                    "confidence": 0.75,
+                    "caveats": [
+                        "Revenue based on global average sequestration rates - site-specific measurement recommended",
+                        "Verra VCS verification adds 12-18 months and certification costs before credit issuance",
+                        "Carbon price reflects voluntary market; CORSIA compliance market prices may differ",
+                    ],
+                    "axioms_used": ["BA-007", "BA-017"],
+                    "provenance_risk": "medium",
+                    "scenario_request": scenario_req.model_dump(),
+                    "annual_revenue_usd": rev["annual_revenue_usd"],
+                    "revenue_range": rev["annual_revenue_range"],
+                }
+    else:
+        result = {
+            "answer": (
+                f"Scenario type '{scenario_req.scenario_type}' is not yet supported. "
+                f"Supported types: counterfactual, climate (SSP), tipping_point, market (blue carbon revenue). "
+                f"Please rephrase your question using one of these scenario types."
+            ),
+            "confidence": 0.0,
+            "provenance_risk": "high",
+            "category": "scenario_analysis",
+            "caveats": [f"Scenario type '{scenario_req.scenario_type}' not implemented"],
+            "axioms_used": [],
+        }
+
+    # Convert Pydantic ScenarioResponse to dict for uniform .get() access
+    if hasattr(result, "model_dump"):
+        result = result.model_dump()
+
+    elapsed_ms = int((time.monotonic() - start) * 1000)
+    # Return scenario result as QueryResponse
+    return QueryResponse(
+        answer=result.get("answer", "Scenario analysis complete."),
+        confidence=result.get("confidence", 0.0),
+        evidence=[],
+        axioms_used=result.get("axioms_used", []),
+        graph_path=[],
+        caveats=result.get("caveats", []),
+        verified_claims=[],
+        unverified_claims=[],
+        evidence_count=0,
+        doi_citation_count=0,
+        evidence_completeness_score=0.0,
+        provenance_warnings=result.get("provenance_warnings", []),
+        provenance_risk=result.get("provenance_risk", "high"),
+        scenario_request=result.get("scenario_request"),
+        annual_revenue_usd=result.get("annual_revenue_usd"),
+        revenue_range=result.get("revenue_range"),
+        query_metadata=QueryMetadata(
+            category="scenario_analysis",
+            classification_confidence=classification.get("confidence", 0.0),
+            template_used=f"scenario_analysis:{scenario_req.scenario_type}",
+            response_time_ms=elapsed_ms,
+        ),
+    )
+
+
+@dataclass
+class _GroundedQuery:
+    """Graph-side outcome of a query (steps 2-3), ready for LLM synthesis."""
+
+    category: str
+    site: str | None
+    graph_result: dict[str, Any]
+    provenance_edges: list[dict[str, Any]]
+    inference_trace: list[dict[str, Any]]
+    explanation_chain: str | None
+    provisional_axioms: list[str]
+    evidence_index: NumericEvidenceIndex | None = None  # Shared by batch items reading the same graph result
+
+
+async def _answer_query(
+    request: QueryRequest,
+    classification: dict[str, Any],
+    start: float,
+    *,
+    executor: Any = None,
+    generation_slots: asyncio.Semaphore | None = None,
+) -> QueryResponse:
+    """Run the post-classification pipeline (steps 2-6) for one request.
+
+    ``executor`` overrides the module executor for graph reads (the batch
+    endpoint passes a shared-read proxy); ``generation_slots`` bounds how
+    many LLM syntheses run at once.
+    """
+    assert _generator  # narrowing for type checker
+
+    grounded = await _ground_query(request, classification, start, executor=executor)
+    if isinstance(grounded, QueryResponse):
+        return grounded
+
+    # 4. Generate response via LLM
+    cfg = get_config()
+    try:
+        async with generation_slots or contextlib.nullcontext():
+            raw = await asyncio.wait_for(
+                run_stage(_generator, "generate", **_generation_kwargs(request, grounded)),
+                timeout=cfg.query_generation_timeout_seconds,
+            )
+    except asyncio.TimeoutError:
+        logger.warning("Response generation exceeded its deadline for category=%s", grounded.category)
+        raise HTTPException(status_code=504, detail="Response generation timed out")
+    except Exception:
+        logger.exception("Response generation failed for category=%s", grounded.category)
+        raise HTTPException(status_code=500, detail="Response generation failed")
+
+    return _assemble_response(request, classification, grounded, raw, start)
+
+
+async def _ground_query(
+    request: QueryRequest,
+    classification: dict[str, Any],
+    start: float,
+    *,
+    executor: Any = None,
+) -> _GroundedQuery | QueryResponse:
+    """Build template parameters, read the graph and run inference (steps 2-3).
+
+    Returns a finished ``QueryResponse`` for answers that need no LLM
+    synthesis (scenario analysis, open-domain queries without graph data).
+    """
+    executor = executor or _executor
+    assert executor  # narrowing for type checker
 
-    # 1. Classify
-    classification = _classifier.classify(request.question)
     category = classification["category"]
     site = request.site or classification.get("site")
 
@@ -365,197 +775,62 @@ def query(request: QueryRequest):
                 detail="Comparison queries must specify at least two sites.",
             )
     elif category == "scenario_analysis":
-        # Scenario analysis uses its own engine pipeline, bypassing graph execution.
-        # Lazy imports to avoid circular dependencies and allow incremental build.
-        try:
-            from maris.scenario.scenario_parser import parse_scenario_request
-            from maris.scenario.counterfactual_engine import run_counterfactual
-            from maris.scenario.climate_scenarios import run_climate_scenario
-            from maris.scenario.tipping_point_analyzer import get_tipping_point_site_report
-            from maris.scenario.blue_carbon_revenue import compute_blue_carbon_revenue
-            from maris.scenario.counterfactual_engine import _load_site_data as _load_cf_data
-        except ImportError:
-            logger.warning("Scenario modules not yet available")
-            elapsed_ms = int((time.monotonic() - start) * 1000)
-            return QueryResponse(
-                answer="Scenario analysis module is not yet initialized. Please try again later.",
-                confidence=0.0,
-                evidence=[],
-                axioms_used=[],
-                graph_path=[],
-                caveats=["Scenario module not available"],
-                verified_claims=[],
-                unverified_claims=[],
-                evidence_count=0,
-                doi_citation_count=0,
-                evidence_completeness_score=0.0,
-                provenance_warnings=["Scenario module import failed"],
-                provenance_risk="high",
-                query_metadata=QueryMetadata(
-                    category="scenario_analysis",
-                    classification_confidence=classification.get("confidence", 0.0),
-                    template_used="scenario_analysis:unavailable",
-                    response_time_ms=elapsed_ms,
-                ),
-            )
+        # Scenario engines are local CPU work; keep them off the event loop
+        return await run_in_threadpool(_answer_scenario, request, classification, site, start)
 
-        scenario_req = parse_scenario_request(request.question, site, classification)
-
-        if scenario_req.scenario_type == "counterfactual":
-            result = run_counterfactual(scenario_req)
-        elif scenario_req.scenario_type == "climate":
-            result = run_climate_scenario(scenario_req)
-        elif scenario_req.scenario_type == "tipping_point":
-            site_name = scenario_req.site_scope[0] if scenario_req.site_scope else ""
-            site_data = _load_cf_data(site_name) if site_name else None
-            if site_data is None:
-                result = {
-                    "answer": "No site data available for tipping point analysis. Please specify a site.",
-                    "confidence": 0.0, "caveats": ["Site not found"],
-                    "axioms_used": [], "provenance_risk": "high",
-                }
-            else:
-                report = get_tipping_point_site_report(site_data)
-                if report.get("applicable"):
-                    answer = (
-                        f"{report['site_name']} current fish biomass: {report['current_biomass_kg_ha']:.0f} kg/ha "
-                        f"(reef function: {report['reef_function_current']:.1%}, {report['nearest_threshold']['name']} zone). "
-                        f"{report['proximity_description']} "
-                        f"ESV at collapse threshold (150 kg/ha): ${report['esv_at_collapse']:,.0f}/yr "
-                        f"vs current ${report['esv_current']:,.0f}/yr. "
-                        f"Source: McClanahan et al. 2011 (doi:{report['source_doi']})"
-                    )
-                    result = {
-                        "answer": answer, "confidence": 0.80,
-                        "caveats": ["McClanahan piecewise function calibrated on Indo-Pacific reefs",
-                                    "Biomass derived from recovery_ratio * 200 kg/ha pre-protection baseline (Aburto-Oropeza et al. 2011)"],
-                        "axioms_used": ["BA-036", "BA-037", "BA-038", "BA-039"],
-                        "provenance_risk": "medium",
-                        "scenario_request": scenario_req.model_dump(),
-                    }
-                else:
-                    answer = (
-                        f"Tipping point analysis for {report['site_name']}: {report.get('reason', 'Not applicable')}. "
-                        f"Habitat type: {report.get('habitat_type', 'unknown')}. "
-                        f"The McClanahan et al. 2011 piecewise function (doi:10.1073/pnas.1106861108) applies to coral reef "
-                        f"fish biomass. For mangrove habitats, deforestation thresholds apply; for seagrass, heatwave-driven "
-                        f"dieback thresholds per Arias-Ortiz et al. 2018 (doi:10.1038/s41558-018-0096-y)."
-                    )
-                    result = {
-                        "answer": answer, "confidence": 0.60,
-                        "caveats": ["Tipping point analysis requires site-specific biomass survey data"],
-                        "axioms_used": ["BA-036", "BA-040"], "provenance_risk": "medium",
-                        "scenario_request": scenario_req.model_dump(),
-                    }
-        elif scenario_req.scenario_type == "market":
-            site_name = scenario_req.site_scope[0] if scenario_req.site_scope else ""
-            site_data = _load_cf_data(site_name) if site_name else None
-            if site_data is None:
-                result = {
-                    "answer": "No site data available for blue carbon revenue analysis.",
-                    "confidence": 0.0, "caveats": ["Site not found"],
-                    "axioms_used": [], "provenance_risk": "high",
-                }
-            else:
-                # Map requested carbon price to nearest price scenario key
-                carbon_price = scenario_req.assumptions.get("carbon_price_usd", 25.25)
-                from maris.scenario.constants import CARBON_PRICE_SCENARIOS
-                price_scenario = min(
-                    CARBON_PRICE_SCENARIOS,
-                    key=lambda k: abs(CARBON_PRICE_SCENARIOS[k]["price_usd"] - carbon_price),
-                )
-                rev = compute_blue_carbon_revenue(
-                    site_name, site_data,
-                    price_scenario=price_scenario,
-                    target_year=scenario_req.target_year or 2030,
-                )
-                if "error" in rev:
-                    answer = (
-                        f"{site_name} does not have blue carbon habitat eligible for voluntary carbon market credits "
-                        f"in the current knowledge base ({rev['error']}). "
-                        f"Blue carbon credits require mangrove forest or seagrass meadow habitat with verified area data. "
-                        f"Reference: Blue Carbon Initiative (bluecarboninitiative.org)."
-                    )
-                    result = {
-                        "answer": answer, "confidence": 0.70,
-                        "caveats": ["No eligible blue carbon habitat detected for this site"],
-                        "axioms_used": [], "provenance_risk": "medium",
-                    }
-                else:
-                    answer = (
-                        f"{site_name} could generate approximately ${rev['annual_revenue_usd']:,.0f}/yr in blue carbon credits "
-                        f"at ${rev['price_usd']}/tCO2e ({price_scenario} price scenario). "
-                        f"Based on {rev['habitat_area_ha']:,.0f} ha of {rev['habitat_type'].replace('_', ' ')} "
-                        f"at {rev['seq_rate_tco2_ha_yr']:.1f} tCO2/ha/yr (mid estimate, 60% Verra-verified). "
-                        f"Range: ${rev['annual_revenue_range']['low']:,.0f} to ${rev['annual_revenue_range']['high']:,.0f}/yr. "
-                        f"Source: {rev.get('source', 'Blue Carbon Initiative')}."
-                    )
-                    result = {
-                        "answer": answer,
-                        "confidence": 0.75,
-                        "caveats": [
-                            "Revenue based on global average sequestration rates - site-specific measurement recommended",
-                            "Verra VCS verification adds 12-18 months and certification costs before credit issuance",
-                            "Carbon price reflects voluntary market; CORSIA compliance market prices may differ",
-                        ],
-                        "axioms_used": ["BA-007", "BA-017"],
-                        "provenance_risk": "medium",
-                        "scenario_request": scenario_req.model_dump(),
-                        "annual_revenue_usd": rev["annual_revenue_usd"],
-                        "revenue_range": rev["annual_revenue_range"],
-                    }
-        else:
-            result = {
-                "answer": (
-                    f"Scenario type '{scenario_req.scenario_type}' is not yet supported. "
-                    f"Supported types: counterfactual, climate (SSP), tipping_point, market (blue carbon revenue). "
-                    f"Please rephrase your question using one of these scenario types."
-                ),
-                "confidence": 0.0,
-                "provenance_risk": "high",
-                "category": "scenario_analysis",
-                "caveats": [f"Scenario type '{scenario_req.scenario_type}' not implemented"],
-                "axioms_used": [],
-            }
-
-        # Convert Pydantic ScenarioResponse to dict for uniform .get() access
-        if hasattr(result, "model_dump"):
-            result = result.model_dump()
+    # 3. Graph reads and inference as a stage DAG: template execution and
+    # provenance lookups are independent round trips and run concurrently;
+    # inference waits for both.
+    cfg = get_config()
+    strict = category in _STRICT_DETERMINISTIC_CATEGORIES
+
+    async def _graph_stage(_deps: dict[str, Any]) -> dict:
+        with stage("cypher"):
+            return await run_stage(
+                executor,
+                "execute_with_strategy",
+                category,
+                params,
+                question=request.question,
+                site_name=site,
+            )
 
-        elapsed_ms = int((time.monotonic() - start) * 1000)
-        # Return scenario result as QueryResponse
-        return QueryResponse(
-            answer=result.get("answer", "Scenario analysis complete."),
-            confidence=result.get("confidence", 0.0),
-            evidence=[],
-            axioms_used=result.get("axioms_used", []),
-            graph_path=[],
-            caveats=result.get("caveats", []),
-            verified_claims=[],
-            unverified_claims=[],
-            evidence_count=0,
-            doi_citation_count=0,
-            evidence_completeness_score=0.0,
-            provenance_warnings=result.get("provenance_warnings", []),
-            provenance_risk=result.get("provenance_risk", "high"),
-            scenario_request=result.get("scenario_request"),
-            annual_revenue_usd=result.get("annual_revenue_usd"),
-            revenue_range=result.get("revenue_range"),
-            query_metadata=QueryMetadata(
-                category="scenario_analysis",
-                classification_confidence=classification.get("confidence", 0.0),
-                template_used=f"scenario_analysis:{scenario_req.scenario_type}",
-                response_time_ms=elapsed_ms,
-            ),
-        )
+    async def _provenance_stage(_deps: dict[str, Any]) -> list[dict[str, Any]]:
+        if category == "open_domain":
+            return []
+        with stage("provenance"):
+            return await run_stage(executor, "get_provenance_edges", category, params)
+
+    async def _inference_stage(deps: dict[str, Any]) -> tuple | None:
+        # Only runs when the graph/provenance checks below will pass
+        if not strict or deps["graph"].get("error") or not deps["provenance"]:
+            return None
+        axiom_ids = _extract_axiom_ids(deps["graph"]) | _extract_axiom_ids(deps["provenance"])
+        if not axiom_ids:
+            return None
+        with stage("inference"):
+            # First use loads the registry and may verify DOIs over the network
+            return await run_in_threadpool(_build_inference_trace, axiom_ids, site)
+
+    stages = [
+        Stage("graph", _graph_stage, timeout=cfg.query_graph_timeout_seconds),
+        Stage(
+            "provenance",
+            _provenance_stage,
+            timeout=cfg.query_provenance_timeout_seconds,
+            # Provenance only decorates non-strict answers; degrade to no edges
+            optional=not strict,
+            default=[],
+        ),
+        Stage("inference", _inference_stage, depends_on=("graph", "provenance")),
+    ]
+    try:
+        scheduled = await StageScheduler(cfg.query_stage_concurrency).run(stages)
+    except StageTimeoutError as exc:
+        logger.warning("Query pipeline deadline exceeded: %s", exc)
+        raise HTTPException(status_code=504, detail=f"Query stage '{exc.stage}' timed out")
 
-    # 3. Execute with strict strategy enforcement
-    graph_result = _executor.execute_with_strategy(
-        category,
-        params,
-        question=request.question,
-        site_name=site,
-    )
+    graph_result = scheduled["graph"]
     if graph_result.get("error"):
         error_type = graph_result.get("error_type", "execution_failed")
         if category == "open_domain" and error_type == "no_results":
@@ -603,11 +878,9 @@ def query(request: QueryRequest):
         status_code = 422 if error_type in _CLIENT_ERROR_TYPES else 500
         raise HTTPException(status_code=status_code, detail=graph_result["error"])
 
-    provenance_edges: list[dict[str, Any]] = []
-    if category != "open_domain":
-        provenance_edges = _executor.get_provenance_edges(category, params)
+    provenance_edges: list[dict[str, Any]] = scheduled["provenance"]
 
-    if category in _STRICT_DETERMINISTIC_CATEGORIES and not provenance_edges:
+    if strict and not provenance_edges:
         raise HTTPException(
             status_code=422,
             detail=(
@@ -619,9 +892,8 @@ def query(request: QueryRequest):
     explanation_chain: str | None = None
     inference_trace: list[dict[str, Any]] = []
     provisional_axioms: list[str] = []
-    if category in _STRICT_DETERMINISTIC_CATEGORIES:
-        axiom_ids = _extract_axiom_ids(graph_result) | _extract_axiom_ids(provenance_edges)
-        if not axiom_ids:
+    if strict:
+        if scheduled["inference"] is None:
             raise HTTPException(
                 status_code=422,
                 detail=(
@@ -630,10 +902,7 @@ def query(request: QueryRequest):
                 ),
             )
 
-        inference_trace, explanation_chain, provisional_axioms = _build_inference_trace(
-            axiom_ids,
-            site,
-        )
+        inference_trace, explanation_chain, provisional_axioms = scheduled["inference"]
         if not inference_trace:
             raise HTTPException(
                 status_code=422,
@@ -643,23 +912,68 @@ def query(request: QueryRequest):
                 ),
             )
 
-    # 4. Generate response via LLM
+    evidence_index = None
+    if isinstance(executor, SharedGraphReads):
+        evidence_index = executor.evidence_index(category, params, question=request.question, site_name=site)
+
+    return _GroundedQuery(
+        category=category,
+        site=site,
+        graph_result=graph_result,
+        provenance_edges=provenance_edges,
+        inference_trace=inference_trace,
+        explanation_chain=explanation_chain,
+        provisional_axioms=provisional_axioms,
+        evidence_index=evidence_index,
+    )
+
+
+def _graph_path(request: QueryRequest, grounded: _GroundedQuery) -> list[dict[str, Any]]:
+    """Structured graph path from the Neo4j traversal and inference trace."""
+    if not request.include_graph_path:
+        return []
+    graph_path = list(grounded.provenance_edges)
+    graph_path.extend({
+        "from_node": step["axiom_id"],
+        "from_type": "BridgeAxiom",
+        "relationship": "INFERRED_AS",
+        "to_node": step["output_fact"],
+        "to_type": "DerivedFact",
+    } for step in grounded.inference_trace)
+    return graph_path
+
+
+def _generation_kwargs(request: QueryRequest, grounded: _GroundedQuery) -> dict[str, Any]:
+    """Arguments for ``ResponseGenerator.generate*`` for a grounded query."""
     # Inject site context for habitat-aware responses
+    site = grounded.site
     site_context = ""
     if site and site in _SITE_HABITAT_MAP:
         habitat = _SITE_HABITAT_MAP[site]
         site_context = f" [Site context: {site} ({habitat.replace('_', ' ')})]"
-
-    try:
-        raw = _generator.generate(
-            question=request.question + site_context,
-            graph_context=graph_result,
-            category=category,
-            explanation_chain=explanation_chain,
-        )
-    except Exception:
-        logger.exception("Response generation failed for category=%s", category)
-        raise HTTPException(status_code=500, detail="Response generation failed")
+    kwargs = {
+        "question": request.question + site_context,
+        "graph_context": grounded.graph_result,
+        "category": grounded.category,
+        "explanation_chain": grounded.explanation_chain,
+    }
+    if grounded.evidence_index is not None:
+        kwargs["evidence_index"] = grounded.evidence_index
+    return kwargs
+
+
+def _assemble_response(
+    request: QueryRequest,
+    classification: dict[str, Any],
+    grounded: _GroundedQuery,
+    raw: dict[str, Any],
+    start: float,
+) -> QueryResponse:
+    """Format, re-score and package a generated answer (steps 5-6)."""
+    category = grounded.category
+    graph_result = grounded.graph_result
+    inference_trace = grounded.inference_trace
+    provisional_axioms = grounded.provisional_axioms
 
     # 5. Format
     try:
@@ -682,17 +996,7 @@ def query(request: QueryRequest):
         formatted["caveats"] = list(formatted.get("caveats", [])) + classification["caveats"]
 
     # 6. Build structured graph_path from actual Neo4j traversal (not LLM text)
-    graph_path = []
-    if request.include_graph_path:
-        graph_path = list(provenance_edges)
-        if inference_trace:
-            graph_path.extend({
-                "from_node": step["axiom_id"],
-                "from_type": "BridgeAxiom",
-                "relationship": "INFERRED_AS",
-                "to_node": step["output_fact"],
-                "to_type": "DerivedFact",
-            } for step in inference_trace)
+    graph_path = _graph_path(request, grounded)
 
     elapsed_ms = int((time.monotonic() - start) * 1000)
 
@@ -700,15 +1004,16 @@ def query(request: QueryRequest):
     evidence = [EvidenceItem(**e) for e in visible_evidence_payload]
 
     visible_evidence_dicts = [item.model_dump() for item in evidence]
-    provenance_summary = build_provenance_summary(visible_evidence_dicts, formatted.get("answer", ""))
-    provenance_summary["has_numeric_claims"] = bool(
-        extract_numerical_claims(formatted.get("answer", ""))
-    )
-    confidence_breakdown = calculate_response_confidence(
-        visible_evidence_dicts,
-        n_hops=_CATEGORY_HOPS.get(category, 1),
-        provenance_summary=provenance_summary,
-    )
+    with stage("confidence"):
+        provenance_summary = build_provenance_summary(visible_evidence_dicts, formatted.get("answer", ""))
+        provenance_summary["has_numeric_claims"] = bool(
+            extract_numerical_claims(formatted.get("answer", ""))
+        )
+        confidence_breakdown = calculate_response_confidence(
+            visible_evidence_dicts,
+            n_hops=_CATEGORY_HOPS.get(category, 1),
+            provenance_summary=provenance_summary,
+        )
     formatted["confidence"] = confidence_breakdown["composite"]
 
     return QueryResponse(
@@ -731,5 +1036,265 @@ def query(request: QueryRequest):
             classification_confidence=classification.get("confidence", 0.0),
             template_used=f"{category}:{graph_result.get('strategy', 'unknown')}",
             response_time_ms=elapsed_ms,
+            degraded=bool(raw.get("degraded")),
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Streaming (server-sent events)
+# ---------------------------------------------------------------------------
+
+@router.post("/query/stream", dependencies=[Depends(rate_limit_query)])
+async def query_stream(request: QueryRequest):
+    """Answer a question as a stream of server-sent events.
+
+    Classification and graph reads finish before the stream opens, so
+    request errors keep the status codes of ``/api/query``. The stream
+    then carries, in order:
+
+    - ``grounding``: graph evidence, inference trace, axioms and the
+      deterministic confidence score, all available before the LLM runs
+    - ``token``: answer text deltas as the LLM produces them
+    - ``final``: the validated ``QueryResponse`` (authoritative; validation
+      may rewrite the streamed answer)
+    - ``error``: ``{"status_code", "detail"}`` if generation fails mid-stream
+
+    Streamed answers bypass the response cache.
+    """
+    await run_in_threadpool(_init_components)
+    assert _classifier and _executor and _generator  # narrowing for type checker
+
+    start = time.monotonic()
+    timings = StageTimings()
+    with timings.activate():
+        with stage("classify"):
+            classification = await run_stage(_classifier, "classify", request.question)
+        grounded = await _ground_query(request, classification, start)
+    if isinstance(grounded, QueryResponse):
+        events = _final_event(request, grounded, timings, start)
+    else:
+        events = _stream_answer(request, classification, grounded, timings, start)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: Any) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _final_event(
+    request: QueryRequest,
+    response: QueryResponse,
+    timings: StageTimings,
+    start: float,
+) -> AsyncIterator[str]:
+    response.query_metadata.cache_status = CACHE_BYPASS
+    _record_timings(request, response, timings, start)
+    yield _sse("final", response.model_dump(mode="json"))
+
+
+def _grounding_payload(
+    request: QueryRequest,
+    classification: dict[str, Any],
+    grounded: _GroundedQuery,
+) -> dict[str, Any]:
+    """Deterministic, pre-LLM view of the answer: evidence, axioms, confidence."""
+    graph_evidence = format_response({
+        "evidence": ResponseGenerator.graph_evidence(grounded.graph_result),
+    })["evidence"]
+    evidence = [
+        EvidenceItem(**e).model_dump()
+        for e in graph_evidence[:request.max_evidence_sources]
+    ]
+    provenance_summary = build_provenance_summary(evidence)
+    confidence_breakdown = calculate_response_confidence(
+        evidence,
+        n_hops=_CATEGORY_HOPS.get(grounded.category, 1),
+        provenance_summary=provenance_summary,
+    )
+    return {
+        "category": grounded.category,
+        "site": grounded.site,
+        "classification_confidence": classification.get("confidence", 0.0),
+        "evidence": evidence,
+        "axioms_used": [step["axiom_id"] for step in grounded.inference_trace],
+        "provisional_axioms": grounded.provisional_axioms,
+        "inference_trace": grounded.inference_trace,
+        "graph_path": _graph_path(request, grounded),
+        "confidence": confidence_breakdown["composite"],
+        "confidence_breakdown": confidence_breakdown,
+    }
+
+
+async def _stream_answer(
+    request: QueryRequest,
+    classification: dict[str, Any],
+    grounded: _GroundedQuery,
+    timings: StageTimings,
+    start: float,
+) -> AsyncIterator[str]:
+    """Event stream for a grounded query: grounding, tokens, final envelope."""
+    events = _stream_events(request, classification, grounded, timings, start)
+    with timings.activate():
+        async with contextlib.aclosing(events):
+            async for event in events:
+                yield event
+
+
+async def _stream_events(
+    request: QueryRequest,
+    classification: dict[str, Any],
+    grounded: _GroundedQuery,
+    timings: StageTimings,
+    start: float,
+) -> AsyncIterator[str]:
+    yield _sse("grounding", _grounding_payload(request, classification, grounded))
+
+    cfg = get_config()
+    deadline = time.monotonic() + cfg.query_generation_timeout_seconds
+    kwargs = _generation_kwargs(request, grounded)
+    raw: dict[str, Any] | None = None
+    try:
+        if inspect.isasyncgenfunction(getattr(_generator, "generate_stream", None)):
+            events = _generator.generate_stream(**kwargs)
+            try:
+                while raw is None:
+                    remaining = max(deadline - time.monotonic(), 0.0)
+                    kind, value = await asyncio.wait_for(anext(events), timeout=remaining)
+                    if kind == "token":
+                        yield _sse("token", {"text": value})
+                    else:
+                        raw = value
+            finally:
+                await events.aclose()
+        else:
+            # Sync-only generators (custom or test doubles): one blocking call
+            raw = await asyncio.wait_for(
+                run_stage(_generator, "generate", **kwargs),
+                timeout=cfg.query_generation_timeout_seconds,
+            )
+            if raw.get("answer"):
+                yield _sse("token", {"text": raw["answer"]})
+    except asyncio.TimeoutError:
+        logger.warning("Streamed generation exceeded its deadline for category=%s", grounded.category)
+        yield _sse("error", {"status_code": 504, "detail": "Response generation timed out"})
+        return
+    except Exception:
+        logger.exception("Streamed generation failed for category=%s", grounded.category)
+        yield _sse("error", {"status_code": 500, "detail": "Response generation failed"})
+        return
+
+    try:
+        response = _assemble_response(request, classification, grounded, raw, start)
+    except HTTPException as exc:
+        yield _sse("error", {"status_code": exc.status_code, "detail": exc.detail})
+        return
+    except Exception:
+        logger.exception("Streamed response assembly failed")
+        yield _sse("error", {"status_code": 500, "detail": "Response formatting failed"})
+        return
+    response.query_metadata.cache_status = CACHE_BYPASS
+    _record_timings(request, response, timings, start)
+    yield _sse("final", response.model_dump(mode="json"))
+
+
+# ---------------------------------------------------------------------------
+# Batch
+# ---------------------------------------------------------------------------
+
+@router.post("/query/batch", response_model=BatchQueryResponse, dependencies=[Depends(rate_limit_batch)])
+async def query_batch(batch: BatchQueryRequest):
+    """Answer many questions in one call, sharing classification and graph work.
+
+    Identical questions (after normalization, with the same options) are
+    answered once. The rest are grouped by classified category and site,
+    each distinct template execution and provenance lookup runs once for
+    the whole batch, and LLM calls are bounded by
+    ``MARIS_QUERY_BATCH_LLM_CONCURRENCY``. A failing question is reported
+    in its item's ``error`` instead of failing the batch.
+    """
+    await run_in_threadpool(_init_components)
+    assert _classifier and _executor and _generator  # narrowing for type checker
+
+    start = time.monotonic()
+    cfg = get_config()
+    llm_slots = asyncio.Semaphore(max(int(cfg.query_batch_llm_concurrency), 1))
+
+    # 1. Collapse duplicate questions
+    distinct = batch.distinct_queries()
+    requests = [batch.queries[indices[0]] for indices in distinct.values()]
+    timings = [StageTimings() for _ in requests]
+
+    # 2. Classify (rules are instant; LLM fallbacks share the LLM slots)
+    async def _classify(pos: int) -> dict[str, Any]:
+        async with llm_slots:
+            with timings[pos].activate(), stage("classify"):
+                return await run_stage(_classifier, "classify", requests[pos].question)
+
+    classifications = await asyncio.gather(*(_guarded(_classify(pos)) for pos in range(len(requests))))
+
+    # 3. Group by (category, site) and answer through shared graph reads
+    groups: dict[tuple[str, str | None], list[int]] = {}
+    for pos, (request, classification) in enumerate(zip(requests, classifications)):
+        if isinstance(classification, BatchQueryError):
+            continue
+        group = (classification.get("category", ""), request.site or classification.get("site"))
+        groups.setdefault(group, []).append(pos)
+
+    epoch = await run_in_threadpool(get_graph_epoch) if _response_cache is not None else None
+    reads = SharedGraphReads(_executor)
+    outcomes: list[QueryResponse | BatchQueryError | None] = list(classifications)
+    ordered = [pos for members in groups.values() for pos in members]
+
+    async def _answer(pos: int) -> QueryResponse:
+        item_start = time.monotonic()
+        with span("query.batch_item", **{"batch.position": pos}):
+            with timings[pos].activate():
+                response = await _respond(
+                    requests[pos], classifications[pos], item_start, epoch,
+                    executor=reads, generation_slots=llm_slots,
+                )
+            _record_timings(requests[pos], response, timings[pos], item_start)
+        return response
+
+    answered = await asyncio.gather(*(_guarded(_answer(pos)) for pos in ordered))
+    for pos, outcome in zip(ordered, answered):
+        outcomes[pos] = outcome
+
+    results: list[BatchQueryItem | None] = [None] * len(batch.queries)
+    for indices, outcome in zip(distinct.values(), outcomes):
+        for index in indices:
+            item = BatchQueryItem(index=index, question=batch.queries[index].question)
+            if isinstance(outcome, BatchQueryError):
+                item.error = outcome
+            else:
+                item.response = outcome
+            results[index] = item
+
+    return BatchQueryResponse(
+        results=results,
+        batch_metadata=BatchQueryMetadata(
+            total=len(batch.queries),
+            distinct_questions=len(requests),
+            groups=len(groups),
+            graph_reads=reads.graph_reads,
+            provenance_reads=reads.provenance_reads,
+            response_time_ms=int((time.monotonic() - start) * 1000),
         ),
     )
+
+
+async def _guarded(awaitable: Any) -> Any:
+    """Await one batch item, converting failures into a ``BatchQueryError``."""
+    try:
+        return await awaitable
+    except HTTPException as exc:
+        return BatchQueryError(status_code=exc.status_code, detail=str(exc.detail))
+    except Exception:
+        logger.exception("Batch query item failed")
+        return BatchQueryError(status_code=500, detail="Query failed")
@@ -0,0 +1,11 @@
+"""Offline text embeddings and exact similarity search over small collections."""
+
+from maris.embeddings.embedder import EMBEDDING_DIM, HashingEmbedder, get_embedder
+from maris.embeddings.flat_index import FlatIndex
+
+__all__ = [
+    "EMBEDDING_DIM",
+    "HashingEmbedder",
+    "get_embedder",
+    "FlatIndex",
+]
@@ -0,0 +1,128 @@
+"""Deterministic, offline text embeddings via feature hashing.
+
+``HashingEmbedder`` maps word unigrams, word bigrams and character
+trigrams into a fixed number of signed buckets (the "hashing trick"),
+weights them by sublinear term frequency (per word, shared by its
+trigrams) and L2-normalises the result. It needs no model download, no
+network and no fitting, and the same text always produces the same vector,
+so vectors written to Neo4j stay valid across processes
+and restarts.
+
+Cosine similarity between two embeddings approximates lexical overlap
+with partial credit for shared word stems (via the character trigrams).
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+import numpy as np
+
+EMBEDDING_DIM = 384
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Relative feature weights
+_WORD_WEIGHT = 1.0
+_BIGRAM_WEIGHT = 0.7
+_TRIGRAM_WEIGHT = 0.35
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were what which "
+    "with how does do".split()
+)
+
+
+def _bucket(feature: str, dim: int) -> tuple[int, float]:
+    """Hash bucket and sign for a feature (crc32: fast and process-stable)."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+
+@lru_cache(maxsize=65536)
+def _word_features(word: str, dim: int) -> tuple[np.ndarray, np.ndarray]:
+    """Buckets and signed weights for a word and its character trigrams."""
+    buckets, weights = [], []
+    bucket, sign = _bucket("w:" + word, dim)
+    buckets.append(bucket)
+    weights.append(sign * _WORD_WEIGHT)
+    padded = f"<{word}>"
+    for i in range(len(padded) - 2):
+        bucket, sign = _bucket("c:" + padded[i:i + 3], dim)
+        buckets.append(bucket)
+        weights.append(sign * _TRIGRAM_WEIGHT)
+    return np.array(buckets, dtype=np.int64), np.array(weights, dtype=np.float32)
+
+
+class HashingEmbedder:
+    """Feature-hashing text embedder producing unit-norm float32 vectors."""
+
+    def __init__(self, dim: int = EMBEDDING_DIM) -> None:
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        self.dim = dim
+
+    def _embed_into(self, text: str, out: np.ndarray) -> None:
+        words = [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+        if not words:
+            return
+        buckets: list[np.ndarray] = []
+        weights: list[np.ndarray] = []
+        for word, tf in Counter(words).items():
+            word_buckets, word_weights = _word_features(word, self.dim)
+            buckets.append(word_buckets)
+            weights.append(word_weights * (1.0 + math.log(tf)))
+        for pair, tf in Counter(zip(words, words[1:])).items():
+            bucket, sign = _bucket(f"b:{pair[0]} {pair[1]}", self.dim)
+            buckets.append(np.array([bucket]))
+            weights.append(np.array([sign * _BIGRAM_WEIGHT * (1.0 + math.log(tf))], dtype=np.float32))
+        out += np.bincount(
+            np.concatenate(buckets), weights=np.concatenate(weights), minlength=self.dim,
+        ).astype(np.float32)
+        norm = float(np.linalg.norm(out))
+        if norm > 0:
+            out /= norm
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed one text; empty or stopword-only text gives the zero vector."""
+        out = np.zeros(self.dim, dtype=np.float32)
+        self._embed_into(text or "", out)
+        return out
+
+    def embed_batch(self, texts: Sequence[str], batch_size: int = 1024) -> np.ndarray:
+        """Embed ``texts`` into an ``(n, dim)`` float32 matrix."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), max(1, batch_size)):
+            for row in range(start, min(start + batch_size, len(texts))):
+                self._embed_into(texts[row] or "", matrix[row])
+        return matrix
+
+    def iter_batches(self, texts: Iterable[str], batch_size: int = 1024) -> Iterable[np.ndarray]:
+        """Yield embedding matrices for successive ``batch_size`` slices of ``texts``."""
+        batch: list[str] = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= batch_size:
+                yield self.embed_batch(batch, batch_size)
+                batch = []
+        if batch:
+            yield self.embed_batch(batch, batch_size)
+
+
+_default: HashingEmbedder | None = None
+_default_lock = threading.Lock()
+
+
+def get_embedder() -> HashingEmbedder:
+    """Process-wide default embedder (``EMBEDDING_DIM`` dimensions)."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = HashingEmbedder(EMBEDDING_DIM)
+    return _default
@@ -0,0 +1,35 @@
+"""Exact nearest-neighbour search over small unit-norm embedding matrices.
+
+``FlatIndex`` is brute-force inner-product search. The hybrid retriever
+uses it to rank the nodes of a retrieved context graph (tens to a few
+thousand vectors). Document-scale search runs in Neo4j's vector index.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest scores, best first."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+class FlatIndex:
+    """Exact inner-product search over an in-memory matrix."""
+
+    def __init__(self, vectors: np.ndarray) -> None:
+        self._vectors = np.asarray(vectors, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self._vectors.shape[0]
+
+    def search(self, query: np.ndarray, k: int = 10) -> list[tuple[int, float]]:
+        if len(self) == 0:
+            return []
+        scores = self._vectors @ np.asarray(query, dtype=np.float32)
+        return [(int(row), float(scores[row])) for row in _top_k(scores, k)]
@@ -1,8 +1,17 @@
 """MARIS Graph module - Neo4j schema, connection, population, and validation."""
 
 from maris.graph.connection import get_driver, close_driver
+from maris.graph.async_connection import get_async_driver, close_async_driver
 from maris.graph.schema import ensure_schema
 from maris.graph.population import populate_graph
 from maris.graph.validation import validate_graph
 
-__all__ = ["get_driver", "close_driver", "ensure_schema", "populate_graph", "validate_graph"]
+__all__ = [
+    "get_driver",
+    "close_driver",
+    "get_async_driver",
+    "close_async_driver",
+    "ensure_schema",
+    "populate_graph",
+    "validate_graph",
+]
@@ -0,0 +1,121 @@
+"""Async Neo4j driver management for the async query path.
+
+Mirrors ``maris.graph.connection`` on ``AsyncGraphDatabase`` so request
+handlers can await graph reads without holding a threadpool thread.
+
+Async driver connections are bound to the event loop that opened them. The
+singleton is therefore tracked per loop: if it is requested from a different
+loop (e.g. a test client spinning up a fresh loop) a new driver is created
+and the stale one is discarded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import ServiceUnavailable, TransientError
+
+from maris.config import get_config
+from maris.graph.connection import annotate_query_span
+from maris.observability.tracing import current_span, traced
+
+logger = logging.getLogger(__name__)
+
+_driver = None
+_driver_loop: asyncio.AbstractEventLoop | None = None
+_lock: asyncio.Lock | None = None
+_lock_loop: asyncio.AbstractEventLoop | None = None
+
+_QUERY_TIMEOUT = 30  # seconds
+
+
+def async_retry(max_attempts: int = 3, backoff_seconds: tuple[float, ...] = (1.0, 2.0, 4.0),
+                retryable: tuple[type[Exception], ...] = (TransientError, ServiceUnavailable)):
+    """Async counterpart of ``maris.graph.connection.retry``."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            last_exc: Exception | None = None
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await fn(*args, **kwargs)
+                except retryable as exc:
+                    last_exc = exc
+                    current_span().add_event(
+                        "retry", attempt=attempt, max_attempts=max_attempts, error=type(exc).__name__,
+                    )
+                    if attempt < max_attempts:
+                        wait = backoff_seconds[min(attempt - 1, len(backoff_seconds) - 1)]
+                        logger.warning(
+                            "Retry %d/%d for %s after %s: sleeping %.1fs",
+                            attempt, max_attempts, fn.__name__,
+                            type(exc).__name__, wait,
+                        )
+                        await asyncio.sleep(wait)
+                    else:
+                        logger.error(
+                            "All %d attempts failed for %s: %s",
+                            max_attempts, fn.__name__, exc,
+                        )
+            raise last_exc  # type: ignore[misc]
+        return wrapper
+    return decorator
+
+
+def _loop_lock() -> asyncio.Lock:
+    global _lock, _lock_loop
+    loop = asyncio.get_running_loop()
+    if _lock is None or _lock_loop is not loop:
+        _lock = asyncio.Lock()
+        _lock_loop = loop
+    return _lock
+
+
+async def get_async_driver():
+    """Return the async Neo4j driver for the running event loop."""
+    global _driver, _driver_loop
+    loop = asyncio.get_running_loop()
+    if _driver is not None and _driver_loop is loop:
+        return _driver
+    async with _loop_lock():
+        if _driver is None or _driver_loop is not loop:
+            cfg = get_config()
+            driver = AsyncGraphDatabase.driver(
+                cfg.neo4j_uri,
+                auth=(cfg.neo4j_user, cfg.neo4j_password),
+            )
+            await driver.verify_connectivity()
+            _driver, _driver_loop = driver, loop
+            logger.info("Async Neo4j driver initialized: %s", cfg.neo4j_uri)
+    return _driver
+
+
+async def close_async_driver() -> None:
+    """Close the async driver if it belongs to the running loop."""
+    global _driver, _driver_loop
+    if _driver is None:
+        return
+    if _driver_loop is asyncio.get_running_loop():
+        await _driver.close()
+        logger.info("Async Neo4j driver closed")
+    _driver, _driver_loop = None, None
+
+
+@traced("neo4j.query")
+@async_retry(max_attempts=3, backoff_seconds=(1.0, 2.0, 4.0))
+async def run_query_async(cypher: str, parameters: dict | None = None, *, write: bool = False):
+    """Execute a Cypher query and return list of record dicts (async).
+
+    Same retry and timeout policy as ``run_query``.
+    """
+    annotate_query_span(cypher, parameters)
+    driver = await get_async_driver()
+    cfg = get_config()
+    async with driver.session(database=cfg.neo4j_database) as session:
+        result = await session.run(cypher, parameters or {}, timeout=_QUERY_TIMEOUT)
+        records = [record.data() async for record in result]
+    current_span().set_attribute("db.rows", len(records))
+    return records
@@ -0,0 +1,108 @@
+"""UNWIND-batched writes for graph population.
+
+The population stages issue one parameterized MERGE per row, so a full
+``populate_graph`` spends most of its time on round trips. ``BatchWriter``
+stands in for the session those stages write through: each
+``run(cypher, parameters)`` is queued under its statement (one statement
+per label or relationship type in practice) and written as
+
+    UNWIND $rows AS row <statement with $param rewritten to row.param>
+
+in batches of ``batch_size`` rows, one managed write transaction per
+batch.
+
+Ordering is what keeps the final graph identical to row-at-a-time
+execution. Rows of one statement are written in the order they were
+issued, and statements are written in the order each was *first* issued
+within the writer. A population loop merges a node before it matches it
+(``MERGE (es:EcosystemService ...)`` then ``MATCH (es ...) MERGE
+(m)-[:GENERATES]->(es)``), so every relationship statement is first seen
+after the node statements it depends on and is always written after
+them. That holds within a single stage, so use one writer per stage and
+leave it (or call ``flush``) before the next stage runs.
+
+Statements that cannot be batched this way run immediately, after
+everything queued before them: those without parameters (global links
+such as ``MATCH (t:TrophicLevel) ... MERGE``) and those whose own clauses
+would change the meaning under UNWIND (``WITH``, ``LIMIT``, ``RETURN``,
+subqueries).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+DEFAULT_BATCH_SIZE = 500
+
+_PARAM_RE = re.compile(r"\$(\w+)")
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_UNBATCHABLE_RE = re.compile(r"\b(WITH|LIMIT|RETURN|UNWIND|CALL|FOREACH|UNION)\b", re.IGNORECASE)
+
+
+def batchable(cypher: str) -> bool:
+    """Whether ``cypher`` keeps its per-row meaning under ``UNWIND $rows AS row``."""
+    if any("$" in literal for literal in _STRING_RE.findall(cypher)):
+        return False  # the $param rewrite would reach into the literal
+    text = _STRING_RE.sub("''", cypher)
+    return _PARAM_RE.search(text) is not None and _UNBATCHABLE_RE.search(text) is None
+
+
+def unwind_statement(cypher: str) -> str:
+    """``cypher`` rewritten to run once per element of ``$rows``."""
+    return "UNWIND $rows AS row\n" + _PARAM_RE.sub(r"row.\1", cypher)
+
+
+class BatchWriter:
+    """Session stand-in that batches population writes into UNWIND statements.
+
+    Usage::
+
+        with BatchWriter(session, batch_size=500) as writer:
+            _populate_entities(writer, cfg)
+
+    Queued rows are written when a statement reaches ``batch_size`` rows,
+    before an unbatchable statement, on ``flush()`` and on leaving the
+    ``with`` block without an exception.
+    """
+
+    def __init__(self, session, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._session = session
+        self._batch_size = batch_size
+        # statement -> queued rows; insertion order is first-issued order
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+        self.statements = 0  # round trips issued
+        self.rows = 0  # rows written through UNWIND batches
+
+    def run(self, cypher: str, parameters: dict[str, Any] | None = None) -> None:
+        if not parameters or not batchable(cypher):
+            self.flush()
+            self._session.run(cypher, parameters or {}).consume()
+            self.statements += 1
+            return
+        rows = self._pending.setdefault(cypher, [])
+        rows.append(parameters)
+        if len(rows) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every queued row, statements in first-issued order."""
+        for cypher, rows in self._pending.items():
+            if not rows:
+                continue
+            statement = unwind_statement(cypher)
+            for start in range(0, len(rows), self._batch_size):
+                batch = rows[start:start + self._batch_size]
+                self._session.execute_write(lambda tx: tx.run(statement, {"rows": batch}).consume())
+                self.statements += 1
+                self.rows += len(batch)
+            rows.clear()
+
+    def __enter__(self) -> BatchWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
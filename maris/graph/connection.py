@@ -17,6 +17,7 @@ from neo4j import GraphDatabase
 from neo4j.exceptions import ServiceUnavailable, TransientError
 
 from maris.config import get_config
+from maris.observability.tracing import current_span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,9 @@ def retry(max_attempts: int = 3, backoff_seconds: tuple[float, ...] = (1.0, 2.0,
                     return fn(*args, **kwargs)
                 except retryable as exc:
                     last_exc = exc
+                    current_span().add_event(
+                        "retry", attempt=attempt, max_attempts=max_attempts, error=type(exc).__name__,
+                    )
                     if attempt < max_attempts:
                         wait = backoff_seconds[min(attempt - 1, len(backoff_seconds) - 1)]
                         logger.warning(
@@ -108,6 +112,16 @@ def close_driver():
 
 _QUERY_TIMEOUT = 30  # seconds
 
+def annotate_query_span(cypher: str, parameters: dict | None) -> None:
+    """Record the statement and parameter names on the active Neo4j span."""
+    span = current_span()
+    if span.recording:
+        span.set_attribute("db.system", "neo4j")
+        span.set_attribute("db.statement", " ".join(cypher.split()))
+        span.set_attribute("db.parameters", sorted(parameters or {}))
+
+
+@traced("neo4j.query")
 @retry(max_attempts=3, backoff_seconds=(1.0, 2.0, 4.0))
 def run_query(cypher: str, parameters: dict | None = None, *, write: bool = False):
     """Execute a Cypher query and return list of record dicts.
@@ -115,16 +129,21 @@ def run_query(cypher: str, parameters: dict | None = None, *, write: bool = Fals
     Retries up to 3 times on TransientError/ServiceUnavailable with
     exponential backoff (1s, 2s, 4s). Each query has a 30-second timeout.
     """
+    annotate_query_span(cypher, parameters)
     driver = get_driver()
     cfg = get_config()
     with driver.session(database=cfg.neo4j_database) as session:
         result = session.run(cypher, parameters or {}, timeout=_QUERY_TIMEOUT)
-        return [record.data() for record in result]
+        records = [record.data() for record in result]
+    current_span().set_attribute("db.rows", len(records))
+    return records
 
 
+@traced("neo4j.write")
 @retry(max_attempts=3, backoff_seconds=(1.0, 2.0, 4.0))
 def run_write(cypher: str, parameters: dict | None = None):
     """Execute a write transaction with retry on transient failures."""
+    annotate_query_span(cypher, parameters)
     driver = get_driver()
     cfg = get_config()
     with driver.session(database=cfg.neo4j_database) as session:
@@ -0,0 +1,108 @@
+"""Graph epoch - a monotonically increasing version number for graph contents.
+
+Population and ingestion bump the epoch after writing to Neo4j. Read-side
+caches include the epoch in their keys, so any graph change invalidates
+previously cached answers without explicit purging.
+
+The epoch is stored on a singleton ``GraphMeta`` node so that writers running
+in other processes (population scripts, ingestion jobs, the graph-init
+container) are visible to the API. Reads are cached in-process for a few
+seconds to keep the lookup off the hot path.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from maris.graph.connection import get_config, get_driver, run_query
+
+logger = logging.getLogger(__name__)
+
+_EPOCH_KEY = "graph"
+_EPOCH_CACHE_SECONDS = 5.0
+_EPOCH_READ_TIMEOUT = 5  # seconds
+
+_BUMP_CYPHER = """
+MERGE (g:GraphMeta {key: $key})
+SET g.epoch      = coalesce(g.epoch, 0) + 1,
+    g.updated_at = datetime()
+RETURN g.epoch AS epoch
+"""
+
+_READ_CYPHER = "MATCH (g:GraphMeta {key: $key}) RETURN g.epoch AS epoch"
+
+_lock = threading.Lock()
+_cached_epoch: int | None = None
+_cached_at: float = float("-inf")
+
+
+def bump_graph_epoch(session=None) -> int:
+    """Increment the graph epoch and return the new value.
+
+    Pass an open Neo4j ``session`` to bump inside an existing population
+    run; otherwise a standalone write is issued.
+    """
+    params = {"key": _EPOCH_KEY}
+    if session is not None:
+        record = session.run(_BUMP_CYPHER, params).single()
+        epoch = int(record["epoch"]) if record else 0
+    else:
+        rows = run_query(_BUMP_CYPHER, params, write=True)
+        epoch = int(rows[0]["epoch"]) if rows else 0
+    _remember(epoch)
+    logger.info("Graph epoch bumped to %d", epoch)
+    return epoch
+
+
+def read_graph_epoch() -> int:
+    """Read the current epoch from Neo4j (0 when never bumped).
+
+    Deliberately bypasses the retry decorator on ``run_query``: callers on
+    the request path prefer a fast failure over seconds of backoff.
+    """
+    driver = get_driver()
+    cfg = get_config()
+    with driver.session(database=cfg.neo4j_database) as session:
+        record = session.run(_READ_CYPHER, {"key": _EPOCH_KEY}, timeout=_EPOCH_READ_TIMEOUT).single()
+    if record is None or record["epoch"] is None:
+        return 0
+    return int(record["epoch"])
+
+
+def get_graph_epoch(max_age_seconds: float = _EPOCH_CACHE_SECONDS) -> int | None:
+    """Return the current graph epoch, cached for ``max_age_seconds``.
+
+    Returns None when the epoch cannot be read (e.g. Neo4j unavailable);
+    callers should then skip any epoch-keyed cache. Failures are cached for
+    the same window to avoid hammering an unavailable database.
+    """
+    global _cached_epoch, _cached_at
+    now = time.monotonic()
+    with _lock:
+        if now - _cached_at < max_age_seconds:
+            return _cached_epoch
+    try:
+        epoch: int | None = read_graph_epoch()
+    except Exception:
+        logger.warning("Graph epoch lookup failed; epoch-keyed caches are bypassed", exc_info=True)
+        epoch = None
+    with _lock:
+        _cached_epoch = epoch
+        _cached_at = time.monotonic()
+    return epoch
+
+
+def invalidate_graph_epoch_cache() -> None:
+    """Force the next ``get_graph_epoch`` call to re-read Neo4j."""
+    global _cached_at
+    with _lock:
+        _cached_at = float("-inf")
+
+
+def _remember(epoch: int) -> None:
+    global _cached_epoch, _cached_at
+    with _lock:
+        _cached_epoch = epoch
+        _cached_at = time.monotonic()
@@ -0,0 +1,320 @@
+"""Index advisor: derive required indexes from the Cypher the code runs.
+
+Parses the query templates, the validation queries and the population
+Cypher for lookups the planner could serve from a schema index, then
+compares them with ``SCHEMA_STATEMENTS`` and proposes the missing
+statements:
+
+- equality, ``IN``, ``STARTS WITH`` and range predicates on a label or
+  relationship-type property -> a RANGE index;
+- ``CONTAINS`` / ``ENDS WITH`` predicates -> a TEXT index;
+- ``MERGE`` keys (inline properties of a merged node) -> a uniqueness
+  constraint, which MERGE needs both for speed and for correctness under
+  concurrent writers.
+
+Only *anchor* lookups count: a pattern that reaches a node by expanding
+from an already-bound variable (``(ba)-[:EVIDENCED_BY]->(d:Document)``)
+is served by the traversal, and indexing ``d`` would not change the
+plan. Function-wrapped properties (``toLower(n.name) = ...``) cannot use
+an index either and are not counted. Property lookups on unlabeled anchors (``MATCH (n) WHERE n.name
+...``) cannot use any index and are reported separately.
+
+The parser is a deliberately small regex-based reader of the Cypher
+dialect this repository writes, not a general Cypher parser.
+"""
+
+from __future__ import annotations
+
+import ast
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_POPULATION_MODULES = ("maris/graph/population.py",)
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+_CLAUSE_RE = re.compile(
+    r"\b(OPTIONAL\s+MATCH|MATCH|MERGE|ON\s+CREATE\s+SET|ON\s+MATCH\s+SET|CREATE|WHERE|WITH|RETURN|"
+    r"UNWIND|SET|DETACH\s+DELETE|DELETE|REMOVE|CALL|YIELD|ORDER\s+BY|SKIP|LIMIT|UNION(?:\s+ALL)?|FOREACH)\b",
+    re.IGNORECASE,
+)
+_NODE_RE = re.compile(r"\(\s*(\w*)\s*((?::\s*`?\w+`?\s*)*)(\{[^{}]*\})?\s*\)")
+_REL_RE = re.compile(r"\[\s*(\w*)\s*(?::\s*(\w+))?[^\]{]*(\{[^{}]*\})?\s*\]")
+_MAP_KEY_RE = re.compile(r"(\w+)\s*:")
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_COMMENT_RE = re.compile(r"//[^\n]*")
+_PREDICATE_RE = re.compile(
+    r"\b(\w+)\.(\w+)\s*(=|<=|>=|<(?!>)|>|IN\b|STARTS\s+WITH|ENDS\s+WITH|CONTAINS)",
+    re.IGNORECASE,
+)
+_DYNAMIC = "__dynamic__"
+
+# Schema statements: constraints, range/text indexes on nodes and relationships
+_SCHEMA_NODE_RE = re.compile(
+    r"CREATE\s+(CONSTRAINT|TEXT\s+INDEX|RANGE\s+INDEX|INDEX)\b.*?FOR\s*\(\s*\w+\s*:\s*(\w+)\s*\)"
+    r"\s*(?:ON|REQUIRE)\s*\(?\s*\w+\.(\w+)",
+    re.IGNORECASE | re.DOTALL,
+)
+_SCHEMA_REL_RE = re.compile(
+    r"CREATE\s+(CONSTRAINT|TEXT\s+INDEX|RANGE\s+INDEX|INDEX)\b.*?FOR\s*\(\s*\)\s*-\s*\[\s*\w+\s*:\s*(\w+)\s*\]"
+    r"\s*-\s*\(\s*\)\s*(?:ON|REQUIRE)\s*\(?\s*\w+\.(\w+)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@dataclass(frozen=True)
+class Lookup:
+    """One indexable property access found in a statement."""
+
+    entity: str  # "node" or "relationship"
+    label: str
+    prop: str
+    kind: str  # "range", "text" or "merge_key"
+    source: str
+
+
+@dataclass(frozen=True)
+class UnlabeledLookup:
+    variable: str
+    prop: str
+    source: str
+
+
+@dataclass
+class Recommendation:
+    entity: str
+    label: str
+    prop: str
+    kind: str  # "constraint", "range" or "text"
+    statement: str
+    sources: list[str] = field(default_factory=list)
+
+
+@dataclass
+class AdvisorReport:
+    recommendations: list[Recommendation]
+    unlabeled: list[UnlabeledLookup]
+    lookups: list[Lookup]
+
+
+# ---------------------------------------------------------------------------
+# Cypher reading
+# ---------------------------------------------------------------------------
+
+
+def _split_top_level(text: str, sep: str = ",") -> list[str]:
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _clauses(cypher: str) -> list[tuple[str, str]]:
+    """``(KEYWORD, body)`` pairs in statement order, strings and comments blanked."""
+    text = _STRING_RE.sub("''", _COMMENT_RE.sub("", cypher))
+    matches = list(_CLAUSE_RE.finditer(text))
+    return [
+        (" ".join(m.group(1).upper().split()), text[m.end():matches[i + 1].start() if i + 1 < len(matches) else None])
+        for i, m in enumerate(matches)
+    ]
+
+
+def _first_label(labels: str) -> str | None:
+    names = re.findall(r"\w+", labels)
+    return names[0] if names and names[0] != _DYNAMIC else None
+
+
+def extract_lookups(cypher: str, source: str) -> tuple[list[Lookup], list[UnlabeledLookup]]:
+    """Anchor property lookups in one statement (see module docstring)."""
+    lookups: list[Lookup] = []
+    unlabeled: list[UnlabeledLookup] = []
+    bound: set[str] = set()
+    labels: dict[str, tuple[str, str]] = {}  # var -> (entity, label)
+    anchors: set[str] = set()
+
+    for keyword, body in _clauses(cypher):
+        if keyword in ("MATCH", "OPTIONAL MATCH", "MERGE", "CREATE"):
+            for pattern in _split_top_level(body):
+                nodes = _NODE_RE.findall(pattern)
+                rels = _REL_RE.findall(pattern)
+                pattern_vars = {v for v, *_ in nodes if v} | {v for v, *_ in rels if v}
+                is_anchor = keyword != "CREATE" and not (pattern_vars & bound)
+                for var, label_text, props in nodes:
+                    label = _first_label(label_text)
+                    if var and label:
+                        labels.setdefault(var, ("node", label))
+                    if var and is_anchor and var not in bound:
+                        anchors.add(var)
+                    if not (is_anchor and props and label):
+                        continue
+                    kind = "merge_key" if keyword == "MERGE" else "range"
+                    for prop in _MAP_KEY_RE.findall(props):
+                        lookups.append(Lookup("node", label, prop, kind, source))
+                for var, rel_type, props in rels:
+                    if var and rel_type:
+                        labels.setdefault(var, ("relationship", rel_type))
+                    if var and is_anchor and var not in bound:
+                        anchors.add(var)
+                    if is_anchor and props and rel_type and keyword != "MERGE":
+                        for prop in _MAP_KEY_RE.findall(props):
+                            lookups.append(Lookup("relationship", rel_type, prop, "range", source))
+                bound |= pattern_vars
+        elif keyword == "WHERE":
+            for var, prop, op in _PREDICATE_RE.findall(body):
+                if var not in anchors:
+                    continue
+                if var not in labels:
+                    unlabeled.append(UnlabeledLookup(var, prop, source))
+                    continue
+                entity, label = labels[var]
+                kind = "text" if op.upper().split()[0] in ("CONTAINS", "ENDS") else "range"
+                lookups.append(Lookup(entity, label, prop, kind, source))
+        elif keyword in ("UNWIND", "WITH"):
+            bound |= set(re.findall(r"\bAS\s+(\w+)", body, re.IGNORECASE))
+            bound |= {v.strip() for v in _split_top_level(body) if re.fullmatch(r"\s*\w+\s*", v)}
+    return lookups, unlabeled
+
+
+def _module_cypher(path: Path) -> list[tuple[str, str]]:
+    """String constants (f-string holes as a dynamic label) that look like Cypher."""
+    tree = ast.parse(path.read_text(), filename=str(path))
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.JoinedStr):
+            text = "".join(
+                part.value if isinstance(part, ast.Constant) else _DYNAMIC for part in node.values
+            )
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            text = node.value
+        else:
+            continue
+        if re.search(r"\b(MATCH|MERGE)\b", text):
+            found.append((f"{path.name}:{node.lineno}", text))
+    return found
+
+
+def collect_statements(project_root: Path = _PROJECT_ROOT) -> list[tuple[str, str]]:
+    """``(source, cypher)`` for templates, validation queries and population code."""
+    from maris.graph.validation import VALIDATION_QUERIES
+    from maris.query.cypher_templates import TEMPLATES
+
+    statements = [(f"template:{name}", t["cypher"]) for name, t in TEMPLATES.items()]
+    statements += [(f"validation:{name}", q["cypher"]) for name, q in VALIDATION_QUERIES.items()]
+    for module in _POPULATION_MODULES:
+        statements += _module_cypher(project_root / module)
+    return statements
+
+
+# ---------------------------------------------------------------------------
+# Schema comparison
+# ---------------------------------------------------------------------------
+
+
+def schema_coverage(statements: list[str]) -> dict[tuple[str, str, str], set[str]]:
+    """``(entity, label, prop) -> {"constraint", "range", "text"}`` declared by ``statements``."""
+    coverage: dict[tuple[str, str, str], set[str]] = {}
+    for stmt in statements:
+        for entity, regex in (("relationship", _SCHEMA_REL_RE), ("node", _SCHEMA_NODE_RE)):
+            match = regex.search(stmt)
+            if match is None:
+                continue
+            kind = match.group(1).upper().split()[0]
+            kind = {"CONSTRAINT": "constraint", "TEXT": "text"}.get(kind, "range")
+            coverage.setdefault((entity, match.group(2), match.group(3)), set()).add(kind)
+            break
+    return coverage
+
+
+def _covered(lookup: Lookup, kinds: set[str]) -> bool:
+    if lookup.kind == "text":
+        return "text" in kinds
+    return bool(kinds & {"constraint", "range"})
+
+
+def _snake(name: str) -> str:
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", name).lower()
+
+
+def _statement(entity: str, label: str, prop: str, kind: str) -> str:
+    name = f"{_snake(label)}_{prop}" + ("_text" if kind == "text" else "")
+    if entity == "relationship":
+        target = f"()-[r:{label}]-()"
+        var = "r"
+    else:
+        var = _snake(label)[0]
+        target = f"({var}:{label})"
+    if kind == "constraint":
+        return f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR {target} REQUIRE {var}.{prop} IS UNIQUE"
+    prefix = "CREATE TEXT INDEX" if kind == "text" else "CREATE INDEX"
+    return f"{prefix} {name} IF NOT EXISTS FOR {target} ON ({var}.{prop})"
+
+
+def advise(
+    statements: list[tuple[str, str]] | None = None,
+    schema: list[str] | None = None,
+) -> AdvisorReport:
+    """Compare the lookups in ``statements`` with ``schema``; defaults to the repository's."""
+    if statements is None:
+        statements = collect_statements()
+    if schema is None:
+        from maris.graph.schema import SCHEMA_STATEMENTS
+
+        schema = SCHEMA_STATEMENTS
+
+    lookups: list[Lookup] = []
+    unlabeled: list[UnlabeledLookup] = []
+    for source, cypher in statements:
+        found, blind = extract_lookups(cypher, source)
+        lookups += found
+        unlabeled += blind
+
+    coverage = schema_coverage(schema)
+    recommendations: dict[tuple[str, str, str, str], Recommendation] = {}
+    for lookup in lookups:
+        key = (lookup.entity, lookup.label, lookup.prop)
+        if _covered(lookup, coverage.get(key, set())):
+            continue
+        kind = {"merge_key": "constraint"}.get(lookup.kind, lookup.kind)
+        rec = recommendations.get((*key, kind))
+        if rec is None:
+            rec = recommendations[(*key, kind)] = Recommendation(
+                *key, kind, _statement(lookup.entity, lookup.label, lookup.prop, kind),
+            )
+        if lookup.source not in rec.sources:
+            rec.sources.append(lookup.source)
+
+    # A missing constraint already covers range lookups on the same property
+    for (entity, label, prop, kind), rec in list(recommendations.items()):
+        if kind == "range" and (entity, label, prop, "constraint") in recommendations:
+            recommendations[(entity, label, prop, "constraint")].sources += rec.sources
+            del recommendations[(entity, label, prop, kind)]
+
+    ordered = sorted(recommendations.values(), key=lambda r: (r.entity, r.label, r.prop, r.kind))
+    return AdvisorReport(ordered, unlabeled, lookups)
+
+
+def apply_recommendations(session, recommendations: list[Recommendation]) -> dict[str, str | None]:
+    """Run each statement; returns ``statement -> error message`` (None on success).
+
+    A uniqueness constraint fails on data that already violates it; the
+    error is reported and the remaining statements still run.
+    """
+    outcome: dict[str, str | None] = {}
+    for rec in recommendations:
+        try:
+            session.run(rec.statement).consume()
+            outcome[rec.statement] = None
+        except Exception as exc:
+            logger.warning("Index statement failed: %s (%s)", rec.statement, exc)
+            outcome[rec.statement] = str(exc)
+    return outcome
@@ -0,0 +1,270 @@
+"""Precomputed bounded k-hop neighborhoods for the traversal templates.
+
+``graph_traverse`` (``POST /api/graph/traverse`` and the hybrid
+retriever's graph leg) and ``provenance_drilldown`` expand
+variable-length paths at request time, which is where the slowest
+queries come from on well-connected start nodes. The precompute job
+stores each hot node's bounded neighborhood as a JSON blob stamped with
+the graph epoch it was computed at, on a separate relationship-free
+``(:NeighborhoodCache {key: <name>, neighborhood, epoch})`` node so that
+traversals never reach it and ``properties(n)`` on the domain node never
+exposes it:
+
+- ``neighborhood.traverse``: the ``graph_traverse`` rows for the node's
+  name up to ``query_neighborhood_hops`` hops, shortest paths first,
+  with ``complete_hops`` = the deepest depth whose paths are all stored;
+- ``neighborhood.drilldown`` (sites only): the ``provenance_drilldown``
+  rows, newest document first, with ``complete`` when none were cut.
+
+Hot nodes are sites (``MPA``) and bridge axioms (``BridgeAxiom``): the
+traversal templates start from a node's ``name``, which services do not
+carry (they are keyed by ``service_name``), so a service neighborhood
+would never be read. Paths are computed by name exactly as the live
+template does, so a name shared with another node is covered too.
+
+Memory is capped per node and view: at most ``query_neighborhood_max_paths``
+rows and ``query_neighborhood_max_bytes`` of encoded JSON, cutting the
+deepest (traverse) or oldest (drilldown) rows first. The layers are
+derived one depth at a time with a LIMIT, so a dense neighborhood costs
+at most the cap per depth rather than every path.
+
+A request is served from a blob only when the answer is exact: the blob
+matches the current epoch and either covers the requested depth
+completely or already holds ``result_limit`` qualifying rows (the live
+templates return an arbitrary ``LIMIT`` of their matches). Anything else
+runs live; blobs are refreshed by ``materialize_neighborhoods``, which
+population runs after bumping the epoch.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Callable
+
+from maris.graph.connection import get_config, get_driver
+
+logger = logging.getLogger(__name__)
+
+NEIGHBORHOOD_LABELS = ("MPA", "BridgeAxiom")
+DRILLDOWN_FIELDS = ("site", "doi", "title", "year", "tier", "citation", "provenance_path")
+_DEPTH_PLACEHOLDER = "DEPTH_PLACEHOLDER"
+
+# One depth of graph_traverse (same start match, filter and row shape)
+_TRAVERSE_LAYER_CYPHER = """
+    UNWIND $keys AS key
+    CALL {
+        WITH key
+        MATCH (start)
+        WHERE start.name = key
+        MATCH path = (start)-[*DEPTH_PLACEHOLDER..DEPTH_PLACEHOLDER]-(end)
+        WHERE NOT end:Document
+        RETURN [n IN nodes(path) | {labels: labels(n), name: n.name}] AS node_list,
+               [r IN relationships(path) | type(r)] AS rel_list
+        LIMIT $limit
+    }
+    RETURN key, node_list, rel_list
+"""
+
+DRILLDOWN_CYPHER = """
+    UNWIND $keys AS key
+    CALL {
+        WITH key
+        MATCH (m:MPA {name: key})
+        OPTIONAL MATCH path = (m)-[*1..4]->(d:Document)
+        WITH m, d, [r IN relationships(path) | type(r)] AS rel_types
+        RETURN m.name AS site,
+               d.doi AS doi, d.title AS title, d.year AS year,
+               d.source_tier AS tier, properties(d)['citation'] AS citation,
+               rel_types AS provenance_path
+        ORDER BY d.year DESC
+        LIMIT $limit
+    }
+    RETURN key, site, doi, title, year, tier, citation, provenance_path
+"""
+
+CACHE_LABEL = "NeighborhoodCache"
+
+KEYS_CYPHER = """
+    MATCH (n)
+    WHERE (n:MPA OR n:BridgeAxiom) AND n.name IS NOT NULL
+    RETURN DISTINCT n.name AS key
+"""
+
+LOOKUP_CYPHER = """
+    MATCH (c:NeighborhoodCache {key: $name})
+    RETURN c.neighborhood AS neighborhood, c.epoch AS epoch
+"""
+
+STORE_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (c:NeighborhoodCache {key: row.key})
+    SET c.neighborhood = row.neighborhood, c.epoch = $epoch
+"""
+
+# Cache nodes of names that no longer start a hot node
+PRUNE_CYPHER = "MATCH (c:NeighborhoodCache) WHERE NOT c.key IN $keys DELETE c"
+
+# Blobs stored on the hot nodes themselves by earlier versions
+LEGACY_CLEANUP_CYPHER = """
+    MATCH (n)
+    WHERE (n:MPA OR n:BridgeAxiom) AND n.neighborhood IS NOT NULL
+    REMOVE n.neighborhood, n.neighborhood_epoch
+"""
+
+# Templates served from blobs, and the parameter holding the blob key
+SERVED_TEMPLATES = {"graph_traverse": "start_name", "provenance_drilldown": "site_name"}
+
+
+def traverse_layer_cypher(depth: int) -> str:
+    """The fixed-depth layer query (path bounds cannot be parameters)."""
+    return _TRAVERSE_LAYER_CYPHER.replace(_DEPTH_PLACEHOLDER, str(depth))
+
+
+def _size(row: Any) -> int:
+    return len(json.dumps(row, separators=(",", ":"))) + 1
+
+
+def cap_layers(layers: list[list[list]], max_paths: int, max_bytes: int) -> tuple[list[list], int]:
+    """Keep paths shallowest first within the caps; returns ``(paths, complete_hops)``."""
+    kept: list[list] = []
+    size = 2
+    complete = 0
+    for depth, layer in enumerate(layers, start=1):
+        for path in layer:
+            cost = _size(path)
+            if len(kept) >= max_paths or size + cost > max_bytes:
+                return kept, complete
+            kept.append(path)
+            size += cost
+        complete = depth
+    return kept, complete
+
+
+def cap_rows(rows: list[dict[str, Any]], max_rows: int, max_bytes: int) -> tuple[list[list], bool]:
+    """Keep drilldown rows in order within the caps; returns ``(rows, complete)``."""
+    kept: list[list] = []
+    size = 2
+    for row in rows:
+        values = [row.get(f) for f in DRILLDOWN_FIELDS]
+        cost = _size(values)
+        if len(kept) >= max_rows or size + cost > max_bytes:
+            return kept, False
+        kept.append(values)
+        size += cost
+    return kept, True
+
+
+def derive_neighborhoods(
+    run: Callable[[str, dict[str, Any]], list[dict[str, Any]]],
+    keys: list[str],
+    hops: int,
+    max_paths: int,
+    max_bytes: int,
+) -> dict[str, dict[str, Any]]:
+    """Blob contents for ``keys``; ``run(cypher, params)`` returns row dicts.
+
+    Each depth asks for at most ``max_paths + 1`` rows per key, and keys
+    whose cap is already reached are not expanded further.
+    """
+    layers: dict[str, list[list[list]]] = {key: [] for key in keys}
+    open_keys = list(keys)
+    for depth in range(1, hops + 1):
+        if not open_keys:
+            break
+        layer: dict[str, list[list]] = {key: [] for key in open_keys}
+        for row in run(traverse_layer_cypher(depth), {"keys": open_keys, "limit": max_paths + 1}):
+            layer[row["key"]].append([row["node_list"], row["rel_list"]])
+        for key in open_keys:
+            layers[key].append(layer[key])
+        open_keys = [key for key in open_keys if sum(map(len, layers[key])) <= max_paths]
+
+    drilldown: dict[str, list[dict[str, Any]]] = {}
+    for row in run(DRILLDOWN_CYPHER, {"keys": keys, "limit": max_paths + 1}):
+        drilldown.setdefault(row["key"], []).append(row)
+
+    blobs: dict[str, dict[str, Any]] = {}
+    for key in keys:
+        paths, complete_hops = cap_layers(layers[key], max_paths, max_bytes)
+        blob: dict[str, Any] = {"traverse": {"paths": paths, "complete_hops": complete_hops}}
+        if key in drilldown:
+            rows, complete = cap_rows(drilldown[key], max_paths, max_bytes)
+            blob["drilldown"] = {"rows": rows, "complete": complete}
+        blobs[key] = blob
+    return blobs
+
+
+def encode_neighborhood(blob: dict[str, Any]) -> str:
+    return json.dumps(blob, separators=(",", ":"))
+
+
+def fresh_neighborhood(row: dict[str, Any] | None, epoch: int) -> dict[str, Any] | None:
+    """The decoded blob from a ``LOOKUP_CYPHER`` row, or None if missing, stale or corrupt."""
+    if not row or row.get("neighborhood") is None or row.get("epoch") != epoch:
+        return None
+    try:
+        return json.loads(row["neighborhood"])
+    except (TypeError, ValueError):
+        logger.warning("Discarding unreadable materialized neighborhood blob")
+        return None
+
+
+def serve(template_name: str, blob: dict[str, Any], hops: int | None, limit: int) -> list[dict] | None:
+    """Template rows answered from ``blob``, or None when only a live query is exact."""
+    if template_name == "graph_traverse":
+        view = blob.get("traverse")
+        if view is None:
+            return None
+        paths = [p for p in view["paths"] if len(p[1]) <= hops]
+        if hops > view["complete_hops"] and len(paths) < limit:
+            return None
+        return [{"node_list": nodes, "rel_list": rels} for nodes, rels in paths[:limit]]
+    if template_name == "provenance_drilldown":
+        view = blob.get("drilldown")
+        if view is None or (not view["complete"] and len(view["rows"]) < limit):
+            return None
+        return [dict(zip(DRILLDOWN_FIELDS, row)) for row in view["rows"][:limit]]
+    return None
+
+
+def materialize_neighborhoods(
+    session=None,
+    epoch: int | None = None,
+    batch_size: int = 50,
+) -> int:
+    """Recompute and store neighborhood blobs for every hot node.
+
+    Pass the open population ``session`` and the epoch it just bumped to;
+    without an epoch the current one is read. Returns the number of names
+    written.
+    """
+    if session is None:
+        cfg = get_config()
+        with get_driver().session(database=cfg.neo4j_database) as own_session:
+            return materialize_neighborhoods(own_session, epoch, batch_size)
+
+    if epoch is None:
+        from maris.graph.epoch import read_graph_epoch
+
+        epoch = read_graph_epoch()
+
+    cfg = get_config()
+
+    def run(cypher: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return [record.data() for record in session.run(cypher, params)]
+
+    keys = [record["key"] for record in session.run(KEYS_CYPHER)]
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start + batch_size]
+        blobs = derive_neighborhoods(
+            run, batch, cfg.query_neighborhood_hops,
+            cfg.query_neighborhood_max_paths, cfg.query_neighborhood_max_bytes,
+        )
+        session.run(STORE_CYPHER, {
+            "rows": [{"key": key, "neighborhood": encode_neighborhood(blob)} for key, blob in blobs.items()],
+            "epoch": epoch,
+        })
+    session.run(PRUNE_CYPHER, {"keys": keys})
+    session.run(LEGACY_CLEANUP_CYPHER)
+    logger.info("Materialized neighborhoods for %d nodes at epoch %d", len(keys), epoch)
+    return len(keys)
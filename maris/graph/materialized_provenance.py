@@ -0,0 +1,234 @@
+"""Precomputed provenance edge lists for sites and bridge axioms.
+
+The graph explorer shows the site -> service -> axiom -> document edges of
+every answer. Deriving them takes a five-way ``UNION ALL`` traversal per
+site (three-way per axiom) that returns the same rows until the graph
+changes. Materialization stores each subject's edges as a compact JSON
+blob stamped with the graph epoch it was computed at, on a separate
+``ProvenanceCache`` node keyed by ``(kind, key)``:
+
+- ``(:ProvenanceCache {kind: "site", key: <MPA name>, edges, epoch})``
+- ``(:ProvenanceCache {kind: "axiom", key: <axiom_id>, edges, epoch})``
+
+Cache nodes have no relationships, so traversals never reach them, and
+the domain nodes carry no blobs that ``properties(n)`` could expose.
+Readers fetch the blobs in one lookup on the uniquely-constrained
+``(kind, key)``. A blob whose epoch differs from the current graph epoch
+is stale and the reader derives its edges live; readers never write.
+``materialize_provenance`` (run after population) refreshes every blob.
+
+Every statement takes a ``$keys`` list and ``UNWIND``s it, so a
+comparison across several sites costs one round trip per step rather
+than one per site.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from maris.graph.connection import get_config, get_driver
+
+logger = logging.getLogger(__name__)
+
+CACHE_LABEL = "ProvenanceCache"
+EDGE_FIELDS = ("from_node", "from_type", "relationship", "to_node", "to_type")
+
+SITE_PROVENANCE_CYPHER = """
+    UNWIND $keys AS key
+    CALL {
+        // MPA -> EcosystemService
+        WITH key
+        MATCH (m:MPA {name: key})-[:GENERATES]->(es:EcosystemService)
+        RETURN m.name AS from_node, labels(m)[0] AS from_type,
+               'GENERATES' AS relationship,
+               es.service_name AS to_node, labels(es)[0] AS to_type
+        UNION ALL
+        // BridgeAxiom -> MPA
+        WITH key
+        MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m:MPA {name: key})
+        RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
+               'APPLIES_TO' AS relationship,
+               m.name AS to_node, 'MPA' AS to_type
+        UNION ALL
+        // BridgeAxiom -> EcosystemService (for axioms that apply to this site)
+        WITH key
+        MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(:MPA {name: key})
+        MATCH (ba)-[:TRANSLATES]->(es:EcosystemService)
+        RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
+               'TRANSLATES' AS relationship,
+               es.service_name AS to_node, 'EcosystemService' AS to_type
+        UNION ALL
+        // BridgeAxiom -> Document (for axioms that apply to this site)
+        WITH key
+        MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(:MPA {name: key})
+        MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+        RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
+               'EVIDENCED_BY' AS relationship,
+               COALESCE(d.title, d.doi) AS to_node, 'Document' AS to_type
+        UNION ALL
+        // MPA -> Habitat
+        WITH key
+        MATCH (m:MPA {name: key})-[:HAS_HABITAT]->(h:Habitat)
+        RETURN m.name AS from_node, 'MPA' AS from_type,
+               'HAS_HABITAT' AS relationship,
+               h.name AS to_node, 'Habitat' AS to_type
+    }
+    RETURN key, from_node, from_type, relationship, to_node, to_type
+"""
+
+AXIOM_PROVENANCE_CYPHER = """
+    UNWIND $keys AS key
+    CALL {
+        // Axiom -> MPA
+        WITH key
+        MATCH (ba:BridgeAxiom {axiom_id: key})-[:APPLIES_TO]->(m:MPA)
+        RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
+               'APPLIES_TO' AS relationship,
+               m.name AS to_node, 'MPA' AS to_type
+        UNION ALL
+        // Axiom -> EcosystemService
+        WITH key
+        MATCH (ba:BridgeAxiom {axiom_id: key})-[:TRANSLATES]->(es:EcosystemService)
+        RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
+               'TRANSLATES' AS relationship,
+               es.service_name AS to_node, 'EcosystemService' AS to_type
+        UNION ALL
+        // Axiom -> Document
+        WITH key
+        MATCH (ba:BridgeAxiom {axiom_id: key})-[:EVIDENCED_BY]->(d:Document)
+        RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
+               'EVIDENCED_BY' AS relationship,
+               COALESCE(d.title, d.doi) AS to_node, 'Document' AS to_type
+    }
+    RETURN key, from_node, from_type, relationship, to_node, to_type
+"""
+
+
+@dataclass(frozen=True)
+class ProvenanceSubject:
+    """How one kind of provenance subject is keyed, derived and stored."""
+
+    kind: str
+    label: str
+    key_property: str
+    derive_cypher: str  # Live edges for ``$keys``, one row per edge tagged with its key
+
+    @property
+    def lookup_cypher(self) -> str:
+        return (
+            f"UNWIND $keys AS key MATCH (c:{CACHE_LABEL} {{kind: '{self.kind}', key: key}}) "
+            "RETURN key, c.edges AS edges, c.epoch AS epoch"
+        )
+
+    @property
+    def store_cypher(self) -> str:
+        return (
+            "UNWIND $rows AS row "
+            f"MATCH (:{self.label} {{{self.key_property}: row.key}}) "
+            f"MERGE (c:{CACHE_LABEL} {{kind: '{self.kind}', key: row.key}}) "
+            "SET c.edges = row.edges, c.epoch = $epoch"
+        )
+
+    @property
+    def prune_cypher(self) -> str:
+        """Drop cache nodes of subjects that no longer exist."""
+        return f"MATCH (c:{CACHE_LABEL} {{kind: '{self.kind}'}}) WHERE NOT c.key IN $keys DELETE c"
+
+    @property
+    def legacy_cleanup_cypher(self) -> str:
+        """Remove blobs stored on the subject nodes by earlier versions."""
+        return (
+            f"MATCH (n:{self.label}) WHERE n.provenance_edges IS NOT NULL "
+            "REMOVE n.provenance_edges, n.provenance_epoch"
+        )
+
+    @property
+    def keys_cypher(self) -> str:
+        return f"MATCH (n:{self.label}) WHERE n.{self.key_property} IS NOT NULL RETURN n.{self.key_property} AS key"
+
+
+SUBJECTS: dict[str, ProvenanceSubject] = {
+    "site": ProvenanceSubject("site", "MPA", "name", SITE_PROVENANCE_CYPHER),
+    "axiom": ProvenanceSubject("axiom", "BridgeAxiom", "axiom_id", AXIOM_PROVENANCE_CYPHER),
+}
+
+
+def encode_edges(edges: list[dict[str, Any]]) -> str:
+    """Serialize edges as a JSON array of ``EDGE_FIELDS`` tuples."""
+    return json.dumps([[edge.get(f) for f in EDGE_FIELDS] for edge in edges], separators=(",", ":"))
+
+
+def decode_edges(blob: str) -> list[dict[str, Any]]:
+    return [dict(zip(EDGE_FIELDS, row)) for row in json.loads(blob)]
+
+
+def fresh_edges(rows: list[dict[str, Any]], epoch: int) -> dict[str, list[dict[str, Any]]]:
+    """Edges per key from a lookup result; missing, stale and corrupt blobs are left out."""
+    fresh: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        if row.get("edges") is None or row.get("epoch") != epoch:
+            continue
+        try:
+            fresh[row["key"]] = decode_edges(row["edges"])
+        except (TypeError, ValueError):
+            logger.warning("Discarding unreadable materialized provenance blob for %s", row["key"])
+    return fresh
+
+
+def group_edges(rows: list[dict[str, Any]], keys: list[str]) -> dict[str, list[dict[str, Any]]]:
+    """Split ``derive_cypher`` rows by key; keys without edges map to []."""
+    grouped: dict[str, list[dict[str, Any]]] = {key: [] for key in keys}
+    for row in rows:
+        grouped.setdefault(row["key"], []).append({f: row.get(f) for f in EDGE_FIELDS})
+    return grouped
+
+
+def store_parameters(edges_by_key: dict[str, list[dict[str, Any]]], epoch: int) -> dict[str, Any]:
+    """Parameters for ``store_cypher``."""
+    return {
+        "rows": [{"key": key, "edges": encode_edges(edges)} for key, edges in edges_by_key.items()],
+        "epoch": epoch,
+    }
+
+
+def materialize_provenance(
+    session=None,
+    epoch: int | None = None,
+    kinds: tuple[str, ...] = ("site", "axiom"),
+    batch_size: int = 500,
+) -> dict[str, int]:
+    """Recompute and store provenance blobs for every site and axiom.
+
+    Pass the open population ``session`` and the epoch it just bumped to so
+    the blobs are fresh for that epoch; without an epoch the current one is
+    read. Returns the number of subjects written per kind.
+    """
+    if session is None:
+        cfg = get_config()
+        with get_driver().session(database=cfg.neo4j_database) as own_session:
+            return materialize_provenance(own_session, epoch, kinds, batch_size)
+
+    if epoch is None:
+        from maris.graph.epoch import read_graph_epoch
+
+        epoch = read_graph_epoch()
+
+    written: dict[str, int] = {}
+    for kind in kinds:
+        subject = SUBJECTS[kind]
+        keys = [record["key"] for record in session.run(subject.keys_cypher)]
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            rows = [record.data() for record in session.run(subject.derive_cypher, {"keys": batch})]
+            session.run(subject.store_cypher, store_parameters(group_edges(rows, batch), epoch))
+        session.run(subject.prune_cypher, {"keys": keys})
+        session.run(subject.legacy_cleanup_cypher)
+        written[kind] = len(keys)
+    logger.info(
+        "Materialized provenance for %s at epoch %d",
+        ", ".join(f"{n} {kind}s" for kind, n in written.items()), epoch,
+    )
+    return written
@@ -17,7 +17,11 @@ import json
 from pathlib import Path
 
 from maris.config import get_config
+from maris.graph.batch_writer import BatchWriter
 from maris.graph.connection import get_driver
+from maris.graph.epoch import bump_graph_epoch
+from maris.graph.materialized_neighborhoods import materialize_neighborhoods
+from maris.graph.materialized_provenance import materialize_provenance
 from maris.provenance.doi_verifier import get_doi_verifier
 
 
@@ -1271,27 +1275,48 @@ def _populate_registered_sites(session, registry_path=None):
 # ---------------------------------------------------------------------------
 # Main entry point
 # ---------------------------------------------------------------------------
-def populate_graph(site_registry_path=None):
-    """Run the full population pipeline. Idempotent via MERGE."""
+def populate_graph(site_registry_path=None, batch_size=None):
+    """Run the full population pipeline. Idempotent via MERGE.
+
+    Each stage writes through its own ``BatchWriter``, so its rows go out
+    as UNWIND batches of ``batch_size`` (default
+    ``MARIS_POPULATION_BATCH_SIZE``) and are all written before the next
+    stage starts.
+    """
     cfg = get_config()
     driver = get_driver()
+    batch_size = batch_size or cfg.population_batch_size
 
     print("Populating Neo4j graph from curated data assets...")
     print("=" * 60)
 
+    stages = [
+        (_populate_documents, (cfg,)),
+        (_populate_entities, (cfg,)),
+        (_populate_cabo_pulmo, (cfg,)),
+        (_populate_shark_bay, (cfg,)),
+        (_populate_bridge_axioms, (cfg,)),
+        (_populate_comparison_sites, ()),
+        (_populate_relationships, (cfg,)),
+        (_populate_cross_domain_links, ()),
+        (_populate_provenance, (cfg,)),
+        (_populate_registered_sites, (site_registry_path,)),
+    ]
     with driver.session(database=cfg.neo4j_database) as session:
         total = 0
-        total += _populate_documents(session, cfg)
-        total += _populate_entities(session, cfg)
-        total += _populate_cabo_pulmo(session, cfg)
-        total += _populate_shark_bay(session, cfg)
-        total += _populate_bridge_axioms(session, cfg)
-        total += _populate_comparison_sites(session)
-        total += _populate_relationships(session, cfg)
-        total += _populate_cross_domain_links(session)
-        total += _populate_provenance(session, cfg)
-        total += _populate_registered_sites(session, site_registry_path)
+        round_trips = 0
+        for stage, args in stages:
+            with BatchWriter(session, batch_size) as writer:
+                total += stage(writer, *args)
+            round_trips += writer.statements
+
+        epoch = bump_graph_epoch(session)
+        materialized = materialize_provenance(session, epoch)
+        neighborhoods = materialize_neighborhoods(session, epoch)
 
     print("=" * 60)
-    print(f"Population complete. ~{total} operations executed.")
+    print(f"Graph epoch: {epoch}")
+    print(f"Materialized provenance: {materialized['site']} sites, {materialized['axiom']} axioms")
+    print(f"Materialized neighborhoods: {neighborhoods} nodes")
+    print(f"Population complete. ~{total} operations executed in {round_trips} write round trips.")
     return total
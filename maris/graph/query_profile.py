@@ -0,0 +1,318 @@
+"""PROFILE harness for Cypher templates and graph validation queries.
+
+Runs every entry of ``maris.query.cypher_templates.TEMPLATES`` and
+``maris.graph.validation.VALIDATION_QUERIES`` under ``PROFILE`` against a
+small, deterministic fixture graph and compares database hits and result
+rows with the budgets checked in at ``tests/fixtures/query_budgets.json``.
+An innocent-looking OPTIONAL MATCH that multiplies intermediate rows shows
+up as a db-hit regression here before it shows up as a latency incident.
+
+The fixture graph is seeded into an *empty* database (a throwaway Neo4j
+container), with the production schema applied so plans use the same
+indexes and constraints. Numbers are only comparable between runs on the
+same fixture, so seeding refuses to touch a database that already holds
+other data.
+
+Entry point: ``scripts/profile_queries.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from maris.graph.schema import OPTIONAL_STATEMENTS, SCHEMA_STATEMENTS
+from maris.graph.validation import VALIDATION_QUERIES
+from maris.query.cypher_templates import DEFAULT_HOPS, TEMPLATES
+from maris.query.template_registry import get_template_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGETS_PATH = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "query_budgets.json"
+DEFAULT_TOLERANCE = 0.10  # Allowed db-hit growth over budget before flagging
+
+FIXTURE_SITE = "Cabo Pulmo National Park"
+
+# ---------------------------------------------------------------------------
+# Fixture graph
+# ---------------------------------------------------------------------------
+
+_SITES = [
+    {"name": FIXTURE_SITE, "total_esv_usd": 29.27e6, "biomass_ratio": 4.63, "neoli_score": 4,
+     "asset_rating": "AAA", "biomass_measurement_year": 2009, "characterization_tier": "gold",
+     "obis_species_richness": 412},
+    {"name": "Great Barrier Reef Marine Park", "total_esv_usd": 6.4e9, "biomass_ratio": 1.8,
+     "neoli_score": 3, "asset_rating": "A", "biomass_measurement_year": 2019,
+     "characterization_tier": "gold", "obis_species_richness": 1800},
+    {"name": "Sundarbans Reserve Forest", "total_esv_usd": 778.0e6, "biomass_ratio": None,
+     "neoli_score": 2, "asset_rating": "BBB", "biomass_measurement_year": 2015,
+     "characterization_tier": "silver", "obis_species_richness": None},
+]
+_SERVICES_PER_SITE = 5
+_AXIOMS = 12
+_DOCS_PER_AXIOM = 3
+_RISKS_PER_SITE = 3
+_CONCEPTS = 3
+_HABITATS = ["coral_reef", "mangrove_forest", "seagrass_meadow"]
+
+_SEED_STATEMENTS = [
+    """
+    UNWIND $sites AS site
+    CREATE (m:MPA) SET m = site
+    WITH m
+    UNWIND range(1, $services_per_site) AS i
+    CREATE (m)-[:GENERATES]->(:EcosystemService {
+        service_id: m.name + '-svc-' + i, service_name: 'Service ' + i,
+        annual_value_usd: i * 1.0e6, valuation_method: 'market_price'})
+    """,
+    """
+    UNWIND $habitats AS habitat_id
+    CREATE (:Habitat {habitat_id: habitat_id, name: replace(habitat_id, '_', ' ')})
+    """,
+    """
+    MATCH (m:MPA), (h:Habitat)
+    WHERE (m.name = $site AND h.habitat_id = 'coral_reef') OR
+          (m.name <> $site AND h.habitat_id <> 'coral_reef')
+    CREATE (m)-[:HAS_HABITAT]->(h)
+    """,
+    """
+    MATCH (m:MPA)
+    UNWIND range(1, $risks_per_site) AS i
+    CREATE (m)-[:FACES_RISK {severity: 'high', likelihood: 0.2 * i, evidence: 'fixture'}]->
+           (:Risk {name: m.name + ' risk ' + i, severity: 'high', likelihood: 0.2 * i})
+    CREATE (m)-[:HAS_ECOLOGICAL_PROCESS]->(:EcologicalProcess {name: m.name + ' process ' + i})
+    WITH DISTINCT m WHERE m.name = $site
+    CREATE (m)-[:USING_MECHANISM]->(:FinancialMechanism {name: 'Tourism fees', type: 'user_fee'})
+    """,
+    """
+    UNWIND range(1, $axioms) AS a
+    WITH a, 'BA-' + right('00' + toString(a), 3) AS axiom_id
+    CREATE (ba:BridgeAxiom {
+        axiom_id: axiom_id, name: 'Axiom ' + a, description: 'carbon and tourism axiom ' + a,
+        category: CASE WHEN a % 2 = 0 THEN 'ecological_to_service' ELSE 'service_to_financial' END,
+        coefficients_json: '{}'})
+    WITH ba, a
+    UNWIND range(1, $docs_per_axiom) AS k
+    CREATE (ba)-[:EVIDENCED_BY]->(:Document {
+        doi: '10.9999/fixture.' + a + '.' + k, title: 'Fixture paper ' + a + '.' + k,
+        year: 2000 + k, source_tier: 'T' + k})
+    """,
+    """
+    MATCH (ba:BridgeAxiom)
+    WITH ba, toInteger(right(ba.axiom_id, 3)) AS a
+    MATCH (m:MPA) WHERE m.name = $site OR m.name = $sites[a % size($sites)].name
+    CREATE (ba)-[:APPLIES_TO]->(m)
+    """,
+    """
+    MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(:MPA)-[:GENERATES]->(es:EcosystemService)
+    WHERE es.service_name = 'Service ' + (toInteger(right(ba.axiom_id, 3)) % $services_per_site + 1)
+    MERGE (ba)-[:TRANSLATES]->(es)
+    """,
+    """
+    MATCH (ba:BridgeAxiom), (h:Habitat)
+    WHERE toInteger(right(ba.axiom_id, 3)) % size($habitats) = CASE h.habitat_id
+        WHEN 'coral_reef' THEN 0 WHEN 'mangrove_forest' THEN 1 ELSE 2 END
+    CREATE (ba)-[:APPLIES_TO_HABITAT]->(h)
+    """,
+    """
+    UNWIND range(1, $concepts) AS c
+    CREATE (concept:Concept {concept_id: 'BC-' + right('00' + toString(c), 3),
+                             name: CASE c WHEN 1 THEN 'Blue Carbon Sequestration'
+                                          WHEN 2 THEN 'Marine Tourism Economics'
+                                          ELSE 'Coastal Protection' END,
+                             description: 'Fixture concept', domain: 'blue_finance'})
+    WITH concept, c
+    MATCH (ba:BridgeAxiom) WHERE toInteger(right(ba.axiom_id, 3)) % $concepts = c - 1
+    CREATE (concept)-[:INVOLVES_AXIOM]->(ba)
+    WITH DISTINCT concept
+    MATCH (concept)-[:INVOLVES_AXIOM]->(:BridgeAxiom)-[:EVIDENCED_BY]->(d:Document)
+    WHERE d.doi ENDS WITH '.1'
+    CREATE (concept)-[:DOCUMENTED_BY]->(d)
+    """,
+    """
+    MATCH (concept:Concept), (h:Habitat)
+    CREATE (concept)-[:RELEVANT_TO]->(h)
+    """,
+]
+
+# Template parameters resolving against the fixture graph; ``node_id`` is
+# looked up at run time because element ids are assigned by the server.
+FIXTURE_PARAMETERS: dict[str, dict[str, Any]] = {
+    "site_valuation": {"site_name": FIXTURE_SITE},
+    "provenance_drilldown": {"site_name": FIXTURE_SITE},
+    "axiom_explanation": {"axiom_id": "BA-001"},
+    "axiom_by_concept": {"concept_term": "carbon", "axiom_ids": ["BA-002", "BA-004"]},
+    "comparison": {"site_names": [FIXTURE_SITE, "Great Barrier Reef Marine Park"]},
+    "risk_assessment": {"site_name": FIXTURE_SITE},
+    "mechanism_chain": {"concept_id": "BC-001"},
+    "concept_overview": {"search_term": "Carbon", "concept_id": "BC-001"},
+    "node_detail": {},
+    "graph_traverse": {"start_name": FIXTURE_SITE},
+    "graph_stats": {},
+    "graph_neighborhood": {"start_name": FIXTURE_SITE},
+    "semantic_search": {"search_term": "Cabo"},
+}
+
+_NODE_ID_CYPHER = "MATCH (m:MPA {name: $site}) RETURN elementId(m) AS node_id"
+
+
+def seed_fixture_graph(session) -> int:
+    """Apply the schema and create the fixture graph; returns the node count.
+
+    Raises RuntimeError when the database already contains nodes.
+    """
+    existing = session.run("MATCH (n) RETURN count(n) AS n").single()["n"]
+    if existing:
+        raise RuntimeError(
+            f"Refusing to seed the profiling fixture into a database with {existing} nodes; "
+            "point MARIS_NEO4J_URI at an empty instance"
+        )
+    for stmt in SCHEMA_STATEMENTS:
+        try:
+            session.run(stmt).consume()
+        except Exception:
+            if stmt not in OPTIONAL_STATEMENTS:
+                raise
+            logger.warning("Optional schema statement skipped: %s", stmt)
+    params = {
+        "sites": _SITES, "site": FIXTURE_SITE, "services_per_site": _SERVICES_PER_SITE,
+        "axioms": _AXIOMS, "docs_per_axiom": _DOCS_PER_AXIOM, "risks_per_site": _RISKS_PER_SITE,
+        "concepts": _CONCEPTS, "habitats": _HABITATS,
+    }
+    for stmt in _SEED_STATEMENTS:
+        session.run(stmt, params).consume()
+    return session.run("MATCH (n) RETURN count(n) AS n").single()["n"]
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ProfiledQuery:
+    """A statement under profile, keyed ``template:<name>`` or ``validation:<name>``."""
+
+    key: str
+    cypher: str
+    parameters: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ProfileResult:
+    key: str
+    db_hits: int
+    rows: int
+    plan: dict[str, Any]
+
+
+@dataclass
+class BudgetCheck:
+    """Outcome of comparing profile results with the checked-in budgets."""
+
+    regressions: list[str] = field(default_factory=list)
+    unbudgeted: list[str] = field(default_factory=list)
+    improved: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        # A query without a budget is unchecked, so it fails until recorded
+        return not self.regressions and not self.unbudgeted
+
+
+def collect_queries() -> list[ProfiledQuery]:
+    """Every template (traversals at the default hop depth) and validation query."""
+    registry = get_template_registry()
+    queries = []
+    for name, template in TEMPLATES.items():
+        hops = DEFAULT_HOPS if registry.takes_hops(name) else None
+        params = {"result_limit": template.get("default_limit", 100), **FIXTURE_PARAMETERS.get(name, {})}
+        queries.append(ProfiledQuery(f"template:{name}", registry.variant(name, hops).cypher, params))
+    for name, query in VALIDATION_QUERIES.items():
+        queries.append(ProfiledQuery(f"validation:{name}", query["cypher"]))
+    return queries
+
+
+def summarize_plan(plan: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a driver profile tree to operator, rows, db hits and children."""
+    return {
+        "operator": plan.get("operatorType", "?"),
+        "rows": plan.get("rows", 0),
+        "db_hits": plan.get("dbHits", 0),
+        "children": [summarize_plan(child) for child in plan.get("children", [])],
+    }
+
+
+def total_db_hits(plan: dict[str, Any]) -> int:
+    return plan["db_hits"] + sum(total_db_hits(child) for child in plan["children"])
+
+
+def profile_query(session, query: ProfiledQuery) -> ProfileResult:
+    result = session.run(f"PROFILE {query.cypher}", query.parameters)
+    rows = sum(1 for _ in result)
+    plan = summarize_plan(result.consume().profile or {})
+    return ProfileResult(query.key, total_db_hits(plan), rows, plan)
+
+
+def profile_all(session, queries: list[ProfiledQuery] | None = None) -> list[ProfileResult]:
+    """PROFILE each query in turn; ``node_id`` parameters resolve to the fixture site."""
+    node_id = session.run(_NODE_ID_CYPHER, {"site": FIXTURE_SITE}).single()
+    results = []
+    for query in queries if queries is not None else collect_queries():
+        if query.key == "template:node_detail" and node_id is not None:
+            query = ProfiledQuery(query.key, query.cypher, {**query.parameters, "node_id": node_id["node_id"]})
+        results.append(profile_query(session, query))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Budgets
+# ---------------------------------------------------------------------------
+
+
+def load_budgets(path: Path = DEFAULT_BUDGETS_PATH) -> dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_budgets(results: list[ProfileResult], budgets: dict[str, Any]) -> BudgetCheck:
+    """Flag queries whose db hits exceed budget by more than the tolerance, or whose row count changed.
+
+    A changed row count means the fixture or the query semantics changed,
+    which invalidates the comparison as much as a cost regression does.
+    Queries with no budget are listed in ``unbudgeted`` and fail the check.
+    """
+    tolerance = budgets.get("tolerance", DEFAULT_TOLERANCE)
+    entries = budgets.get("budgets", {})
+    check = BudgetCheck()
+    for result in results:
+        budget = entries.get(result.key)
+        if budget is None:
+            check.unbudgeted.append(result.key)
+            continue
+        limit = budget["db_hits"] * (1 + tolerance)
+        if result.db_hits > limit:
+            check.regressions.append(
+                f"{result.key}: {result.db_hits} db hits > budget {budget['db_hits']} (+{tolerance:.0%})"
+            )
+        elif result.db_hits < budget["db_hits"]:
+            check.improved.append(f"{result.key}: {result.db_hits} db hits < budget {budget['db_hits']}")
+        if "rows" in budget and result.rows != budget["rows"]:
+            check.regressions.append(f"{result.key}: {result.rows} rows != expected {budget['rows']}")
+    return check
+
+
+def budgets_from(results: list[ProfileResult], tolerance: float = DEFAULT_TOLERANCE) -> dict[str, Any]:
+    """A budgets document recording ``results`` as the new baseline."""
+    return {
+        "tolerance": tolerance,
+        "budgets": {r.key: {"db_hits": r.db_hits, "rows": r.rows} for r in sorted(results, key=lambda r: r.key)},
+    }
+
+
+def report(results: list[ProfileResult]) -> list[dict[str, Any]]:
+    """JSON-serializable results including operator trees."""
+    return [asdict(r) for r in results]
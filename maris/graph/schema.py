@@ -1,7 +1,14 @@
 """Neo4j schema definitions - constraints, indexes, and vector indexes."""
 
+import logging
+
+from maris.embeddings.embedder import EMBEDDING_DIM
 from maris.graph.connection import get_driver, get_config
 
+logger = logging.getLogger(__name__)
+
+DOCUMENT_VECTOR_INDEX = "document_embedding"
+
 # Each statement is executed individually (Neo4j requires separate transactions for DDL).
 SCHEMA_STATEMENTS = [
     # ===== NODE CONSTRAINTS =====
@@ -15,6 +22,9 @@ SCHEMA_STATEMENTS = [
     "CREATE CONSTRAINT framework_id IF NOT EXISTS FOR (fw:Framework) REQUIRE fw.framework_id IS UNIQUE",
     "CREATE CONSTRAINT trophic_node_id IF NOT EXISTS FOR (t:TrophicLevel) REQUIRE t.node_id IS UNIQUE",
     "CREATE CONSTRAINT concept_id IF NOT EXISTS FOR (c:Concept) REQUIRE c.concept_id IS UNIQUE",
+    "CREATE CONSTRAINT graph_meta_key IF NOT EXISTS FOR (g:GraphMeta) REQUIRE g.key IS UNIQUE",
+    "CREATE CONSTRAINT provenance_cache_key IF NOT EXISTS FOR (c:ProvenanceCache) REQUIRE (c.kind, c.key) IS UNIQUE",
+    "CREATE CONSTRAINT neighborhood_cache_key IF NOT EXISTS FOR (c:NeighborhoodCache) REQUIRE c.key IS UNIQUE",
 
     # ===== INDEXES =====
     "CREATE INDEX document_tier IF NOT EXISTS FOR (d:Document) ON (d.source_tier)",
@@ -23,11 +33,29 @@ SCHEMA_STATEMENTS = [
     "CREATE INDEX mpa_neoli IF NOT EXISTS FOR (m:MPA) ON (m.neoli_score)",
     "CREATE INDEX concept_name IF NOT EXISTS FOR (c:Concept) ON (c.name)",
     "CREATE INDEX concept_domain IF NOT EXISTS FOR (c:Concept) ON (c.domain)",
+    "CREATE INDEX mpa_characterization_tier IF NOT EXISTS FOR (m:MPA) ON (m.characterization_tier)",
+    "CREATE INDEX bridge_axiom_name IF NOT EXISTS FOR (b:BridgeAxiom) ON (b.name)",
+
+    # ===== TEXT INDEXES (CONTAINS / ENDS WITH lookups) =====
+    "CREATE TEXT INDEX concept_name_text IF NOT EXISTS FOR (c:Concept) ON (c.name)",
+    "CREATE TEXT INDEX bridge_axiom_name_text IF NOT EXISTS FOR (b:BridgeAxiom) ON (b.name)",
+    "CREATE TEXT INDEX bridge_axiom_description_text IF NOT EXISTS FOR (b:BridgeAxiom) ON (b.description)",
 
     # ===== FULLTEXT INDEX =====
     "CREATE FULLTEXT INDEX document_fulltext IF NOT EXISTS FOR (d:Document) ON EACH [d.abstract, d.title]",
+
+    # ===== VECTOR INDEX (Neo4j 5.11+) =====
+    (
+        f"CREATE VECTOR INDEX {DOCUMENT_VECTOR_INDEX} IF NOT EXISTS FOR (d:Document) ON (d.embedding) "
+        f"OPTIONS {{indexConfig: {{`vector.dimensions`: {EMBEDDING_DIM}, "
+        "`vector.similarity_function`: 'cosine'}}"
+    ),
 ]
 
+# Statements whose failure (e.g. an older server without vector indexes)
+# should degrade features rather than abort schema setup.
+OPTIONAL_STATEMENTS = frozenset(stmt for stmt in SCHEMA_STATEMENTS if "VECTOR INDEX" in stmt)
+
 
 def ensure_schema():
     """Create all constraints and indexes (idempotent)."""
@@ -41,5 +69,8 @@ def ensure_schema():
                 # Some older Neo4j versions may not support IF NOT EXISTS for all types
                 if "already exists" in str(e).lower() or "equivalent" in str(e).lower():
                     continue
+                if stmt in OPTIONAL_STATEMENTS:
+                    logger.warning("Optional schema statement skipped (%s): %s", e, stmt)
+                    continue
                 raise
     print(f"Schema applied: {len(SCHEMA_STATEMENTS)} statements executed.")
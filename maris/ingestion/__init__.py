@@ -3,7 +3,11 @@
 from maris.ingestion.pdf_extractor import extract_text, chunk_pages
 from maris.ingestion.llm_extractor import LLMExtractor
 from maris.ingestion.graph_merger import GraphMerger
-from maris.ingestion.embedding_generator import generate_embedding, update_document_embeddings
+from maris.ingestion.embedding_generator import (
+    generate_embedding,
+    generate_embeddings,
+    update_document_embeddings,
+)
 
 __all__ = [
     "extract_text",
@@ -11,5 +15,6 @@ __all__ = [
     "LLMExtractor",
     "GraphMerger",
     "generate_embedding",
+    "generate_embeddings",
     "update_document_embeddings",
 ]
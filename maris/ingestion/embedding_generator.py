@@ -1,37 +1,51 @@
 """Document embedding generation for vector search.
 
-Stub implementation: returns zero vectors. Replace with sentence-transformers
-(e.g. all-MiniLM-L6-v2) for production use.
+Embeddings come from the offline ``HashingEmbedder`` in ``maris.embeddings``:
+deterministic, 384-dimensional and unit-norm, with no model download or
+network access.
 """
 
 import logging
 
+from maris.embeddings import get_embedder
 from maris.graph.connection import run_write, get_driver
 from maris.config import get_config
 
 logger = logging.getLogger(__name__)
 
-EMBEDDING_DIM = 384
-
 
 def generate_embedding(text: str) -> list[float]:
-    """Generate a 384-dimensional embedding vector for the given text.
+    """Generate a 384-dimensional embedding vector for the given text."""
+    return get_embedder().embed(text).tolist()
 
-    Stub implementation returns zeros. To enable real embeddings, install
-    sentence-transformers and replace this function body:
 
-        from sentence_transformers import SentenceTransformer
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        return model.encode(text).tolist()
-    """
-    return [0.0] * EMBEDDING_DIM
+def generate_embeddings(texts: list[str], batch_size: int = 256) -> list[list[float]]:
+    """Embed ``texts`` in batches; same vectors as ``generate_embedding``."""
+    return get_embedder().embed_batch(texts, batch_size).tolist()
+
+
+_PENDING_DOCUMENTS_CYPHER = """
+MATCH (d:Document)
+WHERE d.embedding IS NULL AND d.doi IS NOT NULL
+  AND trim(coalesce(d.title, '') + ' ' + coalesce(d.abstract, '')) <> ''
+RETURN d.doi AS doi, d.title AS title, d.abstract AS abstract
+LIMIT $limit
+"""
+
+_WRITE_EMBEDDINGS_CYPHER = """
+UNWIND $rows AS row
+MATCH (d:Document {doi: row.doi})
+SET d.embedding = row.embedding
+"""
 
 
-def update_document_embeddings(batch_size: int = 50) -> int:
+def update_document_embeddings(batch_size: int = 500, max_documents: int | None = None) -> int:
     """Batch-update Document nodes with embedding vectors.
 
-    Finds all Document nodes missing an 'embedding' property and generates
-    embeddings from their title + abstract text.
+    Finds Document nodes missing an 'embedding' property and embeds their
+    title + abstract text, ``batch_size`` documents at a time. Each batch is
+    written with a single ``UNWIND`` transaction, so the cost is one round
+    trip per batch rather than one per document.
 
     Returns:
         Number of documents updated.
@@ -39,43 +53,25 @@ def update_document_embeddings(batch_size: int = 50) -> int:
     cfg = get_config()
     driver = get_driver()
 
-    # Fetch documents without embeddings
-    with driver.session(database=cfg.neo4j_database) as session:
-        result = session.run(
-            """
-            MATCH (d:Document)
-            WHERE d.embedding IS NULL
-            RETURN d.doi AS doi, d.title AS title, d.abstract AS abstract
-            LIMIT $limit
-            """,
-            {"limit": batch_size},
-        )
-        docs = [record.data() for record in result]
-
-    if not docs:
-        logger.info("All documents already have embeddings.")
-        return 0
-
     count = 0
-    for doc in docs:
-        doi = doc.get("doi", "")
-        if not doi:
-            continue
-
-        text = f"{doc.get('title', '')} {doc.get('abstract', '')}".strip()
-        if not text:
-            continue
-
-        embedding = generate_embedding(text)
-
-        run_write(
-            """
-            MATCH (d:Document {doi: $doi})
-            SET d.embedding = $embedding
-            """,
-            {"doi": doi, "embedding": embedding},
-        )
-        count += 1
-
-    logger.info("Updated embeddings for %d documents.", count)
+    while max_documents is None or count < max_documents:
+        limit = batch_size if max_documents is None else min(batch_size, max_documents - count)
+        with driver.session(database=cfg.neo4j_database) as session:
+            docs = [record.data() for record in session.run(_PENDING_DOCUMENTS_CYPHER, {"limit": limit})]
+        if not docs:
+            break
+
+        rows = [{"doi": doc["doi"]} for doc in docs]
+        texts = [f"{doc.get('title') or ''} {doc.get('abstract') or ''}".strip() for doc in docs]
+        for row, embedding in zip(rows, generate_embeddings(texts, batch_size=batch_size)):
+            row["embedding"] = embedding
+
+        run_write(_WRITE_EMBEDDINGS_CYPHER, {"rows": rows})
+        count += len(rows)
+        logger.info("Embedded %d documents (%d total)", len(rows), count)
+
+    if count == 0:
+        logger.info("All documents already have embeddings.")
+    else:
+        logger.info("Updated embeddings for %d documents.", count)
     return count
@@ -4,6 +4,7 @@ import logging
 
 from maris.config import MARISConfig
 from maris.graph.connection import run_write
+from maris.graph.epoch import bump_graph_epoch
 
 logger = logging.getLogger(__name__)
 
@@ -154,6 +155,8 @@ class GraphMerger:
                 logger.error("Failed to merge %s entity: %s", etype, e)
 
         self._entity_counts = counts
+        if counts:
+            bump_graph_epoch()
         return counts
 
     def merge_relationships(self, relationships: list[dict]) -> int:
@@ -208,6 +211,8 @@ class GraphMerger:
                 logger.error("Failed to merge relationship %s->%s (%s): %s", source, target, rel_type, e)
 
         self._rel_count = count
+        if count:
+            bump_graph_epoch()
         return count
 
     def _detect_entity_type(self, ent: dict) -> str | None:
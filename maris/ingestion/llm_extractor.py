@@ -4,9 +4,8 @@ import json
 import logging
 import re
 
-from openai import OpenAI
-
 from maris.config import MARISConfig
+from maris.llm.adapter import LLMAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -62,8 +61,8 @@ For each relationship, provide:
 Return ONLY a JSON array. Do NOT infer relationships not clearly stated. If none found, return []."""
 
 
-def _parse_json_from_response(text: str) -> list[dict]:
-    """Extract a JSON array from an LLM response, handling markdown fences."""
+def _json_array(text: str) -> list | None:
+    """The JSON array in an LLM response (markdown fences allowed), or None."""
     text = text.strip()
 
     # Strip markdown code fences
@@ -75,13 +74,26 @@ def _parse_json_from_response(text: str) -> list[dict]:
     start = text.find("[")
     end = text.rfind("]")
     if start == -1 or end == -1 or end <= start:
-        return []
+        return None
 
     try:
         return json.loads(text[start : end + 1])
-    except json.JSONDecodeError as e:
-        logger.warning("Failed to parse LLM JSON response: %s", e)
+    except json.JSONDecodeError:
+        return None
+
+
+def _is_json_array_completion(text: str) -> bool:
+    """Whether ``text`` yields a JSON array; bad output is kept out of the cache."""
+    return _json_array(text) is not None
+
+
+def _parse_json_from_response(text: str) -> list[dict]:
+    """Extract a JSON array from an LLM response, handling markdown fences."""
+    parsed = _json_array(text)
+    if parsed is None:
+        logger.warning("Failed to parse LLM JSON response")
         return []
+    return parsed
 
 
 class LLMExtractor:
@@ -89,14 +101,20 @@ class LLMExtractor:
 
     def __init__(self, config: MARISConfig, provenance_manager=None):
         self.config = config
-        self.client = OpenAI(
-            api_key=config.llm_api_key,
-            base_url=config.llm_base_url,
-        )
-        self.model = config.llm_model
+        # Re-ingesting unchanged chunks is answered from the adapter's completion cache
+        self.llm = LLMAdapter(config)
+        self.model = self.llm.default_model
         self.threshold = config.extraction_confidence_threshold
         self._provenance = provenance_manager
 
+    def _complete(self, prompt: str) -> str:
+        """Run one extraction prompt; only complete JSON arrays are cached."""
+        return self.llm.complete(
+            [{"role": "user", "content": prompt}],
+            temperature=0.1,
+            cache_if=_is_json_array_completion,
+        )
+
     def extract_entities(self, chunk: dict, paper_meta: dict) -> list[dict]:
         """Extract entities from a single chunk.
 
@@ -115,14 +133,7 @@ class LLMExtractor:
         )
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=self.config.llm_max_tokens,
-                timeout=self.config.llm_timeout,
-            )
-            raw = response.choices[0].message.content or ""
+            raw = self._complete(prompt)
         except Exception as e:
             logger.error("LLM entity extraction failed for chunk %s: %s", chunk.get("chunk_id"), e)
             return []
@@ -192,14 +203,7 @@ class LLMExtractor:
         )
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=self.config.llm_max_tokens,
-                timeout=self.config.llm_timeout,
-            )
-            raw = response.choices[0].message.content or ""
+            raw = self._complete(prompt)
         except Exception as e:
             logger.error("LLM relationship extraction failed for chunk %s: %s", chunk.get("chunk_id"), e)
             return []
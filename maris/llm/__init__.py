@@ -1,5 +1,5 @@
 """MARIS LLM module - model-agnostic adapter and prompt templates."""
 
-from maris.llm.adapter import LLMAdapter
+from maris.llm.adapter import AsyncLLMAdapter, LLMAdapter
 
-__all__ = ["LLMAdapter"]
+__all__ = ["AsyncLLMAdapter", "LLMAdapter"]
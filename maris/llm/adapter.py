@@ -3,15 +3,34 @@
 Supports DeepSeek, OpenAI, Anthropic (via proxy), and Ollama. Non-Ollama
 providers require a valid ``MARIS_LLM_API_KEY``. Calls are retried twice
 on transient HTTP errors (429, 500, 502, 503) with exponential backoff.
+
+Low-temperature completions are served from a disk-backed cache
+(``maris.llm.cache``) when ``MARIS_LLM_CACHE_ENABLED`` is set; pass
+``use_cache=False`` to force a provider round trip. Completions cut off
+at ``max_tokens`` are never stored, and ``complete_json`` stores only
+output that parses as JSON.
+
+``AsyncLLMAdapter`` exposes the same interface on ``AsyncOpenAI`` for the
+async query path, sharing provider resolution, retries and the cache.
+
+Both adapters also offer ``stream()``, which yields completion text deltas
+as the provider produces them (used by the SSE query endpoint).
+
+Completions run in ``llm.complete``/``llm.stream`` trace spans carrying
+the model, cache outcome, token usage and one event per retry.
 """
 
+import asyncio
 import functools
 import logging
 import time
+from typing import AsyncIterator, Callable, Iterator
 
-from openai import APITimeoutError, OpenAI, APIStatusError
+from openai import APITimeoutError, AsyncOpenAI, OpenAI, APIStatusError
 
 from maris.config import MARISConfig, get_config
+from maris.llm.cache import CompletionCache, completion_cache_key
+from maris.observability.tracing import current_span, get_tracer, traced, use_span
 
 logger = logging.getLogger(__name__)
 
@@ -22,97 +41,471 @@ logger = logging.getLogger(__name__)
 
 _LLM_RETRYABLE_STATUS = (429, 500, 502, 503)
 
+def _retry_wait(
+    exc: Exception, fn_name: str, attempt: int, max_attempts: int, backoff_seconds: tuple[float, ...],
+) -> float | None:
+    """Return the backoff before the next attempt, or None if ``exc`` is final."""
+    if attempt >= max_attempts:
+        return None
+    if isinstance(exc, APIStatusError) and exc.status_code not in _LLM_RETRYABLE_STATUS:
+        return None
+    wait = backoff_seconds[min(attempt - 1, len(backoff_seconds) - 1)]
+    current_span().add_event(
+        "retry",
+        attempt=attempt,
+        max_attempts=max_attempts,
+        error=f"HTTP {exc.status_code}" if isinstance(exc, APIStatusError) else "timeout",
+        backoff_seconds=wait,
+    )
+    if isinstance(exc, APIStatusError):
+        logger.warning(
+            "LLM retry %d/%d for %s after HTTP %d: sleeping %.1fs",
+            attempt, max_attempts, fn_name, exc.status_code, wait,
+        )
+    else:
+        logger.warning(
+            "LLM retry %d/%d for %s after timeout: sleeping %.1fs",
+            attempt, max_attempts, fn_name, wait,
+        )
+    return wait
+
+
 def _llm_retry(max_attempts: int = 3, backoff_seconds: tuple[float, ...] = (2.0, 5.0)):
     """Retry decorator for LLM API calls on timeout or transient HTTP errors."""
     def decorator(fn):
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
-            last_exc: Exception | None = None
             for attempt in range(1, max_attempts + 1):
                 try:
                     return fn(*args, **kwargs)
-                except APITimeoutError as exc:
-                    last_exc = exc
-                    if attempt < max_attempts:
-                        wait = backoff_seconds[min(attempt - 1, len(backoff_seconds) - 1)]
-                        logger.warning(
-                            "LLM retry %d/%d for %s after timeout: sleeping %.1fs",
-                            attempt, max_attempts, fn.__name__, wait,
-                        )
-                        time.sleep(wait)
-                except APIStatusError as exc:
-                    last_exc = exc
-                    if exc.status_code in _LLM_RETRYABLE_STATUS and attempt < max_attempts:
-                        wait = backoff_seconds[min(attempt - 1, len(backoff_seconds) - 1)]
-                        logger.warning(
-                            "LLM retry %d/%d for %s after HTTP %d: sleeping %.1fs",
-                            attempt, max_attempts, fn.__name__, exc.status_code, wait,
-                        )
-                        time.sleep(wait)
-                    else:
+                except (APITimeoutError, APIStatusError) as exc:
+                    wait = _retry_wait(exc, fn.__name__, attempt, max_attempts, backoff_seconds)
+                    if wait is None:
+                        if isinstance(exc, APITimeoutError):
+                            logger.error("All %d LLM attempts failed for %s", max_attempts, fn.__name__)
                         raise
-            if last_exc is not None:
-                logger.error("All %d LLM attempts failed for %s", max_attempts, fn.__name__)
-                raise last_exc
+                    time.sleep(wait)
         return wrapper
     return decorator
 
 
-class LLMAdapter:
-    """Unified LLM interface supporting DeepSeek, OpenAI, Anthropic, and Ollama."""
+def _llm_retry_async(max_attempts: int = 3, backoff_seconds: tuple[float, ...] = (2.0, 5.0)):
+    """Async counterpart of ``_llm_retry`` (sleeps without blocking the loop)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await fn(*args, **kwargs)
+                except (APITimeoutError, APIStatusError) as exc:
+                    wait = _retry_wait(exc, fn.__name__, attempt, max_attempts, backoff_seconds)
+                    if wait is None:
+                        if isinstance(exc, APITimeoutError):
+                            logger.error("All %d LLM attempts failed for %s", max_attempts, fn.__name__)
+                        raise
+                    await asyncio.sleep(wait)
+        return wrapper
+    return decorator
 
-    PROVIDER_CONFIGS = {
-        "deepseek": {"base_url": "https://api.deepseek.com/v1", "default_model": "deepseek-chat"},
-        "openai": {"base_url": "https://api.openai.com/v1", "default_model": "gpt-4o"},
-        "anthropic": {"base_url": "https://api.anthropic.com/v1", "default_model": "claude-sonnet-4-5-20250929"},
-        "ollama": {"base_url": "http://localhost:11434/v1", "default_model": "llama3.1:8b"},
-    }
 
-    def __init__(self, config: MARISConfig | None = None):
-        self.config = config or get_config()
-        provider = self.config.llm_provider.lower()
-        provider_cfg = self.PROVIDER_CONFIGS.get(provider, {})
+_PROVIDER_CONFIGS = {
+    "deepseek": {"base_url": "https://api.deepseek.com/v1", "default_model": "deepseek-chat"},
+    "openai": {"base_url": "https://api.openai.com/v1", "default_model": "gpt-4o"},
+    "anthropic": {"base_url": "https://api.anthropic.com/v1", "default_model": "claude-sonnet-4-5-20250929"},
+    "ollama": {"base_url": "http://localhost:11434/v1", "default_model": "llama3.1:8b"},
+}
+
+
+def _truncated(response) -> bool:
+    """Whether a completion (or its final stream chunk) stopped at ``max_tokens``."""
+    choices = getattr(response, "choices", None)
+    return bool(choices) and getattr(choices[0], "finish_reason", None) == "length"
+
+
+def is_json_completion(text: str) -> bool:
+    """Whether ``text`` yields a JSON object; bad output is kept out of the cache."""
+    # Lazy import to avoid circular dependency (query -> llm -> query)
+    from maris.query.validators import extract_json_robust
+    return "error" not in extract_json_robust(text)
+
 
-        base_url = self.config.llm_base_url or provider_cfg.get("base_url", "")
-        api_key = self.config.llm_api_key
+def _chunk_text(chunk) -> str:
+    """Text delta carried by one streamed chat-completion chunk."""
+    choices = getattr(chunk, "choices", None)
+    if not choices:
+        return ""
+    delta = getattr(choices[0], "delta", None)
+    return (getattr(delta, "content", None) or "") if delta is not None else ""
 
-        if not api_key and provider != "ollama":
-            raise ValueError(
-                f"MARIS_LLM_API_KEY is required for provider '{provider}'. "
-                "Set it in .env or as an environment variable."
-            )
-        if not api_key:
-            api_key = "ollama"
 
-        self.default_model = self.config.llm_model or provider_cfg.get("default_model", "")
+def _resolve_provider(config: MARISConfig) -> tuple[str, str, str, str]:
+    """Return ``(provider, base_url, api_key, default_model)`` for a config."""
+    provider = config.llm_provider.lower()
+    provider_cfg = _PROVIDER_CONFIGS.get(provider, {})
+
+    base_url = config.llm_base_url or provider_cfg.get("base_url", "")
+    api_key = config.llm_api_key
+
+    if not api_key and provider != "ollama":
+        raise ValueError(
+            f"MARIS_LLM_API_KEY is required for provider '{provider}'. "
+            "Set it in .env or as an environment variable."
+        )
+    if not api_key:
+        api_key = "ollama"
+
+    default_model = config.llm_model or provider_cfg.get("default_model", "")
+    return provider, base_url, api_key, default_model
+
+
+def _record_usage(response) -> None:
+    """Copy provider token counts onto the active LLM span."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    span = current_span()
+    for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = getattr(usage, field, None)
+        if isinstance(value, int):
+            span.set_attribute(f"llm.{field}", value)
+
+
+class LLMAdapter:
+    """Unified LLM interface supporting DeepSeek, OpenAI, Anthropic, and Ollama."""
+
+    PROVIDER_CONFIGS = _PROVIDER_CONFIGS
+
+    def __init__(self, config: MARISConfig | None = None, cache: CompletionCache | None = None):
+        self.config = config or get_config()
+        provider, base_url, api_key, self.default_model = _resolve_provider(self.config)
         self.reasoning_model = self.config.llm_reasoning_model
 
+        self.base_url = base_url
         self.client = OpenAI(
             base_url=base_url,
             api_key=api_key,
             timeout=self.config.llm_timeout,
         )
+        self.cache = cache if cache is not None else CompletionCache.from_config(self.config)
         logger.info("LLMAdapter initialized: provider=%s, model=%s", provider, self.default_model)
 
-    @_llm_retry(max_attempts=3, backoff_seconds=(2.0, 5.0))
-    def complete(self, messages: list[dict], model: str | None = None, temperature: float = 0.1) -> str:
-        """Send messages to the LLM and return the text response."""
+    @traced("llm.complete")
+    def complete(
+        self,
+        messages: list[dict],
+        model: str | None = None,
+        temperature: float = 0.1,
+        response_format: dict | None = None,
+        use_cache: bool = True,
+        cache_if: Callable[[str], bool] | None = None,
+    ) -> str:
+        """Send messages to the LLM and return the text response.
+
+        Identical low-temperature requests are answered from the completion
+        cache; ``use_cache=False`` bypasses it for this call. A completion is
+        stored only when it was not cut off at ``max_tokens`` and, if given,
+        ``cache_if(text)`` holds.
+        """
         model = model or self.default_model
+        max_tokens = self.config.llm_max_tokens
+        llm_span = current_span()
+        llm_span.set_attribute("llm.model", model)
+        cache = self.cache
+        if cache is None or not use_cache or not cache.is_cacheable(temperature):
+            if cache is not None:
+                cache.record_bypass()
+                llm_span.set_attribute("llm.cache", "bypass")
+            text, _ = self._complete_uncached(messages, model, temperature, max_tokens, response_format)
+            return text
+
+        key = completion_cache_key(
+            model, messages, temperature, max_tokens, response_format, base_url=self.base_url,
+        )
+        cached = cache.get(key)
+        llm_span.set_attribute("llm.cache", "hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+        text, truncated = self._complete_uncached(messages, model, temperature, max_tokens, response_format)
+        if not truncated and (cache_if is None or cache_if(text)):
+            cache.put(key, model, text)
+        return text
+
+    @_llm_retry(max_attempts=3, backoff_seconds=(2.0, 5.0))
+    def _complete_uncached(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict | None = None,
+    ) -> tuple[str, bool]:
+        """Provider round trip; returns ``(text, truncated)``."""
+        kwargs: dict = {}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
         response = self.client.chat.completions.create(
             model=model,
             messages=messages,
             temperature=temperature,
-            max_tokens=self.config.llm_max_tokens,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        _record_usage(response)
+        return response.choices[0].message.content or "", _truncated(response)
+
+    def stream(
+        self,
+        messages: list[dict],
+        model: str | None = None,
+        temperature: float = 0.1,
+        response_format: dict | None = None,
+        use_cache: bool = True,
+        cache_if: Callable[[str], bool] | None = None,
+    ) -> Iterator[str]:
+        """Yield completion text deltas as the provider produces them.
+
+        A cached completion is replayed as a single chunk and a fully
+        streamed one is written back to the cache (under the same conditions
+        as ``complete``). Retries cover opening the stream only; a failure
+        after the first delta propagates.
+        """
+        model = model or self.default_model
+        max_tokens = self.config.llm_max_tokens
+        cache = self.cache
+        key = None
+        if cache is not None:
+            if use_cache and cache.is_cacheable(temperature):
+                key = completion_cache_key(
+                    model, messages, temperature, max_tokens, response_format, base_url=self.base_url,
+                )
+                cached = cache.get(key)
+                if cached is not None:
+                    yield cached
+                    return
+            else:
+                cache.record_bypass()
+
+        # Spans the whole stream, so it is ended explicitly rather than
+        # activated around the yields (which would parent the consumer's spans)
+        stream_span = get_tracer().start_span("llm.stream", **{"llm.model": model})
+        parts: list[str] = []
+        truncated = False
+        try:
+            with use_span(stream_span):
+                response = self._open_stream(messages, model, temperature, max_tokens, response_format)
+            for chunk in response:
+                truncated = truncated or _truncated(chunk)
+                text = _chunk_text(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+            stream_span.set_attribute("llm.chunks", len(parts))
+        except Exception as exc:
+            stream_span.record_exception(exc)
+            raise
+        finally:
+            stream_span.end()
+        text = "".join(parts)
+        if key is not None and not truncated and (cache_if is None or cache_if(text)):
+            cache.put(key, model, text)
+
+    @_llm_retry(max_attempts=3, backoff_seconds=(2.0, 5.0))
+    def _open_stream(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict | None = None,
+    ):
+        kwargs: dict = {}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+        return self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **kwargs,
         )
-        return response.choices[0].message.content or ""
 
-    def complete_json(self, messages: list[dict], model: str | None = None) -> dict:
+    def complete_json(
+        self, messages: list[dict], model: str | None = None, use_cache: bool = True,
+    ) -> dict:
         """Send messages and parse a JSON object from the response.
 
         Uses robust JSON extraction that handles code fences, truncated
         responses, multiple code blocks, and non-JSON output.
         """
-        text = self.complete(messages, model=model, temperature=0.0)
+        text = self.complete(
+            messages, model=model, temperature=0.0, use_cache=use_cache, cache_if=is_json_completion,
+        )
         # Lazy import to avoid circular dependency (query -> llm -> query)
         from maris.query.validators import extract_json_robust
         return extract_json_robust(text)
+
+    def cache_stats(self) -> dict[str, int]:
+        """Completion cache hit/miss counters (empty when caching is off)."""
+        return self.cache.stats() if self.cache is not None else {}
+
+
+class AsyncLLMAdapter:
+    """``LLMAdapter`` counterpart built on ``AsyncOpenAI`` for the async query path."""
+
+    def __init__(self, config: MARISConfig | None = None, cache: CompletionCache | None = None):
+        self.config = config or get_config()
+        provider, base_url, api_key, self.default_model = _resolve_provider(self.config)
+        self.reasoning_model = self.config.llm_reasoning_model
+
+        self.base_url = base_url
+        self.client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=self.config.llm_timeout,
+        )
+        self.cache = cache if cache is not None else CompletionCache.from_config(self.config)
+        logger.info("AsyncLLMAdapter initialized: provider=%s, model=%s", provider, self.default_model)
+
+    @traced("llm.complete")
+    async def complete(
+        self,
+        messages: list[dict],
+        model: str | None = None,
+        temperature: float = 0.1,
+        response_format: dict | None = None,
+        use_cache: bool = True,
+        cache_if: Callable[[str], bool] | None = None,
+    ) -> str:
+        """Async ``LLMAdapter.complete`` (same caching semantics).
+
+        The SQLite cache is read and written in a worker thread.
+        """
+        model = model or self.default_model
+        max_tokens = self.config.llm_max_tokens
+        llm_span = current_span()
+        llm_span.set_attribute("llm.model", model)
+        cache = self.cache
+        if cache is None or not use_cache or not cache.is_cacheable(temperature):
+            if cache is not None:
+                cache.record_bypass()
+                llm_span.set_attribute("llm.cache", "bypass")
+            text, _ = await self._complete_uncached(messages, model, temperature, max_tokens, response_format)
+            return text
+
+        key = completion_cache_key(
+            model, messages, temperature, max_tokens, response_format, base_url=self.base_url,
+        )
+        cached = await asyncio.to_thread(cache.get, key)
+        llm_span.set_attribute("llm.cache", "hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+        text, truncated = await self._complete_uncached(messages, model, temperature, max_tokens, response_format)
+        if not truncated and (cache_if is None or cache_if(text)):
+            await asyncio.to_thread(cache.put, key, model, text)
+        return text
+
+    @_llm_retry_async(max_attempts=3, backoff_seconds=(2.0, 5.0))
+    async def _complete_uncached(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict | None = None,
+    ) -> tuple[str, bool]:
+        """Provider round trip; returns ``(text, truncated)``."""
+        kwargs: dict = {}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        _record_usage(response)
+        return response.choices[0].message.content or "", _truncated(response)
+
+    async def stream(
+        self,
+        messages: list[dict],
+        model: str | None = None,
+        temperature: float = 0.1,
+        response_format: dict | None = None,
+        use_cache: bool = True,
+        cache_if: Callable[[str], bool] | None = None,
+    ) -> AsyncIterator[str]:
+        """Async ``LLMAdapter.stream`` (same caching and retry semantics)."""
+        model = model or self.default_model
+        max_tokens = self.config.llm_max_tokens
+        cache = self.cache
+        key = None
+        if cache is not None:
+            if use_cache and cache.is_cacheable(temperature):
+                key = completion_cache_key(
+                    model, messages, temperature, max_tokens, response_format, base_url=self.base_url,
+                )
+                cached = await asyncio.to_thread(cache.get, key)
+                if cached is not None:
+                    yield cached
+                    return
+            else:
+                cache.record_bypass()
+
+        stream_span = get_tracer().start_span("llm.stream", **{"llm.model": model})
+        parts: list[str] = []
+        truncated = False
+        try:
+            with use_span(stream_span):
+                response = await self._open_stream(messages, model, temperature, max_tokens, response_format)
+            async for chunk in response:
+                truncated = truncated or _truncated(chunk)
+                text = _chunk_text(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+            stream_span.set_attribute("llm.chunks", len(parts))
+        except Exception as exc:
+            stream_span.record_exception(exc)
+            raise
+        finally:
+            stream_span.end()
+        text = "".join(parts)
+        if key is not None and not truncated and (cache_if is None or cache_if(text)):
+            await asyncio.to_thread(cache.put, key, model, text)
+
+    @_llm_retry_async(max_attempts=3, backoff_seconds=(2.0, 5.0))
+    async def _open_stream(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict | None = None,
+    ):
+        kwargs: dict = {}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+        return await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **kwargs,
+        )
+
+    async def complete_json(
+        self, messages: list[dict], model: str | None = None, use_cache: bool = True,
+    ) -> dict:
+        """Async ``LLMAdapter.complete_json``."""
+        text = await self.complete(
+            messages, model=model, temperature=0.0, use_cache=use_cache, cache_if=is_json_completion,
+        )
+        from maris.query.validators import extract_json_robust
+        return extract_json_robust(text)
+
+    def cache_stats(self) -> dict[str, int]:
+        return self.cache.stats() if self.cache is not None else {}
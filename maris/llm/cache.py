@@ -0,0 +1,207 @@
+"""Disk-backed cache for deterministic LLM completions.
+
+Completions are keyed on everything that shapes the provider's output:
+endpoint, model, messages, temperature, max_tokens and response format.
+Only low-temperature calls are cached (above ``max_temperature`` sampling is
+treated as intentionally non-deterministic), so re-running ingestion,
+discovery or repeated queries over unchanged prompts costs no round trips.
+
+Entries live in SQLite (WAL mode, safe for concurrent processes) with a TTL
+and an entry cap enforced by least-recently-used pruning. The connection is
+opened lazily on first use.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key   TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    response    TEXT NOT NULL
+)
+"""
+_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+
+# Enforce the entry cap every N writes rather than on each insert
+_PRUNE_EVERY = 100
+
+
+def completion_cache_key(
+    model: str,
+    messages: list[dict],
+    temperature: float,
+    max_tokens: int | None,
+    response_format: dict | None = None,
+    base_url: str = "",
+) -> str:
+    """Return a stable SHA-256 key for a chat completion request."""
+    material = {
+        "base_url": base_url,
+        "model": model,
+        "messages": messages,
+        "temperature": round(float(temperature), 4),
+        "max_tokens": max_tokens,
+        "response_format": response_format,
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """SQLite-backed completion store with TTL, size cap and hit/miss counters.
+
+    ``db_path`` of ``""`` or ``":memory:"`` keeps the cache in-process only.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = "",
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_entries: int = 50_000,
+        max_temperature: float = 0.2,
+    ) -> None:
+        self.db_path = str(db_path) if db_path else ":memory:"
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(int(max_entries), 1)
+        self.max_temperature = float(max_temperature)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.writes = 0
+
+    @classmethod
+    def from_config(cls, config: Any) -> CompletionCache | None:
+        """Build from ``MARIS_LLM_CACHE_*`` settings, or None when disabled."""
+        if not config.llm_cache_enabled:
+            return None
+        return cls(
+            db_path=config.llm_cache_path,
+            ttl_seconds=config.llm_cache_ttl_seconds,
+            max_entries=config.llm_cache_max_entries,
+            max_temperature=config.llm_cache_max_temperature,
+        )
+
+    def is_cacheable(self, temperature: float) -> bool:
+        return temperature <= self.max_temperature
+
+    # -- Lookup / store ------------------------------------------------------
+
+    def get(self, key: str) -> str | None:
+        """Return the cached completion for ``key``, or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE cache_key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a completion. Empty responses are not cached."""
+        if not response:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(cache_key, model, created_at, accessed_at, response) VALUES (?, ?, ?, ?, ?)",
+                (key, model, now, now, response),
+            )
+            self.writes += 1
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= _PRUNE_EVERY:
+                self._prune(conn)
+            conn.commit()
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    # -- Maintenance ---------------------------------------------------------
+
+    def prune(self) -> None:
+        """Drop expired entries and enforce the entry cap now."""
+        with self._lock:
+            conn = self._connect()
+            self._prune(conn)
+            conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries = 0
+            if self._conn is not None:
+                entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "writes": self.writes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -- Internals -----------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            if self.db_path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_CREATE_TABLE)
+            conn.execute(_CREATE_INDEX)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        self._writes_since_prune = 0
+        if self.ttl_seconds > 0:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+        conn.execute(
+            "DELETE FROM llm_cache WHERE cache_key IN ("
+            "SELECT cache_key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
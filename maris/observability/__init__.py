@@ -0,0 +1,48 @@
+"""Query pipeline instrumentation: stage timings, Prometheus-format metrics and span tracing."""
+
+from maris.observability.metrics import (
+    CONTENT_TYPE,
+    REGISTRY,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+)
+from maris.observability.timing import STAGES, StageTimings, current_timings, stage
+from maris.observability.tracing import (
+    InMemorySpanExporter,
+    JSONLSpanExporter,
+    OTLPJSONSpanExporter,
+    Span,
+    SpanExporter,
+    Tracer,
+    configure_tracing,
+    current_span,
+    get_tracer,
+    span,
+    traced,
+    use_span,
+)
+
+__all__ = [
+    "CONTENT_TYPE",
+    "REGISTRY",
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "STAGES",
+    "StageTimings",
+    "current_timings",
+    "stage",
+    "Span",
+    "SpanExporter",
+    "InMemorySpanExporter",
+    "JSONLSpanExporter",
+    "OTLPJSONSpanExporter",
+    "Tracer",
+    "configure_tracing",
+    "current_span",
+    "get_tracer",
+    "span",
+    "traced",
+    "use_span",
+]
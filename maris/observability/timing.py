@@ -0,0 +1,102 @@
+"""Per-request query stage timings.
+
+A ``StageTimings`` collector is activated for the duration of a request
+and carried in a context variable, so pipeline code anywhere below the
+route (the generator, validators, threadpool stages) records into it with
+``with stage("validation"): ...`` without threading an argument through.
+``asyncio`` tasks and ``run_in_threadpool``/``to_thread`` calls copy the
+context, and the collector itself is shared and lock-protected, so
+concurrent stages of one request all land in the same breakdown.
+
+Each stage is also a ``query.<name>`` span when tracing is enabled.
+Outside an active request, with tracing off, ``stage`` only costs a
+context-variable read.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Iterator
+
+from maris.observability.metrics import QUERY_DURATION_SECONDS, QUERY_STAGE_SECONDS
+from maris.observability.tracing import span
+
+# Canonical stage names, in pipeline order
+STAGES = ("classify", "cypher", "provenance", "inference", "llm", "validation", "confidence")
+
+_current: contextvars.ContextVar[StageTimings | None] = contextvars.ContextVar(
+    "maris_stage_timings", default=None,
+)
+
+
+class StageTimings:
+    """Accumulated wall-clock seconds per stage for one request."""
+
+    def __init__(self) -> None:
+        self._seconds: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        # A stage entered twice (e.g. validation retried) accumulates
+        with self._lock:
+            self._seconds[name] = self._seconds.get(name, 0.0) + seconds
+
+    def seconds(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._seconds)
+
+    def as_ms(self) -> dict[str, float]:
+        """Breakdown in milliseconds, canonical stages first."""
+        seconds = self.seconds()
+        order = {name: i for i, name in enumerate(STAGES)}
+        return {
+            name: round(seconds[name] * 1000, 2)
+            for name in sorted(seconds, key=lambda n: (order.get(n, len(order)), n))
+        }
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[StageTimings]:
+        """Make this collector the target of ``stage`` in the current context."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            try:
+                _current.reset(token)
+            except ValueError:
+                # Exited from another context (an async generator closed elsewhere)
+                pass
+
+    def publish(self, category: str, template: str, cache_status: str, total_seconds: float) -> None:
+        """Observe this request's stages and total in the process histograms."""
+        for name, seconds in self.seconds().items():
+            QUERY_STAGE_SECONDS.observe(seconds, stage=name, category=category, template=template)
+        QUERY_DURATION_SECONDS.observe(
+            total_seconds, category=category, template=template, cache_status=cache_status,
+        )
+
+
+def current_timings() -> StageTimings | None:
+    """The collector active in this context, if any."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as stage ``name`` of the active request.
+
+    The block also runs in a ``query.<name>`` trace span.
+    """
+    timings = _current.get()
+    with span(f"query.{name}"):
+        if timings is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings.record(name, time.perf_counter() - start)
@@ -0,0 +1,450 @@
+"""Structured span tracing with pluggable local exporters.
+
+Spans nest through a context variable, so a span opened in a route handler
+parents the executor, Neo4j and LLM spans opened below it, including work
+offloaded to ``asyncio`` tasks and threadpool workers (both copy the
+context). Each finished span is handed to every configured exporter:
+
+- ``JSONLSpanExporter``: one JSON object per span appended to a file
+- ``InMemorySpanExporter``: bounded ring buffer, grouped by trace on read
+- ``OTLPJSONSpanExporter``: OTLP/HTTP JSON ``ExportTraceServiceRequest``
+  payloads passed to a sink (a file by default), a dependency-free
+  stand-in for an OpenTelemetry collector
+
+Exporters come from ``MARIS_TRACING_EXPORTERS``. With none configured,
+``span`` returns a shared no-op span and costs one attribute check.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MAX_ATTRIBUTE_CHARS = 1000
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "maris_current_span", default=None,
+)
+
+
+def _clean(value: Any) -> Any:
+    """Coerce an attribute value to a JSON-friendly scalar or list of scalars."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    text = str(value)
+    return text if len(text) <= _MAX_ATTRIBUTE_CHARS else text[:_MAX_ATTRIBUTE_CHARS] + "..."
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+        "attributes", "events", "status", "status_message", "_start_perf", "_tracer",
+    )
+
+    def __init__(self, name: str, tracer: Tracer | None, parent: Span | None = None) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes: dict[str, Any] = {}
+        self.events: list[dict[str, Any]] = []
+        self.status = "ok"
+        self.status_message = ""
+        self._start_perf = time.perf_counter_ns()
+        self._tracer = tracer
+
+    @property
+    def recording(self) -> bool:
+        return self._tracer is not None
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self._tracer is not None:
+            self.attributes[key] = _clean(value)
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        if self._tracer is not None:
+            self.events.append({
+                "name": name,
+                "time_ns": time.time_ns(),
+                "attributes": {k: _clean(v) for k, v in attributes.items()},
+            })
+
+    def record_exception(self, exc: BaseException) -> None:
+        if self._tracer is not None:
+            self.status = "error"
+            self.status_message = f"{type(exc).__name__}: {exc}"[:_MAX_ATTRIBUTE_CHARS]
+            self.add_event("exception", type=type(exc).__name__, message=str(exc))
+
+    def end(self) -> None:
+        """Close the span and export it (idempotent)."""
+        if self._tracer is None or self.end_ns is not None:
+            return
+        # Wall-clock start plus a monotonic duration: immune to clock steps
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._start_perf)
+        self._tracer._export(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": dict(self.attributes),
+            "events": list(self.events),
+            "status": self.status,
+            "status_message": self.status_message,
+        }
+
+
+_NOOP_SPAN = Span("noop", None)
+
+
+# ---------------------------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------------------------
+
+class SpanExporter:
+    """Receives every finished span. Implementations must be thread-safe."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        """Flush buffered spans and release resources."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keep the most recent ``max_spans`` finished spans."""
+
+    def __init__(self, max_spans: int = 2048) -> None:
+        self._spans: collections.deque[Span] = collections.deque(maxlen=max(1, max_spans))
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self, name: str | None = None) -> list[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        return [s for s in spans if name is None or s.name == name]
+
+    def traces(self) -> dict[str, list[Span]]:
+        """Buffered spans grouped by trace, each in start order."""
+        grouped: dict[str, list[Span]] = {}
+        for span in self.spans():
+            grouped.setdefault(span.trace_id, []).append(span)
+        for spans in grouped.values():
+            spans.sort(key=lambda s: s.start_ns)
+        return grouped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class JSONLSpanExporter(SpanExporter):
+    """Append each finished span to ``path`` as one JSON line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}  # int64 is a string in OTLP/JSON
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, list):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": "" if value is None else str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def otlp_span(span: Span) -> dict[str, Any]:
+    """One span in the OTLP/JSON trace encoding."""
+    encoded: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "events": [
+            {
+                "timeUnixNano": str(event["time_ns"]),
+                "name": event["name"],
+                "attributes": _otlp_attributes(event["attributes"]),
+            }
+            for event in span.events
+        ],
+        # STATUS_CODE_OK = 1, STATUS_CODE_ERROR = 2
+        "status": {"code": 2, "message": span.status_message} if span.status == "error" else {"code": 1},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+
+class OTLPJSONSpanExporter(SpanExporter):
+    """Batch spans into OTLP/HTTP JSON ``ExportTraceServiceRequest`` payloads.
+
+    A batch is flushed when it reaches ``batch_size``, when a root span
+    ends (so each request's trace leaves together) and on shutdown. The
+    payload goes to ``sink``, which defaults to appending one JSON line per
+    payload to ``path``; pass a callable that POSTs to ``/v1/traces`` to
+    feed a real collector.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        sink: Callable[[dict[str, Any]], None] | None = None,
+        service_name: str = "maris-api",
+        batch_size: int = 256,
+    ) -> None:
+        if sink is None:
+            if path is None:
+                raise ValueError("OTLPJSONSpanExporter needs a path or a sink")
+            sink = _jsonl_sink(Path(path))
+        self._sink = sink
+        self.service_name = service_name
+        self.batch_size = max(1, batch_size)
+        self._batch: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._batch.append(span)
+            if len(self._batch) < self.batch_size and span.parent_id is not None:
+                return
+            batch, self._batch = self._batch, []
+        self._sink(self.payload(batch))
+
+    def payload(self, spans: Iterable[Span]) -> dict[str, Any]:
+        return {"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+            "scopeSpans": [{
+                "scope": {"name": "maris.observability"},
+                "spans": [otlp_span(span) for span in spans],
+            }],
+        }]}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            batch, self._batch = self._batch, []
+        if batch:
+            self._sink(self.payload(batch))
+
+
+def _jsonl_sink(path: Path) -> Callable[[dict[str, Any]], None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock = threading.Lock()
+
+    def _write(payload: dict[str, Any]) -> None:
+        line = json.dumps(payload)
+        with lock, path.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+    return _write
+
+
+# ---------------------------------------------------------------------------
+# Tracer
+# ---------------------------------------------------------------------------
+
+class Tracer:
+    """Creates spans and fans finished ones out to exporters."""
+
+    def __init__(self, exporters: Iterable[SpanExporter] = ()) -> None:
+        self.exporters = list(exporters)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def start_span(self, name: str, parent: Span | None = None, **attributes: Any) -> Span:
+        """Start a span without activating it; the caller must ``end()`` it."""
+        if not self.exporters:
+            return _NOOP_SPAN
+        if parent is None:
+            parent = _current_span.get()
+        span = Span(name, self, parent if parent is not None and parent.recording else None)
+        span.set_attributes(attributes)
+        return span
+
+    def _export(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                logger.warning("Span exporter %s failed", type(exporter).__name__, exc_info=True)
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.shutdown()
+            except Exception:
+                logger.warning("Span exporter %s failed to shut down", type(exporter).__name__, exc_info=True)
+
+
+_tracer: Tracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def _exporters_from_config() -> list[SpanExporter]:
+    from maris.config import get_config
+
+    cfg = get_config()
+    exporters: list[SpanExporter] = []
+    for name in (n.strip().lower() for n in cfg.tracing_exporters.split(",")):
+        if not name:
+            continue
+        if name == "memory":
+            exporters.append(InMemorySpanExporter(cfg.tracing_memory_spans))
+        elif name == "jsonl":
+            exporters.append(JSONLSpanExporter(cfg.tracing_jsonl_path))
+        elif name == "otlp":
+            exporters.append(OTLPJSONSpanExporter(cfg.tracing_otlp_path, service_name=cfg.tracing_service_name))
+        else:
+            logger.warning("Unknown tracing exporter %r ignored", name)
+    return exporters
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer, configured from settings on first use."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer(_exporters_from_config())
+    return _tracer
+
+
+def configure_tracing(exporters: Iterable[SpanExporter] | None = None) -> Tracer:
+    """Replace the process tracer; ``None`` re-reads the settings.
+
+    Exporters of the previous tracer are shut down.
+    """
+    global _tracer
+    with _tracer_lock:
+        previous = _tracer
+        _tracer = Tracer(_exporters_from_config() if exporters is None else exporters)
+    if previous is not None:
+        previous.shutdown()
+    return _tracer
+
+
+def current_span() -> Span:
+    """The active span, or a no-op span when none is recording."""
+    return _current_span.get() or _NOOP_SPAN
+
+
+@contextlib.contextmanager
+def use_span(span: Span) -> Iterator[Span]:
+    """Make ``span`` the parent of spans opened in the block (does not end it)."""
+    if not span.recording:
+        yield span
+        return
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # Exited from another context (a generator closed elsewhere)
+            pass
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Open a child of the active span for the enclosed block."""
+    tracer = _tracer if _tracer is not None else get_tracer()
+    if not tracer.exporters:
+        yield _NOOP_SPAN
+        return
+    current = tracer.start_span(name, **attributes)
+    try:
+        with use_span(current):
+            yield current
+    except GeneratorExit:
+        raise
+    except BaseException as exc:
+        current.record_exception(exc)
+        raise
+    finally:
+        current.end()
+
+
+def traced(name: str | None = None, **attributes: Any) -> Callable[[F], F]:
+    """Decorator running each call of a sync or async function in a span."""
+    def decorator(fn: F) -> F:
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name, **attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name, **attributes):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
@@ -0,0 +1,101 @@
+"""Shared graph reads for batched queries.
+
+Report jobs submit many near-duplicate questions at once ("What is Cabo
+Pulmo worth?", "Cabo Pulmo total ESV", ...). After classification most of
+them resolve to the same template and parameters, so ``SharedGraphReads``
+wraps a ``QueryExecutor`` and runs each distinct template execution and
+provenance lookup once per batch. Concurrent callers with the same key
+await one in-flight task and each receive their own copy of the result.
+The numeric evidence index used to check claims against a graph read is
+likewise built once and shared by every answer generated from it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+from typing import Any, Awaitable, Callable
+
+from maris.query.scheduler import run_stage
+from maris.query.validators import NumericEvidenceIndex
+
+
+def read_key(kind: str, category: str, params: dict, *extra: Any) -> str:
+    """Stable key for one graph read (parameter order-insensitive)."""
+    return json.dumps([kind, category, params, *extra], sort_keys=True, default=str)
+
+
+class SharedGraphReads:
+    """Executor proxy that deduplicates graph reads across a batch."""
+
+    def __init__(self, executor: Any):
+        self._executor = executor
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._evidence_indexes: dict[str, NumericEvidenceIndex] = {}
+        self.graph_reads = 0
+        self.provenance_reads = 0
+
+    async def _shared(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+        # Shield so one caller's stage deadline cannot cancel the shared read
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    @staticmethod
+    def _graph_key(category: str, parameters: dict, question: str | None, site_name: str | None) -> str:
+        # Open-domain retrieval ranks against the question text itself
+        scope = question if category == "open_domain" else None
+        return read_key("graph", category, parameters, site_name, scope)
+
+    async def execute_with_strategy_async(
+        self,
+        category: str,
+        parameters: dict,
+        *,
+        question: str | None = None,
+        site_name: str | None = None,
+    ) -> dict:
+        key = self._graph_key(category, parameters, question, site_name)
+
+        async def _read() -> dict:
+            self.graph_reads += 1
+            return await run_stage(
+                self._executor, "execute_with_strategy", category, parameters,
+                question=question, site_name=site_name,
+            )
+
+        return await self._shared(key, _read)
+
+    def evidence_index(
+        self,
+        category: str,
+        parameters: dict,
+        *,
+        question: str | None = None,
+        site_name: str | None = None,
+    ) -> NumericEvidenceIndex | None:
+        """Numeric evidence index of a completed graph read, built on first use.
+
+        Returns None when the read has not completed successfully.
+        """
+        key = self._graph_key(category, parameters, question, site_name)
+        index = self._evidence_indexes.get(key)
+        if index is None:
+            task = self._tasks.get(key)
+            if task is None or not task.done() or task.cancelled() or task.exception() is not None:
+                return None
+            index = self._evidence_indexes[key] = NumericEvidenceIndex.from_context(task.result())
+        return index
+
+    async def get_provenance_edges_async(self, category: str, params: dict) -> list[dict]:
+        key = read_key("provenance", category, params)
+
+        async def _read() -> list[dict]:
+            self.provenance_reads += 1
+            return await run_stage(self._executor, "get_provenance_edges", category, params)
+
+        return await self._shared(key, _read)
@@ -6,13 +6,14 @@ ambiguous queries. Includes Unicode normalization, acronym support, fuzzy
 site matching, multi-site detection, and negation handling.
 """
 
-import difflib
+import asyncio
 import logging
 import re
 import unicodedata
 
-from maris.llm.adapter import LLMAdapter
+from maris.llm.adapter import AsyncLLMAdapter, LLMAdapter
 from maris.llm.prompts import QUERY_CLASSIFICATION_PROMPT
+from maris.query.site_index import SiteIndex
 
 logger = logging.getLogger(__name__)
 
@@ -103,48 +104,45 @@ _SITE_PATTERNS: list[tuple[str, str]] = [
 # Canonical names list for fuzzy matching fallback
 _CANONICAL_SITES = [s[1] for s in _SITE_PATTERNS]
 
-# Dynamic site patterns loaded from the site registry (populated at runtime)
-_DYNAMIC_SITE_PATTERNS: list[tuple[str, str]] = []
+# Static sites are matched exactly by the regexes above (acronyms included);
+# their index is consulted only for the fuzzy fallback.
+_STATIC_SITE_INDEX = SiteIndex()
+_STATIC_SITE_INDEX.add_many(_CANONICAL_SITES)
+
+# Dynamic sites loaded from the site registry (populated at runtime). The
+# index serves both exact alias detection and fuzzy fallback, so lookups do
+# not scale with the number of registered sites.
+_DYNAMIC_SITE_INDEX = SiteIndex()
 
 
 def register_dynamic_sites(site_names: list[str]) -> int:
     """Register additional site names for query classification.
 
-    Called by the site registry when new sites are added. Each name gets
-    a word-boundary regex pattern generated automatically.
+    Called by the site registry when new sites are added. Each name is
+    detectable by its full name, a short form from the first two words,
+    and a first-word alias (for prompts like "Sundarbans" or "Cispata").
+
+    The dynamic set is replaced by ``site_names``, but the index is updated
+    incrementally: only names that were added or dropped are touched.
 
-    Returns the number of patterns registered.
+    Returns the number of dynamic sites registered.
     """
-    global _DYNAMIC_SITE_PATTERNS  # noqa: PLW0603
-    _DYNAMIC_SITE_PATTERNS = []
-    seen_patterns: set[str] = set()
-    for name in site_names:
-        # Build a regex from the canonical name (case-insensitive word match)
-        escaped = re.escape(name)
-        # Also create a short form from the first two words
-        parts = name.split()
-        patterns = [rf"\b{escaped}\b"]
-        if len(parts) >= 2:
-            short = re.escape(" ".join(parts[:2]))
-            patterns.append(rf"\b{short}\b")
-        # Add first-word alias for common prompts like "Sundarbans" or "Cispata"
-        if parts and len(parts[0]) >= 4:
-            first = re.escape(parts[0])
-            patterns.append(rf"\b{first}\b")
-        combined = "|".join(patterns)
-        pattern = f"(?:{combined})"
-        if pattern not in seen_patterns:
-            _DYNAMIC_SITE_PATTERNS.append((pattern, name))
-            seen_patterns.add(pattern)
-    return len(_DYNAMIC_SITE_PATTERNS)
+    wanted = [name for name in dict.fromkeys(site_names) if name and name.strip()]
+    wanted_set = set(wanted)
+    for name in _DYNAMIC_SITE_INDEX.names():
+        if name not in wanted_set:
+            _DYNAMIC_SITE_INDEX.remove(name)
+    added = _DYNAMIC_SITE_INDEX.add_many(wanted)
+    if added:
+        logger.debug("Indexed %d new dynamic sites (%d total)", added, len(_DYNAMIC_SITE_INDEX))
+    return len(_DYNAMIC_SITE_INDEX)
 
 
 def get_all_canonical_sites() -> list[str]:
     """Return all canonical site names (static + dynamic)."""
     names = list(_CANONICAL_SITES)
-    for _, canonical in _DYNAMIC_SITE_PATTERNS:
-        if canonical not in names:
-            names.append(canonical)
+    static = set(names)
+    names.extend(name for name in _DYNAMIC_SITE_INDEX.names() if name not in static)
     return names
 
 
@@ -163,8 +161,9 @@ class QueryClassifier:
     detection, and negation handling.
     """
 
-    def __init__(self, llm: LLMAdapter | None = None):
+    def __init__(self, llm: LLMAdapter | None = None, async_llm: AsyncLLMAdapter | None = None):
         self._llm = llm
+        self._async_llm = async_llm
 
     def classify(self, question: str) -> dict:
         """Classify a question and extract metadata.
@@ -172,6 +171,30 @@ class QueryClassifier:
         Returns dict with keys: category, site (or sites), metrics, confidence,
         and optionally caveats.
         """
+        result, pending = self._classify_by_rules(question)
+        if result is not None:
+            return result
+        question, site, metrics, caveats = pending
+        return self._finish_llm_result(self._classify_with_llm(question, site, metrics), caveats)
+
+    async def classify_async(self, question: str) -> dict:
+        """Async ``classify``: only the LLM fallback is awaited."""
+        result, pending = self._classify_by_rules(question)
+        if result is not None:
+            return result
+        question, site, metrics, caveats = pending
+        if self._async_llm is not None:
+            llm_result = await self._classify_with_llm_async(question, site, metrics)
+        else:
+            llm_result = await asyncio.to_thread(self._classify_with_llm, question, site, metrics)
+        return self._finish_llm_result(llm_result, caveats)
+
+    def _classify_by_rules(self, question: str) -> tuple[dict | None, tuple]:
+        """Run keyword classification.
+
+        Returns ``(result, ())`` when decided without the LLM, otherwise
+        ``(None, (question, site, metrics, caveats))`` for the LLM fallback.
+        """
         if not question or not question.strip():
             return {
                 "category": "site_valuation",
@@ -179,7 +202,7 @@ class QueryClassifier:
                 "metrics": [],
                 "confidence": 0.0,
                 "caveats": ["Empty question provided"],
-            }
+            }, ()
 
         caveats: list[str] = []
 
@@ -210,7 +233,7 @@ class QueryClassifier:
                 "metrics": metrics,
                 "confidence": 0.85,
                 "caveats": caveats or [],
-            }
+            }, ()
 
         site = sites[0] if sites else None
 
@@ -313,22 +336,11 @@ class QueryClassifier:
                 "metrics": metrics,
                 "confidence": confidence,
                 "caveats": caveats or [],
-            }
+            }, ()
 
         # LLM fallback for ambiguous queries
-        if self._llm:
-            result = self._classify_with_llm(question, site, metrics)
-            if caveats:
-                result["caveats"] = result.get("caveats", []) + caveats
-            # Route to open_domain when LLM succeeded but with low confidence.
-            # LLM failure fallback is marked with _llm_failed=True and keeps
-            # its default category.
-            if (
-                not result.pop("_llm_failed", False)
-                and result.get("confidence", 0) < 0.25
-            ):
-                result["category"] = "open_domain"
-            return result
+        if self._llm or self._async_llm:
+            return None, (question, site, metrics, caveats)
 
         # No keyword match and no LLM -> open_domain
         return {
@@ -337,7 +349,21 @@ class QueryClassifier:
             "metrics": metrics,
             "confidence": 0.2,
             "caveats": caveats or [],
-        }
+        }, ()
+
+    @staticmethod
+    def _finish_llm_result(result: dict, caveats: list[str]) -> dict:
+        if caveats:
+            result["caveats"] = result.get("caveats", []) + caveats
+        # Route to open_domain when LLM succeeded but with low confidence.
+        # LLM failure fallback is marked with _llm_failed=True and keeps
+        # its default category.
+        if (
+            not result.pop("_llm_failed", False)
+            and result.get("confidence", 0) < 0.25
+        ):
+            result["category"] = "open_domain"
+        return result
 
     def _extract_metrics(self, text: str) -> list[str]:
         return [
@@ -353,9 +379,9 @@ class QueryClassifier:
                 if canonical not in found:
                     found.append(canonical)
 
-        # Check dynamic patterns from site registry
-        for pat, canonical in _DYNAMIC_SITE_PATTERNS:
-            if canonical not in found and re.search(pat, text, re.IGNORECASE):
+        # Check dynamic sites from the site registry
+        for canonical in _DYNAMIC_SITE_INDEX.find_mentions(text):
+            if canonical not in found:
                 found.append(canonical)
 
         if not found:
@@ -373,8 +399,12 @@ class QueryClassifier:
         return sites[0] if sites else None
 
     def _fuzzy_site_match(self, text: str, cutoff: float = 0.6) -> str | None:
-        """Try fuzzy matching against canonical site names (static + dynamic)."""
-        all_sites = get_all_canonical_sites()
+        """Try fuzzy matching against canonical site names (static + dynamic).
+
+        Candidate phrases are tried longest-first; the first phrase with a
+        match above ``cutoff`` wins. Each phrase is scored only against the
+        small candidate set retrieved from the trigram indexes.
+        """
         # Build candidate words from the text (2-5 word windows)
         words = text.split()
         candidates: list[str] = []
@@ -383,19 +413,16 @@ class QueryClassifier:
                 candidates.append(" ".join(words[i:i + window]))
         candidates.extend(words)
 
-        # Try each candidate against canonical names
-        lower_sites = [name.lower() for name in all_sites]
         for candidate in candidates:
-            matches = difflib.get_close_matches(
-                candidate,
-                lower_sites,
-                n=1,
-                cutoff=cutoff,
-            )
+            matches = [
+                m for m in (
+                    _STATIC_SITE_INDEX.fuzzy_match(candidate, cutoff=cutoff),
+                    _DYNAMIC_SITE_INDEX.fuzzy_match(candidate, cutoff=cutoff),
+                )
+                if m is not None
+            ]
             if matches:
-                # Map back to properly cased canonical name
-                idx = lower_sites.index(matches[0])
-                return all_sites[idx]
+                return max(matches, key=lambda m: m[1])[0]
 
         return None
 
@@ -407,20 +434,41 @@ class QueryClassifier:
             result = self._llm.complete_json(
                 [{"role": "user", "content": prompt}]
             )
-            return {
-                "category": result.get("category", "site_valuation"),
-                "site": result.get("site") or site,
-                "metrics": result.get("metrics", metrics),
-                "confidence": result.get("confidence", 0.5),
-                "caveats": [],
-            }
+            return self._llm_classification(result, site, metrics)
         except Exception:
             logger.exception("LLM classification failed, using default")
-            return {
-                "category": "site_valuation",
-                "site": site,
-                "metrics": metrics,
-                "confidence": 0.3,
-                "caveats": [],
-                "_llm_failed": True,
-            }
+            return self._llm_failure(site, metrics)
+
+    async def _classify_with_llm_async(
+        self, question: str, site: str | None, metrics: list[str]
+    ) -> dict:
+        prompt = QUERY_CLASSIFICATION_PROMPT.format(question=question)
+        try:
+            result = await self._async_llm.complete_json(
+                [{"role": "user", "content": prompt}]
+            )
+            return self._llm_classification(result, site, metrics)
+        except Exception:
+            logger.exception("LLM classification failed, using default")
+            return self._llm_failure(site, metrics)
+
+    @staticmethod
+    def _llm_classification(result: dict, site: str | None, metrics: list[str]) -> dict:
+        return {
+            "category": result.get("category", "site_valuation"),
+            "site": result.get("site") or site,
+            "metrics": result.get("metrics", metrics),
+            "confidence": result.get("confidence", 0.5),
+            "caveats": [],
+        }
+
+    @staticmethod
+    def _llm_failure(site: str | None, metrics: list[str]) -> dict:
+        return {
+            "category": "site_valuation",
+            "site": site,
+            "metrics": metrics,
+            "confidence": 0.3,
+            "caveats": [],
+            "_llm_failed": True,
+        }
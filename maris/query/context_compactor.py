@@ -0,0 +1,242 @@
+"""Token-budgeted serialization of graph context for synthesis prompts.
+
+Template results are highly redundant once serialized: every row of a
+comparison repeats the same supporting documents, ``OPTIONAL MATCH``
+misses leave maps full of nulls, and pretty-printing roughly doubles the
+character count. ``compact_graph_context`` rewrites the context before it
+is inlined into the prompt:
+
+1. null/empty fields and exact duplicate list items are dropped;
+2. the document fields of every citation-like record (anything carrying a
+   ``doi``) are hoisted into a single top-level ``evidence`` list, ranked
+   by relevance; the record stays in its row as a DOI reference together
+   with its own fields (``axiom_id``, ``axiom_name``, ...), so an axiom
+   keeps its link to every document it cites even when documents are
+   shared between axioms;
+3. the result is serialized with compact separators;
+4. if it still exceeds the token budget, long strings are shortened, then
+   the lowest-ranked evidence is dropped, then trailing rows.
+
+Only the prompt text is affected; validation still runs against the raw
+graph context. Token counts use a local estimate (no tokenizer dependency).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Execution bookkeeping that carries no information for answer synthesis
+_BOOKKEEPING_KEYS = frozenset({"has_more", "record_count", "strategy", "retrieval_modes"})
+
+# Fields describing the document itself; everything else on a DOI-bearing
+# record (axiom ids, coefficients, findings) belongs to the citing row
+_DOCUMENT_FIELDS = frozenset({"doi", "title", "year", "tier", "source_tier", "citation", "authors", "journal"})
+
+_TIER_WEIGHT = {"T1": 3.0, "T2": 2.0, "T3": 1.0, "T4": 0.5}
+_MIN_EVIDENCE = 3
+_MIN_ROWS = 1
+_FIELD_CHAR_LIMITS = (400, 160)
+
+_TOKEN_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_WORD_RE = re.compile(r"[a-z]{4,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count of ``text``.
+
+    Letter runs cost one token per four characters, digit runs one per
+    three, and every other non-space character one token each.
+    """
+    total = 0
+    for match in _TOKEN_RE.finditer(text):
+        piece = match.group(0)
+        if piece[0].isalpha():
+            total += -(-len(piece) // 4)
+        elif piece[0].isdigit():
+            total += -(-len(piece) // 3)
+        else:
+            total += 1
+    return total
+
+
+def serialize_compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+@dataclass
+class CompactContext:
+    """Serialized prompt context plus what compaction had to give up."""
+
+    text: str
+    tokens: int
+    evidence_kept: int = 0
+    evidence_dropped: int = 0
+    rows_dropped: int = 0
+    over_budget: bool = False
+
+
+def _prune(value: Any) -> Any:
+    """Drop null/empty values and exact duplicate list items, recursively."""
+    if isinstance(value, dict):
+        pruned = {k: _prune(v) for k, v in value.items()}
+        return {k: v for k, v in pruned.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        seen: set[str] = set()
+        items = []
+        for item in value:
+            item = _prune(item)
+            if item in (None, "", [], {}):
+                continue
+            key = serialize_compact(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            items.append(item)
+        return items
+    return value
+
+
+def _doi_key(item: Any) -> str | None:
+    if isinstance(item, dict) and isinstance(item.get("doi"), str) and item["doi"].strip():
+        return item["doi"].strip().lower()
+    return None
+
+
+def _hoist_evidence(value: Any, sources: dict[str, dict], citations: dict[str, int]) -> Any:
+    """Move document fields of DOI-bearing records into ``sources``.
+
+    The record is left in place as a reference: the bare DOI when it
+    carried only document fields, otherwise its remaining fields plus
+    ``doi``.
+    """
+    if isinstance(value, dict):
+        return {k: _hoist_evidence(v, sources, citations) for k, v in value.items()}
+    if isinstance(value, list):
+        out = []
+        for item in value:
+            key = _doi_key(item)
+            if key is None:
+                out.append(_hoist_evidence(item, sources, citations))
+                continue
+            merged = sources.setdefault(key, {})
+            for field_name, field_value in item.items():
+                if field_name in _DOCUMENT_FIELDS:
+                    merged.setdefault(field_name, field_value)
+            citations[key] = citations.get(key, 0) + 1
+            ref = {k: v for k, v in item.items() if k not in _DOCUMENT_FIELDS}
+            ref = {**ref, "doi": item["doi"]} if ref else item["doi"]
+            if ref not in out:
+                out.append(ref)
+        return out
+    return value
+
+
+def _relevance(source: dict, citations: int, question_terms: set[str]) -> float:
+    tier = str(source.get("tier") or source.get("source_tier") or "").upper()
+    score = _TIER_WEIGHT.get(tier, 0.0) + 0.5 * citations
+    score += len(question_terms & set(_WORD_RE.findall(str(source.get("title") or "").lower())))
+    year = source.get("year")
+    if isinstance(year, int):
+        score += max(0, year - 1990) / 100.0
+    return score
+
+
+def _strip_refs(value: Any, dropped: set[str]) -> Any:
+    """Remove references to ``dropped`` DOIs, keeping the citing records."""
+    if isinstance(value, dict):
+        stripped = {k: _strip_refs(v, dropped) for k, v in value.items()}
+        if _doi_key(stripped) in dropped:
+            del stripped["doi"]
+        return stripped
+    if isinstance(value, list):
+        return [
+            _strip_refs(item, dropped)
+            for item in value
+            if not (isinstance(item, str) and item.strip().lower() in dropped)
+        ]
+    return value
+
+
+def _shorten(value: Any, limit: int) -> Any:
+    if isinstance(value, dict):
+        return {k: _shorten(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_shorten(item, limit) for item in value]
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit].rstrip() + "..."
+    return value
+
+
+def compact_graph_context(
+    graph_context: dict,
+    question: str = "",
+    token_budget: int = 0,
+) -> CompactContext:
+    """Serialize ``graph_context`` compactly, within ``token_budget`` if > 0."""
+    body = {k: v for k, v in graph_context.items() if k not in _BOOKKEEPING_KEYS}
+    sources: dict[str, dict] = {}
+    citations: dict[str, int] = {}
+    body = _hoist_evidence(_prune(body), sources, citations)
+
+    question_terms = set(_WORD_RE.findall(question.lower()))
+    ranked = sorted(
+        sources,
+        key=lambda key: _relevance(sources[key], citations[key], question_terms),
+        reverse=True,
+    )
+    evidence = [_prune(sources[key]) for key in ranked]
+
+    def _render() -> tuple[str, int]:
+        payload = dict(body)
+        if evidence:
+            payload["evidence"] = evidence
+        text = serialize_compact(payload)
+        return text, estimate_tokens(text)
+
+    text, tokens = _render()
+    total_evidence = len(evidence)
+    rows_dropped = 0
+    if token_budget > 0 and tokens > token_budget:
+        for limit in _FIELD_CHAR_LIMITS:
+            body = _shorten(body, limit)
+            evidence = _shorten(evidence, limit)
+            text, tokens = _render()
+            if tokens <= token_budget:
+                break
+
+        dropped: set[str] = set()
+        while tokens > token_budget and len(evidence) > _MIN_EVIDENCE:
+            removed = evidence.pop()
+            key = _doi_key(removed)
+            if key:
+                dropped.add(key)
+            text, tokens = _render()
+        if dropped:
+            body = _strip_refs(body, dropped)
+            text, tokens = _render()
+
+        rows = body.get("results")
+        while tokens > token_budget and isinstance(rows, list) and len(rows) > _MIN_ROWS:
+            rows.pop()
+            rows_dropped += 1
+            text, tokens = _render()
+
+    over_budget = token_budget > 0 and tokens > token_budget
+    if over_budget:
+        logger.warning(
+            "Graph context still %d tokens after compaction (budget %d)", tokens, token_budget,
+        )
+    return CompactContext(
+        text=text,
+        tokens=tokens,
+        evidence_kept=len(evidence),
+        evidence_dropped=total_evidence - len(evidence),
+        rows_dropped=rows_dropped,
+        over_budget=over_budget,
+    )
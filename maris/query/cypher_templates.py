@@ -3,6 +3,13 @@
 All templates include a LIMIT clause to prevent unbounded result sets.
 Detail queries default to 100 rows; traversal queries default to 1000.
 The limit is configurable via the ``result_limit`` parameter (max 1000).
+
+Templates that gather several independent collections around one anchor
+node aggregate each collection in its own ``CALL {}`` subquery. Chained
+OPTIONAL MATCHes would instead expand the cross product of every branch
+(services x axioms x documents x risks ...) before ``collect(DISTINCT)``
+folds it back; per-branch subqueries return the same lists with row
+counts that grow with the sum of the branches, not their product.
 """
 
 # Default limits
@@ -10,6 +17,14 @@ _DETAIL_LIMIT = 100
 _TRAVERSAL_LIMIT = 1000
 _MAX_LIMIT = 1000
 
+# Variable-length traversal depth. Neo4j does not accept parameters in
+# path bounds, so templates containing HOP_PLACEHOLDER are pre-rendered
+# once per depth by ``maris.query.template_registry``.
+HOP_PLACEHOLDER = "MAX_HOPS_PLACEHOLDER"
+MIN_HOPS = 1
+MAX_HOPS = 6
+DEFAULT_HOPS = 3
+
 TEMPLATES: dict[str, dict] = {
     # ------------------------------------------------------------------
     # Core query templates (mapped to classifier categories)
@@ -20,49 +35,66 @@ TEMPLATES: dict[str, dict] = {
         "default_limit": _DETAIL_LIMIT,
         "cypher": """
             MATCH (m:MPA {name: $site_name})
-            OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
-            OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
-            OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
-            OPTIONAL MATCH (m)-[:HAS_ECOLOGICAL_PROCESS]->(p:EcologicalProcess)
-            OPTIONAL MATCH (m)-[:USING_MECHANISM]->(fm:FinancialMechanism)
-            OPTIONAL MATCH (m)-[rel:FACES_RISK]->(r:Risk)
+            CALL {
+                WITH m
+                OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
+                RETURN collect(DISTINCT {
+                    service: es.service_name,
+                    value_usd: es.annual_value_usd,
+                    method: es.valuation_method,
+                    ci_low: properties(es)['ci_low'],
+                    ci_high: properties(es)['ci_high']
+                }) AS services
+            }
+            CALL {
+                WITH m
+                OPTIONAL MATCH (m)-[:USING_MECHANISM]->(fm:FinancialMechanism)
+                RETURN collect(DISTINCT {
+                    name: fm.name,
+                    type: fm.type,
+                    amount_usd: fm.amount_usd,
+                    description: fm.description
+                }) AS financial_mechanisms
+            }
+            CALL {
+                WITH m
+                OPTIONAL MATCH (m)-[:HAS_ECOLOGICAL_PROCESS]->(p:EcologicalProcess)
+                RETURN collect(DISTINCT {
+                    process: p.name,
+                    description: p.description,
+                    effect: p.effect,
+                    chain: p.chain
+                }) AS ecological_processes
+            }
+            CALL {
+                WITH m
+                OPTIONAL MATCH (m)-[rel:FACES_RISK]->(r:Risk)
+                RETURN collect(DISTINCT {
+                    risk: r.name,
+                    severity: rel.severity,
+                    likelihood: rel.likelihood,
+                    evidence: rel.evidence
+                }) AS risks
+            }
+            CALL {
+                WITH m
+                OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
+                OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+                RETURN collect(DISTINCT {
+                    axiom_id: ba.axiom_id,
+                    axiom_name: ba.name,
+                    doi: d.doi,
+                    title: d.title,
+                    year: d.year,
+                    tier: d.source_tier
+                }) AS evidence
+            }
             RETURN m.name AS site, m.total_esv_usd AS total_esv,
                    m.biomass_ratio AS biomass_ratio, m.neoli_score AS neoli_score,
                    m.asset_rating AS asset_rating,
-                   collect(DISTINCT {
-                       service: es.service_name,
-                       value_usd: es.annual_value_usd,
-                       method: es.valuation_method,
-                       ci_low: properties(es)['ci_low'],
-                       ci_high: properties(es)['ci_high']
-                   }) AS services,
-                   collect(DISTINCT {
-                       name: fm.name,
-                       type: fm.type,
-                       amount_usd: fm.amount_usd,
-                       description: fm.description
-                   }) AS financial_mechanisms,
-                   collect(DISTINCT {
-                       process: p.name,
-                       description: p.description,
-                       effect: p.effect,
-                       chain: p.chain
-                   }) AS ecological_processes,
-                   collect(DISTINCT {
-                       risk: r.name,
-                       severity: rel.severity,
-                       likelihood: rel.likelihood,
-                       evidence: rel.evidence
-                   }) AS risks,
-                   collect(DISTINCT {
-                       axiom_id: ba.axiom_id,
-                       axiom_name: ba.name,
-                       doi: d.doi,
-                       title: d.title,
-                       year: d.year,
-                       tier: d.source_tier
-                   }) AS evidence
-            LIMIT $result_limit        """,
+                   services, financial_mechanisms, ecological_processes, risks, evidence
+            LIMIT $result_limit
+        """,
         "parameters": ["site_name"],
     },
     "provenance_drilldown": {
@@ -88,15 +120,25 @@ TEMPLATES: dict[str, dict] = {
         "default_limit": _DETAIL_LIMIT,
         "cypher": """
             MATCH (ba:BridgeAxiom {axiom_id: $axiom_id})
-            OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
-            OPTIONAL MATCH (ba)-[:APPLIES_TO]->(m:MPA)
-            OPTIONAL MATCH (ba)-[:TRANSLATES]->(es:EcosystemService)
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+                RETURN collect(DISTINCT {doi: d.doi, title: d.title, year: d.year, tier: d.source_tier}) AS evidence
+            }
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:APPLIES_TO]->(m:MPA)
+                RETURN collect(DISTINCT m.name) AS applicable_sites
+            }
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:TRANSLATES]->(es:EcosystemService)
+                RETURN collect(DISTINCT es.service_name) AS translated_services
+            }
             RETURN ba.axiom_id AS axiom_id, ba.name AS axiom_name,
                    ba.category AS category, ba.description AS description,
                    ba.coefficients_json AS coefficients,
-                   collect(DISTINCT {doi: d.doi, title: d.title, year: d.year, tier: d.source_tier}) AS evidence,
-                   collect(DISTINCT m.name) AS applicable_sites,
-                   collect(DISTINCT es.service_name) AS translated_services
+                   evidence, applicable_sites, translated_services
             LIMIT $result_limit
         """,
         "parameters": ["axiom_id"],
@@ -110,17 +152,30 @@ TEMPLATES: dict[str, dict] = {
             WHERE ba.name CONTAINS $concept_term
                OR ba.description CONTAINS $concept_term
                OR ba.axiom_id IN $axiom_ids
-            OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
-            OPTIONAL MATCH (ba)-[:APPLIES_TO]->(m:MPA)
-            OPTIONAL MATCH (ba)-[:TRANSLATES]->(es:EcosystemService)
-            OPTIONAL MATCH (ba)-[:APPLIES_TO_HABITAT]->(h:Habitat)
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+                RETURN collect(DISTINCT {doi: d.doi, title: d.title, year: d.year, tier: d.source_tier}) AS evidence
+            }
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:APPLIES_TO]->(m:MPA)
+                RETURN collect(DISTINCT m.name) AS applicable_sites
+            }
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:TRANSLATES]->(es:EcosystemService)
+                RETURN collect(DISTINCT es.service_name) AS services
+            }
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:APPLIES_TO_HABITAT]->(h:Habitat)
+                RETURN collect(DISTINCT h.habitat_id) AS habitats
+            }
             RETURN ba.axiom_id AS axiom_id, ba.name AS axiom_name,
                    ba.description AS description, ba.coefficient AS coefficient,
                    ba.category AS category,
-                   collect(DISTINCT {doi: d.doi, title: d.title, year: d.year, tier: d.source_tier}) AS evidence,
-                   collect(DISTINCT m.name) AS applicable_sites,
-                   collect(DISTINCT es.service_name) AS services,
-                   collect(DISTINCT h.habitat_id) AS habitats
+                   evidence, applicable_sites, services, habitats
             LIMIT $result_limit
         """,
         "parameters": ["concept_term", "axiom_ids"],
@@ -132,14 +187,21 @@ TEMPLATES: dict[str, dict] = {
         "cypher": """
             MATCH (m:MPA)
             WHERE m.name IN $site_names
-            OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
-            OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
-            OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+            CALL {
+                WITH m
+                OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
+                RETURN collect(DISTINCT {service: es.service_name, value_usd: es.annual_value_usd}) AS services
+            }
+            CALL {
+                WITH m
+                OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
+                OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+                RETURN collect(DISTINCT {doi: d.doi, title: d.title, year: d.year, tier: d.source_tier}) AS evidence
+            }
             RETURN m.name AS site, m.total_esv_usd AS total_esv,
                    m.biomass_ratio AS biomass_ratio, m.neoli_score AS neoli_score,
                    m.asset_rating AS asset_rating,
-                   collect(DISTINCT {service: es.service_name, value_usd: es.annual_value_usd}) AS services,
-                   collect(DISTINCT {doi: d.doi, title: d.title, year: d.year, tier: d.source_tier}) AS evidence
+                   services, evidence
             ORDER BY m.total_esv_usd DESC
             LIMIT $result_limit
         """,
@@ -151,34 +213,44 @@ TEMPLATES: dict[str, dict] = {
         "default_limit": _DETAIL_LIMIT,
         "cypher": """
             MATCH (m:MPA {name: $site_name})
-            OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
-            OPTIONAL MATCH (m)-[:FACES_RISK]->(r:Risk)
-            OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
-            WHERE ba.category IN ['ecological_to_service', 'ecological_to_ecological']
-            OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+            CALL {
+                WITH m
+                OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
+                RETURN collect(DISTINCT {
+                    service: es.service_name,
+                    value_usd: es.annual_value_usd,
+                    ci_low: properties(es)['ci_low'],
+                    ci_high: properties(es)['ci_high']
+                }) AS services
+            }
+            CALL {
+                WITH m
+                OPTIONAL MATCH (m)-[:FACES_RISK]->(r:Risk)
+                RETURN collect(DISTINCT {
+                    risk: r.name,
+                    severity: r.severity,
+                    likelihood: r.likelihood,
+                    evidence: r.evidence
+                }) AS risks
+            }
+            CALL {
+                WITH m
+                OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
+                WHERE ba.category IN ['ecological_to_service', 'ecological_to_ecological']
+                OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+                RETURN collect(DISTINCT {
+                    axiom_id: ba.axiom_id,
+                    axiom_name: ba.name,
+                    coefficients: ba.coefficients_json,
+                    doi: d.doi,
+                    title: d.title,
+                    year: d.year,
+                    tier: d.source_tier
+                }) AS risk_axioms
+            }
             RETURN m.name AS site, m.total_esv_usd AS total_esv,
                    m.biomass_ratio AS biomass_ratio,
-                   collect(DISTINCT {
-                       service: es.service_name,
-                       value_usd: es.annual_value_usd,
-                       ci_low: properties(es)['ci_low'],
-                       ci_high: properties(es)['ci_high']
-                   }) AS services,
-                   collect(DISTINCT {
-                       risk: r.name,
-                       severity: r.severity,
-                       likelihood: r.likelihood,
-                       evidence: r.evidence
-                   }) AS risks,
-                   collect(DISTINCT {
-                       axiom_id: ba.axiom_id,
-                       axiom_name: ba.name,
-                       coefficients: ba.coefficients_json,
-                       doi: d.doi,
-                       title: d.title,
-                       year: d.year,
-                       tier: d.source_tier
-                   }) AS risk_axioms
+                   services, risks, risk_axioms
             LIMIT $result_limit
         """,
         "parameters": ["site_name"],
@@ -194,11 +266,23 @@ TEMPLATES: dict[str, dict] = {
         "cypher": """
             MATCH (c:Concept {concept_id: $concept_id})
             MATCH (c)-[:INVOLVES_AXIOM]->(ba:BridgeAxiom)
-            OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
-            OPTIONAL MATCH (ba)-[:TRANSLATES]->(es:EcosystemService)
-            OPTIONAL MATCH (ba)-[:APPLIES_TO_HABITAT]->(h:Habitat)
-            WITH ba, collect(DISTINCT d) AS docs, collect(DISTINCT es) AS services,
-                 collect(DISTINCT h.habitat_id) AS habitats
+            WITH DISTINCT ba
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+                RETURN collect(DISTINCT d) AS docs
+            }
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:TRANSLATES]->(es:EcosystemService)
+                RETURN collect(DISTINCT es) AS services
+            }
+            CALL {
+                WITH ba
+                OPTIONAL MATCH (ba)-[:APPLIES_TO_HABITAT]->(h:Habitat)
+                RETURN collect(DISTINCT h.habitat_id) AS habitats
+            }
+            WITH ba, docs, services, habitats
             ORDER BY ba.axiom_id
             RETURN ba.axiom_id AS axiom_id, ba.name AS name,
                    ba.description AS description, ba.category AS category,
@@ -217,19 +301,29 @@ TEMPLATES: dict[str, dict] = {
         "cypher": """
             MATCH (c:Concept)
             WHERE c.name CONTAINS $search_term OR c.concept_id = $concept_id
-            OPTIONAL MATCH (c)-[:INVOLVES_AXIOM]->(ba:BridgeAxiom)
-            OPTIONAL MATCH (c)-[:DOCUMENTED_BY]->(d:Document)
-            OPTIONAL MATCH (c)-[:RELEVANT_TO]->(h:Habitat)
+            CALL {
+                WITH c
+                OPTIONAL MATCH (c)-[:INVOLVES_AXIOM]->(ba:BridgeAxiom)
+                RETURN collect(DISTINCT ba.axiom_id) AS axiom_ids
+            }
+            CALL {
+                WITH c
+                OPTIONAL MATCH (c)-[:DOCUMENTED_BY]->(d:Document)
+                RETURN collect(DISTINCT {
+                    doi: d.doi,
+                    title: d.title,
+                    year: d.year,
+                    tier: d.source_tier
+                }) AS key_papers
+            }
+            CALL {
+                WITH c
+                OPTIONAL MATCH (c)-[:RELEVANT_TO]->(h:Habitat)
+                RETURN collect(DISTINCT h.habitat_id) AS habitats
+            }
             RETURN c.concept_id AS concept_id, c.name AS name,
                    c.description AS description, c.domain AS domain,
-                   collect(DISTINCT ba.axiom_id) AS axiom_ids,
-                   collect(DISTINCT {
-                       doi: d.doi,
-                       title: d.title,
-                       year: d.year,
-                       tier: d.source_tier
-                   }) AS key_papers,
-                   collect(DISTINCT h.habitat_id) AS habitats
+                   axiom_ids, key_papers, habitats
             LIMIT $result_limit
         """,
         "parameters": ["search_term", "concept_id"],
@@ -257,8 +351,9 @@ TEMPLATES: dict[str, dict] = {
         "name": "graph_traverse",
         "category": "utility",
         "default_limit": _TRAVERSAL_LIMIT,
-        # NOTE: max_hops is substituted via str.replace in executor (Neo4j
-        # does not allow parameters in variable-length path bounds).
+        # NOTE: one variant per max_hops value is pre-rendered by the
+        # template registry (Neo4j does not allow parameters in
+        # variable-length path bounds).
         "cypher": """
             MATCH (start)
             WHERE start.name = $start_name
@@ -1,20 +1,95 @@
-"""Execute Cypher queries against Neo4j."""
+"""Execute Cypher queries against Neo4j.
+
+Each graph-reading method has an ``*_async`` counterpart on the async Neo4j
+driver for the async query path; template preparation and result shaping
+are shared between the two. Template executions and provenance lookups
+run in ``cypher.template``/``cypher.provenance`` trace spans.
+
+Provenance edges are served from the per-node blobs kept by
+``maris.graph.materialized_provenance`` when they match the current graph
+epoch; a missing or stale blob is derived live. Readers never write:
+blobs are refreshed by the population run.
+``graph_traverse`` and ``provenance_drilldown`` are answered from the
+precomputed neighborhoods of ``maris.graph.materialized_neighborhoods``
+when a current blob gives the exact answer, and run live otherwise.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Callable
 
+from maris.config import get_config
+from maris.graph.async_connection import run_query_async
 from maris.graph.connection import run_query
-from maris.query.cypher_templates import get_template, _MAX_LIMIT
+from maris.graph.materialized_neighborhoods import (
+    LOOKUP_CYPHER as NEIGHBORHOOD_LOOKUP_CYPHER,
+    SERVED_TEMPLATES as NEIGHBORHOOD_TEMPLATES,
+    fresh_neighborhood,
+    serve as serve_neighborhood,
+)
+from maris.graph.materialized_provenance import (
+    SUBJECTS,
+    ProvenanceSubject,
+    fresh_edges,
+    group_edges,
+)
+from maris.observability.tracing import current_span, traced
+from maris.query.cypher_templates import DEFAULT_HOPS, MAX_HOPS, MIN_HOPS, get_template, _MAX_LIMIT
+from maris.query.template_registry import get_template_registry
 
 logger = logging.getLogger(__name__)
 
 _OPEN_DOMAIN_TOP_K = 20
+_VECTOR_TOP_K = 10
+_VECTOR_MIN_SCORE = 0.55  # cosine mapped by Neo4j to (1 + cos) / 2
+
+_VECTOR_SEARCH_CYPHER = """
+    CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
+    YIELD node, score
+    WHERE score >= $min_score
+    RETURN node.doi AS doi, node.title AS title, node.year AS year,
+           node.source_tier AS tier, score
+    ORDER BY score DESC
+"""
 
 
 class QueryExecutor:
     """Run parameterized Cypher templates or raw queries against Neo4j."""
 
+    def __init__(self, epoch_provider: Callable[[], int | None] | None = None) -> None:
+        self._retriever = None
+        self._vector_index_available = True
+        cfg = get_config()
+        self._materialized_provenance = cfg.query_materialized_provenance
+        self._precomputed_neighborhoods = cfg.query_precomputed_neighborhoods
+        if epoch_provider is None and (self._materialized_provenance or self._precomputed_neighborhoods):
+            from maris.graph.epoch import get_graph_epoch
+
+            epoch_provider = get_graph_epoch
+        # None disables materialized provenance and neighborhoods: every lookup runs live
+        self._epoch_provider = epoch_provider
+
+    def _hybrid_retriever(self):
+        """The executor's shared HybridRetriever (contexts cached per graph epoch)."""
+        if self._retriever is None:
+            from maris.embeddings import get_embedder
+            from maris.graph.epoch import get_graph_epoch
+            from maris.graph.schema import DOCUMENT_VECTOR_INDEX
+            from maris.query.classifier import _KEYWORD_RULES
+            from maris.reasoning.hybrid_retriever import HybridRetriever
+
+            self._retriever = HybridRetriever(
+                executor=self,
+                keyword_rules=_KEYWORD_RULES,
+                epoch_provider=get_graph_epoch,
+                embedder=get_embedder(),
+                vector_index=DOCUMENT_VECTOR_INDEX,
+            )
+        return self._retriever
+
+    @traced("retrieval.open_domain")
     def execute_open_domain(self, question: str, site_name: str | None = None) -> dict:
         """Execute an open-domain query using hybrid retrieval.
 
@@ -30,16 +105,8 @@ class QueryExecutor:
                 "results": [],
             }
 
-        from maris.query.classifier import _KEYWORD_RULES
-        from maris.reasoning.hybrid_retriever import HybridRetriever
-
-        retriever = HybridRetriever(
-            executor=self,
-            keyword_rules=_KEYWORD_RULES,
-        )
-
         try:
-            result = retriever.retrieve(
+            result = self._hybrid_retriever().retrieve(
                 question=question,
                 site_name=site_name,
                 max_hops=3,
@@ -80,6 +147,32 @@ class QueryExecutor:
             "strategy": "safe_open_domain_retrieval",
         }
 
+    def vector_search_documents(
+        self,
+        embedding: list[float],
+        index_name: str,
+        top_k: int = _VECTOR_TOP_K,
+        min_score: float = _VECTOR_MIN_SCORE,
+    ) -> list[dict]:
+        """Nearest Documents to ``embedding`` via the Neo4j vector index.
+
+        Similarity is computed inside the database; only the top-k rows are
+        returned. If the index is missing (older server, schema not applied)
+        the search is disabled for this executor after one warning.
+        """
+        if not self._vector_index_available:
+            return []
+        params = {"index_name": index_name, "top_k": top_k, "embedding": embedding, "min_score": min_score}
+        try:
+            return run_query(_VECTOR_SEARCH_CYPHER, params)
+        except Exception as exc:
+            if "no such vector schema index" in str(exc).lower() or "procedurenotfound" in str(exc).lower():
+                logger.warning("Vector index %s unavailable; vector search disabled: %s", index_name, exc)
+                self._vector_index_available = False
+            else:
+                logger.exception("Vector search failed on index %s", index_name)
+            return []
+
     def execute_with_strategy(
         self,
         category: str,
@@ -98,6 +191,31 @@ class QueryExecutor:
             return self.execute_open_domain(question or "", site_name=site_name)
 
         result = self.execute(category, dict(parameters))
+        return self._apply_strategy(category, parameters, result)
+
+    async def execute_with_strategy_async(
+        self,
+        category: str,
+        parameters: dict,
+        *,
+        question: str | None = None,
+        site_name: str | None = None,
+    ) -> dict:
+        """Async ``execute_with_strategy``.
+
+        Open-domain hybrid retrieval is CPU-heavy and issues several sync
+        graph reads, so it is offloaded to a worker thread.
+        """
+        if category == "open_domain":
+            return await asyncio.to_thread(
+                self.execute_open_domain, question or "", site_name=site_name,
+            )
+
+        result = await self.execute_async(category, dict(parameters))
+        return self._apply_strategy(category, parameters, result)
+
+    @staticmethod
+    def _apply_strategy(category: str, parameters: dict, result: dict) -> dict:
         if result.get("error"):
             result.setdefault("error_type", "execution_failed")
             return result
@@ -120,12 +238,61 @@ class QueryExecutor:
         result["strategy"] = "deterministic_template"
         return result
 
+    @traced("cypher.template")
     def execute(self, template_name: str, parameters: dict) -> dict:
         """Execute a named Cypher template with parameters.
 
         Returns dict with keys: template, parameters, results, record_count,
         and has_more (true if results were truncated by the LIMIT clause).
         """
+        current_span().set_attribute("cypher.template", template_name)
+        prepared = self._prepare_template(template_name, parameters)
+        if isinstance(prepared, dict):
+            return prepared
+        cypher, requested_limit, hops = prepared
+
+        key = self._neighborhood_key(template_name, parameters)
+        records = None
+        if key is not None:
+            records = self._precomputed(template_name, key, self._epoch_provider(), hops, requested_limit)
+        if records is None:
+            try:
+                records = run_query(cypher, parameters)
+            except Exception:
+                logger.exception("Cypher execution failed for template=%s", template_name)
+                return self._execution_failed(template_name)
+        return self._template_result(template_name, parameters, records, requested_limit)
+
+    @traced("cypher.template")
+    async def execute_async(self, template_name: str, parameters: dict) -> dict:
+        """Async ``execute`` on the async Neo4j driver."""
+        current_span().set_attribute("cypher.template", template_name)
+        prepared = self._prepare_template(template_name, parameters)
+        if isinstance(prepared, dict):
+            return prepared
+        cypher, requested_limit, hops = prepared
+
+        key = self._neighborhood_key(template_name, parameters)
+        records = None
+        if key is not None:
+            epoch = await asyncio.to_thread(self._epoch_provider)
+            records = await self._precomputed_async(template_name, key, epoch, hops, requested_limit)
+        if records is None:
+            try:
+                records = await run_query_async(cypher, parameters)
+            except Exception:
+                logger.exception("Cypher execution failed for template=%s", template_name)
+                return self._execution_failed(template_name)
+        return self._template_result(template_name, parameters, records, requested_limit)
+
+    @staticmethod
+    def _prepare_template(template_name: str, parameters: dict) -> tuple[str, int, int | None] | dict:
+        """Resolve and validate a template; returns ``(cypher, limit, hops)`` or an error dict.
+
+        Mutates ``parameters`` in place (injects ``result_limit``, consumes
+        ``max_hops``). The statement is the registry's pre-rendered variant
+        for the requested hop depth, so no template text is built per call.
+        """
         template = get_template(template_name)
         if template is None:
             return {
@@ -135,8 +302,6 @@ class QueryExecutor:
                 "results": [],
             }
 
-        cypher = template["cypher"]
-
         # Inject result_limit if not already provided by caller
         default_limit = template.get("default_limit", 100)
         if "result_limit" not in parameters:
@@ -155,34 +320,89 @@ class QueryExecutor:
         requested_limit = parameters["result_limit"]
 
         # Neo4j does not allow parameters in variable-length path bounds,
-        # so we substitute max_hops directly after strict validation.
-        if "MAX_HOPS_PLACEHOLDER" in cypher and "max_hops" in parameters:
+        # so each depth has its own pre-rendered variant.
+        registry = get_template_registry()
+        hops = None
+        if registry.takes_hops(template_name):
             try:
-                hops = int(parameters.pop("max_hops"))
+                hops = int(parameters.pop("max_hops", DEFAULT_HOPS))
             except (TypeError, ValueError):
                 return {"error": "max_hops must be an integer", "results": []}
-            if hops < 1 or hops > 6:
-                return {"error": "max_hops must be between 1 and 6", "results": []}
-            cypher = cypher.replace("MAX_HOPS_PLACEHOLDER", str(hops))
+            if hops < MIN_HOPS or hops > MAX_HOPS:
+                return {"error": f"max_hops must be between {MIN_HOPS} and {MAX_HOPS}", "results": []}
 
-        try:
-            records = run_query(cypher, parameters)
-            has_more = len(records) >= requested_limit
+        reason = registry.invalid_reason(template_name, hops)
+        if reason is not None:
             return {
                 "template": template_name,
-                "parameters": parameters,
-                "results": records,
-                "record_count": len(records),
-                "has_more": has_more,
-            }
-        except Exception:
-            logger.exception("Cypher execution failed for template=%s", template_name)
-            return {
-                "template": template_name,
-                "error_type": "execution_failed",
-                "error": "Query execution failed",
+                "error_type": "invalid_template",
+                "error": f"Template failed validation: {reason}",
                 "results": [],
             }
+        return registry.variant(template_name, hops).cypher, requested_limit, hops
+
+    def _neighborhood_key(self, template_name: str, parameters: dict) -> str | None:
+        """Blob key when ``template_name`` can be answered from precomputed neighborhoods."""
+        if not self._precomputed_neighborhoods or self._epoch_provider is None:
+            return None
+        param = NEIGHBORHOOD_TEMPLATES.get(template_name)
+        return parameters.get(param) if param else None
+
+    @staticmethod
+    def _precomputed(
+        template_name: str, key: str, epoch: int | None, hops: int | None, limit: int,
+    ) -> list[dict] | None:
+        """Rows from a current neighborhood blob, or None to run the template live."""
+        if epoch is None:
+            return None
+        try:
+            rows = run_query(NEIGHBORHOOD_LOOKUP_CYPHER, {"name": key})
+        except Exception:
+            logger.warning("Neighborhood lookup failed; running %s live", template_name, exc_info=True)
+            return None
+        return QueryExecutor._served(template_name, rows, epoch, hops, limit)
+
+    @staticmethod
+    async def _precomputed_async(
+        template_name: str, key: str, epoch: int | None, hops: int | None, limit: int,
+    ) -> list[dict] | None:
+        if epoch is None:
+            return None
+        try:
+            rows = await run_query_async(NEIGHBORHOOD_LOOKUP_CYPHER, {"name": key})
+        except Exception:
+            logger.warning("Neighborhood lookup failed; running %s live", template_name, exc_info=True)
+            return None
+        return QueryExecutor._served(template_name, rows, epoch, hops, limit)
+
+    @staticmethod
+    def _served(template_name: str, rows: list[dict], epoch: int, hops: int | None, limit: int) -> list[dict] | None:
+        blob = fresh_neighborhood(rows[0] if rows else None, epoch)
+        records = serve_neighborhood(template_name, blob, hops, limit) if blob is not None else None
+        current_span().set_attribute("cypher.precomputed", records is not None)
+        return records
+
+    @staticmethod
+    def _template_result(
+        template_name: str, parameters: dict, records: list[dict], requested_limit: int,
+    ) -> dict:
+        current_span().set_attributes({"db.rows": len(records), "cypher.limit": requested_limit})
+        return {
+            "template": template_name,
+            "parameters": parameters,
+            "results": records,
+            "record_count": len(records),
+            "has_more": len(records) >= requested_limit,
+        }
+
+    @staticmethod
+    def _execution_failed(template_name: str) -> dict:
+        return {
+            "template": template_name,
+            "error_type": "execution_failed",
+            "error": "Query execution failed",
+            "results": [],
+        }
 
     def execute_raw(self, cypher: str, parameters: dict | None = None) -> list[dict]:
         """Execute arbitrary Cypher and return result dicts."""
@@ -192,89 +412,94 @@ class QueryExecutor:
             logger.exception("Raw Cypher execution failed")
             return []
 
+    @traced("cypher.provenance")
     def get_provenance_edges(self, category: str, params: dict) -> list[dict]:
         """Return structured provenance edges for the graph explorer visualization.
 
         Each edge is a dict with from_node, from_type, relationship, to_node, to_type.
+        All sites of a comparison are resolved together, one round trip per step.
         """
+        lookups = self._provenance_lookups(category, params)
+        epoch = self._provenance_epoch() if lookups else None
+        found = {
+            kind: self._provenance(SUBJECTS[kind], keys, epoch)
+            for kind, keys in self._keys_by_kind(lookups).items()
+        }
+        return self._ordered_edges(lookups, found)
+
+    @traced("cypher.provenance")
+    async def get_provenance_edges_async(self, category: str, params: dict) -> list[dict]:
+        """Async ``get_provenance_edges``; site and axiom lookups run concurrently."""
+        lookups = self._provenance_lookups(category, params)
+        # The epoch read may hit Neo4j when its in-process cache has expired
+        epoch = await asyncio.to_thread(self._provenance_epoch) if lookups else None
+        by_kind = self._keys_by_kind(lookups)
+        results = await asyncio.gather(*(
+            self._provenance_async(SUBJECTS[kind], keys, epoch) for kind, keys in by_kind.items()
+        ))
+        return self._ordered_edges(lookups, dict(zip(by_kind, results)))
+
+    @staticmethod
+    def _keys_by_kind(lookups: list[tuple[str, str]]) -> dict[str, list[str]]:
+        by_kind: dict[str, list[str]] = {}
+        for kind, key in lookups:
+            if key not in by_kind.setdefault(kind, []):
+                by_kind[kind].append(key)
+        return by_kind
+
+    @staticmethod
+    def _ordered_edges(lookups: list[tuple[str, str]], found: dict[str, dict[str, list[dict]]]) -> list[dict]:
+        """Flatten per-key edges in lookup order (comparison keeps the input site order)."""
+        edges = [edge for kind, key in lookups for edge in found[kind].get(key, [])]
+        current_span().set_attribute("provenance.edges", len(edges))
+        return edges
+
+    @staticmethod
+    def _provenance_lookups(category: str, params: dict) -> list[tuple[str, str]]:
+        """Return the ``("site"|"axiom", key)`` provenance lookups for a query."""
         site_name = params.get("site_name")
         axiom_id = params.get("axiom_id")
 
         if category in ("site_valuation", "provenance_drilldown", "risk_assessment") and site_name:
-            return self._site_provenance(site_name)
+            return [("site", site_name)]
         elif category == "axiom_explanation" and axiom_id:
-            return self._axiom_provenance(axiom_id)
+            return [("axiom", axiom_id)]
         elif category == "comparison":
-            edges = []
-            for name in params.get("site_names", []):
-                edges.extend(self._site_provenance(name))
-            return edges
+            return [("site", name) for name in params.get("site_names", [])]
         return []
 
-    def _site_provenance(self, site_name: str) -> list[dict]:
-        """Get provenance chain edges for a site."""
-        cypher = """
-            // MPA -> EcosystemService
-            MATCH (m:MPA {name: $site_name})-[:GENERATES]->(es:EcosystemService)
-            RETURN m.name AS from_node, labels(m)[0] AS from_type,
-                   'GENERATES' AS relationship,
-                   es.service_name AS to_node, labels(es)[0] AS to_type
-            UNION ALL
-            // BridgeAxiom -> MPA
-            MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m:MPA {name: $site_name})
-            RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
-                   'APPLIES_TO' AS relationship,
-                   m.name AS to_node, 'MPA' AS to_type
-            UNION ALL
-            // BridgeAxiom -> EcosystemService (for axioms that apply to this site)
-            MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(:MPA {name: $site_name})
-            MATCH (ba)-[:TRANSLATES]->(es:EcosystemService)
-            RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
-                   'TRANSLATES' AS relationship,
-                   es.service_name AS to_node, 'EcosystemService' AS to_type
-            UNION ALL
-            // BridgeAxiom -> Document (for axioms that apply to this site)
-            MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(:MPA {name: $site_name})
-            MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
-            RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
-                   'EVIDENCED_BY' AS relationship,
-                   COALESCE(d.title, d.doi) AS to_node, 'Document' AS to_type
-            UNION ALL
-            // MPA -> Habitat
-            MATCH (m:MPA {name: $site_name})-[:HAS_HABITAT]->(h:Habitat)
-            RETURN m.name AS from_node, 'MPA' AS from_type,
-                   'HAS_HABITAT' AS relationship,
-                   h.name AS to_node, 'Habitat' AS to_type
-        """
+    def _provenance_epoch(self) -> int | None:
+        if self._epoch_provider is None or not self._materialized_provenance:
+            return None
+        return self._epoch_provider()
+
+    def _provenance(self, subject: ProvenanceSubject, keys: list[str], epoch: int | None) -> dict[str, list[dict]]:
+        """Provenance edges per key: fresh blobs in one lookup, the rest derived in one query."""
+        found: dict[str, list[dict]] = {}
         try:
-            return run_query(cypher, {"site_name": site_name})
+            if epoch is not None:
+                found = fresh_edges(run_query(subject.lookup_cypher, {"keys": keys}), epoch)
+            missing = [key for key in keys if key not in found]
+            if not missing:
+                return found
+            derived = group_edges(run_query(subject.derive_cypher, {"keys": missing}), missing)
         except Exception:
-            logger.exception("Provenance edge query failed for site=%s", site_name)
-            return []
-
-    def _axiom_provenance(self, axiom_id: str) -> list[dict]:
-        """Get provenance chain edges for an axiom."""
-        cypher = """
-            // Axiom -> MPA
-            MATCH (ba:BridgeAxiom {axiom_id: $axiom_id})-[:APPLIES_TO]->(m:MPA)
-            RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
-                   'APPLIES_TO' AS relationship,
-                   m.name AS to_node, 'MPA' AS to_type
-            UNION ALL
-            // Axiom -> EcosystemService
-            MATCH (ba:BridgeAxiom {axiom_id: $axiom_id})-[:TRANSLATES]->(es:EcosystemService)
-            RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
-                   'TRANSLATES' AS relationship,
-                   es.service_name AS to_node, 'EcosystemService' AS to_type
-            UNION ALL
-            // Axiom -> Document
-            MATCH (ba:BridgeAxiom {axiom_id: $axiom_id})-[:EVIDENCED_BY]->(d:Document)
-            RETURN ba.axiom_id AS from_node, 'BridgeAxiom' AS from_type,
-                   'EVIDENCED_BY' AS relationship,
-                   COALESCE(d.title, d.doi) AS to_node, 'Document' AS to_type
-        """
+            logger.exception("Provenance edge query failed for %s=%s", subject.kind, keys)
+            return found
+        return found | derived
+
+    async def _provenance_async(
+        self, subject: ProvenanceSubject, keys: list[str], epoch: int | None,
+    ) -> dict[str, list[dict]]:
+        found: dict[str, list[dict]] = {}
         try:
-            return run_query(cypher, {"axiom_id": axiom_id})
+            if epoch is not None:
+                found = fresh_edges(await run_query_async(subject.lookup_cypher, {"keys": keys}), epoch)
+            missing = [key for key in keys if key not in found]
+            if not missing:
+                return found
+            derived = group_edges(await run_query_async(subject.derive_cypher, {"keys": missing}), missing)
         except Exception:
-            logger.exception("Provenance edge query failed for axiom=%s", axiom_id)
-            return []
+            logger.exception("Provenance edge query failed for %s=%s", subject.kind, keys)
+            return found
+        return found | derived
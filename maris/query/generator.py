@@ -1,15 +1,22 @@
 """Graph-constrained response generation using LLM."""
 
-import json
+import asyncio
 import logging
 import re
+from typing import Any, AsyncIterator
 
 from maris.axioms.confidence import calculate_response_confidence
-from maris.llm.adapter import LLMAdapter
+from maris.config import get_config
+from maris.llm.adapter import AsyncLLMAdapter, LLMAdapter, is_json_completion
 from maris.llm.prompts import RESPONSE_SYNTHESIS_PROMPT
+from maris.observability.timing import stage
+from maris.query.context_compactor import compact_graph_context
+from maris.query.streaming import AnswerFieldStream
 from maris.query.validators import (
+    NumericEvidenceIndex,
     build_provenance_summary,
     empty_result_response,
+    extract_json_robust,
     extract_numerical_claims,
     is_graph_context_empty,
     validate_llm_response,
@@ -38,11 +45,27 @@ _CATEGORY_HOPS = {
 }
 
 
+def _degraded_response() -> dict:
+    """Fallback answer for a failed LLM call, flagged so it is never cached."""
+    response = empty_result_response()
+    response["degraded"] = True
+    return response
+
+
 class ResponseGenerator:
     """Generate provenance-grounded answers from graph query results."""
 
-    def __init__(self, llm: LLMAdapter):
+    def __init__(
+        self,
+        llm: LLMAdapter,
+        async_llm: AsyncLLMAdapter | None = None,
+        context_token_budget: int | None = None,
+    ):
         self._llm = llm
+        self._async_llm = async_llm
+        if context_token_budget is None:
+            context_token_budget = get_config().query_context_token_budget
+        self._context_token_budget = context_token_budget
 
     def generate(
         self,
@@ -50,21 +73,131 @@ class ResponseGenerator:
         graph_context: dict,
         category: str,
         explanation_chain: str | None = None,
+        evidence_index: NumericEvidenceIndex | None = None,
     ) -> dict:
         """Synthesize a response from graph results.
 
         Returns dict with keys: answer, confidence, evidence, axioms_used,
-        graph_path, caveats, verified_claims, unverified_claims.
+        graph_path, caveats, verified_claims, unverified_claims. ``degraded``
+        is set when the LLM call failed or produced no answer.
 
         If explanation_chain is provided (from inference engine), it is
         appended to the LLM prompt to ground the response in the reasoning.
+        ``evidence_index`` is a prebuilt numeric index of ``graph_context``
+        (shared across a batch); numerical claims are checked against it.
         """
         # Empty result protection: do not call LLM if graph has no data
         if is_graph_context_empty(graph_context):
             logger.info("Empty graph context for question: %s", question[:80])
             return empty_result_response()
 
-        context_str = json.dumps(graph_context, indent=2, default=str)
+        prompt = self._build_prompt(question, graph_context, category, explanation_chain)
+        try:
+            with stage("llm"):
+                result = self._llm.complete_json([{"role": "user", "content": prompt}])
+        except Exception:
+            logger.exception("LLM complete_json failed for category=%s", category)
+            return _degraded_response()
+
+        return self._finalize(result, graph_context, category, evidence_index)
+
+    async def generate_async(
+        self,
+        question: str,
+        graph_context: dict,
+        category: str,
+        explanation_chain: str | None = None,
+        evidence_index: NumericEvidenceIndex | None = None,
+    ) -> dict:
+        """Async ``generate``; awaits the async LLM adapter when configured."""
+        if is_graph_context_empty(graph_context):
+            logger.info("Empty graph context for question: %s", question[:80])
+            return empty_result_response()
+
+        prompt = self._build_prompt(question, graph_context, category, explanation_chain)
+        messages = [{"role": "user", "content": prompt}]
+        try:
+            with stage("llm"):
+                if self._async_llm is not None:
+                    result = await self._async_llm.complete_json(messages)
+                else:
+                    result = await asyncio.to_thread(self._llm.complete_json, messages)
+        except Exception:
+            logger.exception("LLM complete_json failed for category=%s", category)
+            return _degraded_response()
+
+        return self._finalize(result, graph_context, category, evidence_index)
+
+    async def generate_stream(
+        self,
+        question: str,
+        graph_context: dict,
+        category: str,
+        explanation_chain: str | None = None,
+        evidence_index: NumericEvidenceIndex | None = None,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Stream a response as ``("token", text)`` events, then ``("result", dict)``.
+
+        Tokens are the answer prose decoded from the streamed JSON as it
+        arrives. The final ``result`` is the same validated dict ``generate``
+        returns and is authoritative: validation may rewrite the answer.
+        """
+        if is_graph_context_empty(graph_context):
+            logger.info("Empty graph context for question: %s", question[:80])
+            yield "result", empty_result_response()
+            return
+
+        if self._async_llm is None:
+            # No streaming client: fall back to one blocking completion
+            result = await self.generate_async(
+                question, graph_context, category, explanation_chain, evidence_index,
+            )
+            if result.get("answer"):
+                yield "token", result["answer"]
+            yield "result", result
+            return
+
+        prompt = self._build_prompt(question, graph_context, category, explanation_chain)
+        answer = AnswerFieldStream()
+        parts: list[str] = []
+        try:
+            with stage("llm"):
+                async for chunk in self._async_llm.stream(
+                    [{"role": "user", "content": prompt}], temperature=0.0, cache_if=is_json_completion,
+                ):
+                    parts.append(chunk)
+                    text = answer.feed(chunk)
+                    if text:
+                        yield "token", text
+        except Exception:
+            logger.exception("LLM stream failed for category=%s", category)
+            yield "result", _degraded_response()
+            return
+
+        yield "result", self._finalize(
+            extract_json_robust("".join(parts)), graph_context, category, evidence_index,
+        )
+
+    @staticmethod
+    def graph_evidence(graph_context: dict) -> list[dict]:
+        """Citation-like evidence available in the graph context, pre-LLM."""
+        return _materialize_graph_evidence(graph_context)
+
+    def _build_prompt(
+        self,
+        question: str,
+        graph_context: dict,
+        category: str,
+        explanation_chain: str | None,
+    ) -> str:
+        compact = compact_graph_context(
+            graph_context, question=question, token_budget=self._context_token_budget,
+        )
+        logger.debug(
+            "Graph context for category=%s: ~%d tokens (%d evidence kept, %d dropped, %d rows dropped)",
+            category, compact.tokens, compact.evidence_kept, compact.evidence_dropped, compact.rows_dropped,
+        )
+        context_str = compact.text
 
         prompt = RESPONSE_SYNTHESIS_PROMPT.format(
             question=question,
@@ -78,13 +211,16 @@ class ResponseGenerator:
                 "\n\nInference chain (use this to structure your answer):\n"
                 + explanation_chain
             )
+        return prompt
 
-        try:
-            result = self._llm.complete_json([{"role": "user", "content": prompt}])
-        except Exception:
-            logger.exception("LLM complete_json failed for category=%s", category)
-            return empty_result_response()
-
+    @staticmethod
+    def _finalize(
+        result: dict,
+        graph_context: dict,
+        category: str,
+        evidence_index: NumericEvidenceIndex | None = None,
+    ) -> dict:
+        """Ground, validate and score a parsed LLM response."""
         llm_evidence = result.get("evidence", [])
         if not isinstance(llm_evidence, list):
             llm_evidence = []
@@ -118,50 +254,55 @@ class ResponseGenerator:
 
         # Validate response against graph context
         strict_deterministic = category != "open_domain"
-        validated = validate_llm_response(
-            raw,
-            graph_context,
-            category=category,
-            strict_deterministic=strict_deterministic,
-        )
+        with stage("validation"):
+            validated = validate_llm_response(
+                raw,
+                graph_context,
+                category=category,
+                strict_deterministic=strict_deterministic,
+                evidence_index=evidence_index,
+            )
 
         # Preserve axioms_used and graph_path through validation
         validated.setdefault("axioms_used", raw["axioms_used"])
         validated.setdefault("graph_path", raw["graph_path"])
 
         # Replace LLM self-stated confidence with composite grounded score
-        try:
-            evidence_nodes = validated.get("evidence", [])
-            if not isinstance(evidence_nodes, list):
-                evidence_nodes = []
-            provenance_summary = build_provenance_summary(
-                validated.get("evidence", []),
-                validated.get("answer", ""),
-            )
-            provenance_summary["has_numeric_claims"] = bool(
-                extract_numerical_claims(validated.get("answer", ""))
-            )
-            n_hops = _CATEGORY_HOPS.get(category, 1)
-            breakdown = calculate_response_confidence(
-                evidence_nodes,
-                n_hops=n_hops,
-                provenance_summary=provenance_summary,
-            )
-            validated["confidence"] = breakdown["composite"]
-            validated["confidence_breakdown"] = breakdown
-            validated.update({
-                "evidence_count": provenance_summary["evidence_count"],
-                "doi_citation_count": provenance_summary["doi_citation_count"],
-                "evidence_completeness_score": provenance_summary["evidence_completeness_score"],
-                "provenance_warnings": provenance_summary["provenance_warnings"],
-                "provenance_risk": provenance_summary["provenance_risk"],
-            })
-        except Exception:
-            logger.warning(
-                "Composite confidence scoring failed, keeping LLM confidence",
-                exc_info=True,
-            )
-
+        with stage("confidence"):
+            try:
+                evidence_nodes = validated.get("evidence", [])
+                if not isinstance(evidence_nodes, list):
+                    evidence_nodes = []
+                provenance_summary = build_provenance_summary(
+                    validated.get("evidence", []),
+                    validated.get("answer", ""),
+                )
+                provenance_summary["has_numeric_claims"] = bool(
+                    extract_numerical_claims(validated.get("answer", ""))
+                )
+                n_hops = _CATEGORY_HOPS.get(category, 1)
+                breakdown = calculate_response_confidence(
+                    evidence_nodes,
+                    n_hops=n_hops,
+                    provenance_summary=provenance_summary,
+                )
+                validated["confidence"] = breakdown["composite"]
+                validated["confidence_breakdown"] = breakdown
+                validated.update({
+                    "evidence_count": provenance_summary["evidence_count"],
+                    "doi_citation_count": provenance_summary["doi_citation_count"],
+                    "evidence_completeness_score": provenance_summary["evidence_completeness_score"],
+                    "provenance_warnings": provenance_summary["provenance_warnings"],
+                    "provenance_risk": provenance_summary["provenance_risk"],
+                })
+            except Exception:
+                logger.warning(
+                    "Composite confidence scoring failed, keeping LLM confidence",
+                    exc_info=True,
+                )
+
+        if not str(validated.get("answer") or "").strip():
+            validated["degraded"] = True
         return validated
 
 
@@ -0,0 +1,292 @@
+"""End-to-end response cache for the /api/query pipeline.
+
+Answers are keyed on the normalized question, resolved site, classified
+category, response-shaping request options and the graph epoch (see
+``maris.graph.epoch``). Because the epoch is part of the key, population or
+ingestion runs invalidate every cached answer implicitly.
+
+Storage is an in-process LRU with optional SQLite persistence so that warm
+answers survive API restarts. Entries past their TTL are served as ``stale``
+for a grace window while a single background refresh recomputes them
+(stale-while-revalidate).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from maris.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Cache status values reported in QueryMetadata.cache_status
+CACHE_HIT = "hit"
+CACHE_STALE = "stale"
+CACHE_MISS = "miss"
+CACHE_BYPASS = "bypass"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s?.!]+$")
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS response_cache (
+    cache_key  TEXT PRIMARY KEY,
+    epoch      INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    payload    TEXT NOT NULL
+)
+"""
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for cache keying.
+
+    Applies NFKC, case folding, whitespace collapsing and trailing
+    punctuation removal, so trivially different phrasings of the same
+    sample question share an entry.
+    """
+    text = unicodedata.normalize("NFKC", question or "").casefold()
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return _TRAILING_PUNCT_RE.sub("", text)
+
+
+def make_cache_key(
+    question: str,
+    site: str | None,
+    category: str,
+    epoch: int,
+    **options: Any,
+) -> str:
+    """Build a stable cache key from the response-determining inputs."""
+    material = {
+        "q": normalize_question(question),
+        "site": (site or "").casefold(),
+        "category": category,
+        "epoch": epoch,
+        "options": {k: options[k] for k in sorted(options)},
+    }
+    encoded = json.dumps(material, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A cached response payload with its creation time and graph epoch."""
+
+    payload: dict[str, Any]
+    epoch: int
+    created_at: float
+
+
+class ResponseCache:
+    """LRU response cache with optional SQLite persistence and SWR refresh.
+
+    Thread-safe. ``lookup`` classifies an entry as hit, stale or miss;
+    ``revalidate_async`` schedules at most one background refresh per key.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+        stale_seconds: float = 600.0,
+        db_path: str | Path | None = None,
+        max_persisted_entries: int = 5000,
+    ) -> None:
+        self._max_entries = max(int(max_entries), 1)
+        self._ttl = max(float(ttl_seconds), 0.0)
+        self._stale = max(float(stale_seconds), 0.0)
+        self._max_persisted = max(int(max_persisted_entries), self._max_entries)
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.RLock()
+        self._inflight: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._latest_epoch: int | None = None
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+
+        self._db: sqlite3.Connection | None = None
+        if db_path:
+            path = Path(db_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(_CREATE_TABLE)
+            self._db.commit()
+
+    @classmethod
+    def from_config(cls) -> ResponseCache | None:
+        """Build the cache from ``MARIS_QUERY_CACHE_*`` settings (None if disabled)."""
+        cfg = get_config()
+        if not cfg.query_cache_enabled:
+            return None
+        return cls(
+            max_entries=cfg.query_cache_max_entries,
+            ttl_seconds=cfg.query_cache_ttl_seconds,
+            stale_seconds=cfg.query_cache_stale_seconds,
+            db_path=cfg.query_cache_db or None,
+        )
+
+    # -- Lookup / store ------------------------------------------------------
+
+    def lookup(self, key: str) -> tuple[str, dict[str, Any] | None]:
+        """Return ``(status, payload)`` where status is hit, stale or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            else:
+                entry = self._load_persisted(key)
+                if entry is not None:
+                    self._insert(key, entry)
+
+            if entry is None:
+                self._misses += 1
+                return CACHE_MISS, None
+
+            age = time.time() - entry.created_at
+            if age <= self._ttl:
+                self._hits += 1
+                return CACHE_HIT, entry.payload
+            if age <= self._ttl + self._stale:
+                self._stale_hits += 1
+                return CACHE_STALE, entry.payload
+
+            self._evict(key)
+            self._misses += 1
+            return CACHE_MISS, None
+
+    def store(self, key: str, payload: dict[str, Any], epoch: int) -> None:
+        """Insert or replace an entry."""
+        entry = CacheEntry(payload=payload, epoch=epoch, created_at=time.time())
+        with self._lock:
+            if self._latest_epoch is not None and epoch > self._latest_epoch:
+                self._purge_older_epochs(epoch)
+            if self._latest_epoch is None or epoch > self._latest_epoch:
+                self._latest_epoch = epoch
+            self._insert(key, entry)
+            self._persist(key, entry)
+
+    def revalidate_async(
+        self,
+        key: str,
+        epoch: int,
+        compute: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> bool:
+        """Schedule a background refresh as a task on the running event loop.
+
+        Returns False if a refresh for the key is already in flight.
+        ``compute`` returning None (or raising) leaves the stale entry in
+        place until it expires.
+        """
+        with self._lock:
+            if key in self._inflight:
+                return False
+            self._inflight.add(key)
+
+        async def _run() -> None:
+            try:
+                payload = await compute()
+                if payload is not None:
+                    await asyncio.to_thread(self.store, key, payload, epoch)
+            except Exception:
+                logger.warning("Background cache refresh failed", exc_info=True)
+            finally:
+                with self._lock:
+                    self._inflight.discard(key)
+
+        task = asyncio.get_running_loop().create_task(_run())
+        # Hold a reference until completion so the task is not garbage collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM response_cache")
+                self._db.commit()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "refreshing": len(self._inflight),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # -- Internals -----------------------------------------------------------
+
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _evict(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM response_cache WHERE cache_key = ?", (key,))
+            self._db.commit()
+
+    def _purge_older_epochs(self, epoch: int) -> None:
+        """Drop entries from earlier epochs; they can never be hit again."""
+        for key in [k for k, e in self._entries.items() if e.epoch < epoch]:
+            del self._entries[key]
+        if self._db is not None:
+            self._db.execute("DELETE FROM response_cache WHERE epoch < ?", (epoch,))
+            self._db.commit()
+
+    def _load_persisted(self, key: str) -> CacheEntry | None:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT payload, epoch, created_at FROM response_cache WHERE cache_key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            payload = json.loads(row[0])
+        except json.JSONDecodeError:
+            logger.warning("Discarding corrupt persisted cache entry")
+            self._evict(key)
+            return None
+        return CacheEntry(payload=payload, epoch=int(row[1]), created_at=float(row[2]))
+
+    def _persist(self, key: str, entry: CacheEntry) -> None:
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO response_cache (cache_key, epoch, created_at, payload) "
+            "VALUES (?, ?, ?, ?)",
+            (key, entry.epoch, entry.created_at, json.dumps(entry.payload, default=str)),
+        )
+        # Bound the on-disk store by dropping the oldest rows
+        self._db.execute(
+            "DELETE FROM response_cache WHERE cache_key IN ("
+            "SELECT cache_key FROM response_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self._max_persisted,),
+        )
+        self._db.commit()
@@ -0,0 +1,160 @@
+"""Dependency-aware stage scheduler for the async query pipeline.
+
+A query is a small DAG of stages (template execution, provenance lookups,
+inference, LLM synthesis). Stages whose dependencies are satisfied run
+concurrently, bounded by ``max_concurrency``, so request latency tracks the
+critical path rather than the sum of all stages.
+
+Each stage may carry a deadline. A required stage that fails or times out
+cancels the rest of the run and re-raises; an optional stage resolves to
+its ``default`` instead, so a slow provenance lookup cannot sink an
+otherwise complete answer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimeoutError(TimeoutError):
+    """A required stage exceeded its deadline."""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Stage '{stage}' exceeded its {timeout:.1f}s deadline")
+        self.stage = stage
+        self.timeout = timeout
+
+
+@dataclass
+class Stage:
+    """One unit of pipeline work.
+
+    ``run`` receives a mapping of completed dependency names to their
+    results and returns an awaitable.
+    """
+
+    name: str
+    run: Callable[[dict[str, Any]], Awaitable[Any]]
+    depends_on: tuple[str, ...] = ()
+    timeout: float | None = None
+    optional: bool = False
+    default: Any = None
+
+
+@dataclass
+class ScheduleResult:
+    """Stage results plus per-stage wall-clock durations (ms)."""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    durations_ms: dict[str, int] = field(default_factory=dict)
+    degraded: list[str] = field(default_factory=list)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+
+def _validate(stages: list[Stage]) -> None:
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate stage names")
+    known = set(names)
+    for stage in stages:
+        missing = [d for d in stage.depends_on if d not in known]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {missing}")
+
+    # Kahn's algorithm to reject cycles before anything is started
+    indegree = {s.name: len(s.depends_on) for s in stages}
+    dependents: dict[str, list[str]] = {s.name: [] for s in stages}
+    for stage in stages:
+        for dep in stage.depends_on:
+            dependents[dep].append(stage.name)
+    ready = [n for n, d in indegree.items() if d == 0]
+    seen = 0
+    while ready:
+        name = ready.pop()
+        seen += 1
+        for child in dependents[name]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if seen != len(stages):
+        raise ValueError("Stage dependencies contain a cycle")
+
+
+class StageScheduler:
+    """Run a DAG of async stages with bounded parallelism and deadlines."""
+
+    def __init__(self, max_concurrency: int = 4):
+        self._max_concurrency = max(int(max_concurrency), 1)
+
+    async def run(self, stages: list[Stage]) -> ScheduleResult:
+        _validate(stages)
+        outcome = ScheduleResult()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        by_name = {s.name: s for s in stages}
+        pending = dict(by_name)
+        running: dict[asyncio.Task, str] = {}
+
+        async def _execute(stage: Stage) -> Any:
+            deps = {d: outcome.results[d] for d in stage.depends_on}
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    if stage.timeout is not None:
+                        return await asyncio.wait_for(stage.run(deps), timeout=stage.timeout)
+                    return await stage.run(deps)
+                except asyncio.TimeoutError:
+                    raise StageTimeoutError(stage.name, stage.timeout or 0.0) from None
+                finally:
+                    outcome.durations_ms[stage.name] = int((time.monotonic() - started) * 1000)
+
+        def _launch_ready() -> None:
+            for name, stage in list(pending.items()):
+                if all(d in outcome.results for d in stage.depends_on):
+                    del pending[name]
+                    running[asyncio.ensure_future(_execute(stage))] = name
+
+        try:
+            _launch_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    stage = by_name[name]
+                    exc = task.exception()
+                    if exc is None:
+                        outcome.results[name] = task.result()
+                    elif stage.optional:
+                        logger.warning("Optional stage '%s' degraded: %s", name, exc)
+                        outcome.results[name] = stage.default
+                        outcome.degraded.append(name)
+                    else:
+                        raise exc
+                _launch_ready()
+        finally:
+            for task in running:
+                task.cancel()
+        return outcome
+
+
+async def run_stage(component: Any, method: str, *args: Any, **kwargs: Any) -> Any:
+    """Run one I/O-bound pipeline stage without blocking the event loop.
+
+    Awaits the component's native ``<method>_async`` coroutine when it has
+    one; sync-only components (custom executors, test doubles) fall back
+    to the threadpool.
+    """
+    native = getattr(component, f"{method}_async", None)
+    if inspect.iscoroutinefunction(native):
+        return await native(*args, **kwargs)
+    return await run_in_threadpool(getattr(component, method), *args, **kwargs)
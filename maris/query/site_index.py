@@ -0,0 +1,269 @@
+"""Scalable site mention index for query classification.
+
+Replaces per-site regex scans and an all-pairs ``difflib`` fallback with two
+structures that stay fast as the site registry grows into the thousands:
+
+- a token trie over site aliases (full name, first-two-words short form and
+  first-word alias) for exact mention detection in a single pass over the
+  question, independent of the number of registered sites;
+- a character-trigram inverted index over canonical names for fuzzy
+  candidate retrieval. Only the rarest trigrams of a query are expanded and
+  at most ``max_candidates`` names are scored with ``SequenceMatcher``, so
+  fuzzy scoring cost is bounded per candidate phrase.
+
+Sites can be added and removed incrementally; no full rebuild is needed when
+new sites are registered at runtime.
+"""
+
+from __future__ import annotations
+
+import difflib
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Trigrams appearing in more than this share of indexed names are skipped
+# during candidate retrieval (they carry little signal, e.g. "mar", "ark").
+_COMMON_TRIGRAM_RATIO = 0.1
+_MIN_COMMON_TRIGRAM_POSTINGS = 64
+
+
+def normalize_site_text(text: str) -> str:
+    """Lowercase and strip combining marks (e.g. ``ā`` -> ``a``)."""
+    normalized = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in normalized if not unicodedata.combining(c)).lower()
+
+
+def tokenize_site_text(text: str) -> list[str]:
+    """Split normalized text into word tokens (``\\w+`` boundaries)."""
+    return _TOKEN_RE.findall(normalize_site_text(text))
+
+
+def site_aliases(name: str) -> list[tuple[str, ...]]:
+    """Return the token aliases a site name is detectable by.
+
+    Mirrors the historical dynamic-pattern rules: the full name, a short
+    form from the first two words, and a first-word alias when that word
+    has at least four characters.
+    """
+    tokens = tokenize_site_text(name)
+    if not tokens:
+        return []
+    aliases: list[tuple[str, ...]] = [tuple(tokens)]
+    words = name.split()
+    if len(words) >= 2:
+        short = tuple(tokenize_site_text(" ".join(words[:2])))
+        if short and short not in aliases:
+            aliases.append(short)
+    if words and len(words[0]) >= 4:
+        first = tuple(tokenize_site_text(words[0]))
+        if first and first not in aliases:
+            aliases.append(first)
+    return aliases
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class _TrieNode:
+    children: dict[str, _TrieNode] = field(default_factory=dict)
+    # Site ordinals terminating at this node, with per-site reference counts
+    # (several aliases of the same site never share a node, but keep the
+    # count to make removal symmetric with insertion).
+    terminals: dict[int, int] = field(default_factory=dict)
+
+
+class SiteIndex:
+    """Exact-match trie plus trigram inverted index over site names.
+
+    Site ordinals are assigned in registration order and used to report
+    matches in that order, preserving the precedence of earlier-registered
+    sites when several are mentioned.
+    """
+
+    def __init__(self, max_candidates: int = 8) -> None:
+        self._max_candidates = max(int(max_candidates), 1)
+        self._lock = threading.RLock()
+        self._root = _TrieNode()
+        self._ordinals: dict[str, int] = {}
+        self._names: dict[int, str] = {}
+        self._lower: dict[int, str] = {}
+        self._grams: dict[int, set[str]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._next_ordinal = 0
+
+    # -- Mutation ------------------------------------------------------------
+
+    def add(self, name: str) -> bool:
+        """Index a site name. Returns False if it was already indexed."""
+        if not name or not name.strip():
+            return False
+        with self._lock:
+            if name in self._ordinals:
+                return False
+            ordinal = self._next_ordinal
+            self._next_ordinal += 1
+            self._ordinals[name] = ordinal
+            self._names[ordinal] = name
+
+            for alias in site_aliases(name):
+                node = self._root
+                for token in alias:
+                    node = node.children.setdefault(token, _TrieNode())
+                node.terminals[ordinal] = node.terminals.get(ordinal, 0) + 1
+
+            lower = normalize_site_text(name)
+            grams = _trigrams(lower)
+            self._lower[ordinal] = lower
+            self._grams[ordinal] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(ordinal)
+            return True
+
+    def add_many(self, names: list[str]) -> int:
+        """Index several names. Returns the number newly added."""
+        return sum(1 for name in names if self.add(name))
+
+    def remove(self, name: str) -> bool:
+        """Remove a site name from both indexes. Returns False if absent."""
+        with self._lock:
+            ordinal = self._ordinals.pop(name, None)
+            if ordinal is None:
+                return False
+            del self._names[ordinal]
+            del self._lower[ordinal]
+
+            for alias in site_aliases(name):
+                self._unlink_alias(alias, ordinal)
+
+            for gram in self._grams.pop(ordinal):
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(ordinal)
+                    if not posting:
+                        del self._postings[gram]
+            return True
+
+    def _unlink_alias(self, alias: tuple[str, ...], ordinal: int) -> None:
+        path: list[tuple[_TrieNode, str]] = []
+        node = self._root
+        for token in alias:
+            child = node.children.get(token)
+            if child is None:
+                return
+            path.append((node, token))
+            node = child
+        count = node.terminals.get(ordinal, 0) - 1
+        if count > 0:
+            node.terminals[ordinal] = count
+        else:
+            node.terminals.pop(ordinal, None)
+        # Prune now-empty branches bottom-up
+        for parent, token in reversed(path):
+            child = parent.children[token]
+            if child.children or child.terminals:
+                break
+            del parent.children[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._root = _TrieNode()
+            self._ordinals.clear()
+            self._names.clear()
+            self._lower.clear()
+            self._grams.clear()
+            self._postings.clear()
+
+    # -- Introspection -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ordinals
+
+    def names(self) -> list[str]:
+        """Return indexed names in registration order."""
+        with self._lock:
+            return [self._names[o] for o in sorted(self._names)]
+
+    # -- Lookup --------------------------------------------------------------
+
+    def find_mentions(self, text: str) -> list[str]:
+        """Return all sites whose aliases appear as whole-token runs in text.
+
+        Cost is O(tokens x longest alias), independent of the index size.
+        """
+        tokens = tokenize_site_text(text)
+        with self._lock:
+            hits: set[int] = set()
+            for start in range(len(tokens)):
+                node = self._root
+                for token in tokens[start:]:
+                    node = node.children.get(token)  # type: ignore[assignment]
+                    if node is None:
+                        break
+                    hits.update(node.terminals)
+            return [self._names[o] for o in sorted(hits)]
+
+    def fuzzy_candidates(self, phrase: str) -> list[str]:
+        """Return up to ``max_candidates`` names sharing the most trigrams.
+
+        Posting lists are expanded rarest-first, and trigrams common to a
+        large share of the index are skipped whenever rarer ones exist.
+        """
+        with self._lock:
+            return [self._names[o] for o in self._candidate_ordinals(normalize_site_text(phrase))]
+
+    def _candidate_ordinals(self, lower_phrase: str) -> list[int]:
+        grams = [g for g in _trigrams(lower_phrase) if g in self._postings]
+        if not grams:
+            return []
+        grams.sort(key=lambda g: len(self._postings[g]))
+        common_cap = max(
+            _MIN_COMMON_TRIGRAM_POSTINGS,
+            int(len(self._ordinals) * _COMMON_TRIGRAM_RATIO),
+        )
+        selective = [g for g in grams if len(self._postings[g]) <= common_cap]
+        if not selective:
+            selective = grams[:1]
+
+        overlap: dict[int, int] = {}
+        for gram in selective:
+            for ordinal in self._postings[gram]:
+                overlap[ordinal] = overlap.get(ordinal, 0) + 1
+        ranked = sorted(overlap.items(), key=lambda item: (-item[1], item[0]))
+        return [ordinal for ordinal, _ in ranked[:self._max_candidates]]
+
+    def fuzzy_match(self, phrase: str, cutoff: float = 0.6) -> tuple[str, float] | None:
+        """Return the best (name, ratio) for a phrase, or None below cutoff.
+
+        Only retrieved candidates are scored, using the same
+        ``SequenceMatcher`` ratio and quick-reject filters as
+        ``difflib.get_close_matches``.
+        """
+        lower_phrase = normalize_site_text(phrase)
+        with self._lock:
+            best: tuple[float, int] | None = None
+            matcher = difflib.SequenceMatcher()
+            matcher.set_seq2(lower_phrase)
+            for ordinal in self._candidate_ordinals(lower_phrase):
+                matcher.set_seq1(self._lower[ordinal])
+                if (
+                    matcher.real_quick_ratio() >= cutoff
+                    and matcher.quick_ratio() >= cutoff
+                ):
+                    ratio = matcher.ratio()
+                    if ratio >= cutoff and (
+                        best is None or ratio > best[0] or (ratio == best[0] and ordinal < best[1])
+                    ):
+                        best = (ratio, ordinal)
+            if best is None:
+                return None
+            return self._names[best[1]], best[0]
@@ -0,0 +1,75 @@
+"""Incremental extraction of the answer text from a streamed LLM response.
+
+The synthesis prompt asks for a JSON object whose first key is ``answer``.
+While the completion is still arriving, ``AnswerFieldStream`` decodes that
+string value chunk by chunk so the prose can be forwarded to the client
+before the rest of the object (evidence, caveats) has been generated. The
+complete text is still parsed and validated once the stream ends.
+"""
+
+from __future__ import annotations
+
+import re
+
+_ANSWER_KEY_RE = re.compile(r'"answer"\s*:\s*"')
+_JSON_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class AnswerFieldStream:
+    """Decode the ``"answer"`` string of a JSON object as it streams in."""
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = -1  # first undecoded char of the answer value, -1 until found
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add ``chunk`` and return newly decoded answer text (may be empty)."""
+        if self.done:
+            return ""
+        self._buffer += chunk
+        if self._pos < 0:
+            match = _ANSWER_KEY_RE.search(self._buffer)
+            if match is None:
+                return ""
+            self._pos = match.end()
+
+        buf = self._buffer
+        out: list[str] = []
+        i, n = self._pos, len(buf)
+        while i < n:
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                i += 1
+                break
+            if ch == "\\":
+                # Hold back escape sequences split across chunks
+                if i + 1 >= n:
+                    break
+                esc = buf[i + 1]
+                if esc == "u":
+                    if i + 6 > n:
+                        break
+                    try:
+                        out.append(chr(int(buf[i + 2:i + 6], 16)))
+                    except ValueError:
+                        pass
+                    i += 6
+                    continue
+                out.append(_JSON_ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            out.append(ch)
+            i += 1
+        self._pos = i
+        return "".join(out)
@@ -0,0 +1,131 @@
+"""Pre-rendered Cypher template variants, validated once with EXPLAIN.
+
+Traversal templates take their hop depth as a literal in the path bound
+(``[*1..3]``) because Neo4j rejects parameters there. Rather than
+substituting the depth into the template text on every call, the registry
+renders one variant per allowed depth up front and the executor dispatches
+on ``(template, hops)``. Every request for the same variant sends the
+byte-identical statement, so Neo4j's plan cache keeps a single entry per
+variant and the hot path does no string work.
+
+``validate`` EXPLAINs each variant once (at API startup) so a template
+broken by a schema or Cypher-version change is reported immediately and
+refused by the executor instead of failing on every request.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+
+from neo4j.exceptions import ClientError
+
+from maris.query.cypher_templates import HOP_PLACEHOLDER, MAX_HOPS, MIN_HOPS, TEMPLATES
+
+logger = logging.getLogger(__name__)
+
+# Errors in the statement itself (syntax, semantics, unknown functions...);
+# other client errors (auth, missing database) say nothing about the template
+_STATEMENT_ERROR_PREFIX = "Neo.ClientError.Statement."
+
+
+@dataclass(frozen=True)
+class TemplateVariant:
+    """One executable statement: a template at a fixed hop depth (or None)."""
+
+    template: str
+    hops: int | None
+    cypher: str
+
+
+class TemplateRegistry:
+    """All template variants keyed by ``(template name, hops)``."""
+
+    def __init__(self, templates: dict[str, dict] = TEMPLATES) -> None:
+        self._variants: dict[tuple[str, int | None], TemplateVariant] = {}
+        self._hop_templates: set[str] = set()
+        for name, template in templates.items():
+            cypher = template["cypher"]
+            if HOP_PLACEHOLDER in cypher:
+                self._hop_templates.add(name)
+                for hops in range(MIN_HOPS, MAX_HOPS + 1):
+                    rendered = cypher.replace(HOP_PLACEHOLDER, str(hops))
+                    self._variants[(name, hops)] = TemplateVariant(name, hops, rendered)
+            else:
+                self._variants[(name, None)] = TemplateVariant(name, None, cypher)
+        self._invalid: dict[tuple[str, int | None], str] = {}
+        self.validated = False
+
+    def __len__(self) -> int:
+        return len(self._variants)
+
+    def variants(self) -> list[TemplateVariant]:
+        return list(self._variants.values())
+
+    def takes_hops(self, name: str) -> bool:
+        """Whether ``name`` has one variant per hop depth."""
+        return name in self._hop_templates
+
+    def variant(self, name: str, hops: int | None = None) -> TemplateVariant | None:
+        return self._variants.get((name, hops))
+
+    def invalid_reason(self, name: str, hops: int | None = None) -> str | None:
+        """The EXPLAIN error for a variant that failed validation, else None."""
+        return self._invalid.get((name, hops))
+
+    def validate(self, session) -> dict[tuple[str, int | None], str]:
+        """EXPLAIN every variant in ``session``; returns the failures.
+
+        Only ``Neo.ClientError.Statement.*`` errors mark a variant invalid.
+        Anything else (connectivity, authentication, a missing database)
+        propagates and leaves the previous validation state untouched, so an
+        unusable session does not condemn every template and the variants
+        are checked again on the next run.
+        """
+        invalid: dict[tuple[str, int | None], str] = {}
+        for key, variant in self._variants.items():
+            try:
+                session.run(f"EXPLAIN {variant.cypher}").consume()
+            except ClientError as exc:
+                if not (exc.code or "").startswith(_STATEMENT_ERROR_PREFIX):
+                    raise
+                invalid[key] = exc.message or type(exc).__name__
+                logger.error("Template %s (hops=%s) failed EXPLAIN: %s", key[0], key[1], invalid[key])
+        self._invalid = invalid
+        self.validated = True
+        return dict(invalid)
+
+
+_registry: TemplateRegistry | None = None
+_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Return the process-wide registry, rendering it on first use."""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = TemplateRegistry()
+    return _registry
+
+
+def validate_templates() -> dict[tuple[str, int | None], str] | None:
+    """EXPLAIN all variants of the shared registry against the live graph.
+
+    Returns the invalid variants, or None when Neo4j is unreachable or
+    refuses the session (the variants then stay unvalidated and are used
+    as-is).
+    """
+    from maris.graph.connection import get_config, get_driver
+
+    registry = get_template_registry()
+    try:
+        with get_driver().session(database=get_config().neo4j_database) as session:
+            invalid = registry.validate(session)
+    except Exception:
+        logger.warning("Template validation skipped: Neo4j unavailable", exc_info=True)
+        return None
+    logger.info("Validated %d template variants (%d invalid)", len(registry), len(invalid))
+    return invalid
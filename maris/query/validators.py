@@ -6,9 +6,11 @@ result protection. Every LLM-generated answer is validated before being
 returned to the user.
 """
 
+import bisect
 import json
 import logging
 import re
+from typing import Iterable
 
 from maris.provenance.doi_verifier import get_doi_verifier
 
@@ -34,6 +36,18 @@ _REQUIRED_FIELDS = {
 
 _VALID_EVIDENCE_TIERS = {"T1", "T2", "T3", "T4", "N/A"}
 
+# Relative tolerance for a numerical claim to match a context value
+_CLAIM_TOLERANCE = 0.05
+_TOLERANCE_FLOOR = 1e-9
+
+# Unit buckets: derived forms of each context value a claim may be stated in
+_UNIT_SCALES = {
+    "raw": 1.0,
+    "millions": 1_000_000,     # 29.27 in context -> $29.27M in the answer
+    "percent": 100.0,          # 0.84 in context -> 84%
+    "per_million": 1 / 1_000_000,
+}
+
 
 def is_graph_context_empty(graph_context: dict | list | None) -> bool:
     """Check if graph context has no usable data.
@@ -300,54 +314,86 @@ def _flatten_values(obj: object) -> list[float]:
     return values
 
 
+def _claim_matches(claim_val: float, context_val: float, tolerance: float = _CLAIM_TOLERANCE) -> bool:
+    if context_val == 0:
+        return claim_val == 0
+    return abs(claim_val - context_val) / max(abs(context_val), _TOLERANCE_FLOOR) < tolerance
+
+
+class NumericEvidenceIndex:
+    """Sorted numeric values from one graph context, for O(log n) claim checks.
+
+    Build once per request context (``from_context``) and reuse it for every
+    claim, or for every answer in a batch generated from the same context.
+    Values are held in one sorted array per unit bucket; a claim is located
+    by bisecting each bucket for the window its tolerance allows.
+    """
+
+    def __init__(self, values: Iterable[float], tolerance: float = _CLAIM_TOLERANCE) -> None:
+        self.tolerance = tolerance
+        raw = set(values)
+        self._has_zero = 0.0 in raw
+        self._buckets: dict[str, list[float]] = {
+            unit: sorted({v * scale for v in raw if v * scale != 0})
+            for unit, scale in _UNIT_SCALES.items()
+        }
+
+    @classmethod
+    def from_context(
+        cls, graph_context: dict | list | None, tolerance: float = _CLAIM_TOLERANCE,
+    ) -> "NumericEvidenceIndex":
+        return cls(_flatten_values(graph_context) if graph_context else (), tolerance)
+
+    def __len__(self) -> int:
+        return len(self._buckets["raw"]) + self._has_zero
+
+    def match(self, claim_val: float) -> str | None:
+        """Unit bucket of a context value within tolerance of ``claim_val``, if any."""
+        if claim_val == 0 and self._has_zero:
+            return "raw"
+        # |claim - v| < tol * |v|  =>  v lies between claim/(1+tol) and claim/(1-tol);
+        # the absolute slack covers values below the relative-tolerance floor.
+        bounds = (claim_val / (1 + self.tolerance), claim_val / (1 - self.tolerance))
+        slack = self.tolerance * _TOLERANCE_FLOOR
+        lo, hi = min(bounds) - slack, max(bounds) + slack
+        for unit, values in self._buckets.items():
+            i = bisect.bisect_left(values, lo)
+            while i < len(values) and values[i] <= hi:
+                if _claim_matches(claim_val, values[i], self.tolerance):
+                    return unit
+                i += 1
+        return None
+
+    def verify(self, claims: Iterable[str]) -> tuple[list[str], list[str]]:
+        """Split claim strings into (verified, unverified)."""
+        verified: list[str] = []
+        unverified: list[str] = []
+        for claim in claims:
+            claim_val = _normalize_number(claim)
+            if claim_val is not None and self.match(claim_val) is not None:
+                verified.append(claim)
+            else:
+                unverified.append(claim)
+        return verified, unverified
+
+
 def verify_numerical_claims(
-    answer: str, graph_context: dict | list | None
+    answer: str,
+    graph_context: dict | list | None,
+    *,
+    evidence_index: NumericEvidenceIndex | None = None,
 ) -> tuple[list[str], list[str]]:
     """Cross-check numerical claims in the answer against graph context.
 
+    Pass a prebuilt ``evidence_index`` to skip re-indexing the context.
     Returns (verified_claims, unverified_claims).
     """
     claims = extract_numerical_claims(answer)
     if not claims:
         return [], []
-
-    # Flatten all numeric values from graph context
-    context_values = set()
-    if graph_context:
-        raw_values = _flatten_values(graph_context)
-        context_values = set(raw_values)
-        # Also add common derived forms (millions, percentages)
-        for v in raw_values:
-            context_values.add(v * 1_000_000)
-            context_values.add(v * 100)
-            context_values.add(v / 1_000_000)
-
-    verified: list[str] = []
-    unverified: list[str] = []
-
-    for claim in claims:
-        claim_val = _normalize_number(claim)
-        if claim_val is None:
-            unverified.append(claim)
-            continue
-
-        # Check if the claim value (or close to it) exists in context
-        found = False
-        for cv in context_values:
-            if cv == 0:
-                if claim_val == 0:
-                    found = True
-                    break
-            elif abs(claim_val - cv) / max(abs(cv), 1e-9) < 0.05:
-                found = True
-                break
-
-        if found:
-            verified.append(claim)
-        else:
-            unverified.append(claim)
-
-    return verified, unverified
+    if evidence_index is None:
+        evidence_index = NumericEvidenceIndex.from_context(graph_context)
+    return evidence_index.verify(claims)
 
 
 def validate_llm_response(
@@ -356,6 +402,7 @@ def validate_llm_response(
     *,
     category: str | None = None,
     strict_deterministic: bool = False,
+    evidence_index: NumericEvidenceIndex | None = None,
 ) -> dict:
     """Full validation pipeline for an LLM response.
 
@@ -385,7 +432,7 @@ def validate_llm_response(
 
     # 3. Numerical claim verification
     answer = cleaned.get("answer", "")
-    verified, unverified = verify_numerical_claims(answer, graph_context)
+    verified, unverified = verify_numerical_claims(answer, graph_context, evidence_index=evidence_index)
     cleaned["verified_claims"] = verified
     cleaned["unverified_claims"] = unverified
     if unverified:
@@ -7,9 +7,11 @@ Cypher system with open-domain queries via forward/backward chaining.
 
 from maris.reasoning.context_builder import ContextNode, ContextEdge, ContextGraph
 from maris.reasoning.hybrid_retriever import HybridRetriever, RetrievalResult
+from maris.reasoning.keyword_index import KeywordIndex
 from maris.reasoning.inference_engine import InferenceEngine, InferenceStep
 from maris.reasoning.explanation import ExplanationGenerator
 from maris.reasoning.rule_compiler import compile_axiom, compile_all, compile_from_templates
+from maris.reasoning.rule_base import CompiledRuleBase, get_rule_base
 
 __all__ = [
     "ContextNode",
@@ -17,10 +19,13 @@ __all__ = [
     "ContextGraph",
     "HybridRetriever",
     "RetrievalResult",
+    "KeywordIndex",
     "InferenceEngine",
     "InferenceStep",
     "ExplanationGenerator",
     "compile_axiom",
     "compile_all",
     "compile_from_templates",
+    "CompiledRuleBase",
+    "get_rule_base",
 ]
@@ -3,12 +3,19 @@
 Converts raw Neo4j node/edge records into lightweight ContextNode and
 ContextEdge objects suitable for reasoning, retrieval ranking, and
 explanation generation.
+
+``ContextGraph`` keeps per-node adjacency lists keyed by relationship type,
+maintained as edges are added, so neighbour lookups and bounded-depth
+traversals cost O(degree) rather than a scan of the full edge list.
 """
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterable, Literal
+
+Direction = Literal["out", "in", "both"]
 
 
 # Map MARIS Neo4j labels to semantic context types used by the reasoning engine.
@@ -72,6 +79,9 @@ class ContextGraph:
     def __init__(self) -> None:
         self._nodes: dict[str, ContextNode] = {}
         self._edges: list[ContextEdge] = []
+        # node_id -> relationship -> edge positions in ``_edges``
+        self._out: dict[str, dict[str, list[int]]] = {}
+        self._in: dict[str, dict[str, list[int]]] = {}
 
     @property
     def nodes(self) -> list[ContextNode]:
@@ -85,20 +95,137 @@ class ContextGraph:
         self._nodes[node.node_id] = node
 
     def add_edge(self, edge: ContextEdge) -> None:
+        position = len(self._edges)
         self._edges.append(edge)
+        self._out.setdefault(edge.source_id, {}).setdefault(edge.relationship, []).append(position)
+        self._in.setdefault(edge.target_id, {}).setdefault(edge.relationship, []).append(position)
+
+    def merge(self, other: ContextGraph) -> None:
+        """Add all nodes and edges of ``other`` to this graph."""
+        for node in other._nodes.values():
+            self.add_node(node)
+        for edge in other._edges:
+            self.add_edge(edge)
 
     def get_node(self, node_id: str) -> ContextNode | None:
         return self._nodes.get(node_id)
 
-    def neighbors(self, node_id: str) -> list[ContextNode]:
+    def _edge_positions(
+        self,
+        node_id: str,
+        relationships: Iterable[str] | None,
+        direction: Direction,
+    ) -> list[int]:
+        tables = []
+        if direction in ("out", "both"):
+            tables.append(self._out.get(node_id, {}))
+        if direction in ("in", "both"):
+            tables.append(self._in.get(node_id, {}))
+        positions: list[int] = []
+        for table in tables:
+            if relationships is None:
+                for bucket in table.values():
+                    positions.extend(bucket)
+            else:
+                for rel in relationships:
+                    positions.extend(table.get(rel, ()))
+        return positions
+
+    def edges_of(
+        self,
+        node_id: str,
+        relationships: Iterable[str] | None = None,
+        direction: Direction = "both",
+    ) -> list[ContextEdge]:
+        """Edges incident to ``node_id``, optionally filtered by type and direction."""
+        positions = self._edge_positions(node_id, relationships, direction)
+        return [self._edges[p] for p in sorted(set(positions))]
+
+    def neighbor_ids(
+        self,
+        node_id: str,
+        relationships: Iterable[str] | None = None,
+        direction: Direction = "both",
+    ) -> list[str]:
+        """IDs adjacent to ``node_id`` in edge insertion order, deduplicated."""
+        seen: dict[str, None] = {}
+        for edge in self.edges_of(node_id, relationships, direction):
+            other = edge.target_id if edge.source_id == node_id else edge.source_id
+            seen.setdefault(other, None)
+        return list(seen)
+
+    def neighbors(
+        self,
+        node_id: str,
+        relationships: Iterable[str] | None = None,
+        direction: Direction = "both",
+    ) -> list[ContextNode]:
         """Return all nodes connected to the given node."""
-        neighbor_ids: set[str] = set()
-        for edge in self._edges:
-            if edge.source_id == node_id:
-                neighbor_ids.add(edge.target_id)
-            elif edge.target_id == node_id:
-                neighbor_ids.add(edge.source_id)
-        return [self._nodes[nid] for nid in neighbor_ids if nid in self._nodes]
+        return [
+            self._nodes[nid]
+            for nid in self.neighbor_ids(node_id, relationships, direction)
+            if nid in self._nodes
+        ]
+
+    def traverse(
+        self,
+        start_id: str,
+        max_depth: int = 2,
+        relationships: Iterable[str] | None = None,
+        direction: Direction = "both",
+    ) -> dict[str, int]:
+        """Breadth-first hop distance from ``start_id`` to every node within ``max_depth``.
+
+        The start node is included at depth 0. Edges to IDs without a node
+        are followed but not reported.
+        """
+        rels = list(relationships) if relationships is not None else None
+        depths = {start_id: 0}
+        queue = deque([start_id])
+        while queue:
+            current = queue.popleft()
+            depth = depths[current]
+            if depth >= max_depth:
+                continue
+            for nid in self.neighbor_ids(current, rels, direction):
+                if nid not in depths:
+                    depths[nid] = depth + 1
+                    queue.append(nid)
+        return {nid: d for nid, d in depths.items() if nid in self._nodes}
+
+    def shortest_path(
+        self,
+        source_id: str,
+        target_id: str,
+        max_depth: int = 4,
+        relationships: Iterable[str] | None = None,
+    ) -> list[str]:
+        """Node IDs on a shortest undirected path, or ``[]`` beyond ``max_depth``."""
+        if source_id == target_id:
+            return [source_id]
+        rels = list(relationships) if relationships is not None else None
+        parents: dict[str, str | None] = {source_id: None}
+        frontier = [source_id]
+        for _ in range(max_depth):
+            next_frontier = []
+            for current in frontier:
+                for nid in self.neighbor_ids(current, rels):
+                    if nid in parents:
+                        continue
+                    parents[nid] = current
+                    if nid == target_id:
+                        path = [nid]
+                        while parents[path[-1]] is not None:
+                            path.append(parents[path[-1]])
+                        return path[::-1]
+                    next_frontier.append(nid)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return []
+
+    def degree(self, node_id: str) -> int:
+        return len(self._edge_positions(node_id, None, "both"))
 
     def node_count(self) -> int:
         return len(self._nodes)
@@ -3,24 +3,39 @@
 The HybridRetriever reuses existing MARIS keyword rules from the classifier
 and graph traversal from the executor, then merges results via Reciprocal
 Rank Fusion (RRF) for unified ranking.
+
+Keyword ranking uses a BM25 inverted index over the context nodes. When an
+``epoch_provider`` is supplied, each retrieved context graph and its index
+are cached per graph epoch, so repeat questions about the same site or
+concept skip both the graph read and the index build. With an ``embedder``
+a third, semantic ranking (cosine similarity of node text to the question)
+joins the fusion. With a ``vector_index`` the executor's
+``vector_search_documents`` ranks Documents inside Neo4j
+(``db.index.vector.queryNodes``) and the hits join as a fourth list.
 """
 
 from __future__ import annotations
 
 import logging
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable, Hashable
 
 from maris.reasoning.context_builder import (
     ContextGraph,
+    ContextNode,
     build_context_from_results,
 )
+from maris.reasoning.keyword_index import KeywordIndex, node_text
 
 logger = logging.getLogger(__name__)
 
 # RRF constant (standard value from Cormack et al.)
 _RRF_K = 60
+_CONTEXT_CACHE_SIZE = 64
+_SEMANTIC_MIN_SCORE = 0.1
 
 
 @dataclass
@@ -42,6 +57,16 @@ class RetrievalResult:
         }
 
 
+@dataclass
+class _IndexedContext:
+    """A retrieved context graph with its keyword and semantic indexes."""
+
+    context: ContextGraph
+    keywords: KeywordIndex
+    node_ids: list[str]
+    semantic: Any = None
+
+
 def reciprocal_rank_fusion(
     ranked_lists: list[list[str]],
     k: int = _RRF_K,
@@ -69,9 +94,20 @@ class HybridRetriever:
         self,
         executor: Any = None,
         keyword_rules: list[tuple[str, list[str]]] | None = None,
+        epoch_provider: Callable[[], int | None] | None = None,
+        embedder: Any = None,
+        vector_index: str | None = None,
     ) -> None:
         self._executor = executor
         self._keyword_rules = keyword_rules or []
+        self._patterns = [
+            re.compile(pat) for _category, patterns in self._keyword_rules for pat in patterns
+        ]
+        self._epoch_provider = epoch_provider
+        self._embedder = embedder
+        self._vector_index = vector_index
+        self._contexts: OrderedDict[Hashable, _IndexedContext] = OrderedDict()
+        self._lock = threading.Lock()
 
     def retrieve(
         self,
@@ -82,40 +118,61 @@ class HybridRetriever:
     ) -> RetrievalResult:
         """Run hybrid retrieval for an open-domain question.
 
-        Returns a RetrievalResult with ranked context nodes.
+        Returns a RetrievalResult with ranked context nodes. The returned
+        context graph may be shared with other requests and must be treated
+        as read-only.
         """
         graph_ranked: list[str] = []
-        keyword_ranked: list[str] = []
-        context = ContextGraph()
         modes: dict[str, int] = {"graph": 0, "keyword": 0}
 
         # 1. Graph traversal (if executor and site available)
         if self._executor and site_name:
-            graph_results = self._graph_retrieve(site_name, max_hops)
-            graph_context = build_context_from_results(graph_results)
-            for node in graph_context.nodes:
-                context.add_node(node)
-            for edge in graph_context.edges:
-                context.add_edge(edge)
-            graph_ranked = [n.node_id for n in graph_context.nodes]
+            indexed = self._context_for(
+                ("graph", site_name, max_hops),
+                lambda: self._graph_retrieve(site_name, max_hops),
+            )
+            graph_ranked = [n.node_id for n in indexed.context.nodes]
             modes["graph"] = len(graph_ranked)
         elif self._executor:
             # Concept-based retrieval: start from axiom nodes matching question keywords
-            concept_results = self._concept_retrieve(question)
-            concept_context = build_context_from_results(concept_results)
-            for node in concept_context.nodes:
-                context.add_node(node)
-            for edge in concept_context.edges:
-                context.add_edge(edge)
-            graph_ranked = [n.node_id for n in concept_context.nodes]
+            terms = self._extract_concept_terms(question)
+            indexed = self._context_for(
+                ("concept", terms[0] if terms else None),
+                lambda: self._concept_retrieve(question),
+            )
+            graph_ranked = [n.node_id for n in indexed.context.nodes]
             modes["graph"] = len(graph_ranked)
+        else:
+            indexed = self._index_context(ContextGraph())
+        context = indexed.context
 
         # 2. Keyword matching against context nodes
-        keyword_ranked = self._keyword_retrieve(question, context)
+        keyword_ranked = self._keyword_retrieve(question, indexed.keywords)
         modes["keyword"] = len(keyword_ranked)
 
-        # 3. RRF fusion
-        ranked_lists = [rl for rl in [graph_ranked, keyword_ranked] if rl]
+        # 3. Semantic similarity (if an embedder is configured)
+        semantic_ranked: list[str] = []
+        if self._embedder is not None:
+            semantic_ranked = self._semantic_retrieve(question, indexed)
+            modes["semantic"] = len(semantic_ranked)
+
+        # 4. In-database vector search over Documents
+        vector_ranked: list[str] = []
+        if self._executor and self._vector_index and self._embedder is not None:
+            vector_nodes = self._vector_retrieve(question)
+            vector_ranked = [node.node_id for node in vector_nodes]
+            modes["vector"] = len(vector_ranked)
+            missing = [node for node in vector_nodes if context.get_node(node.node_id) is None]
+            if missing:
+                # The cached context is shared; extend a per-request copy
+                extended = ContextGraph()
+                extended.merge(context)
+                for node in missing:
+                    extended.add_node(node)
+                context = extended
+
+        # 5. RRF fusion
+        ranked_lists = [rl for rl in [graph_ranked, keyword_ranked, semantic_ranked, vector_ranked] if rl]
         if ranked_lists:
             fused = reciprocal_rank_fusion(ranked_lists)
         else:
@@ -141,6 +198,45 @@ class HybridRetriever:
             total_candidates=context.node_count(),
         )
 
+    def _context_for(
+        self,
+        key: Hashable,
+        load: Callable[[], list[dict[str, Any]]],
+    ) -> _IndexedContext:
+        """Context graph and its indexes for ``key``, cached per graph epoch."""
+        epoch = self._epoch_provider() if self._epoch_provider else None
+        cache_key = (epoch, key)
+        if epoch is not None:
+            with self._lock:
+                cached = self._contexts.get(cache_key)
+                if cached is not None:
+                    self._contexts.move_to_end(cache_key)
+                    return cached
+
+        results = load()
+        entry = self._index_context(build_context_from_results(results))
+        # Empty reads may be transient failures; do not pin them for the epoch
+        if epoch is not None and results:
+            with self._lock:
+                self._contexts[cache_key] = entry
+                while len(self._contexts) > _CONTEXT_CACHE_SIZE:
+                    self._contexts.popitem(last=False)
+        return entry
+
+    def _index_context(self, context: ContextGraph) -> _IndexedContext:
+        nodes = context.nodes
+        semantic = None
+        if self._embedder is not None and nodes:
+            from maris.embeddings.flat_index import FlatIndex
+
+            semantic = FlatIndex(self._embedder.embed_batch([node_text(n) for n in nodes]))
+        return _IndexedContext(
+            context=context,
+            keywords=KeywordIndex(nodes),
+            node_ids=[n.node_id for n in nodes],
+            semantic=semantic,
+        )
+
     def _graph_retrieve(self, site_name: str, max_hops: int) -> list[dict[str, Any]]:
         """Retrieve graph neighborhood via executor."""
         try:
@@ -156,37 +252,48 @@ class HybridRetriever:
     def _keyword_retrieve(
         self,
         question: str,
-        context: ContextGraph,
+        index: KeywordIndex,
     ) -> list[str]:
-        """Rank context nodes by keyword match relevance to the question."""
+        """Rank context nodes by BM25 relevance plus keyword-rule boosts."""
         q_lower = question.lower()
-        scored: list[tuple[str, int]] = []
-
-        for node in context.nodes:
-            score = 0
-            node_text = f"{node.name} {' '.join(str(v) for v in node.properties.values())}".lower()
-
-            # Check keyword rules
-            for _category, patterns in self._keyword_rules:
-                for pat in patterns:
-                    if re.search(pat, q_lower):
-                        # Boost if the pattern also matches node content
-                        if re.search(pat, node_text):
-                            score += 2
-                        else:
-                            score += 1
-
-            # Direct term overlap
-            q_words = set(q_lower.split())
-            node_words = set(node_text.split())
-            overlap = len(q_words & node_words)
-            score += overlap
-
-            if score > 0:
-                scored.append((node.node_id, score))
-
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return [node_id for node_id, _ in scored]
+        matched = [pat for pat in self._patterns if pat.search(q_lower)]
+        return [node_id for node_id, _score in index.search(question, matched)]
+
+    def _semantic_retrieve(self, question: str, indexed: _IndexedContext) -> list[str]:
+        """Rank context nodes by embedding similarity to the question."""
+        if indexed.semantic is None:
+            return []
+        query = self._embedder.embed(question)
+        if not query.any():
+            return []
+        hits = indexed.semantic.search(query, k=len(indexed.node_ids))
+        return [indexed.node_ids[row] for row, score in hits if score >= _SEMANTIC_MIN_SCORE]
+
+    def _vector_retrieve(self, question: str) -> list[ContextNode]:
+        """Documents nearest to the question by the graph's vector index."""
+        query = self._embedder.embed(question)
+        if not query.any():
+            return []
+        try:
+            rows = self._executor.vector_search_documents(query.tolist(), self._vector_index)
+        except Exception:
+            logger.exception("Vector retrieval failed for question=%s", question[:80])
+            return []
+        nodes = []
+        for row in rows:
+            doi = row.get("doi")
+            if not doi:
+                continue
+            props = {k: v for k, v in row.items() if v is not None and k != "score"}
+            nodes.append(ContextNode(
+                node_id=f"doc:{doi}",
+                node_type="evidence",
+                name=row.get("title") or doi,
+                properties=props,
+                confidence=1.0 if row.get("tier") == "T1" else 0.8,
+                source="vector_index",
+            ))
+        return nodes
 
     def _concept_retrieve(self, question: str) -> list[dict[str, Any]]:
         """Retrieve graph context via concept/axiom keyword matching."""
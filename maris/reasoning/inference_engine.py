@@ -3,13 +3,21 @@
 Supports forward chaining (ecological facts -> financial conclusions) and
 backward chaining (financial query -> needed ecological evidence). Tracks
 provenance through the ProvenanceManager from P0.
+
+Rules are indexed by input domain, output domain and habitat. Forward
+chaining keeps a semi-naive agenda: a rule is only considered when its
+input domain first becomes available, rather than rescanning every rule on
+every step. Domain reachability and ``find_chain`` results are cached until
+the rule set changes.
 """
 
 from __future__ import annotations
 
+import heapq
 import logging
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterable
 
 from maris.provenance.bridge_axiom import BridgeAxiom
 
@@ -68,6 +76,19 @@ class InferenceEngine:
     def __init__(self, provenance_manager: Any = None) -> None:
         self._rules: dict[str, InferenceRule] = {}
         self._provenance = provenance_manager
+        self._index: _RuleIndex | None = None
+        self._chain_cache: dict[tuple[str, str], list[InferenceRule]] = {}
+        self._reach_cache: dict[str, frozenset[str]] = {}
+
+    def _invalidate(self) -> None:
+        self._index = None
+        self._chain_cache.clear()
+        self._reach_cache.clear()
+
+    def _indexed(self) -> _RuleIndex:
+        if self._index is None:
+            self._index = _RuleIndex(list(self._rules.values()))
+        return self._index
 
     def register_axiom(self, axiom: BridgeAxiom) -> str:
         """Register a bridge axiom as an inference rule.
@@ -78,6 +99,7 @@ class InferenceEngine:
 
         rule = compile_axiom(axiom)
         self._rules[rule.rule_id] = rule
+        self._invalidate()
         return rule.rule_id
 
     def register_axioms(self, axioms: list[BridgeAxiom]) -> int:
@@ -86,6 +108,15 @@ class InferenceEngine:
             self.register_axiom(axiom)
         return len(axioms)
 
+    def register_rules(self, rules: Iterable[InferenceRule]) -> int:
+        """Register already-compiled rules (e.g. from a shared rule base)."""
+        count = 0
+        for rule in rules:
+            self._rules[rule.rule_id] = rule
+            count += 1
+        self._invalidate()
+        return count
+
     @property
     def rule_count(self) -> int:
         return len(self._rules)
@@ -107,17 +138,26 @@ class InferenceEngine:
 
         Returns list of InferenceSteps representing the derivation chain.
         """
+        index = self._indexed()
         steps: list[InferenceStep] = []
         derived_domains: set[str] = set(facts.keys())
-        used_rules: set[str] = set()
+
+        # Agenda of rule positions whose input domain is available. Positions
+        # preserve registration order: a rule enabled mid-step by an earlier
+        # rule fires in the same step, one enabled by a later rule waits for
+        # the next step (the same order a full rescan per step produces).
+        agenda: list[int] = []
+        for domain in derived_domains:
+            agenda.extend(index.by_input.get(domain, ()))
+        heapq.heapify(agenda)
 
         for _ in range(max_steps):
-            progress = False
-            for rule_id, rule in self._rules.items():
-                if rule_id in used_rules:
-                    continue
-                if rule.input_domain not in derived_domains:
-                    continue
+            if not agenda:
+                break
+            next_agenda: list[int] = []
+            while agenda:
+                position = heapq.heappop(agenda)
+                rule = index.rules[position]
 
                 # Apply the rule
                 input_facts = facts.get(rule.input_domain, {})
@@ -128,7 +168,7 @@ class InferenceEngine:
                 )
 
                 step = InferenceStep(
-                    rule_id=rule_id,
+                    rule_id=rule.rule_id,
                     axiom_id=rule.axiom.axiom_id,
                     input_fact=input_desc,
                     output_fact=output_desc,
@@ -137,20 +177,20 @@ class InferenceEngine:
                     source_doi=rule.axiom.source_doi,
                 )
                 steps.append(step)
-                used_rules.add(rule_id)
 
-                # Add derived domain to available facts
+                # Add derived domain to available facts; enable its rules
                 if rule.output_domain not in derived_domains:
                     derived_domains.add(rule.output_domain)
                     facts[rule.output_domain] = {}
-                progress = True
+                    for enabled in index.by_input.get(rule.output_domain, ()):
+                        heapq.heappush(agenda if enabled > position else next_agenda, enabled)
 
                 # Record provenance if manager available
                 if self._provenance:
                     self._record_inference_provenance(step)
 
-            if not progress:
-                break
+            heapq.heapify(next_agenda)
+            agenda = next_agenda
 
         return steps
 
@@ -168,6 +208,7 @@ class InferenceEngine:
         Returns list of required evidence dicts, each with rule_id, axiom_id,
         needed_domain, needed_facts description, and source_doi.
         """
+        index = self._indexed()
         needed: list[dict[str, Any]] = []
         visited_domains: set[str] = set()
         targets = [target_domain]
@@ -182,11 +223,10 @@ class InferenceEngine:
                 visited_domains.add(domain)
 
                 # Find rules that produce this domain
-                for rule_id, rule in self._rules.items():
-                    if rule.output_domain != domain:
-                        continue
+                for position in index.by_output.get(domain, ()):
+                    rule = index.rules[position]
                     needed.append({
-                        "rule_id": rule_id,
+                        "rule_id": rule.rule_id,
                         "axiom_id": rule.axiom.axiom_id,
                         "axiom_name": rule.axiom.name,
                         "needed_domain": rule.input_domain,
@@ -203,10 +243,9 @@ class InferenceEngine:
 
     def find_rules_for_habitat(self, habitat: str) -> list[InferenceRule]:
         """Return all rules applicable to a specific habitat."""
-        return [
-            r for r in self._rules.values()
-            if "all" in r.applicable_habitats or habitat in r.applicable_habitats
-        ]
+        index = self._indexed()
+        positions = set(index.by_habitat.get("all", ())) | set(index.by_habitat.get(habitat, ()))
+        return [index.rules[p] for p in sorted(positions)]
 
     def find_chain(
         self,
@@ -219,16 +258,41 @@ class InferenceEngine:
         """
         if input_domain == output_domain:
             return []
-
-        # BFS
-        queue: list[tuple[str, list[InferenceRule]]] = [(input_domain, [])]
+        key = (input_domain, output_domain)
+        if key not in self._chain_cache:
+            self._chain_cache[key] = self._bfs_chain(input_domain, output_domain)
+        return list(self._chain_cache[key])
+
+    def reachable_domains(self, input_domain: str) -> frozenset[str]:
+        """Domains derivable from ``input_domain`` (cached per rule set)."""
+        cached = self._reach_cache.get(input_domain)
+        if cached is not None:
+            return cached
+        index = self._indexed()
+        seen: set[str] = set()
+        queue = deque([input_domain])
+        while queue:
+            domain = queue.popleft()
+            for position in index.by_input.get(domain, ()):
+                out = index.rules[position].output_domain
+                if out not in seen:
+                    seen.add(out)
+                    queue.append(out)
+        result = frozenset(seen)
+        self._reach_cache[input_domain] = result
+        return result
+
+    def _bfs_chain(self, input_domain: str, output_domain: str) -> list[InferenceRule]:
+        if output_domain not in self.reachable_domains(input_domain):
+            return []
+        index = self._indexed()
+        queue: deque[tuple[str, list[InferenceRule]]] = deque([(input_domain, [])])
         visited: set[str] = {input_domain}
 
         while queue:
-            current_domain, path = queue.pop(0)
-            for rule in self._rules.values():
-                if rule.input_domain != current_domain:
-                    continue
+            current_domain, path = queue.popleft()
+            for position in index.by_input.get(current_domain, ()):
+                rule = index.rules[position]
                 new_path = path + [rule]
                 if rule.output_domain == output_domain:
                     return new_path
@@ -256,6 +320,21 @@ class InferenceEngine:
             logger.warning("Failed to record inference provenance", exc_info=True)
 
 
+class _RuleIndex:
+    """Positional rule indexes, rebuilt whenever the rule set changes."""
+
+    def __init__(self, rules: list[InferenceRule]) -> None:
+        self.rules = rules
+        self.by_input: dict[str, list[int]] = defaultdict(list)
+        self.by_output: dict[str, list[int]] = defaultdict(list)
+        self.by_habitat: dict[str, list[int]] = defaultdict(list)
+        for position, rule in enumerate(rules):
+            self.by_input[rule.input_domain].append(position)
+            self.by_output[rule.output_domain].append(position)
+            for habitat in rule.applicable_habitats:
+                self.by_habitat[habitat].append(position)
+
+
 def _format_facts(domain: str, facts: dict[str, Any]) -> str:
     """Format facts dict into a human-readable string."""
     if not facts:
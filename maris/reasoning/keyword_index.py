@@ -0,0 +1,117 @@
+"""Inverted keyword index with BM25 scoring over context graph nodes.
+
+Built once per context graph (the retriever caches graphs per graph epoch),
+so a query costs time proportional to the postings of its terms rather than
+a regex pass over every node. Tokenization of node text and of questions is
+cached.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable
+
+from maris.reasoning.context_builder import ContextGraph, ContextNode
+
+# Standard BM25 parameters (Robertson & Zaragoza)
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+_TERM_RE = re.compile(r"[a-z0-9]+(?:[._-][a-z0-9]+)*")
+
+
+@lru_cache(maxsize=4096)
+def tokenize(text: str) -> tuple[str, ...]:
+    """Lowercase word/number tokens of ``text`` (cached)."""
+    return tuple(_TERM_RE.findall(text.lower()))
+
+
+def node_text(node: ContextNode) -> str:
+    """Searchable text of a node: its name plus scalar property values."""
+    parts = [node.name]
+    for value in node.properties.values():
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            parts.append(str(value))
+    return " ".join(parts)
+
+
+class KeywordIndex:
+    """BM25 inverted index over the nodes of one ``ContextGraph``."""
+
+    def __init__(self, nodes: Iterable[ContextNode]) -> None:
+        self._node_ids: list[str] = []
+        self._texts: list[str] = []
+        self._lengths: list[int] = []
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._pattern_hits: dict[str, frozenset[int]] = {}
+
+        for doc, node in enumerate(nodes):
+            text = node_text(node)
+            terms = tokenize(text)
+            self._node_ids.append(node.node_id)
+            self._texts.append(text.lower())
+            self._lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._postings.setdefault(term, []).append((doc, tf))
+
+        total = sum(self._lengths)
+        self._avg_length = total / len(self._lengths) if self._lengths else 0.0
+        n_docs = len(self._node_ids)
+        self._idf = {
+            term: math.log(1.0 + (n_docs - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self._postings.items()
+        }
+
+    @classmethod
+    def from_graph(cls, graph: ContextGraph) -> KeywordIndex:
+        return cls(graph.nodes)
+
+    def __len__(self) -> int:
+        return len(self._node_ids)
+
+    def bm25(self, query_terms: Iterable[str]) -> dict[int, float]:
+        """BM25 score per document position for the distinct ``query_terms``."""
+        scores: dict[int, float] = {}
+        avg = self._avg_length or 1.0
+        for term in set(query_terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for doc, tf in postings:
+                norm = _BM25_K1 * (1.0 - _BM25_B + _BM25_B * self._lengths[doc] / avg)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (_BM25_K1 + 1.0) / (tf + norm)
+        return scores
+
+    def pattern_hits(self, pattern: re.Pattern[str]) -> frozenset[int]:
+        """Positions of nodes whose text matches ``pattern`` (cached per pattern)."""
+        hits = self._pattern_hits.get(pattern.pattern)
+        if hits is None:
+            hits = frozenset(i for i, text in enumerate(self._texts) if pattern.search(text))
+            self._pattern_hits[pattern.pattern] = hits
+        return hits
+
+    def search(
+        self,
+        question: str,
+        patterns: Iterable[re.Pattern[str]] = (),
+        pattern_boost: float = 1.0,
+        top_k: int | None = None,
+    ) -> list[tuple[str, float]]:
+        """Rank nodes for ``question``; returns ``(node_id, score)`` best first.
+
+        ``patterns`` are keyword-rule regexes that already matched the
+        question; each node whose text also matches one gains ``pattern_boost``.
+        """
+        scores = self.bm25(tokenize(question))
+        for pattern in patterns:
+            for doc in self.pattern_hits(pattern):
+                scores[doc] = scores.get(doc, 0.0) + pattern_boost
+        # Ties keep graph insertion order
+        ranked = ((score, -doc) for doc, score in scores.items() if score > 0)
+        best = heapq.nlargest(top_k, ranked) if top_k is not None else sorted(ranked, reverse=True)
+        return [(self._node_ids[-neg_doc], score) for score, neg_doc in best]
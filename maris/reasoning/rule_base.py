@@ -0,0 +1,134 @@
+"""Process-wide compiled bridge-axiom rule base.
+
+Loading the axiom registry verifies every evidence DOI, and compiling it
+produces one ``InferenceRule`` per axiom. Neither result changes unless
+the template/evidence files do, so ``get_rule_base`` keeps a single
+compiled instance and rebuilds it only when a source file's mtime or size
+changes.
+
+Each rule base also memoizes inference traces. The cache lives on the
+instance, so a rebuild (new template version) drops stale traces with it.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable
+
+from maris.provenance.bridge_axiom import BridgeAxiom
+from maris.provenance.bridge_axiom_registry import BridgeAxiomRegistry
+from maris.reasoning.inference_engine import InferenceEngine, InferenceRule
+from maris.reasoning.rule_compiler import compile_all
+
+logger = logging.getLogger(__name__)
+
+_TRACE_CACHE_SIZE = 1024
+
+
+def source_fingerprint(paths: Iterable[Path | None]) -> str:
+    """Hash of (path, mtime, size) for each source; missing files hash as absent."""
+    digest = hashlib.sha256()
+    for path in paths:
+        if path is None:
+            continue
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}|{stat.st_mtime_ns}|{stat.st_size}\n".encode())
+        except OSError:
+            digest.update(f"{path}|missing\n".encode())
+    return digest.hexdigest()[:16]
+
+
+class CompiledRuleBase:
+    """Registry, compiled rules and a shared engine for one template version."""
+
+    def __init__(self, registry: BridgeAxiomRegistry, version: str = ""):
+        self.registry = registry
+        self.version = version
+        self.rules: dict[str, InferenceRule] = compile_all(registry.get_all())
+        self.engine = InferenceEngine()
+        self.engine.register_rules(self.rules.values())
+        self._traces: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.trace_hits = 0
+        self.trace_misses = 0
+
+    @classmethod
+    def load(cls, templates_path: Path, evidence_path: Path | None = None) -> CompiledRuleBase:
+        version = source_fingerprint((templates_path, evidence_path))
+        registry = BridgeAxiomRegistry(templates_path=templates_path, evidence_path=evidence_path)
+        rule_base = cls(registry, version=version)
+        logger.info("Compiled rule base %s: %d rules", version, len(rule_base.rules))
+        return rule_base
+
+    def engine_for(self, axioms: Iterable[BridgeAxiom]) -> InferenceEngine:
+        """Engine restricted to ``axioms``, reusing the precompiled rules."""
+        engine = InferenceEngine()
+        engine.register_rules(
+            rule for axiom in axioms
+            if (rule := self.rules.get(f"rule:{axiom.axiom_id}")) is not None
+        )
+        return engine
+
+    def memoize_trace(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the trace cached under ``key``, computing it on first use.
+
+        Callers receive a deep copy so they may mutate the result freely.
+        """
+        with self._lock:
+            if key in self._traces:
+                self._traces.move_to_end(key)
+                self.trace_hits += 1
+                return copy.deepcopy(self._traces[key])
+        value = compute()
+        with self._lock:
+            self.trace_misses += 1
+            self._traces[key] = value
+            self._traces.move_to_end(key)
+            while len(self._traces) > _TRACE_CACHE_SIZE:
+                self._traces.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "rules": len(self.rules),
+                "traces": len(self._traces),
+                "trace_hits": self.trace_hits,
+                "trace_misses": self.trace_misses,
+            }
+
+
+_current: CompiledRuleBase | None = None
+_current_sources: tuple[Path, Path | None] | None = None
+_build_lock = threading.Lock()
+
+
+def get_rule_base(templates_path: Path | str, evidence_path: Path | str | None = None) -> CompiledRuleBase:
+    """Return the compiled rule base, rebuilding it if its sources changed."""
+    global _current, _current_sources
+    sources = (Path(templates_path), Path(evidence_path) if evidence_path else None)
+    version = source_fingerprint(sources)
+    current = _current
+    if current is not None and _current_sources == sources and current.version == version:
+        return current
+    with _build_lock:
+        if _current is None or _current_sources != sources or _current.version != version:
+            _current = CompiledRuleBase.load(*sources)
+            _current_sources = sources
+        return _current
+
+
+def reset_rule_base() -> None:
+    """Drop the cached rule base (tests, forced reloads)."""
+    global _current, _current_sources
+    with _build_lock:
+        _current = None
+        _current_sources = None
@@ -17,6 +17,7 @@ import json
 import logging
 from pathlib import Path
 
+from maris.observability.tracing import traced
 from maris.scenario.constants import (
     BLUE_CARBON_SEQUESTRATION,
     CARBON_PRICE_SCENARIOS,
@@ -92,6 +93,7 @@ def _detect_habitat_and_area(site_data: dict) -> tuple[str, float]:
     return "unknown", 0.0
 
 
+@traced("scenario.blue_carbon_revenue")
 def compute_blue_carbon_revenue(
     site_name: str,
     site_data: dict,
@@ -193,6 +195,7 @@ def load_site_data(site_json_path: str | Path) -> dict:
         return json.load(f)
 
 
+@traced("scenario.portfolio_blue_carbon")
 def compute_portfolio_blue_carbon(
     price_scenario: str = "current_market",
     target_year: int = 2030,
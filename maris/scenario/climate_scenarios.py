@@ -17,6 +17,7 @@ from typing import Any
 
 import numpy as np
 
+from maris.observability.tracing import traced
 from maris.scenario.constants import (
     DEGRADATION_ANCHORS,
     SCENARIO_CONFIDENCE_PENALTIES,
@@ -202,6 +203,7 @@ def interpolate_degradation(
 # Climate scenario engine
 # ---------------------------------------------------------------------------
 
+@traced("scenario.climate")
 def run_climate_scenario(
     scenario_req: ScenarioRequest,
     n_simulations: int = 10_000,
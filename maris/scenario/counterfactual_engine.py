@@ -15,6 +15,7 @@ from typing import Any
 
 import numpy as np
 
+from maris.observability.tracing import traced
 from maris.scenario.constants import (
     SCENARIO_CONFIDENCE_PENALTIES,
     SERVICE_REEF_SENSITIVITY,
@@ -500,6 +501,7 @@ def _compute_confidence(
 # Public API
 # ---------------------------------------------------------------------------
 
+@traced("scenario.counterfactual")
 def run_counterfactual(scenario_req: ScenarioRequest) -> ScenarioResponse:
     """Run a counterfactual scenario: 'What would this site be worth without protection?'
 
@@ -19,6 +19,8 @@ import logging
 
 import numpy as np
 
+from maris.observability.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 # Volatility by valuation method (annualized, from CI convention)
@@ -56,6 +58,7 @@ def _estimate_esv_volatility(site_data: dict) -> float:
     return weighted_vol
 
 
+@traced("scenario.real_options")
 def compute_conservation_option_value(
     site_data: dict,
     investment_cost_usd: float,
@@ -21,6 +21,7 @@ from pathlib import Path
 
 import numpy as np
 
+from maris.observability.tracing import traced
 from maris.scenario.constants import DEGRADATION_ANCHORS
 
 logger = logging.getLogger(__name__)
@@ -144,6 +145,7 @@ def load_portfolio_esv() -> dict[str, dict]:
     return result
 
 
+@traced("scenario.stress_test")
 def run_portfolio_stress_test(
     site_esv_map: dict[str, dict] | None = None,
     stress_scenario: str = "thermal",
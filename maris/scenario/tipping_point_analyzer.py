@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import pathlib
 
+from maris.observability.tracing import traced
 from maris.scenario.constants import BIOMASS_THRESHOLDS
 
 # Pre-protection biomass baseline for overfished reefs (kg/ha)
@@ -109,6 +110,7 @@ def get_threshold_proximity(biomass_kg_ha: float) -> str:
     )
 
 
+@traced("scenario.tipping_point")
 def get_tipping_point_site_report(site_data: dict) -> dict:
     """Generate a tipping point report for a given site's case study JSON.
 
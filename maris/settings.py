@@ -32,6 +32,7 @@ class MARISSettings(BaseSettings):
     neo4j_user: str = Field(default="neo4j")
     neo4j_password: str = Field(default="")
     neo4j_database: str = Field(default="neo4j")
+    population_batch_size: int = 500  # Rows per UNWIND write during graph population
     
     # v4 Specific Neo4j (Optional)
     neo4j_uri_v4: str | None = None
@@ -46,6 +47,13 @@ class MARISSettings(BaseSettings):
     llm_timeout: int = 30
     llm_max_tokens: int = 4096
 
+    # LLM completion cache (deterministic, low-temperature calls only)
+    llm_cache_enabled: bool = True
+    llm_cache_db: str = "data/cache/llm_cache.db"  # Relative to the project root; empty = in-process only
+    llm_cache_ttl_seconds: float = 30 * 24 * 3600.0
+    llm_cache_max_entries: int = 50000
+    llm_cache_max_temperature: float = 0.2
+
     # --- Extraction Settings ---
     extraction_confidence_threshold: float = 0.7
     extraction_chunk_size: int = 1500
@@ -60,6 +68,34 @@ class MARISSettings(BaseSettings):
     # --- Provenance ---
     provenance_db: str = "provenance.db"
 
+    # --- Query Pipeline ---
+    query_stage_concurrency: int = 4  # Max concurrent graph/inference stages per query
+    query_graph_timeout_seconds: float = 30.0
+    query_provenance_timeout_seconds: float = 15.0
+    query_generation_timeout_seconds: float = 90.0
+    query_batch_llm_concurrency: int = 4  # Max concurrent LLM calls per /api/query/batch
+    query_context_token_budget: int = 6000  # Graph-context tokens per synthesis prompt (0 = unlimited)
+    query_materialized_provenance: bool = True  # Serve provenance edges from per-subject cache blobs keyed by graph epoch
+    query_precomputed_neighborhoods: bool = True  # Serve traversal templates from per-node k-hop blobs
+    query_neighborhood_hops: int = 3  # Depth precomputed per site/axiom (deeper requests run live)
+    query_neighborhood_max_paths: int = 500  # Paths (or drilldown rows) stored per node
+    query_neighborhood_max_bytes: int = 262144  # Encoded size cap per node and view
+
+    # --- Query Response Cache ---
+    query_cache_enabled: bool = True
+    query_cache_max_entries: int = 512
+    query_cache_ttl_seconds: float = 3600.0
+    query_cache_stale_seconds: float = 600.0  # Serve stale while refreshing
+    query_cache_db: str = ""  # SQLite path; empty = in-process only
+
+    # --- Observability ---
+    metrics_enabled: bool = True  # Serve Prometheus text metrics at GET /metrics
+    tracing_exporters: str = ""  # Comma-separated: jsonl, memory, otlp (empty = tracing off)
+    tracing_jsonl_path: str = "traces.jsonl"
+    tracing_otlp_path: str = "traces.otlp.jsonl"  # OTLP/JSON payloads, one per line
+    tracing_memory_spans: int = 2048  # Ring buffer size for the memory exporter
+    tracing_service_name: str = "maris-api"
+
     # --- Feature Flags ---
     enable_live_graph: bool = True
     enable_chat: bool = True
@@ -75,6 +111,13 @@ class MARISSettings(BaseSettings):
     def data_dir(self) -> Path:
         return self.project_root / "data"
 
+    @property
+    def llm_cache_path(self) -> str:
+        """Completion cache database path ("" keeps the cache in-process)."""
+        if not self.llm_cache_db:
+            return ""
+        return str(self.project_root / self.llm_cache_db)
+
     @property
     def papers_dir(self) -> Path:
         return self.data_dir / "papers"
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compare the property lookups in MARIS Cypher with the declared schema.
+
+Reads the query templates, validation queries and population Cypher, and
+prints the index and constraint statements missing from
+maris/graph/schema.py::SCHEMA_STATEMENTS. Exits 1 when any are missing.
+
+Usage:
+    python scripts/advise_indexes.py           # report missing statements
+    python scripts/advise_indexes.py --json    # machine-readable report
+    python scripts/advise_indexes.py --apply   # also run them against Neo4j
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from maris.graph.index_advisor import advise, apply_recommendations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggest missing Neo4j indexes for MARIS Cypher")
+    parser.add_argument("--apply", action="store_true", help="Run the missing statements against Neo4j")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    result = advise()
+
+    if args.json:
+        print(json.dumps({
+            "recommendations": [asdict(r) for r in result.recommendations],
+            "unlabeled": [asdict(u) for u in result.unlabeled],
+        }, indent=2))
+    else:
+        print(f"Analysed {len(result.lookups)} indexable lookups.")
+        for rec in result.recommendations:
+            print(f"\n  {rec.statement};\n    used by: {', '.join(rec.sources)}")
+        for lookup in result.unlabeled:
+            print(f"  unlabeled   {lookup.source}: {lookup.variable}.{lookup.prop} (no index can serve it)")
+        if not result.recommendations:
+            print("Schema covers every labelled lookup.")
+
+    if args.apply and result.recommendations:
+        from maris.config import get_config
+        from maris.graph.connection import close_driver, get_driver
+
+        try:
+            with get_driver().session(database=get_config().neo4j_database) as session:
+                outcome = apply_recommendations(session, result.recommendations)
+        finally:
+            close_driver()
+        failed = {stmt: err for stmt, err in outcome.items() if err}
+        print(f"\nApplied {len(outcome) - len(failed)}/{len(outcome)} statements.")
+        for stmt, err in failed.items():
+            print(f"  FAILED  {stmt}: {err}")
+        sys.exit(1 if failed else 0)
+
+    sys.exit(1 if result.recommendations else 0)
+
+
+if __name__ == "__main__":
+    main()
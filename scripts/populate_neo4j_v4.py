@@ -114,7 +114,11 @@ def populate_v4(validate: bool = False) -> int:
         _populate_provenance,
         _populate_relationships,
     )
-    from maris.graph.schema import SCHEMA_STATEMENTS
+    from maris.graph.batch_writer import BatchWriter
+    from maris.graph.epoch import bump_graph_epoch
+    from maris.graph.materialized_neighborhoods import materialize_neighborhoods
+    from maris.graph.materialized_provenance import materialize_provenance
+    from maris.graph.schema import OPTIONAL_STATEMENTS, SCHEMA_STATEMENTS
     from maris.query.classifier import register_dynamic_sites
     from neo4j import GraphDatabase
 
@@ -148,7 +152,9 @@ def populate_v4(validate: bool = False) -> int:
                 session.run(stmt)
             except Exception as e:
                 # Ignore index already exists errors
-                if "already exists" not in str(e).lower():
+                if stmt in OPTIONAL_STATEMENTS:
+                    print(f"  Skipped optional schema statement: {e}")
+                elif "already exists" not in str(e).lower():
                     raise
         print(f"  Schema applied.")
         print()
@@ -156,13 +162,18 @@ def populate_v4(validate: bool = False) -> int:
         # Step 2: Core pipeline (legacy)
         print("Step 2: Core population pipeline...")
         # Note: These functions take 'cfg' which is now compliant thanks to our wrapper
-        total += _populate_documents(session, cfg)
-        total += _populate_entities(session, cfg)
-        total += _populate_bridge_axioms(session, cfg)
-        total += _populate_comparison_sites(session)
-        total += _populate_relationships(session, cfg)
-        total += _populate_cross_domain_links(session)
-        total += _populate_provenance(session, cfg)
+        # Each stage's rows are written as UNWIND batches before the next stage
+        for stage, args in (
+            (_populate_documents, (cfg,)),
+            (_populate_entities, (cfg,)),
+            (_populate_bridge_axioms, (cfg,)),
+            (_populate_comparison_sites, ()),
+            (_populate_relationships, (cfg,)),
+            (_populate_cross_domain_links, ()),
+            (_populate_provenance, (cfg,)),
+        ):
+            with BatchWriter(session, cfg.population_batch_size) as writer:
+                total += stage(writer, *args)
         print()
 
         # Step 3: Case Studies (New Service)
@@ -177,6 +188,16 @@ def populate_v4(validate: bool = False) -> int:
         total += _populate_concepts(session)
         print()
 
+        # Invalidate epoch-keyed API caches (query responses)
+        epoch = bump_graph_epoch(session)
+        print(f"Graph epoch: {epoch}")
+
+        # Precomputed provenance edges, fresh for the new epoch
+        materialized = materialize_provenance(session, epoch)
+        print(f"  Materialized provenance: {materialized['site']} sites, {materialized['axiom']} axioms")
+        print(f"  Materialized neighborhoods: {materialize_neighborhoods(session, epoch)} nodes")
+        print()
+
     # Step 5: Dynamic Registration
     print("Step 5: Registering sites...")
     site_names = [name for name, _ in sites]
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Refresh the precomputed k-hop neighborhoods of sites and bridge axioms.
+
+Population refreshes them automatically; run this after other graph
+writes (enrichment, manual edits) that bump the graph epoch, so traversal
+requests stop falling back to live queries.
+
+Usage:
+    python scripts/precompute_neighborhoods.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from maris.config import get_config
+from maris.graph.connection import close_driver
+from maris.graph.materialized_neighborhoods import materialize_neighborhoods
+
+
+def main():
+    cfg = get_config()
+    print(f"Neo4j: {cfg.neo4j_uri} (database: {cfg.neo4j_database})")
+    print(
+        f"Depth {cfg.query_neighborhood_hops}, caps: {cfg.query_neighborhood_max_paths} paths, "
+        f"{cfg.query_neighborhood_max_bytes} bytes per node"
+    )
+    try:
+        count = materialize_neighborhoods()
+    except Exception as e:
+        print(f"\nERROR: {e}")
+        sys.exit(1)
+    finally:
+        close_driver()
+    print(f"Materialized neighborhoods: {count} nodes")
+
+
+if __name__ == "__main__":
+    main()
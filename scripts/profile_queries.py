@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+PROFILE every Cypher template and validation query against the fixture graph.
+
+Records db hits, rows and operator trees, and fails when a query exceeds
+its checked-in budget (tests/fixtures/query_budgets.json) or has none. The
+CI query-profile job seeds a fresh server and uploads the recorded budgets
+as an artifact; commit that file to set or move the baseline.
+
+Usage:
+    # Throwaway Neo4j for the fixture (must be empty before --seed)
+    docker run -d --rm -p 7688:7687 -e NEO4J_AUTH=neo4j/profiling neo4j:5-community
+    export MARIS_NEO4J_URI=bolt://localhost:7688 MARIS_NEO4J_PASSWORD=profiling
+
+    python scripts/profile_queries.py --seed              # seed, profile, check budgets
+    python scripts/profile_queries.py --report plans.json # also write operator trees
+    python scripts/profile_queries.py --update-budgets    # record a new baseline
+    python scripts/profile_queries.py --seed --update-budgets  # first baseline
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from maris.config import get_config
+from maris.graph.connection import close_driver, get_driver
+from maris.graph.query_profile import (
+    DEFAULT_BUDGETS_PATH,
+    budgets_from,
+    check_budgets,
+    load_budgets,
+    profile_all,
+    report,
+    seed_fixture_graph,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile MARIS Cypher templates against budgets")
+    parser.add_argument("--seed", action="store_true", help="Seed the fixture graph into an empty database first")
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS_PATH, help="Budgets JSON file")
+    parser.add_argument("--update-budgets", action="store_true", help="Write current results as the new budgets")
+    parser.add_argument("--report", type=Path, help="Write results with operator trees to this JSON file")
+    args = parser.parse_args()
+
+    cfg = get_config()
+    print(f"Neo4j: {cfg.neo4j_uri} (database: {cfg.neo4j_database})")
+
+    try:
+        with get_driver().session(database=cfg.neo4j_database) as session:
+            if args.seed:
+                print(f"Seeded fixture graph: {seed_fixture_graph(session)} nodes")
+            results = profile_all(session)
+    except Exception as e:
+        print(f"\nERROR: {e}")
+        sys.exit(1)
+    finally:
+        close_driver()
+
+    print(f"\n{'query':45s} {'db hits':>10s} {'rows':>6s}")
+    for r in results:
+        print(f"{r.key:45s} {r.db_hits:>10d} {r.rows:>6d}")
+
+    if args.report:
+        args.report.write_text(json.dumps(report(results), indent=2) + "\n")
+        print(f"\nReport written to {args.report}")
+
+    budgets = load_budgets(args.budgets) if args.budgets.exists() else {}
+    if args.update_budgets:
+        args.budgets.write_text(json.dumps(budgets_from(results, budgets.get("tolerance", 0.10)), indent=2) + "\n")
+        print(f"Budgets updated: {args.budgets}")
+        return
+
+    check = check_budgets(results, budgets)
+    for line in check.improved:
+        print(f"  improved    {line}")
+    for key in check.unbudgeted:
+        print(f"  unbudgeted  {key}")
+    for line in check.regressions:
+        print(f"  REGRESSION  {line}")
+    if check.regressions:
+        print(f"\n{len(check.regressions)} budget regression(s). Fix the query or re-baseline with --update-budgets.")
+    if check.unbudgeted:
+        print(f"\n{len(check.unbudgeted)} unbudgeted query(ies). Record a baseline with --update-budgets.")
+    if not check.ok:
+        sys.exit(1)
+    print("\nAll queries within budget.")
+
+
+if __name__ == "__main__":
+    main()
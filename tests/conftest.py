@@ -149,6 +149,7 @@ def mock_config():
         cfg.llm_model = "deepseek-chat"
         cfg.llm_timeout = 30
         cfg.llm_max_tokens = 4096
+        cfg.llm_cache_enabled = False
         cfg.api_key = "test-api-key"
         cfg.cors_origins = ["http://localhost:8501"]
         cfg.demo_mode = True
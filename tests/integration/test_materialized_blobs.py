@@ -0,0 +1,115 @@
+"""Integration regression: materialized blobs never surface in graph responses.
+
+Materializes provenance and neighborhood blobs for a small, isolated
+fixture site and axiom, then checks that the node detail endpoint and the
+open-domain templates returning ``properties(n)`` expose neither the blobs
+nor the cache nodes holding them.
+
+Run via:
+    pytest tests/integration/test_materialized_blobs.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+load_dotenv(PROJECT_ROOT / ".env", override=True)
+
+import maris.config as _cfg_mod  # noqa: E402
+_cfg_mod._config = None
+
+import maris.graph.connection as _conn_mod  # noqa: E402
+_conn_mod._driver = None
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from maris.api.main import create_app  # noqa: E402
+from maris.config import get_config  # noqa: E402
+from maris.graph import materialized_neighborhoods as neighborhoods  # noqa: E402
+from maris.graph.connection import get_driver  # noqa: E402
+from maris.graph.materialized_provenance import SUBJECTS, store_parameters  # noqa: E402
+from maris.query.executor import QueryExecutor  # noqa: E402
+
+
+def _neo4j_available() -> bool:
+    try:
+        get_driver().verify_connectivity()
+        return True
+    except Exception:
+        return False
+
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(not _neo4j_available(), reason="Neo4j not reachable"),
+]
+
+BLOB_KEYS = ("provenance_edges", "provenance_epoch", "neighborhood", "neighborhood_epoch")
+CACHE_LABELS = ("ProvenanceCache", "NeighborhoodCache")
+
+_FIXTURE_CYPHER = """
+    CREATE (m:MPA {name: $site, fixture_tag: $tag})
+    CREATE (m)-[:GENERATES]->(:EcosystemService {service_name: $tag + '-svc', fixture_tag: $tag})
+    CREATE (:BridgeAxiom {axiom_id: $axiom_id, name: $axiom, fixture_tag: $tag})-[:APPLIES_TO]->(m)
+    RETURN elementId(m) AS site_id
+"""
+
+
+@pytest.fixture(scope="module")
+def fixture_site():
+    tag = f"blob-fixture-{uuid.uuid4().hex[:8]}"
+    site, axiom_id, axiom = f"{tag} Marine Park", f"{tag}-BA", f"{tag} axiom"
+    edges = [{"from_node": site, "from_type": "MPA", "relationship": "GENERATES",
+              "to_node": f"{tag}-svc", "to_type": "EcosystemService"}]
+    blob = neighborhoods.encode_neighborhood({"traverse": {"paths": [], "complete_hops": 0}})
+    with get_driver().session(database=get_config().neo4j_database) as session:
+        site_id = session.run(_FIXTURE_CYPHER, {
+            "site": site, "tag": tag, "axiom_id": axiom_id, "axiom": axiom,
+        }).single()["site_id"]
+        session.run(SUBJECTS["site"].store_cypher, store_parameters({site: edges}, 1)).consume()
+        session.run(SUBJECTS["axiom"].store_cypher, store_parameters({axiom_id: edges}, 1)).consume()
+        session.run(neighborhoods.STORE_CYPHER, {
+            "rows": [{"key": site, "neighborhood": blob}, {"key": axiom, "neighborhood": blob}],
+            "epoch": 1,
+        }).consume()
+    yield {"tag": tag, "site": site, "site_id": site_id}
+    with get_driver().session(database=get_config().neo4j_database) as session:
+        session.run("MATCH (n {fixture_tag: $tag}) DETACH DELETE n", {"tag": tag}).consume()
+        session.run(
+            "MATCH (c) WHERE (c:ProvenanceCache OR c:NeighborhoodCache) AND c.key IN $keys DELETE c",
+            {"keys": [site, axiom_id, axiom]},
+        ).consume()
+
+
+def _assert_no_blobs(payload) -> None:
+    text = json.dumps(payload, default=str)
+    for key in BLOB_KEYS + CACHE_LABELS:
+        assert key not in text
+
+
+def test_node_detail_endpoint(fixture_site):
+    _cfg_mod._config = None
+    client = TestClient(create_app())
+    response = client.get(
+        f"/api/graph/node/{fixture_site['site_id']}",
+        headers={"Authorization": f"Bearer {get_config().api_key}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["props"]["name"] == fixture_site["site"]
+    _assert_no_blobs(response.json())
+
+
+@pytest.mark.parametrize("template, params", [
+    ("graph_neighborhood", lambda f: {"start_name": f["site"], "max_hops": 2}),
+    ("semantic_search", lambda f: {"search_term": f["tag"]}),
+])
+def test_open_domain_templates(fixture_site, template, params):
+    result = QueryExecutor().execute(template, params(fixture_site))
+    assert result["results"]
+    _assert_no_blobs(result["results"])
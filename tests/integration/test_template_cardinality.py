@@ -0,0 +1,182 @@
+"""Integration regression: Cartesian-free templates against a fixture graph.
+
+Builds a small, isolated fixture site whose branches (services, axioms x
+documents, risks, processes, mechanisms) would multiply to thousands of
+intermediate rows under chained OPTIONAL MATCHes, then checks that the
+subquery templates return exactly what the legacy chained form returned,
+with far fewer database hits.
+
+Run via:
+    pytest tests/integration/test_template_cardinality.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+load_dotenv(PROJECT_ROOT / ".env", override=True)
+
+import maris.config as _cfg_mod  # noqa: E402
+_cfg_mod._config = None
+
+import maris.graph.connection as _conn_mod  # noqa: E402
+_conn_mod._driver = None
+
+from maris.config import get_config  # noqa: E402
+from maris.graph.connection import get_driver  # noqa: E402
+from maris.query.cypher_templates import get_template  # noqa: E402
+
+
+def _neo4j_available() -> bool:
+    try:
+        get_driver().verify_connectivity()
+        return True
+    except Exception:
+        return False
+
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(not _neo4j_available(), reason="Neo4j not reachable"),
+]
+
+N_SERVICES, N_AXIOMS, N_DOCS_PER_AXIOM, N_RISKS, N_PROCESSES, N_MECHANISMS = 6, 5, 4, 3, 3, 2
+
+# The chained OPTIONAL MATCH forms these templates replaced
+LEGACY = {
+    "site_valuation": """
+        MATCH (m:MPA {name: $site_name})
+        OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
+        OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
+        OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+        OPTIONAL MATCH (m)-[:HAS_ECOLOGICAL_PROCESS]->(p:EcologicalProcess)
+        OPTIONAL MATCH (m)-[:USING_MECHANISM]->(fm:FinancialMechanism)
+        OPTIONAL MATCH (m)-[rel:FACES_RISK]->(r:Risk)
+        RETURN m.name AS site, m.total_esv_usd AS total_esv,
+               m.biomass_ratio AS biomass_ratio, m.neoli_score AS neoli_score,
+               m.asset_rating AS asset_rating,
+               collect(DISTINCT {service: es.service_name, value_usd: es.annual_value_usd,
+                                 method: es.valuation_method, ci_low: properties(es)['ci_low'],
+                                 ci_high: properties(es)['ci_high']}) AS services,
+               collect(DISTINCT {name: fm.name, type: fm.type, amount_usd: fm.amount_usd,
+                                 description: fm.description}) AS financial_mechanisms,
+               collect(DISTINCT {process: p.name, description: p.description, effect: p.effect,
+                                 chain: p.chain}) AS ecological_processes,
+               collect(DISTINCT {risk: r.name, severity: rel.severity, likelihood: rel.likelihood,
+                                 evidence: rel.evidence}) AS risks,
+               collect(DISTINCT {axiom_id: ba.axiom_id, axiom_name: ba.name, doi: d.doi,
+                                 title: d.title, year: d.year, tier: d.source_tier}) AS evidence
+        LIMIT $result_limit
+    """,
+    "risk_assessment": """
+        MATCH (m:MPA {name: $site_name})
+        OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
+        OPTIONAL MATCH (m)-[:FACES_RISK]->(r:Risk)
+        OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
+        WHERE ba.category IN ['ecological_to_service', 'ecological_to_ecological']
+        OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+        RETURN m.name AS site, m.total_esv_usd AS total_esv,
+               m.biomass_ratio AS biomass_ratio,
+               collect(DISTINCT {service: es.service_name, value_usd: es.annual_value_usd,
+                                 ci_low: properties(es)['ci_low'],
+                                 ci_high: properties(es)['ci_high']}) AS services,
+               collect(DISTINCT {risk: r.name, severity: r.severity, likelihood: r.likelihood,
+                                 evidence: r.evidence}) AS risks,
+               collect(DISTINCT {axiom_id: ba.axiom_id, axiom_name: ba.name,
+                                 coefficients: ba.coefficients_json, doi: d.doi, title: d.title,
+                                 year: d.year, tier: d.source_tier}) AS risk_axioms
+        LIMIT $result_limit
+    """,
+    "comparison": """
+        MATCH (m:MPA)
+        WHERE m.name IN $site_names
+        OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService)
+        OPTIONAL MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m)
+        OPTIONAL MATCH (ba)-[:EVIDENCED_BY]->(d:Document)
+        RETURN m.name AS site, m.total_esv_usd AS total_esv,
+               m.biomass_ratio AS biomass_ratio, m.neoli_score AS neoli_score,
+               m.asset_rating AS asset_rating,
+               collect(DISTINCT {service: es.service_name, value_usd: es.annual_value_usd}) AS services,
+               collect(DISTINCT {doi: d.doi, title: d.title, year: d.year, tier: d.source_tier}) AS evidence
+        ORDER BY m.total_esv_usd DESC
+        LIMIT $result_limit
+    """,
+}
+
+_FIXTURE_CYPHER = """
+    CREATE (m:MPA {name: $site, fixture_tag: $tag, total_esv_usd: 1.0e6, biomass_ratio: 4.6,
+                   neoli_score: 4, asset_rating: 'AA'})
+    WITH m
+    UNWIND range(1, $n_services) AS i
+    CREATE (m)-[:GENERATES]->(:EcosystemService {service_name: $tag + '-svc-' + i, fixture_tag: $tag,
+                                                 annual_value_usd: i * 1000.0, valuation_method: 'market'})
+    WITH DISTINCT m
+    UNWIND range(1, $n_axioms) AS a
+    CREATE (ba:BridgeAxiom {axiom_id: $tag + '-BA-' + a, name: 'axiom ' + a, fixture_tag: $tag,
+                            category: 'ecological_to_service', coefficients_json: '{}'})-[:APPLIES_TO]->(m)
+    WITH m, ba, a
+    UNWIND range(1, $n_docs) AS k
+    CREATE (ba)-[:EVIDENCED_BY]->(:Document {doi: $tag + '/' + a + '.' + k, title: 'doc ' + a + '.' + k,
+                                             year: 2000 + k, source_tier: 'T1', fixture_tag: $tag})
+    WITH DISTINCT m
+    UNWIND range(1, $n_risks) AS i
+    CREATE (m)-[:FACES_RISK {severity: 'high', likelihood: 0.1 * i, evidence: 'e'}]->
+           (:Risk {name: $tag + '-risk-' + i, severity: 'high', fixture_tag: $tag})
+    WITH DISTINCT m
+    UNWIND range(1, $n_processes) AS i
+    CREATE (m)-[:HAS_ECOLOGICAL_PROCESS]->(:EcologicalProcess {name: $tag + '-proc-' + i, fixture_tag: $tag})
+    WITH DISTINCT m
+    UNWIND range(1, $n_mechanisms) AS i
+    CREATE (m)-[:USING_MECHANISM]->(:FinancialMechanism {name: $tag + '-fm-' + i, fixture_tag: $tag})
+"""
+
+
+@pytest.fixture(scope="module")
+def fixture_site():
+    tag = f"cardinality-fixture-{uuid.uuid4().hex[:8]}"
+    site = f"{tag} Marine Park"
+    with get_driver().session(database=get_config().neo4j_database) as session:
+        session.run(_FIXTURE_CYPHER, {
+            "site": site, "tag": tag, "n_services": N_SERVICES, "n_axioms": N_AXIOMS,
+            "n_docs": N_DOCS_PER_AXIOM, "n_risks": N_RISKS, "n_processes": N_PROCESSES,
+            "n_mechanisms": N_MECHANISMS,
+        }).consume()
+    yield site
+    with get_driver().session(database=get_config().neo4j_database) as session:
+        session.run("MATCH (n {fixture_tag: $tag}) DETACH DELETE n", {"tag": tag}).consume()
+
+
+def _profile(cypher: str, params: dict) -> tuple[list[dict], int]:
+    """Rows (lists sorted for order-insensitive comparison) and total db hits."""
+    def _hits(plan: dict) -> int:
+        return plan.get("dbHits", 0) + sum(_hits(child) for child in plan.get("children", []))
+
+    def _normalize(value):
+        if isinstance(value, list):
+            return sorted((_normalize(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True, default=str))
+        return value
+
+    with get_driver().session(database=get_config().neo4j_database) as session:
+        result = session.run(f"PROFILE {cypher}", params)
+        rows = [{k: _normalize(v) for k, v in record.data().items()} for record in result]
+        return rows, _hits(result.consume().profile)
+
+
+@pytest.mark.parametrize("name", sorted(LEGACY))
+def test_identical_results_with_fewer_db_hits(fixture_site, name):
+    params = {"site_name": fixture_site, "site_names": [fixture_site], "result_limit": 100}
+    legacy_rows, legacy_hits = _profile(LEGACY[name], params)
+    rows, hits = _profile(get_template(name)["cypher"], params)
+
+    assert rows == legacy_rows
+    assert len(rows) == 1
+    # Bounded by the fixture's size (sum of branches), not the product of them
+    fixture_elements = 1 + N_SERVICES + N_AXIOMS * (1 + N_DOCS_PER_AXIOM) + N_RISKS + N_PROCESSES + N_MECHANISMS
+    assert hits <= 20 * fixture_elements
+    assert hits < legacy_hits
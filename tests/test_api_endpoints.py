@@ -120,8 +120,6 @@ class TestQueryEndpoint:
         qmod._classifier = mock_cls
         qmod._executor = mock_exec
         qmod._generator = mock_gen
-        qmod._axiom_registry = MagicMock()
-        qmod._inference_engine = MagicMock()
 
         response = client.post(
             "/api/query",
@@ -207,8 +205,6 @@ class TestQueryEndpoint:
         qmod._classifier = mock_cls
         qmod._executor = mock_exec
         qmod._generator = mock_gen
-        qmod._axiom_registry = MagicMock()
-        qmod._inference_engine = MagicMock()
 
         response = client.post(
             "/api/query",
@@ -276,8 +272,6 @@ class TestQueryEndpoint:
         qmod._classifier = mock_cls
         qmod._executor = mock_exec
         qmod._generator = mock_gen
-        qmod._axiom_registry = MagicMock()
-        qmod._inference_engine = MagicMock()
 
         response = client.post(
             "/api/query",
@@ -321,8 +315,6 @@ class TestQueryEndpoint:
         qmod._classifier = mock_cls
         qmod._executor = mock_exec
         qmod._generator = mock_gen
-        qmod._axiom_registry = MagicMock()
-        qmod._inference_engine = MagicMock()
 
         response = client.post(
             "/api/query",
@@ -365,8 +357,6 @@ class TestQueryEndpoint:
         qmod._classifier = mock_cls
         qmod._executor = mock_exec
         qmod._generator = mock_gen
-        qmod._axiom_registry = MagicMock()
-        qmod._inference_engine = MagicMock()
 
         response = client.post(
             "/api/query",
@@ -473,19 +463,17 @@ class TestRuntimeSiteRegistration:
         qmod._classifier = None
         qmod._executor = None
         qmod._generator = None
-        qmod._axiom_registry = None
-        qmod._inference_engine = None
         qmod._dynamic_sites_registered = False
 
         with (
             patch.object(qmod, "_register_runtime_sites") as mock_runtime_register,
             patch.object(qmod, "get_config") as mock_cfg,
             patch.object(qmod, "LLMAdapter", return_value=MagicMock()),
+            patch.object(qmod, "AsyncLLMAdapter", return_value=MagicMock()),
             patch.object(qmod, "QueryClassifier", return_value=MagicMock()),
             patch.object(qmod, "QueryExecutor", return_value=MagicMock()),
             patch.object(qmod, "ResponseGenerator", return_value=MagicMock()),
-            patch.object(qmod, "BridgeAxiomRegistry", return_value=MagicMock()),
-            patch.object(qmod, "InferenceEngine", return_value=MagicMock()),
+            patch.object(qmod, "get_rule_base", return_value=MagicMock()),
         ):
             mock_cfg.return_value = MagicMock(
                 schemas_dir=Path("/tmp"),
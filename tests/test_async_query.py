@@ -0,0 +1,196 @@
+"""Tests for the native async query path (driver, LLM adapter, executor, handler)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from maris.llm.cache import CompletionCache
+
+
+def _async_adapter(cache=None):
+    from maris.llm.adapter import AsyncLLMAdapter
+
+    config = MagicMock()
+    config.llm_provider = "deepseek"
+    config.llm_api_key = "test-key"
+    config.llm_base_url = "http://localhost"
+    config.llm_model = "test-model"
+    config.llm_max_tokens = 256
+    config.llm_timeout = 10
+    config.llm_cache_enabled = False
+    with patch("maris.llm.adapter.AsyncOpenAI") as mock_openai:
+        adapter = AsyncLLMAdapter(config, cache=cache)
+    create = AsyncMock()
+    create.return_value.choices = [MagicMock(message=MagicMock(content='{"category": "open_domain"}'))]
+    mock_openai.return_value.chat.completions.create = create
+    return adapter, create
+
+
+class TestAsyncLLMAdapter:
+    async def test_complete_json_uses_shared_cache(self):
+        adapter, create = _async_adapter(CompletionCache())
+        messages = [{"role": "user", "content": "classify"}]
+        assert await adapter.complete_json(messages) == {"category": "open_domain"}
+        assert await adapter.complete_json(messages) == {"category": "open_domain"}
+        assert create.await_count == 1
+
+    async def test_cache_io_runs_off_the_event_loop(self):
+        cache = CompletionCache()
+        adapter, _ = _async_adapter(cache)
+        with patch("maris.llm.adapter.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            await adapter.complete_json([{"role": "user", "content": "classify"}])
+        assert [c.args[0] for c in to_thread.call_args_list] == [cache.get, cache.put]
+
+    def test_missing_api_key_rejected(self):
+        from maris.llm.adapter import AsyncLLMAdapter
+
+        config = MagicMock(llm_provider="openai", llm_api_key="")
+        with pytest.raises(ValueError):
+            AsyncLLMAdapter(config)
+
+
+class TestAsyncDriver:
+    def test_driver_is_recreated_per_event_loop(self):
+        import maris.graph.async_connection as amod
+
+        drivers = []
+
+        def _make(*args, **kwargs):
+            driver = MagicMock()
+            driver.verify_connectivity = AsyncMock()
+            driver.close = AsyncMock()
+            drivers.append(driver)
+            return driver
+
+        async def _get_twice():
+            first = await amod.get_async_driver()
+            second = await amod.get_async_driver()
+            return first, second
+
+        with patch.object(amod.AsyncGraphDatabase, "driver", side_effect=_make):
+            a1, a2 = asyncio.run(_get_twice())
+            b1, _ = asyncio.run(_get_twice())
+            asyncio.run(amod.close_async_driver())
+
+        assert a1 is a2
+        assert b1 is not a1
+        assert len(drivers) == 2
+        assert amod._driver is None
+
+
+class TestAsyncExecutor:
+    async def test_execute_async_matches_sync_shape(self):
+        from maris.query.executor import QueryExecutor
+
+        rows = [{"site": "Cabo Pulmo National Park"}]
+        with (
+            patch("maris.query.executor.run_query_async", AsyncMock(return_value=rows)),
+            patch("maris.query.executor.run_query", return_value=rows),
+        ):
+            async_result = await QueryExecutor().execute_async(
+                "site_valuation", {"site_name": "Cabo Pulmo National Park"},
+            )
+            sync_result = QueryExecutor().execute(
+                "site_valuation", {"site_name": "Cabo Pulmo National Park"},
+            )
+        assert async_result == sync_result
+
+    async def test_strategy_async_reports_no_results(self):
+        from maris.query.executor import QueryExecutor
+
+        with patch("maris.query.executor.run_query_async", AsyncMock(return_value=[])):
+            result = await QueryExecutor().execute_with_strategy_async(
+                "site_valuation", {"site_name": "Nowhere"},
+            )
+        assert result["error_type"] == "no_results"
+
+    async def test_provenance_edges_async(self):
+        from maris.query.executor import QueryExecutor
+
+        edge = {
+            "from_node": "BA-001", "from_type": "BridgeAxiom", "relationship": "APPLIES_TO",
+            "to_node": "X", "to_type": "MPA",
+        }
+        mock_run = AsyncMock(return_value=[{"key": "A", **edge}, {"key": "B", **edge}])
+        with (
+            patch("maris.graph.epoch.get_graph_epoch", return_value=None),
+            patch("maris.query.executor.run_query_async", mock_run),
+        ):
+            edges = await QueryExecutor().get_provenance_edges_async(
+                "comparison", {"site_names": ["A", "B"]},
+            )
+        assert edges == [edge, edge]
+        # Both sites in one UNWIND round trip
+        mock_run.assert_awaited_once()
+        assert mock_run.await_args.args[1] == {"keys": ["A", "B"]}
+
+
+class TestAsyncClassifier:
+    async def test_rules_path_never_touches_llm(self):
+        from maris.query.classifier import QueryClassifier
+
+        async_llm = MagicMock()
+        async_llm.complete_json = AsyncMock()
+        result = await QueryClassifier(async_llm=async_llm).classify_async(
+            "What is Cabo Pulmo worth?"
+        )
+        assert result["category"] == "site_valuation"
+        async_llm.complete_json.assert_not_awaited()
+
+    async def test_llm_fallback_is_awaited(self):
+        from maris.query.classifier import QueryClassifier
+
+        async_llm = MagicMock()
+        async_llm.complete_json = AsyncMock(return_value={"category": "comparison", "confidence": 0.7})
+        result = await QueryClassifier(async_llm=async_llm).classify_async("zzz qqq")
+        assert result["category"] == "comparison"
+        async_llm.complete_json.assert_awaited_once()
+
+
+class TestAsyncQueryHandler:
+    def test_handler_awaits_native_stages(self):
+        import maris.api.routes.query as qmod
+        import maris.config
+        from fastapi.testclient import TestClient
+        from maris.api.main import create_app
+
+        classifier = MagicMock()
+        classifier.classify_async = AsyncMock(return_value={
+            "category": "open_domain",
+            "site": None,
+            "metrics": [],
+            "confidence": 0.6,
+            "caveats": [],
+        })
+        executor = MagicMock()
+        executor.execute_with_strategy_async = AsyncMock(return_value={
+            "error": "No results.",
+            "error_type": "no_results",
+            "results": [],
+            "record_count": 0,
+        })
+
+        qmod._llm = MagicMock()
+        qmod._classifier = classifier
+        qmod._executor = executor
+        qmod._generator = MagicMock()
+        previous_cache = qmod._response_cache
+        qmod._response_cache = None
+        try:
+            maris.config._config = None
+            client = TestClient(create_app())
+            with patch.object(qmod, "_init_components"):
+                response = client.post(
+                    "/api/query",
+                    json={"question": "Tell me about reef carbon"},
+                    headers={"Authorization": "Bearer test-api-key"},
+                )
+        finally:
+            qmod._response_cache = previous_cache
+
+        assert response.status_code == 200
+        classifier.classify_async.assert_awaited_once()
+        executor.execute_with_strategy_async.assert_awaited_once()
+        classifier.classify.assert_not_called()
+        executor.execute_with_strategy.assert_not_called()
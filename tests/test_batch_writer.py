@@ -0,0 +1,130 @@
+"""Tests for UNWIND-batched population writes."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from maris.config import get_config
+from maris.graph import population
+from maris.graph.batch_writer import BatchWriter, batchable, unwind_statement
+
+NODE = "MERGE (es:EcosystemService {service_id: $service_id}) SET es.service_name = $name"
+EDGE = """
+    MATCH (m:MPA {name: "Cabo Pulmo National Park"})
+    MATCH (es:EcosystemService {service_id: $service_id})
+    MERGE (m)-[:GENERATES]->(es)
+"""
+
+
+def _recording_session():
+    """A session whose writes (direct or via execute_write) land in ``session.writes``."""
+    session = MagicMock()
+    session.writes = []
+    tx = MagicMock()
+
+    def _run(cypher, parameters=None):
+        session.writes.append((cypher, parameters))
+        return MagicMock()
+
+    session.run.side_effect = _run
+    tx.run.side_effect = _run
+    session.execute_write.side_effect = lambda work: work(tx)
+    return session
+
+
+class TestStatements:
+    def test_parameters_are_read_from_the_row(self):
+        assert unwind_statement(EDGE) == "UNWIND $rows AS row\n" + EDGE.replace("$service_id", "row.service_id")
+
+    @pytest.mark.parametrize("cypher, expected", [
+        (NODE, True),
+        (EDGE, True),
+        ("MATCH (t:TrophicLevel) MATCH (m:MPA {name: 'x'}) MERGE (t)-[:PART_OF_FOODWEB]->(m)", False),
+        ("MATCH (d:Document) WHERE d.doc_id STARTS WITH $p WITH d LIMIT 1 MERGE (c)-[:CITED_IN]->(d)", False),
+        ("MERGE (n:Note {text: 'costs $5'}) SET n.k = $k", False),
+        ("MERGE (m:MPA {name: $name}) SET m.note = 'with care'", True),
+    ])
+    def test_batchable(self, cypher, expected):
+        assert batchable(cypher) is expected
+
+
+class TestBatchWriter:
+    def test_rows_grouped_per_statement_in_batches(self):
+        session = _recording_session()
+        with BatchWriter(session, batch_size=2) as writer:
+            for i in range(5):
+                writer.run(NODE, {"service_id": f"s{i}", "name": f"S{i}"})
+
+        assert [len(params["rows"]) for _, params in session.writes] == [2, 2, 1]
+        assert {cypher for cypher, _ in session.writes} == {unwind_statement(NODE)}
+        assert session.execute_write.call_count == 3
+        assert (writer.statements, writer.rows) == (3, 5)
+
+    def test_dependents_are_written_after_their_nodes(self):
+        session = _recording_session()
+        with BatchWriter(session, batch_size=3) as writer:
+            for i in range(4):
+                writer.run(NODE, {"service_id": f"s{i}", "name": f"S{i}"})
+                writer.run(EDGE, {"service_id": f"s{i}"})
+
+        written = [(c == unwind_statement(NODE), [r["service_id"] for r in p["rows"]]) for c, p in session.writes]
+        assert written == [(True, ["s0", "s1", "s2"]), (False, ["s0", "s1"]), (True, ["s3"]), (False, ["s2", "s3"])]
+
+    def test_unbatchable_statements_run_in_place(self):
+        session = _recording_session()
+        global_link = "MATCH (t:TrophicLevel) MERGE (t)-[:PART_OF_FOODWEB]->(:MPA {name: 'x'})"
+        with BatchWriter(session) as writer:
+            writer.run(NODE, {"service_id": "s0", "name": "S0"})
+            writer.run(global_link)
+            writer.run(NODE, {"service_id": "s1", "name": "S1"})
+
+        assert [c for c, _ in session.writes] == [unwind_statement(NODE), global_link, unwind_statement(NODE)]
+
+    def test_nothing_written_when_the_stage_fails(self):
+        session = _recording_session()
+        with pytest.raises(RuntimeError):
+            with BatchWriter(session) as writer:
+                writer.run(NODE, {"service_id": "s0", "name": "S0"})
+                raise RuntimeError("bad input")
+        assert session.writes == []
+
+
+def test_population_stages_write_the_same_rows():
+    """Batched stages issue exactly the per-row writes of the row-at-a-time path."""
+    cfg = get_config()
+    stages = [
+        (population._populate_entities, (cfg,)),
+        (population._populate_cabo_pulmo, (cfg,)),
+        (population._populate_shark_bay, (cfg,)),
+        (population._populate_bridge_axioms, (cfg,)),
+        (population._populate_comparison_sites, ()),
+        (population._populate_relationships, (cfg,)),
+        (population._populate_cross_domain_links, ()),
+        (population._populate_provenance, (cfg,)),
+    ]
+
+    direct = _recording_session()
+    for stage, args in stages:
+        stage(direct, *args)
+
+    batched = _recording_session()
+    for stage, args in stages:
+        with BatchWriter(batched, batch_size=16) as writer:
+            stage(writer, *args)
+
+    def per_statement(writes, expand):
+        rows = {}
+        for cypher, params in writes:
+            for original, row in expand(cypher, params):
+                rows.setdefault(original, []).append(row)
+        return rows
+
+    direct_rows = per_statement(direct.writes, lambda c, p: [(c, p or {})])
+    originals = {unwind_statement(c): c for c in direct_rows}
+    batched_rows = per_statement(
+        batched.writes,
+        lambda c, p: [(originals[c], row) for row in p["rows"]] if c in originals else [(c, p or {})],
+    )
+
+    assert batched_rows == direct_rows
+    assert len(batched.writes) < len(direct.writes) / 2
@@ -0,0 +1,127 @@
+"""Tests for token-budgeted graph context compaction."""
+
+import json
+from unittest.mock import MagicMock
+
+from maris.query.context_compactor import compact_graph_context, estimate_tokens
+
+DOCS = [
+    {"doi": "10.1371/journal.pone.0023601", "title": "Large recovery of fish biomass in a no-take marine reserve",
+     "year": 2011, "tier": "T1"},
+    {"doi": "10.1038/s41598-024-83664-1", "title": "Dive tourism willingness to pay", "year": 2024, "tier": "T1"},
+    {"doi": "10.5555/grey.report", "title": "Regional tourism report", "year": 2015, "tier": "T3"},
+    {"doi": "10.1016/j.marpol.2019.01.001", "title": "Mangrove carbon stocks", "year": 2019, "tier": "T2"},
+]
+
+
+def _comparison_context(n_sites=6):
+    rows = []
+    for i in range(n_sites):
+        rows.append({
+            "site": f"Site {i}",
+            "total_esv": 1_000_000 * (i + 1),
+            "biomass_ratio": None,
+            "neoli_score": 4,
+            "asset_rating": "",
+            "services": [
+                {"service": "Tourism", "value_usd": 250000 * (i + 1)},
+                {"service": None, "value_usd": None},
+            ],
+            "evidence": [dict(d) for d in DOCS] + [{"doi": None, "title": None, "year": None, "tier": None}],
+        })
+    return {
+        "template": "comparison",
+        "parameters": {"site_names": [r["site"] for r in rows]},
+        "results": rows,
+        "record_count": len(rows),
+        "has_more": False,
+        "strategy": "deterministic_template",
+    }
+
+
+class TestCompaction:
+    def test_comparison_context_is_much_smaller(self):
+        ctx = _comparison_context()
+        pretty = estimate_tokens(json.dumps(ctx, indent=2, default=str))
+        compact = compact_graph_context(ctx, question="Compare tourism value")
+        assert compact.tokens * 2 < pretty
+        assert not compact.over_budget
+
+    def test_evidence_hoisted_deduplicated_and_ranked(self):
+        compact = compact_graph_context(_comparison_context(), question="dive tourism value")
+        payload = json.loads(compact.text)
+        evidence = payload["evidence"]
+        assert len(evidence) == len(DOCS)
+        # T1 + question overlap ranks first; grey literature ranks last
+        assert evidence[0]["doi"] == "10.1038/s41598-024-83664-1"
+        assert evidence[-1]["tier"] == "T3"
+        # Rows keep DOI references only, nulls and bookkeeping are gone
+        row = payload["results"][0]
+        assert row["evidence"] == [d["doi"] for d in DOCS]
+        assert "biomass_ratio" not in row and "asset_rating" not in row
+        assert row["services"] == [{"service": "Tourism", "value_usd": 250000}]
+        assert "record_count" not in payload and "strategy" not in payload
+
+    def test_axioms_sharing_a_doi_keep_their_links(self):
+        doc = {"doi": "10.1/a", "title": "Shared paper", "year": 2020, "tier": "T1"}
+        ctx = {"results": [{"site": "A", "evidence": [
+            {"axiom_id": "BA-001", **doc},
+            {"axiom_id": "BA-002", **doc},
+            {"axiom_id": "BA-002", "doi": "10.1/b", "title": "Other paper", "year": 2018, "tier": "T2"},
+        ]}]}
+        payload = json.loads(compact_graph_context(ctx).text)
+        assert payload["results"][0]["evidence"] == [
+            {"axiom_id": "BA-001", "doi": "10.1/a"},
+            {"axiom_id": "BA-002", "doi": "10.1/a"},
+            {"axiom_id": "BA-002", "doi": "10.1/b"},
+        ]
+        assert payload["evidence"] == [doc, {"doi": "10.1/b", "title": "Other paper", "year": 2018, "tier": "T2"}]
+
+    def test_numbers_survive_compaction(self):
+        compact = compact_graph_context(_comparison_context(), question="")
+        assert "6000000" in compact.text
+
+    def test_budget_drops_low_ranked_evidence_and_refs(self):
+        ctx = _comparison_context()
+        unlimited = compact_graph_context(ctx)
+        budget = unlimited.tokens - 40
+        compact = compact_graph_context(ctx, question="dive tourism", token_budget=budget)
+        payload = json.loads(compact.text)
+        assert compact.tokens <= budget
+        assert compact.evidence_dropped >= 1
+        kept = {e["doi"] for e in payload["evidence"]}
+        assert "10.5555/grey.report" not in kept
+        for row in payload["results"]:
+            assert set(row["evidence"]) <= kept
+
+    def test_long_strings_shortened_before_dropping(self):
+        ctx = {"results": [{"site": "A", "description": "reef " * 400}]}
+        compact = compact_graph_context(ctx, token_budget=200)
+        assert compact.tokens <= 200
+        assert json.loads(compact.text)["results"][0]["description"].endswith("...")
+
+    def test_rows_dropped_as_last_resort(self):
+        ctx = {"results": [{"site": f"Site {i}", "note": "x" * 100} for i in range(50)]}
+        compact = compact_graph_context(ctx, token_budget=120)
+        assert compact.rows_dropped > 0
+        assert json.loads(compact.text)["results"][0]["site"] == "Site 0"
+
+    def test_estimate_tokens_is_monotonic(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("reef") < estimate_tokens("reef carbon sequestration")
+        assert estimate_tokens('{"a":1}') == 7
+
+
+class TestGeneratorPrompt:
+    def test_prompt_uses_compact_context(self):
+        from maris.query.generator import ResponseGenerator
+
+        llm = MagicMock()
+        llm.complete_json.return_value = {"answer": "ok", "evidence": []}
+        gen = ResponseGenerator(llm=llm, context_token_budget=0)
+        ctx = _comparison_context()
+        gen.generate("Compare tourism value", ctx, "comparison")
+
+        prompt = llm.complete_json.call_args.args[0][0]["content"]
+        assert compact_graph_context(ctx, question="Compare tourism value").text in prompt
+        assert json.dumps(ctx, indent=2, default=str) not in prompt
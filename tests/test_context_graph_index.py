@@ -0,0 +1,96 @@
+"""Tests for ContextGraph adjacency indexing and bounded traversals."""
+
+from maris.reasoning.context_builder import (
+    ContextEdge,
+    ContextGraph,
+    ContextNode,
+    build_context_from_results,
+)
+
+
+def _graph():
+    g = ContextGraph()
+    for node_id, node_type in [
+        ("mpa:A", "site"), ("service:Tourism", "service"), ("axiom:BA-001", "axiom"),
+        ("doc:1", "evidence"), ("doc:2", "evidence"),
+    ]:
+        g.add_node(ContextNode(node_id=node_id, node_type=node_type))
+    g.add_edge(ContextEdge("mpa:A", "service:Tourism", "GENERATES"))
+    g.add_edge(ContextEdge("axiom:BA-001", "mpa:A", "APPLIES_TO"))
+    g.add_edge(ContextEdge("axiom:BA-001", "doc:1", "EVIDENCED_BY"))
+    g.add_edge(ContextEdge("axiom:BA-001", "doc:2", "EVIDENCED_BY"))
+    g.add_edge(ContextEdge("axiom:BA-001", "doc:1", "EVIDENCED_BY"))  # duplicate edge
+    return g
+
+
+def _scan_neighbors(g, node_id):
+    ids = set()
+    for edge in g.edges:
+        if edge.source_id == node_id:
+            ids.add(edge.target_id)
+        elif edge.target_id == node_id:
+            ids.add(edge.source_id)
+    return {nid for nid in ids if g.get_node(nid)}
+
+
+class TestAdjacency:
+    def test_neighbors_match_edge_scan(self):
+        g = _graph()
+        for node in g.nodes:
+            assert {n.node_id for n in g.neighbors(node.node_id)} == _scan_neighbors(g, node.node_id)
+
+    def test_neighbors_deduplicated_in_insertion_order(self):
+        g = _graph()
+        assert g.neighbor_ids("axiom:BA-001") == ["mpa:A", "doc:1", "doc:2"]
+
+    def test_typed_and_directed_filters(self):
+        g = _graph()
+        assert g.neighbor_ids("axiom:BA-001", relationships=["EVIDENCED_BY"]) == ["doc:1", "doc:2"]
+        assert g.neighbor_ids("mpa:A", direction="out") == ["service:Tourism"]
+        assert g.neighbor_ids("mpa:A", direction="in") == ["axiom:BA-001"]
+        assert len(g.edges_of("axiom:BA-001", relationships=["EVIDENCED_BY"])) == 3
+        assert g.degree("mpa:A") == 2
+
+    def test_unknown_node_has_no_neighbors(self):
+        assert _graph().neighbors("missing") == []
+
+    def test_merge_keeps_index(self):
+        g = ContextGraph()
+        g.merge(_graph())
+        assert g.edge_count() == 5
+        assert g.neighbor_ids("doc:2") == ["axiom:BA-001"]
+
+
+class TestTraversal:
+    def test_traverse_bounded_depth(self):
+        g = _graph()
+        assert g.traverse("service:Tourism", max_depth=1) == {"service:Tourism": 0, "mpa:A": 1}
+        depths = g.traverse("service:Tourism", max_depth=3)
+        assert depths == {
+            "service:Tourism": 0, "mpa:A": 1, "axiom:BA-001": 2, "doc:1": 3, "doc:2": 3,
+        }
+
+    def test_traverse_relationship_filter(self):
+        g = _graph()
+        assert set(g.traverse("mpa:A", max_depth=5, relationships=["GENERATES", "APPLIES_TO"])) == {
+            "mpa:A", "service:Tourism", "axiom:BA-001",
+        }
+
+    def test_shortest_path(self):
+        g = _graph()
+        assert g.shortest_path("service:Tourism", "doc:2") == ["service:Tourism", "mpa:A", "axiom:BA-001", "doc:2"]
+        assert g.shortest_path("service:Tourism", "doc:2", max_depth=2) == []
+        assert g.shortest_path("doc:1", "doc:1") == ["doc:1"]
+
+    def test_built_context_is_indexed(self):
+        g = build_context_from_results([{
+            "site": "Cabo Pulmo National Park",
+            "services": [{"service": "Tourism", "value_usd": 25000000}],
+            "evidence": [{"doi": "10.1038/s41598-024-83664-1", "axiom_id": "BA-001"}],
+        }])
+        site = "mpa:Cabo Pulmo National Park"
+        services = g.neighbor_ids(site, relationships=["GENERATES"], direction="out")
+        assert services == ["service:Tourism"]
+        assert g.shortest_path(site, "doc:10.1038/s41598-024-83664-1") == [
+            site, "axiom:BA-001", "doc:10.1038/s41598-024-83664-1",
+        ]
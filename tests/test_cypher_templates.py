@@ -118,6 +118,38 @@ class TestTemplateFields:
         assert "LIMIT" in t["cypher"]
 
 
+def _outside_subqueries(cypher: str) -> str:
+    """The statement with every ``CALL { ... }`` block removed."""
+    out, depth, i = [], 0, 0
+    while i < len(cypher):
+        if depth == 0 and cypher.startswith("CALL {", i):
+            depth, i = 1, i + len("CALL {")
+            continue
+        if depth:
+            depth += {"{": 1, "}": -1}.get(cypher[i], 0)
+        else:
+            out.append(cypher[i])
+        i += 1
+    return "".join(out)
+
+
+class TestCartesianFree:
+    """Independent collections must not be expanded as one cross product."""
+
+    @pytest.mark.parametrize("name,template", list(TEMPLATES.items()))
+    def test_at_most_one_top_level_optional_match(self, name, template):
+        assert _outside_subqueries(template["cypher"]).count("OPTIONAL MATCH") <= 1
+
+    @pytest.mark.parametrize("name", [
+        "site_valuation", "axiom_explanation", "axiom_by_concept", "comparison",
+        "risk_assessment", "mechanism_chain", "concept_overview",
+    ])
+    def test_collections_aggregate_in_subqueries(self, name):
+        cypher = get_template(name)["cypher"]
+        assert "collect(" not in _outside_subqueries(cypher)
+        assert cypher.count("CALL {") >= 2
+
+
 class TestWarningRegression:
     def test_site_valuation_uses_safe_ci_property_access(self):
         cypher = get_template("site_valuation")["cypher"]
@@ -0,0 +1,82 @@
+"""Tests for offline embeddings and exact similarity search."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from maris.embeddings import (
+    EMBEDDING_DIM,
+    FlatIndex,
+    HashingEmbedder,
+)
+from maris.reasoning.hybrid_retriever import HybridRetriever
+
+
+def _clustered_texts(n=6000, n_topics=40, seed=3):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"term{i}" for i in range(1500)])
+    topics = [rng.choice(len(vocab), 40, replace=False) for _ in range(n_topics)]
+    return [" ".join(vocab[rng.choice(topics[rng.integers(n_topics)], 15)]) for _ in range(n)]
+
+
+class TestHashingEmbedder:
+    def test_deterministic_unit_norm(self):
+        a = HashingEmbedder().embed("Mangrove blue carbon sequestration")
+        b = HashingEmbedder().embed("Mangrove blue carbon sequestration")
+        assert a.shape == (EMBEDDING_DIM,) and a.dtype == np.float32
+        assert np.array_equal(a, b)
+        assert np.linalg.norm(a) == pytest.approx(1.0, abs=1e-5)
+
+    def test_similar_texts_closer_than_unrelated(self):
+        e = HashingEmbedder()
+        query = e.embed("coral reef tourism revenue")
+        related = e.embed("Reef tourism generates dive revenue")
+        unrelated = e.embed("seagrass sediment carbon burial")
+        assert query @ related > query @ unrelated + 0.2
+
+    def test_empty_text_is_zero_vector(self):
+        assert not HashingEmbedder().embed("").any()
+        assert not HashingEmbedder().embed("the of and").any()
+
+    def test_batch_matches_single(self):
+        e = HashingEmbedder(dim=64)
+        texts = ["kelp forest", "", "fish biomass recovery"]
+        batch = e.embed_batch(texts, batch_size=2)
+        assert batch.shape == (3, 64)
+        for row, text in zip(batch, texts):
+            assert np.allclose(row, e.embed(text))
+        assert sum(len(b) for b in e.iter_batches(texts, batch_size=2)) == 3
+
+
+class TestFlatIndex:
+    def test_exact_top_k_best_first(self):
+        texts = _clustered_texts(n=500)
+        vectors = HashingEmbedder().embed_batch(texts)
+        query = vectors[7]
+        hits = FlatIndex(vectors).search(query, 5)
+        assert hits[0] == (7, pytest.approx(1.0, abs=1e-5))
+        scores = [score for _, score in hits]
+        assert scores == sorted(scores, reverse=True)
+        assert scores[-1] == pytest.approx(np.sort(vectors @ query)[-5])
+
+    def test_k_larger_than_index_and_empty(self):
+        assert len(FlatIndex(np.eye(3, dtype=np.float32)).search(np.ones(3), 10)) == 3
+        assert FlatIndex(np.zeros((0, 4), dtype=np.float32)).search(np.ones(4)) == []
+
+
+class TestRetrieverSemanticMode:
+    def test_semantic_ranking_joins_fusion(self):
+        executor = MagicMock()
+        executor.execute.return_value = {"results": [{
+            "site": "Cabo Pulmo National Park",
+            "services": [{"service": "Tourism"}, {"service": "Carbon Sequestration"}],
+        }]}
+        retriever = HybridRetriever(executor=executor, embedder=HashingEmbedder())
+        result = retriever.retrieve("sequestered carbon", site_name="Cabo Pulmo National Park")
+        assert result.retrieval_modes["semantic"] >= 1
+        assert result.ranked_nodes[0]["node_id"] == "service:Carbon Sequestration"
+
+    def test_no_semantic_mode_without_embedder(self):
+        result = HybridRetriever().retrieve("carbon")
+        assert "semantic" not in result.retrieval_modes
@@ -0,0 +1,110 @@
+"""Tests for the index advisor that checks Cypher lookups against the schema."""
+
+from unittest.mock import MagicMock
+
+from maris.graph.index_advisor import (
+    Recommendation,
+    advise,
+    apply_recommendations,
+    collect_statements,
+    extract_lookups,
+    schema_coverage,
+)
+from maris.query.cypher_templates import TEMPLATES
+
+
+def _lookups(cypher):
+    found, unlabeled = extract_lookups(cypher, "q")
+    return {(lookup.entity, lookup.label, lookup.prop, lookup.kind) for lookup in found}, unlabeled
+
+
+def test_schema_covers_every_labelled_lookup():
+    # Drift guard: a new template or population query that looks nodes up by
+    # an unindexed property fails here; add the statement to SCHEMA_STATEMENTS.
+    result = advise()
+    assert [r.statement for r in result.recommendations] == []
+
+
+def test_sources_include_templates_and_population_cypher():
+    sources = {source for source, _ in collect_statements()}
+    assert {f"template:{name}" for name in TEMPLATES} <= sources
+    assert any(source.startswith("population.py:") for source in sources)
+
+
+class TestExtraction:
+    def test_anchor_predicates_by_operator(self):
+        found, _ = _lookups("""
+            MATCH (m:MPA {name: $site})
+            MATCH (ba:BridgeAxiom) WHERE ba.axiom_id IN $ids OR ba.name CONTAINS $q
+            MATCH (d:Document) WHERE d.year >= 2000
+            RETURN m, ba, d
+        """)
+        assert found == {
+            ("node", "MPA", "name", "range"),
+            ("node", "BridgeAxiom", "axiom_id", "range"),
+            ("node", "BridgeAxiom", "name", "text"),
+            ("node", "Document", "year", "range"),
+        }
+
+    def test_expansions_from_bound_variables_are_not_anchors(self):
+        found, _ = _lookups("""
+            MATCH (m:MPA {name: $site})
+            OPTIONAL MATCH (m)-[:GENERATES]->(es:EcosystemService {service_name: 'x'})
+            CALL { WITH m MATCH (ba:BridgeAxiom)-[:APPLIES_TO]->(m) WHERE ba.category = 'c' RETURN ba }
+            RETURN m, es, ba
+        """)
+        assert found == {("node", "MPA", "name", "range")}
+
+    def test_merge_keys_relationships_and_unlabeled_anchors(self):
+        found, unlabeled = _lookups("""
+            UNWIND $rows AS row
+            MERGE (c:Concept {concept_id: row.id})
+            MATCH ()-[r:FACES_RISK {severity: 'high'}]->()
+            MATCH (n) WHERE n.name = $name
+            CREATE (x:Note {text: 'ignored'})
+            RETURN c, r, n, x
+        """)
+        assert found == {
+            ("node", "Concept", "concept_id", "merge_key"),
+            ("relationship", "FACES_RISK", "severity", "range"),
+        }
+        assert [(u.variable, u.prop) for u in unlabeled] == [("n", "name")]
+
+
+def test_missing_statements_are_recommended_once_per_property():
+    statements = [
+        ("a", "MERGE (t:TrophicLevel {name: $n})"),
+        ("b", "MATCH (t:TrophicLevel) WHERE t.name = $n RETURN t"),
+        ("c", "MATCH (s:Species) WHERE s.common_name CONTAINS $q RETURN s"),
+        ("d", "MATCH ()-[r:FACES_RISK]->() WHERE r.likelihood > 0.5 RETURN r"),
+        ("e", "MATCH (m:MPA {name: $n}) RETURN m"),
+    ]
+    schema = ["CREATE CONSTRAINT mpa_name IF NOT EXISTS FOR (m:MPA) REQUIRE m.name IS UNIQUE"]
+    result = advise(statements, schema)
+    assert [(r.statement, r.sources) for r in result.recommendations] == [
+        ("CREATE TEXT INDEX species_common_name_text IF NOT EXISTS FOR (s:Species) ON (s.common_name)", ["c"]),
+        ("CREATE CONSTRAINT trophic_level_name IF NOT EXISTS FOR (t:TrophicLevel) REQUIRE t.name IS UNIQUE",
+         ["a", "b"]),
+        ("CREATE INDEX faces_risk_likelihood IF NOT EXISTS FOR ()-[r:FACES_RISK]-() ON (r.likelihood)", ["d"]),
+    ]
+    # Recommended statements are recognised as coverage once applied
+    applied = schema + [r.statement for r in result.recommendations]
+    assert advise(statements, applied).recommendations == []
+
+
+def test_schema_coverage_ignores_fulltext_and_vector_indexes():
+    coverage = schema_coverage([
+        "CREATE FULLTEXT INDEX document_fulltext IF NOT EXISTS FOR (d:Document) ON EACH [d.abstract, d.title]",
+        "CREATE VECTOR INDEX document_embedding IF NOT EXISTS FOR (d:Document) ON (d.embedding)",
+        "CREATE TEXT INDEX concept_name_text IF NOT EXISTS FOR (c:Concept) ON (c.name)",
+    ])
+    assert coverage == {("node", "Concept", "name"): {"text"}}
+
+
+def test_apply_continues_past_failures():
+    session = MagicMock()
+    session.run.side_effect = [MagicMock(), RuntimeError("violates uniqueness"), MagicMock()]
+    recs = [Recommendation("node", "L", p, "range", f"CREATE INDEX {p}") for p in "abc"]
+    assert apply_recommendations(session, recs) == {
+        "CREATE INDEX a": None, "CREATE INDEX b": "violates uniqueness", "CREATE INDEX c": None,
+    }
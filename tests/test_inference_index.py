@@ -0,0 +1,140 @@
+"""Tests for the indexed inference core (agenda forward chaining, cached BFS)."""
+
+import random
+from collections import deque
+from unittest.mock import MagicMock
+
+import pytest
+
+from maris.reasoning.inference_engine import InferenceEngine, InferenceRule
+
+
+def _rule(i, input_domain, output_domain, habitats=("all",)):
+    axiom = MagicMock()
+    axiom.axiom_id = f"BA-{i:04d}"
+    axiom.name = f"axiom {i}"
+    axiom.coefficient = 1.0
+    axiom.confidence = "medium"
+    axiom.source_doi = f"10.0000/{i}"
+    return InferenceRule(
+        rule_id=f"rule:BA-{i:04d}",
+        axiom=axiom,
+        input_domain=input_domain,
+        output_domain=output_domain,
+        condition=f"{input_domain} -> {output_domain}",
+        applicable_habitats=list(habitats),
+    )
+
+
+def _rule_pack(n_rules=1200, n_domains=150, seed=7):
+    rng = random.Random(seed)
+    domains = [f"d{i}" for i in range(n_domains)]
+    habitats = ["coral_reef", "kelp_forest", "mangrove", "seagrass", "all"]
+    return [
+        _rule(i, rng.choice(domains), rng.choice(domains), [rng.choice(habitats)])
+        for i in range(n_rules)
+    ]
+
+
+def _naive_forward(rules, facts, max_steps):
+    """The previous full-rescan implementation, as a reference."""
+    fired, derived, steps = set(), set(facts), []
+    for _ in range(max_steps):
+        progress = False
+        for rule in rules:
+            if rule.rule_id in fired or rule.input_domain not in derived:
+                continue
+            fired.add(rule.rule_id)
+            steps.append(rule.rule_id)
+            derived.add(rule.output_domain)
+            progress = True
+        if not progress:
+            break
+    return steps
+
+
+def _naive_find_chain(rules, start, goal):
+    if start == goal:
+        return []
+    queue, visited = deque([(start, [])]), {start}
+    while queue:
+        domain, path = queue.popleft()
+        for rule in rules:
+            if rule.input_domain != domain:
+                continue
+            if rule.output_domain == goal:
+                return [r.rule_id for r in path + [rule]]
+            if rule.output_domain not in visited:
+                visited.add(rule.output_domain)
+                queue.append((rule.output_domain, path + [rule]))
+    return []
+
+
+@pytest.fixture
+def pack():
+    rules = _rule_pack()
+    engine = InferenceEngine()
+    engine.register_rules(rules)
+    return rules, engine
+
+
+class TestForwardChain:
+    @pytest.mark.parametrize("max_steps", [1, 2, 10])
+    def test_matches_full_rescan_on_large_pack(self, pack, max_steps):
+        rules, engine = pack
+        for start in ("d0", "d17", "d99"):
+            steps = engine.forward_chain({start: {}}, max_steps=max_steps)
+            assert [s.rule_id for s in steps] == _naive_forward(rules, {start: {}}, max_steps)
+
+    def test_rule_enabled_by_earlier_rule_fires_same_step(self):
+        engine = InferenceEngine()
+        engine.register_rules([
+            _rule(1, "b", "c"),   # enabled by rule 2, which comes later: next step
+            _rule(2, "a", "b"),
+            _rule(3, "b", "d"),   # enabled by rule 2, comes later: same step
+        ])
+        steps = engine.forward_chain({"a": {}}, max_steps=1)
+        assert [s.rule_id for s in steps] == ["rule:BA-0002", "rule:BA-0003"]
+        steps = engine.forward_chain({"a": {}}, max_steps=2)
+        assert [s.rule_id for s in steps] == ["rule:BA-0002", "rule:BA-0003", "rule:BA-0001"]
+
+    def test_derived_domains_added_to_facts(self):
+        engine = InferenceEngine()
+        engine.register_rules([_rule(1, "a", "b")])
+        facts = {"a": {"x": 1}}
+        engine.forward_chain(facts)
+        assert facts == {"a": {"x": 1}, "b": {}}
+
+
+class TestChainSearch:
+    def test_find_chain_matches_reference(self, pack):
+        rules, engine = pack
+        for start, goal in [("d0", "d5"), ("d3", "d140"), ("d42", "d42"), ("d7", "missing")]:
+            assert [r.rule_id for r in engine.find_chain(start, goal)] == _naive_find_chain(rules, start, goal)
+
+    def test_find_chain_cached_and_copied(self):
+        engine = InferenceEngine()
+        engine.register_rules([_rule(1, "a", "b"), _rule(2, "b", "c")])
+        first = engine.find_chain("a", "c")
+        first.clear()
+        assert [r.rule_id for r in engine.find_chain("a", "c")] == ["rule:BA-0001", "rule:BA-0002"]
+
+    def test_reachability_invalidated_on_register(self):
+        engine = InferenceEngine()
+        engine.register_rules([_rule(1, "a", "b")])
+        assert engine.reachable_domains("a") == {"b"}
+        assert engine.find_chain("a", "c") == []
+        engine.register_rules([_rule(2, "b", "c")])
+        assert engine.reachable_domains("a") == {"b", "c"}
+        assert len(engine.find_chain("a", "c")) == 2
+
+    def test_backward_chain_uses_output_index(self):
+        engine = InferenceEngine()
+        engine.register_rules([_rule(1, "a", "b"), _rule(2, "x", "c"), _rule(3, "b", "c")])
+        needed = engine.backward_chain("c")
+        assert [n["rule_id"] for n in needed] == ["rule:BA-0002", "rule:BA-0003", "rule:BA-0001"]
+
+    def test_habitat_filter_preserves_order(self, pack):
+        rules, engine = pack
+        expected = [r for r in rules if "all" in r.applicable_habitats or "kelp_forest" in r.applicable_habitats]
+        assert engine.find_rules_for_habitat("kelp_forest") == expected
@@ -0,0 +1,114 @@
+"""Tests for the BM25 keyword index and per-epoch HybridRetriever caching."""
+
+import re
+from unittest.mock import MagicMock, patch
+
+from maris.reasoning.context_builder import ContextNode
+from maris.reasoning.hybrid_retriever import HybridRetriever
+from maris.reasoning.keyword_index import KeywordIndex, tokenize
+
+SITE_RESULTS = [{
+    "site": "Cabo Pulmo National Park",
+    "total_esv": 29270000,
+    "services": [
+        {"service": "Tourism", "value_usd": 25000000},
+        {"service": "Fisheries", "value_usd": 3200000},
+        {"service": "Carbon Sequestration", "value_usd": 180000},
+    ],
+    "evidence": [
+        {"doi": "10.1371/journal.pone.0023601", "title": "Large recovery of fish biomass", "axiom_id": "BA-002"},
+    ],
+}]
+
+
+def _nodes():
+    return [
+        ContextNode(node_id="service:Tourism", node_type="service", name="Tourism",
+                    properties={"description": "dive tourism revenue"}),
+        ContextNode(node_id="service:Fisheries", node_type="service", name="Fisheries"),
+        ContextNode(node_id="doc:1", node_type="evidence", name="Fish biomass recovery in a reserve",
+                    properties={"year": 2011}),
+        ContextNode(node_id="doc:2", node_type="evidence", name="Reef tourism and tourism demand"),
+    ]
+
+
+class TestKeywordIndex:
+    def test_tokenize_cached(self):
+        tokenize.cache_clear()
+        assert tokenize("Blue-carbon in 10.1038/x") == ("blue-carbon", "in", "10.1038", "x")
+        tokenize("Blue-carbon in 10.1038/x")
+        assert tokenize.cache_info().hits == 1
+
+    def test_bm25_ranks_term_frequency_and_length(self):
+        index = KeywordIndex(_nodes())
+        ranked = index.search("tourism value")
+        # Same term frequency; the shorter node ranks first
+        assert [node_id for node_id, _ in ranked] == ["service:Tourism", "doc:2"]
+        assert all(score > 0 for _, score in ranked)
+
+    def test_only_matching_nodes_returned(self):
+        index = KeywordIndex(_nodes())
+        assert index.search("mangrove") == []
+        assert [n for n, _ in index.search("2011 biomass")] == ["doc:1"]
+
+    def test_pattern_boost_and_top_k(self):
+        index = KeywordIndex(_nodes())
+        fish = re.compile(r"\bfish\w*")
+        ranked = index.search("anything", patterns=[fish])
+        assert {n for n, _ in ranked} == {"service:Fisheries", "doc:1"}
+        assert index.pattern_hits(fish) is index.pattern_hits(fish)
+        assert len(index.search("tourism fish", patterns=[fish], top_k=2)) == 2
+
+    def test_empty_index(self):
+        assert KeywordIndex(()).search("tourism") == []
+
+
+class TestRetrieverCaching:
+    def _retriever(self, epoch):
+        executor = MagicMock()
+        executor.execute.return_value = {"results": SITE_RESULTS}
+        retriever = HybridRetriever(
+            executor=executor,
+            keyword_rules=[("site_valuation", [r"\btourism\b"])],
+            epoch_provider=lambda: epoch["value"],
+        )
+        return retriever, executor
+
+    def test_context_reused_within_epoch(self):
+        epoch = {"value": 3}
+        retriever, executor = self._retriever(epoch)
+        first = retriever.retrieve("tourism value?", site_name="Cabo Pulmo National Park")
+        second = retriever.retrieve("fisheries value?", site_name="Cabo Pulmo National Park")
+        assert executor.execute.call_count == 1
+        assert first.context is second.context
+        assert first.ranked_nodes and second.ranked_nodes
+
+        epoch["value"] = 4
+        retriever.retrieve("tourism value?", site_name="Cabo Pulmo National Park")
+        assert executor.execute.call_count == 2
+
+    def test_no_cache_without_epoch(self):
+        retriever, executor = self._retriever({"value": None})
+        retriever.retrieve("tourism", site_name="Cabo Pulmo National Park")
+        retriever.retrieve("tourism", site_name="Cabo Pulmo National Park")
+        assert executor.execute.call_count == 2
+
+    def test_keyword_ranking_promotes_matching_service(self):
+        retriever, _ = self._retriever({"value": 1})
+        result = retriever.retrieve("What is tourism worth?", site_name="Cabo Pulmo National Park")
+        assert result.retrieval_modes["keyword"] >= 1
+        assert result.ranked_nodes[0]["node_id"] == "service:Tourism"
+
+    def test_executor_reuses_single_retriever(self):
+        from maris.query.executor import QueryExecutor
+
+        executor = QueryExecutor()
+        with (
+            patch("maris.graph.epoch.get_graph_epoch", return_value=None),
+            patch.object(QueryExecutor, "execute", return_value={"results": SITE_RESULTS}),
+        ):
+            executor.execute_open_domain("tourism value", site_name="Cabo Pulmo National Park")
+            retriever = executor._retriever
+            executor.execute_open_domain("fisheries value", site_name="Cabo Pulmo National Park")
+        assert retriever is not None
+        assert executor._retriever is retriever
@@ -0,0 +1,182 @@
+"""Tests for the deterministic LLM completion cache."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from maris.llm.cache import CompletionCache, completion_cache_key
+
+
+def _adapter(cache):
+    from maris.llm.adapter import LLMAdapter
+
+    config = MagicMock()
+    config.llm_provider = "deepseek"
+    config.llm_api_key = "test-key"
+    config.llm_base_url = "http://localhost"
+    config.llm_model = "test-model"
+    config.llm_max_tokens = 256
+    config.llm_timeout = 10
+    config.llm_cache_enabled = False
+    with patch("maris.llm.adapter.OpenAI") as mock_openai:
+        adapter = LLMAdapter(config, cache=cache)
+    create = mock_openai.return_value.chat.completions.create
+    create.return_value.choices = [MagicMock(message=MagicMock(content='{"answer": "ok"}'))]
+    return adapter, create
+
+
+MESSAGES = [{"role": "user", "content": "Summarize BA-001"}]
+
+
+class TestCacheKey:
+    def test_key_covers_request_shape(self):
+        base = completion_cache_key("m", MESSAGES, 0.0, 100)
+        assert base == completion_cache_key("m", [dict(MESSAGES[0])], 0.0, 100)
+        assert base != completion_cache_key("m2", MESSAGES, 0.0, 100)
+        assert base != completion_cache_key("m", MESSAGES, 0.1, 100)
+        assert base != completion_cache_key("m", MESSAGES, 0.0, 200)
+        assert base != completion_cache_key("m", MESSAGES, 0.0, 100, {"type": "json_object"})
+
+
+class TestCompletionCache:
+    def test_get_put_and_counters(self):
+        cache = CompletionCache()
+        assert cache.get("k") is None
+        cache.put("k", "m", "text")
+        assert cache.get("k") == "text"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_empty_response_not_cached(self):
+        cache = CompletionCache()
+        cache.put("k", "m", "")
+        assert cache.get("k") is None
+
+    def test_ttl_expiry(self):
+        cache = CompletionCache(ttl_seconds=60)
+        cache.put("k", "m", "text")
+        with patch("maris.llm.cache.time.time", return_value=time.time() + 120):
+            assert cache.get("k") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_size_cap_prunes_least_recently_used(self):
+        cache = CompletionCache(max_entries=2)
+        cache.put("a", "m", "1")
+        cache.put("b", "m", "2")
+        cache.get("a")
+        cache.put("c", "m", "3")
+        cache.prune()
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+
+    def test_persists_across_instances(self, tmp_path):
+        db = tmp_path / "llm" / "cache.db"
+        first = CompletionCache(db_path=db)
+        first.put("k", "m", "persisted")
+        first.close()
+        assert CompletionCache(db_path=db).get("k") == "persisted"
+
+    def test_from_config(self, tmp_path):
+        assert CompletionCache.from_config(MagicMock(llm_cache_enabled=False)) is None
+        cache = CompletionCache.from_config(MagicMock(
+            llm_cache_enabled=True, llm_cache_path=str(tmp_path / "llm.db"), llm_cache_ttl_seconds=60,
+            llm_cache_max_entries=10, llm_cache_max_temperature=0.2,
+        ))
+        assert (cache.db_path, cache.max_entries) == (str(tmp_path / "llm.db"), 10)
+
+    def test_default_path_is_under_the_project_root(self):
+        from maris.settings import MARISSettings
+
+        settings = MARISSettings(llm_cache_db="data/cache/llm_cache.db")
+        assert settings.llm_cache_path == str(settings.project_root / "data" / "cache" / "llm_cache.db")
+        assert MARISSettings(llm_cache_db="").llm_cache_path == ""
+
+
+class TestAdapterCaching:
+    def test_identical_prompt_skips_provider(self):
+        adapter, create = _adapter(CompletionCache())
+        assert adapter.complete_json(MESSAGES) == {"answer": "ok"}
+        assert adapter.complete_json(MESSAGES) == {"answer": "ok"}
+        assert create.call_count == 1
+        assert adapter.cache_stats()["hits"] == 1
+
+    def test_use_cache_false_bypasses(self):
+        adapter, create = _adapter(CompletionCache())
+        adapter.complete(MESSAGES, temperature=0.0)
+        adapter.complete(MESSAGES, temperature=0.0, use_cache=False)
+        assert create.call_count == 2
+        assert adapter.cache_stats()["bypassed"] == 1
+
+    def test_high_temperature_not_cached(self):
+        adapter, create = _adapter(CompletionCache(max_temperature=0.2))
+        adapter.complete(MESSAGES, temperature=0.7)
+        adapter.complete(MESSAGES, temperature=0.7)
+        assert create.call_count == 2
+
+    def test_unparseable_json_not_cached(self):
+        adapter, create = _adapter(CompletionCache())
+        create.return_value.choices = [MagicMock(message=MagicMock(content="not json at all"))]
+        adapter.complete_json(MESSAGES)
+        adapter.complete_json(MESSAGES)
+        assert create.call_count == 2
+        assert adapter.cache_stats()["writes"] == 0
+
+    def test_truncated_completion_not_cached(self):
+        adapter, create = _adapter(CompletionCache())
+        create.return_value.choices = [
+            MagicMock(message=MagicMock(content='{"answer": "cut'), finish_reason="length"),
+        ]
+        adapter.complete(MESSAGES, temperature=0.0)
+        adapter.complete(MESSAGES, temperature=0.0)
+        assert create.call_count == 2
+
+    def test_response_format_forwarded(self):
+        adapter, create = _adapter(None)
+        adapter.complete(MESSAGES, response_format={"type": "json_object"})
+        assert create.call_args.kwargs["response_format"] == {"type": "json_object"}
+        assert adapter.cache_stats() == {}
+
+
+class TestExtractorCaching:
+    CHUNK = {"chunk_id": "c1", "text": "Cabo Pulmo fish biomass rose 463%.", "page_start": 1, "page_end": 1}
+    PAPER = {"title": "Recovery", "doi": "10.1/x"}
+
+    def _extractor(self, content, finish_reason="stop"):
+        pytest.importorskip("fitz")  # maris.ingestion imports the PDF extractor
+        from maris.ingestion.llm_extractor import LLMExtractor
+
+        config = MagicMock()
+        config.llm_provider = "deepseek"
+        config.llm_api_key = "test-key"
+        config.llm_base_url = ""
+        config.llm_model = "test-model"
+        config.llm_max_tokens = 256
+        config.llm_timeout = 10
+        config.llm_cache_enabled = False
+        config.extraction_confidence_threshold = 0.5
+        with patch("maris.llm.adapter.OpenAI") as mock_openai:
+            extractor = LLMExtractor(config)
+        extractor.llm.cache = CompletionCache()
+        create = mock_openai.return_value.chat.completions.create
+        create.return_value.choices = [MagicMock(message=MagicMock(content=content), finish_reason=finish_reason)]
+        return extractor, create
+
+    def test_json_array_cached_under_the_resolved_base_url(self):
+        extractor, create = self._extractor("[]")
+        for _ in range(2):
+            assert extractor.extract_entities(self.CHUNK, self.PAPER) == []
+        assert create.call_count == 1
+        assert extractor.llm.base_url == "https://api.deepseek.com/v1"
+
+    @pytest.mark.parametrize("content, finish_reason", [
+        ("", "stop"),
+        ("I could not find any entities.", "stop"),
+        ('[{"name": "Cabo Pulmo", "confidence": 0.9', "length"),
+    ])
+    def test_bad_extractions_not_cached(self, content, finish_reason):
+        extractor, create = self._extractor(content, finish_reason)
+        for _ in range(2):
+            extractor.extract_entities(self.CHUNK, self.PAPER)
+        assert create.call_count == 2
+        assert extractor.llm.cache_stats()["writes"] == 0
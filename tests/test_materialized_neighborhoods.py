@@ -0,0 +1,168 @@
+"""Tests for precomputed k-hop neighborhoods serving the traversal templates."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from maris.graph.materialized_neighborhoods import (
+    CACHE_LABEL,
+    DRILLDOWN_CYPHER,
+    KEYS_CYPHER,
+    LEGACY_CLEANUP_CYPHER,
+    LOOKUP_CYPHER,
+    PRUNE_CYPHER,
+    STORE_CYPHER,
+    cap_layers,
+    derive_neighborhoods,
+    encode_neighborhood,
+    materialize_neighborhoods,
+    serve,
+    traverse_layer_cypher,
+)
+from maris.query.executor import QueryExecutor
+from maris.query.template_registry import get_template_registry
+
+SITE = "Cabo Pulmo National Park"
+
+
+def _path(hops, tag=""):
+    return [[{"labels": ["MPA"], "name": SITE}] + [{"labels": ["X"], "name": f"{tag}{i}"} for i in range(hops)],
+            ["REL"] * hops]
+
+
+BLOB = {
+    "traverse": {"paths": [_path(1, "a"), _path(1, "b"), _path(2, "c")], "complete_hops": 2},
+    "drilldown": {"rows": [[SITE, "10.1/x", "T", 2020, "T1", None, ["APPLIES_TO", "EVIDENCED_BY"]]],
+                  "complete": True},
+}
+
+
+class TestCaps:
+    def test_shallowest_paths_kept_and_complete_depth_tracked(self):
+        layers = [[_path(1, "a"), _path(1, "b")], [_path(2, "c"), _path(2, "d")], [_path(3, "e")]]
+        assert cap_layers(layers, max_paths=10, max_bytes=10**6) == (sum(layers, []), 3)
+
+        paths, complete = cap_layers(layers, max_paths=3, max_bytes=10**6)
+        assert (paths, complete) == (layers[0] + layers[1][:1], 1)
+
+    def test_byte_cap(self):
+        layers = [[_path(1, "a"), _path(1, "b")]]
+        one = len(json.dumps(_path(1, "a"), separators=(",", ":"))) + 1
+        assert cap_layers(layers, max_paths=10, max_bytes=2 + one) == ([_path(1, "a")], 0)
+
+
+def test_derive_stops_expanding_capped_keys():
+    calls = []
+
+    def run(cypher, params):
+        calls.append((cypher, params))
+        if cypher == DRILLDOWN_CYPHER:
+            return [{"key": SITE, "site": SITE, "doi": "10.1/x", "year": 2020}]
+        depth = next(d for d in range(1, 4) if cypher == traverse_layer_cypher(d))
+        return [{"key": key, "node_list": [key] * (depth + 1), "rel_list": ["R"] * depth}
+                for key in params["keys"] for _ in range(2 if key == SITE else 1)]
+
+    blobs = derive_neighborhoods(run, [SITE, "BA-001 axiom"], hops=3, max_paths=3, max_bytes=10**6)
+
+    assert [params["keys"] for _, params in calls[:3]] == [[SITE, "BA-001 axiom"]] * 2 + [["BA-001 axiom"]]
+    assert all(params["limit"] == 4 for _, params in calls)
+    assert blobs[SITE]["traverse"]["complete_hops"] == 1
+    assert len(blobs[SITE]["traverse"]["paths"]) == 3
+    assert blobs["BA-001 axiom"]["traverse"]["complete_hops"] == 3
+    assert "drilldown" not in blobs["BA-001 axiom"]
+    assert blobs[SITE]["drilldown"]["complete"]
+
+
+class TestServe:
+    @pytest.mark.parametrize("hops, limit, expected", [
+        (1, 25, 2),     # within the complete depth
+        (2, 2, 2),      # limit reached by complete layers
+        (3, 2, 2),      # deeper than stored, but enough rows for the limit
+        (3, 25, None),  # deeper than stored and short of the limit: live
+    ])
+    def test_traverse(self, hops, limit, expected):
+        rows = serve("graph_traverse", BLOB, hops, limit)
+        assert (None if rows is None else len(rows)) == expected
+
+    def test_drilldown_rows_and_truncation(self):
+        assert serve("provenance_drilldown", BLOB, None, 10)[0]["doi"] == "10.1/x"
+        truncated = {"drilldown": {**BLOB["drilldown"], "complete": False}}
+        assert serve("provenance_drilldown", truncated, None, 10) is None
+        assert serve("provenance_drilldown", {"traverse": BLOB["traverse"]}, None, 10) is None
+
+
+def _fake_run_query(blob, epoch):
+    calls = []
+
+    def _run(cypher, params=None, **kwargs):
+        calls.append(cypher)
+        if cypher == LOOKUP_CYPHER:
+            return [{"neighborhood": encode_neighborhood(blob), "epoch": epoch}]
+        return [{"node_list": [], "rel_list": []}]
+
+    return _run, calls
+
+
+class TestExecutor:
+    def test_current_blob_answers_without_live_traversal(self):
+        run, calls = _fake_run_query(BLOB, epoch=4)
+        with patch("maris.query.executor.run_query", side_effect=run):
+            result = QueryExecutor(epoch_provider=lambda: 4).execute(
+                "graph_traverse", {"start_name": SITE, "max_hops": 1},
+            )
+        assert calls == [LOOKUP_CYPHER]
+        assert result["record_count"] == 2
+        assert result["results"][0]["rel_list"] == ["REL"]
+
+    def test_stale_or_uncovered_requests_run_live(self):
+        live = get_template_registry().variant("graph_traverse", 5).cypher
+        run, calls = _fake_run_query(BLOB, epoch=3)
+        with patch("maris.query.executor.run_query", side_effect=run):
+            executor = QueryExecutor(epoch_provider=lambda: 4)
+            executor.execute("graph_traverse", {"start_name": SITE, "max_hops": 1})
+        assert calls == [LOOKUP_CYPHER, get_template_registry().variant("graph_traverse", 1).cypher]
+
+        run, calls = _fake_run_query(BLOB, epoch=4)
+        with patch("maris.query.executor.run_query", side_effect=run):
+            executor.execute("graph_traverse", {"start_name": SITE, "max_hops": 5})
+        assert calls == [LOOKUP_CYPHER, live]
+
+    def test_no_epoch_skips_the_lookup(self):
+        with patch("maris.query.executor.run_query", return_value=[]) as mock_run:
+            QueryExecutor(epoch_provider=lambda: None).execute("provenance_drilldown", {"site_name": SITE})
+        assert mock_run.call_count == 1
+        assert mock_run.call_args.args[0] != LOOKUP_CYPHER
+
+    async def test_async_serves_drilldown(self):
+        rows = [{"neighborhood": encode_neighborhood(BLOB), "epoch": 9}]
+        with patch("maris.query.executor.run_query_async", AsyncMock(return_value=rows)) as mock_run:
+            result = await QueryExecutor(epoch_provider=lambda: 9).execute_async(
+                "provenance_drilldown", {"site_name": SITE},
+            )
+        mock_run.assert_awaited_once_with(LOOKUP_CYPHER, {"name": SITE})
+        assert result["results"][0]["provenance_path"] == ["APPLIES_TO", "EVIDENCED_BY"]
+
+
+def test_materialize_stores_each_batch_at_the_epoch():
+    def run(cypher, params=None):
+        if cypher == KEYS_CYPHER:
+            return [{"key": SITE}, {"key": "Ningaloo Coast"}]
+        return []
+
+    session = MagicMock()
+    session.run.side_effect = run
+    assert materialize_neighborhoods(session, epoch=12, batch_size=1) == 2
+
+    stores = [c.args[1] for c in session.run.call_args_list if c.args[0] == STORE_CYPHER]
+    assert [row["key"] for params in stores for row in params["rows"]] == [SITE, "Ningaloo Coast"]
+    assert {params["epoch"] for params in stores} == {12}
+    assert json.loads(stores[0]["rows"][0]["neighborhood"])["traverse"] == {"paths": [], "complete_hops": 3}
+    tail = [c.args for c in session.run.call_args_list][-2:]
+    assert tail == [(PRUNE_CYPHER, {"keys": [SITE, "Ningaloo Coast"]}), (LEGACY_CLEANUP_CYPHER,)]
+
+
+def test_blobs_live_on_cache_nodes_not_hot_nodes():
+    for cypher in (LOOKUP_CYPHER, STORE_CYPHER):
+        assert f"(c:{CACHE_LABEL} {{key:" in cypher
+        assert "MPA" not in cypher and "BridgeAxiom" not in cypher
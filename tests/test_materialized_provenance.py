@@ -0,0 +1,151 @@
+"""Tests for materialized per-site and per-axiom provenance edge lists."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from maris.graph.materialized_provenance import (
+    CACHE_LABEL,
+    SITE_PROVENANCE_CYPHER,
+    SUBJECTS,
+    decode_edges,
+    encode_edges,
+    materialize_provenance,
+)
+from maris.query.executor import QueryExecutor
+
+SITE = "Cabo Pulmo National Park"
+EDGES = [
+    {"from_node": SITE, "from_type": "MPA", "relationship": "GENERATES",
+     "to_node": "Tourism", "to_type": "EcosystemService"},
+    {"from_node": "BA-001", "from_type": "BridgeAxiom", "relationship": "EVIDENCED_BY",
+     "to_node": "Aburto-Oropeza et al. 2011", "to_type": "Document"},
+]
+SITE_SUBJECT = SUBJECTS["site"]
+
+
+def _fake_run_query(blobs, live=None):
+    """A ``run_query`` stand-in serving ``blobs`` ({key: (edges_json, epoch)}).
+
+    ``live`` maps keys to the edges the live derivation returns (default EDGES).
+    """
+    calls = []
+
+    def _run(cypher, params=None, *, write=False):
+        calls.append((cypher, params, write))
+        if cypher == SITE_SUBJECT.lookup_cypher:
+            return [
+                {"key": key, "edges": blobs[key][0], "epoch": blobs[key][1]}
+                for key in params["keys"] if key in blobs
+            ]
+        if cypher == SITE_SUBJECT.store_cypher:
+            for row in params["rows"]:
+                blobs[row["key"]] = (row["edges"], params["epoch"])
+            return []
+        return [
+            {"key": key, **edge}
+            for key in params["keys"] for edge in (live or {}).get(key, EDGES)
+        ]
+
+    return _run, calls
+
+
+def test_blob_round_trip_is_compact():
+    blob = encode_edges(EDGES)
+    assert decode_edges(blob) == EDGES
+    assert json.loads(blob)[0] == [SITE, "MPA", "GENERATES", "Tourism", "EcosystemService"]
+
+
+def test_provenance_statements_unwind_keys():
+    for subject in SUBJECTS.values():
+        for cypher in (subject.derive_cypher, subject.lookup_cypher, subject.store_cypher):
+            assert "UNWIND $" in cypher
+        assert "RETURN key," in subject.derive_cypher
+
+
+def test_blobs_live_on_cache_nodes_not_subjects():
+    for subject in SUBJECTS.values():
+        for cypher in (subject.lookup_cypher, subject.store_cypher):
+            assert f"(c:{CACHE_LABEL} {{kind: '{subject.kind}'" in cypher
+            assert "provenance_edges" not in cypher
+        assert "SET c." in subject.store_cypher and "SET n." not in subject.store_cypher
+
+
+class TestExecutor:
+    def test_fresh_blob_served_in_one_lookup(self):
+        run, calls = _fake_run_query({SITE: (encode_edges(EDGES), 7)})
+        with patch("maris.query.executor.run_query", side_effect=run):
+            edges = QueryExecutor(epoch_provider=lambda: 7).get_provenance_edges(
+                "site_valuation", {"site_name": SITE},
+            )
+        assert edges == EDGES
+        assert [c[0] for c in calls] == [SITE_SUBJECT.lookup_cypher]
+
+    def test_stale_blob_derived_live_without_writing(self):
+        blobs = {SITE: (encode_edges(EDGES[:1]), 6)}
+        run, calls = _fake_run_query(blobs)
+        with patch("maris.query.executor.run_query", side_effect=run):
+            edges = QueryExecutor(epoch_provider=lambda: 7).get_provenance_edges(
+                "site_valuation", {"site_name": SITE},
+            )
+        assert edges == EDGES
+        assert [c[0] for c in calls] == [SITE_SUBJECT.lookup_cypher, SITE_SUBJECT.derive_cypher]
+        assert not any(write for _, _, write in calls)
+        assert blobs[SITE] == (encode_edges(EDGES[:1]), 6)
+
+    def test_unknown_epoch_runs_live_only(self):
+        run, calls = _fake_run_query({SITE: (encode_edges(EDGES[:1]), 7)})
+        with patch("maris.query.executor.run_query", side_effect=run):
+            edges = QueryExecutor(epoch_provider=lambda: None).get_provenance_edges(
+                "site_valuation", {"site_name": SITE},
+            )
+        assert edges == EDGES
+        assert [c[0] for c in calls] == [SITE_PROVENANCE_CYPHER]
+
+    def test_comparison_resolves_all_sites_together(self):
+        blobs = {"B": (encode_edges(EDGES[1:]), 5)}
+        live = {"A": EDGES[:1], "C": []}
+        run, calls = _fake_run_query(blobs, live)
+        with patch("maris.query.executor.run_query", side_effect=run):
+            edges = QueryExecutor(epoch_provider=lambda: 5).get_provenance_edges(
+                "comparison", {"site_names": ["A", "B", "C", "A"]},
+            )
+        # Input site order, duplicates repeated; one lookup, one derive
+        assert edges == EDGES[:1] + EDGES[1:] + EDGES[:1]
+        assert [(c[0], c[1].get("keys")) for c in calls] == [
+            (SITE_SUBJECT.lookup_cypher, ["A", "B", "C"]),
+            (SITE_SUBJECT.derive_cypher, ["A", "C"]),
+        ]
+
+    async def test_async_comparison_serves_blobs(self):
+        blobs = {"A": (encode_edges(EDGES), 3), "B": (encode_edges(EDGES[:1]), 3)}
+        run, calls = _fake_run_query(blobs)
+        mock_run = AsyncMock(side_effect=run)
+        with patch("maris.query.executor.run_query_async", mock_run):
+            edges = await QueryExecutor(epoch_provider=lambda: 3).get_provenance_edges_async(
+                "comparison", {"site_names": ["A", "B"]},
+            )
+        assert edges == EDGES + EDGES[:1]
+        assert mock_run.await_count == 1
+
+
+def test_materialize_writes_unwind_batches():
+    def run(cypher, params=None):
+        if cypher == SITE_SUBJECT.keys_cypher:
+            return [{"key": "A"}, {"key": "B"}, {"key": "C"}]
+        if cypher == SITE_SUBJECT.derive_cypher:
+            return [MagicMock(data=lambda k=k, e=e: {"key": k, **e}) for k in params["keys"] for e in EDGES]
+        return []
+
+    session = MagicMock()
+    session.run.side_effect = run
+    assert materialize_provenance(session, epoch=4, kinds=("site",), batch_size=2) == {"site": 3}
+
+    derives = [c.args[1]["keys"] for c in session.run.call_args_list if c.args[0] == SITE_SUBJECT.derive_cypher]
+    stores = [c.args[1] for c in session.run.call_args_list if c.args[0] == SITE_SUBJECT.store_cypher]
+    assert derives == [["A", "B"], ["C"]]
+    assert [len(p["rows"]) for p in stores] == [2, 1]
+    assert all(p["epoch"] == 4 for p in stores)
+    assert decode_edges(stores[0]["rows"][0]["edges"]) == EDGES
+    # Cache nodes of removed sites are pruned, and old on-node blobs removed
+    tail = [c.args for c in session.run.call_args_list][-2:]
+    assert tail == [(SITE_SUBJECT.prune_cypher, {"keys": ["A", "B", "C"]}), (SITE_SUBJECT.legacy_cleanup_cypher,)]
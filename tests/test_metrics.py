@@ -0,0 +1,174 @@
+"""Tests for query stage timings, metrics registry and the /metrics endpoint."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from maris.observability import MetricsRegistry, StageTimings, current_timings, stage
+from maris.observability.metrics import QUERY_STAGE_SECONDS
+
+GRAPH_RESULT = {
+    "results": [{"site": "Cabo Pulmo National Park", "axiom_id": "BA-001", "total_esv": 29_270_000}],
+    "record_count": 1,
+    "strategy": "deterministic_template",
+}
+EDGES = [{
+    "from_node": "BA-001", "from_type": "BridgeAxiom", "relationship": "APPLIES_TO",
+    "to_node": "Cabo Pulmo National Park", "to_type": "MPA",
+}]
+
+
+class TestRegistry:
+    def test_histogram_exposition(self):
+        registry = MetricsRegistry()
+        hist = registry.histogram("h_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 2.0):
+            hist.observe(value, stage="llm")
+        lines = registry.render().splitlines()
+        assert "# TYPE h_seconds histogram" in lines
+        assert 'h_seconds_bucket{stage="llm",le="0.1"} 1' in lines
+        assert 'h_seconds_bucket{stage="llm",le="1"} 2' in lines
+        assert 'h_seconds_bucket{stage="llm",le="+Inf"} 3' in lines
+        assert 'h_seconds_sum{stage="llm"} 2.55' in lines
+        assert 'h_seconds_count{stage="llm"} 3' in lines
+
+    def test_counter_and_label_validation(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("hits", "Hits.", ("route",))
+        counter.inc(route='/a"b')
+        counter.inc(2, route='/a"b')
+        assert 'hits_total{route="/a\\"b"} 3' in registry.render()
+        with pytest.raises(ValueError):
+            counter.inc(route="/a", status="200")
+        with pytest.raises(ValueError):
+            counter.inc(-1, route="/a")
+
+    def test_reregistration_returns_same_metric(self):
+        registry = MetricsRegistry()
+        assert registry.counter("c", "C.", ("a",)) is registry.counter("c", "C.", ("a",))
+        with pytest.raises(ValueError):
+            registry.histogram("c", "C.", ("a",))
+
+
+class TestStageTimings:
+    def test_stage_is_noop_without_active_timings(self):
+        assert current_timings() is None
+        with stage("classify"):
+            pass
+
+    async def test_records_across_tasks_and_threads(self):
+        timings = StageTimings()
+
+        def _blocking():
+            with stage("validation"):
+                pass
+
+        async def _task():
+            with stage("cypher"):
+                await asyncio.sleep(0.01)
+
+        with timings.activate():
+            with stage("classify"):
+                pass
+            await asyncio.gather(_task(), asyncio.to_thread(_blocking))
+            with stage("classify"):
+                pass
+        assert current_timings() is None
+
+        ms = timings.as_ms()
+        assert list(ms) == ["classify", "cypher", "validation"]
+        assert ms["cypher"] >= 10
+
+    def test_publish_observes_histograms(self):
+        timings = StageTimings()
+        timings.record("llm", 0.25)
+        before = QUERY_STAGE_SECONDS.snapshot(stage="llm", category="t_cat", template="t_cat:x")
+        timings.publish("t_cat", "t_cat:x", "miss", 0.3)
+        count, total = QUERY_STAGE_SECONDS.snapshot(stage="llm", category="t_cat", template="t_cat:x")
+        assert count == before[0] + 1
+        assert total == pytest.approx(before[1] + 0.25)
+
+
+class TestQueryInstrumentation:
+    def _client(self):
+        import maris.api.routes.query as qmod
+        import maris.config
+        from fastapi.testclient import TestClient
+        from maris.api.main import create_app
+        from maris.query.generator import ResponseGenerator
+
+        classifier = MagicMock()
+        classifier.classify.return_value = {
+            "category": "site_valuation",
+            "site": "Cabo Pulmo National Park",
+            "metrics": [],
+            "confidence": 0.9,
+            "caveats": [],
+        }
+        executor = MagicMock()
+        executor.execute_with_strategy.return_value = GRAPH_RESULT
+        executor.get_provenance_edges.return_value = EDGES
+        llm = MagicMock()
+        llm.complete_json.return_value = {
+            "answer": "Cabo Pulmo is valued at $29.27M/yr.",
+            "confidence": 0.8,
+            "evidence": [],
+            "axioms_used": ["BA-001"],
+            "caveats": [],
+        }
+        qmod._llm = llm
+        qmod._classifier = classifier
+        qmod._executor = executor
+        qmod._generator = ResponseGenerator(llm, context_token_budget=0)
+        maris.config._config = None
+        return qmod, TestClient(create_app())
+
+    def _post(self, body):
+        qmod, client = self._client()
+        trace = ([{"axiom_id": "BA-001", "input_fact": "a", "output_fact": "b"}], "chain", [])
+        previous_cache = qmod._response_cache
+        qmod._response_cache = None
+        try:
+            with (
+                patch.object(qmod, "_init_components"),
+                patch.object(qmod, "_build_inference_trace", return_value=trace),
+            ):
+                response = client.post(
+                    "/api/query", json=body, headers={"Authorization": "Bearer test-api-key"},
+                )
+        finally:
+            qmod._response_cache = previous_cache
+        return client, response
+
+    def test_breakdown_on_request(self):
+        _, response = self._post({"question": "What is Cabo Pulmo worth?", "include_timings": True})
+        assert response.status_code == 200
+        timings = response.json()["query_metadata"]["stage_timings_ms"]
+        assert list(timings) == ["classify", "cypher", "provenance", "inference", "llm", "validation", "confidence"]
+        assert all(v >= 0 for v in timings.values())
+
+    def test_breakdown_omitted_by_default(self):
+        _, response = self._post({"question": "What is Cabo Pulmo worth?"})
+        assert response.json()["query_metadata"]["stage_timings_ms"] is None
+
+    def test_metrics_endpoint(self):
+        client, _ = self._post({"question": "What is Cabo Pulmo worth?"})
+        response = client.get("/metrics", headers={"Authorization": "Bearer test-api-key"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert (
+            'maris_query_stage_seconds_count{stage="llm",category="site_valuation",'
+            'template="site_valuation:deterministic_template"}'
+        ) in body
+        assert 'maris_query_duration_seconds_bucket{category="site_valuation"' in body
+        assert 'maris_http_requests_total{method="POST",route="/api/query",status="200"}' in body
+
+    def test_metrics_can_be_disabled(self):
+        import maris.config
+
+        _, client = self._client()
+        with patch.object(maris.config.get_config(), "metrics_enabled", False):
+            response = client.get("/metrics", headers={"Authorization": "Bearer test-api-key"})
+        assert response.status_code == 404
@@ -0,0 +1,116 @@
+"""Tests for the precomputed numeric evidence index used in claim validation."""
+
+import random
+from unittest.mock import MagicMock, patch
+
+from maris.query.validators import (
+    NumericEvidenceIndex,
+    _flatten_values,
+    _normalize_number,
+    validate_llm_response,
+    verify_numerical_claims,
+)
+
+
+def _linear_verify(claims, graph_context):
+    """The previous linear scan over every context value, as a reference."""
+    raw = _flatten_values(graph_context) if graph_context else []
+    context_values = set(raw)
+    for v in raw:
+        context_values.update((v * 1_000_000, v * 100, v / 1_000_000))
+    verified, unverified = [], []
+    for claim in claims:
+        value = _normalize_number(claim)
+        found = value is not None and any(
+            (value == 0) if cv == 0 else abs(value - cv) / max(abs(cv), 1e-9) < 0.05
+            for cv in context_values
+        )
+        (verified if found else unverified).append(claim)
+    return verified, unverified
+
+
+def _comparison_context(n_sites=300, seed=11):
+    rng = random.Random(seed)
+    return {"results": [
+        {
+            "site": f"Site {i}",
+            "total_esv": rng.uniform(1e5, 5e8),
+            "biomass_ratio": round(rng.uniform(0.5, 6), 2),
+            "neoli_score": rng.randint(0, 5),
+            "coverage": str(round(rng.random(), 3)),
+            "services": [{"service": "Tourism", "value_usd": rng.uniform(1e4, 1e8)}],
+        }
+        for i in range(n_sites)
+    ]}
+
+
+class TestNumericEvidenceIndex:
+    def test_matches_linear_scan(self):
+        ctx = _comparison_context()
+        rng = random.Random(5)
+        values = _flatten_values(ctx)
+        claims = []
+        for _ in range(400):
+            v = rng.choice(values) * rng.choice([0.9, 0.96, 1.0, 1.04, 1.2])
+            claims.append(rng.choice([f"${v:,.0f}", f"${v / 1e6:.2f}M", f"{v:.2f}x", f"{v * 100:.1f}%"]))
+        claims += ["0%", "$0", "1.00x"]
+        index = NumericEvidenceIndex.from_context(ctx)
+        assert index.verify(claims) == _linear_verify(claims, ctx)
+
+    def test_unit_buckets(self):
+        index = NumericEvidenceIndex([29.27, 0.84, 29_270_000])
+        assert index.match(29_270_000) == "raw"
+        assert index.match(84.0) == "percent"
+        assert index.match(0.0000293) == "per_million"
+        assert index.match(1234.0) is None
+
+    def test_tolerance_boundaries(self):
+        index = NumericEvidenceIndex([100.0])
+        assert index.match(104.9) is not None
+        assert index.match(95.1) is not None
+        assert index.match(105.1) is None
+        assert index.match(94.9) is None
+
+    def test_negative_zero_and_tiny_values(self):
+        ctx = {"delta": -12.5, "zero": 0, "tiny": 1e-12}
+        claims = ["0%", "12.5%", "$0"]
+        assert NumericEvidenceIndex.from_context(ctx).verify(claims) == _linear_verify(claims, ctx)
+        assert NumericEvidenceIndex([-12.5]).match(-12.6) == "raw"
+        assert NumericEvidenceIndex([]).match(0.0) is None
+
+    def test_empty_context(self):
+        assert len(NumericEvidenceIndex.from_context(None)) == 0
+        assert verify_numerical_claims("Worth $5M.", None) == ([], ["$5M"])
+
+
+class TestIndexReuse:
+    def test_verify_reuses_index(self):
+        ctx = {"total_esv": 29_270_000, "biomass_ratio": 4.63}
+        index = NumericEvidenceIndex.from_context(ctx)
+        answers = ["ESV is $29.27M.", "Biomass rose 4.63x.", "No numbers.", "Worth $80M."]
+        with patch.object(NumericEvidenceIndex, "from_context") as build:
+            results = [verify_numerical_claims(a, ctx, evidence_index=index) for a in answers]
+        build.assert_not_called()
+        assert results == [(["$29.27M"], []), (["4.63x"], []), ([], []), ([], ["$80M"])]
+
+    def test_validate_llm_response_reuses_index(self):
+        ctx = {"total_esv": 29_270_000}
+        index = NumericEvidenceIndex.from_context(ctx)
+        response = {"answer": "ESV is $29.27M.", "confidence": 0.8, "evidence": [], "caveats": []}
+        with patch.object(NumericEvidenceIndex, "from_context") as build:
+            result = validate_llm_response(response, ctx, evidence_index=index)
+        build.assert_not_called()
+        assert result["verified_claims"] == ["$29.27M"]
+
+    def test_generator_validates_against_passed_index(self):
+        from maris.query.generator import ResponseGenerator
+
+        ctx = {"total_esv": 29_270_000}
+        index = NumericEvidenceIndex.from_context(ctx)
+        llm = MagicMock()
+        llm.complete_json.return_value = {"answer": "ESV is $29.27M.", "confidence": 0.8, "evidence": []}
+        generator = ResponseGenerator(llm=llm, context_token_budget=2000)
+        with patch.object(NumericEvidenceIndex, "from_context") as build:
+            result = generator.generate("What is it worth?", ctx, "open_domain", evidence_index=index)
+        build.assert_not_called()
+        assert result["verified_claims"] == ["$29.27M"]
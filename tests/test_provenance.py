@@ -582,10 +582,11 @@ class TestLLMExtractorProvenance:
         mock_config.llm_timeout = 10
         mock_config.llm_max_tokens = 100
         mock_config.extraction_confidence_threshold = 0.5
+        mock_config.llm_cache_enabled = False
 
         manager = MARISProvenanceManager()
 
-        with patch("maris.ingestion.llm_extractor.OpenAI"):
+        with patch("maris.llm.adapter.OpenAI"):
             extractor = LLMExtractor(mock_config, provenance_manager=manager)
             assert extractor._provenance is manager
 
@@ -600,8 +601,9 @@ class TestLLMExtractorProvenance:
         mock_config.llm_timeout = 10
         mock_config.llm_max_tokens = 100
         mock_config.extraction_confidence_threshold = 0.5
+        mock_config.llm_cache_enabled = False
 
-        with patch("maris.ingestion.llm_extractor.OpenAI"):
+        with patch("maris.llm.adapter.OpenAI"):
             extractor = LLMExtractor(mock_config)
             assert extractor._provenance is None
 
@@ -711,7 +713,8 @@ class TestBackwardCompatibility:
         mock_config.llm_timeout = 10
         mock_config.llm_max_tokens = 100
         mock_config.extraction_confidence_threshold = 0.5
+        mock_config.llm_cache_enabled = False
 
-        with patch("maris.ingestion.llm_extractor.OpenAI"):
+        with patch("maris.llm.adapter.OpenAI"):
             extractor = LLMExtractor(mock_config)
             assert extractor._provenance is None
@@ -0,0 +1,192 @@
+"""Tests for /api/query/batch and shared graph reads."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from maris.query.batch import SharedGraphReads
+from maris.query.validators import NumericEvidenceIndex
+
+GRAPH_RESULT = {
+    "results": [{"site": "Cabo Pulmo National Park", "axiom_id": "BA-001"}],
+    "record_count": 1,
+    "strategy": "deterministic_template",
+}
+EDGES = [{
+    "from_node": "BA-001", "from_type": "BridgeAxiom", "relationship": "APPLIES_TO",
+    "to_node": "Cabo Pulmo National Park", "to_type": "MPA",
+}]
+
+
+class TestSharedGraphReads:
+    async def test_identical_reads_run_once(self):
+        executor = MagicMock()
+        executor.execute_with_strategy.return_value = GRAPH_RESULT
+        reads = SharedGraphReads(executor)
+
+        results = await asyncio.gather(*(
+            reads.execute_with_strategy_async(
+                "site_valuation", {"site_name": "Cabo Pulmo National Park"},
+                question=f"q{i}", site_name="Cabo Pulmo National Park",
+            )
+            for i in range(5)
+        ))
+        assert executor.execute_with_strategy.call_count == 1
+        assert reads.graph_reads == 1
+        assert all(r == GRAPH_RESULT for r in results)
+        # Each caller gets its own copy
+        results[0]["results"].clear()
+        assert results[1]["results"]
+
+    async def test_open_domain_keyed_on_question(self):
+        executor = MagicMock()
+        executor.execute_with_strategy.return_value = GRAPH_RESULT
+        reads = SharedGraphReads(executor)
+        for question in ("reef carbon", "reef carbon", "kelp carbon"):
+            await reads.execute_with_strategy_async("open_domain", {}, question=question)
+        assert reads.graph_reads == 2
+
+    async def test_evidence_index_built_once_per_read(self):
+        executor = MagicMock()
+        executor.execute_with_strategy.return_value = {**GRAPH_RESULT, "total_esv": 29_270_000}
+        reads = SharedGraphReads(executor)
+        params = {"site_name": "Cabo Pulmo National Park"}
+        assert reads.evidence_index("site_valuation", params) is None
+
+        await reads.execute_with_strategy_async("site_valuation", params)
+        with patch.object(NumericEvidenceIndex, "from_context", wraps=NumericEvidenceIndex.from_context) as build:
+            first = reads.evidence_index("site_valuation", params, question="q1")
+            second = reads.evidence_index("site_valuation", dict(params), question="q2")
+        assert build.call_count == 1
+        assert first is second
+        assert first.match(29.27e6) == "raw"
+
+    async def test_provenance_deduplicated(self):
+        executor = MagicMock()
+        executor.get_provenance_edges.return_value = EDGES
+        reads = SharedGraphReads(executor)
+        params = {"site_name": "Cabo Pulmo National Park"}
+        await reads.get_provenance_edges_async("site_valuation", params)
+        await reads.get_provenance_edges_async("site_valuation", dict(params))
+        assert executor.get_provenance_edges.call_count == 1
+
+
+class TestBatchEndpoint:
+    def _post(self, questions, classify):
+        import maris.api.routes.query as qmod
+        import maris.config
+        from fastapi.testclient import TestClient
+        from maris.api.main import create_app
+
+        classifier = MagicMock()
+        classifier.classify.side_effect = classify
+        executor = MagicMock()
+        executor.execute_with_strategy.return_value = GRAPH_RESULT
+        executor.get_provenance_edges.return_value = EDGES
+        generator = MagicMock()
+        generator.generate.return_value = {
+            "answer": "Cabo Pulmo is valued at $29.27M/yr.",
+            "confidence": 0.8,
+            "evidence": [],
+            "axioms_used": ["BA-001"],
+            "graph_path": [],
+            "caveats": [],
+        }
+        qmod._llm = MagicMock()
+        qmod._classifier = classifier
+        qmod._executor = executor
+        qmod._generator = generator
+        trace = ([{"axiom_id": "BA-001", "input_fact": "a", "output_fact": "b"}], "chain", [])
+
+        previous_cache = qmod._response_cache
+        qmod._response_cache = None
+        try:
+            maris.config._config = None
+            client = TestClient(create_app())
+            with (
+                patch.object(qmod, "_init_components"),
+                patch.object(qmod, "_build_inference_trace", return_value=trace),
+            ):
+                response = client.post(
+                    "/api/query/batch",
+                    json={"queries": [{"question": q} for q in questions]},
+                    headers={"Authorization": "Bearer test-api-key"},
+                )
+        finally:
+            qmod._response_cache = previous_cache
+        return response, classifier, executor, generator
+
+    @staticmethod
+    def _site_valuation(question):
+        return {
+            "category": "site_valuation",
+            "site": "Cabo Pulmo National Park",
+            "metrics": [],
+            "confidence": 0.9,
+            "caveats": [],
+        }
+
+    def test_near_duplicates_share_graph_work(self):
+        questions = [
+            "What is Cabo Pulmo worth?",
+            "what is cabo pulmo worth",
+            "Cabo Pulmo total ESV?",
+            "Value of Cabo Pulmo ecosystem services",
+        ]
+        response, classifier, executor, generator = self._post(questions, self._site_valuation)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [item["index"] for item in body["results"]] == [0, 1, 2, 3]
+        assert all(item["response"]["answer"] for item in body["results"])
+
+        meta = body["batch_metadata"]
+        assert meta["total"] == 4
+        assert meta["distinct_questions"] == 3
+        assert meta["groups"] == 1
+        assert meta["graph_reads"] == 1
+        assert meta["provenance_reads"] == 1
+        assert classifier.classify.call_count == 3
+        assert executor.execute_with_strategy.call_count == 1
+        assert generator.generate.call_count == 3
+        indexes = [c.kwargs["evidence_index"] for c in generator.generate.call_args_list]
+        assert isinstance(indexes[0], NumericEvidenceIndex)
+        assert all(index is indexes[0] for index in indexes)
+
+    def test_item_errors_do_not_fail_batch(self):
+        def classify(question):
+            if "compare" in question:
+                return {"category": "comparison", "site": None, "sites": [], "confidence": 0.8, "caveats": []}
+            return self._site_valuation(question)
+
+        response, *_ = self._post(["What is Cabo Pulmo worth?", "compare this"], classify)
+        assert response.status_code == 200
+        first, second = response.json()["results"]
+        assert first["response"] is not None and first["error"] is None
+        assert second["response"] is None
+        assert second["error"]["status_code"] == 422
+
+    def test_empty_batch_rejected(self):
+        response, *_ = self._post([], self._site_valuation)
+        assert response.status_code == 422
+
+    def test_each_distinct_question_is_charged_to_the_query_limit(self):
+        from maris.api.auth import _rate_buckets
+
+        _rate_buckets.clear()
+        try:
+            response, *_ = self._post(
+                ["What is Cabo Pulmo worth?", "what is cabo pulmo  worth", "Cabo Pulmo total ESV?"],
+                self._site_valuation,
+            )
+            assert response.status_code == 200
+            assert [len(v) for k, v in _rate_buckets.items() if k.startswith("query:")] == [2]
+
+            response, *_ = self._post([f"Cabo Pulmo ESV in {2000 + i}?" for i in range(29)], self._site_valuation)
+            assert response.status_code == 429
+            assert [len(v) for k, v in _rate_buckets.items() if k.startswith("query:")] == [2]
+        finally:
+            _rate_buckets.clear()
+
+    def test_batch_larger_than_the_query_limit_rejected(self):
+        response, *_ = self._post(["What is Cabo Pulmo worth?"] * 31, self._site_valuation)
+        assert response.status_code == 422
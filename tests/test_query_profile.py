@@ -0,0 +1,121 @@
+"""Tests for the Cypher PROFILE harness and its budget checks."""
+
+import json
+import re
+from unittest.mock import MagicMock
+
+import pytest
+
+from maris.graph.query_profile import (
+    DEFAULT_BUDGETS_PATH,
+    ProfiledQuery,
+    ProfileResult,
+    budgets_from,
+    check_budgets,
+    collect_queries,
+    load_budgets,
+    profile_query,
+    seed_fixture_graph,
+)
+from maris.graph.validation import VALIDATION_QUERIES
+from maris.query.cypher_templates import HOP_PLACEHOLDER, TEMPLATES
+
+PROFILE = {
+    "operatorType": "ProduceResults", "rows": 1, "dbHits": 0,
+    "children": [{
+        "operatorType": "Apply", "rows": 1, "dbHits": 4,
+        "children": [
+            {"operatorType": "NodeUniqueIndexSeek", "rows": 1, "dbHits": 2, "children": []},
+            {"operatorType": "Expand(All)", "rows": 5, "dbHits": 11, "children": []},
+        ],
+    }],
+}
+
+
+def _result(key, db_hits, rows=1):
+    return ProfileResult(key, db_hits, rows, {})
+
+
+def test_every_template_and_validation_query_is_profiled():
+    queries = {q.key: q for q in collect_queries()}
+    assert set(queries) == (
+        {f"template:{n}" for n in TEMPLATES} | {f"validation:{n}" for n in VALIDATION_QUERIES}
+    )
+    for name in TEMPLATES:
+        query = queries[f"template:{name}"]
+        assert HOP_PLACEHOLDER not in query.cypher
+        used = set(re.findall(r"\$(\w+)", query.cypher)) - {"node_id"}
+        assert used <= set(query.parameters), name
+
+
+def test_profile_query_records_hits_rows_and_operator_tree():
+    result = MagicMock()
+    result.__iter__.return_value = iter([MagicMock(), MagicMock()])
+    result.consume.return_value.profile = PROFILE
+    session = MagicMock()
+    session.run.return_value = result
+
+    profiled = profile_query(session, ProfiledQuery("template:x", "MATCH (n) RETURN n", {"a": 1}))
+
+    session.run.assert_called_once_with("PROFILE MATCH (n) RETURN n", {"a": 1})
+    assert (profiled.db_hits, profiled.rows) == (17, 2)
+    assert profiled.plan["operator"] == "ProduceResults"
+    assert [c["operator"] for c in profiled.plan["children"][0]["children"]] == [
+        "NodeUniqueIndexSeek", "Expand(All)",
+    ]
+
+
+class TestBudgets:
+    def test_regressions_beyond_tolerance_are_flagged(self):
+        budgets = {"tolerance": 0.1, "budgets": {
+            "template:a": {"db_hits": 100, "rows": 1},
+            "template:b": {"db_hits": 100, "rows": 1},
+            "template:c": {"db_hits": 100, "rows": 1},
+        }}
+        check = check_budgets(
+            [_result("template:a", 110), _result("template:b", 111), _result("template:c", 80, rows=2),
+             _result("template:new", 5)],
+            budgets,
+        )
+        assert not check.ok
+        assert [r.split(":")[1] for r in check.regressions] == ["b", "c"]
+        assert "rows" in check.regressions[1]
+        assert check.unbudgeted == ["template:new"]
+        assert check.improved == ["template:c: 80 db hits < budget 100"]
+
+    def test_unbudgeted_query_fails_the_check(self):
+        budgets = {"tolerance": 0.1, "budgets": {"template:a": {"db_hits": 100, "rows": 1}}}
+        check = check_budgets([_result("template:a", 100), _result("template:new", 5)], budgets)
+        assert check.regressions == []
+        assert not check.ok
+
+    def test_rebaseline_round_trips(self):
+        results = [_result("validation:x", 7, rows=3), _result("template:y", 40)]
+        budgets = json.loads(json.dumps(budgets_from(results, tolerance=0.2)))
+        assert list(budgets["budgets"]) == ["template:y", "validation:x"]
+        assert check_budgets(results, budgets).ok
+
+    def test_checked_in_budgets_are_well_formed(self):
+        budgets = load_budgets(DEFAULT_BUDGETS_PATH)
+        known = {q.key for q in collect_queries()}
+        assert 0 <= budgets["tolerance"] < 1
+        for key, entry in budgets["budgets"].items():
+            assert key in known
+            assert entry["db_hits"] >= 0 and entry["rows"] >= 0
+
+    @pytest.mark.xfail(
+        not load_budgets(DEFAULT_BUDGETS_PATH)["budgets"],
+        reason="GAP: budgets not recorded yet; commit recorded_budgets.json from the CI query-profile job",
+        strict=True,
+    )
+    def test_every_query_has_a_budget(self):
+        budgets = load_budgets(DEFAULT_BUDGETS_PATH)["budgets"]
+        assert sorted(q.key for q in collect_queries() if q.key not in budgets) == []
+
+
+def test_seeding_refuses_a_populated_database():
+    session = MagicMock()
+    session.run.return_value.single.return_value = {"n": 1024}
+    with pytest.raises(RuntimeError, match="1024 nodes"):
+        seed_fixture_graph(session)
+    session.run.assert_called_once()
@@ -0,0 +1,204 @@
+"""Tests for SSE streaming answers (/api/query/stream)."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from maris.llm.cache import CompletionCache
+from maris.query.streaming import AnswerFieldStream
+
+LLM_JSON = (
+    '{"answer": "Cabo Pulmo is valued at \\"$29.27M\\"/yr.\\nSee BA-001.", '
+    '"confidence": 0.8, "evidence": [], "axioms_used": ["BA-001"], "caveats": []}'
+)
+
+GRAPH_CONTEXT = {
+    "results": [{
+        "site": "Cabo Pulmo National Park",
+        "total_esv": 29270000,
+        "axiom_id": "BA-001",
+        "evidence": [{"doi": "10.1371/journal.pone.0023601", "title": "Large recovery", "year": 2011, "tier": "T1"}],
+    }],
+    "record_count": 1,
+    "strategy": "deterministic_template",
+}
+
+
+def _chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestAnswerFieldStream:
+    def test_decodes_answer_across_split_escapes(self):
+        stream = AnswerFieldStream()
+        decoded = "".join(stream.feed(c) for c in _chunks(LLM_JSON, 3))
+        assert decoded == 'Cabo Pulmo is valued at "$29.27M"/yr.\nSee BA-001.'
+        assert stream.done
+
+    def test_unicode_escape_and_missing_key(self):
+        stream = AnswerFieldStream()
+        assert stream.feed('{"confidence": 0.5, ') == ""
+        assert stream.feed('"answer": "caf\\u00') == "caf"
+        assert stream.feed('e9"}') == "é"
+
+
+class _FakeStreamingLLM:
+    """Async LLM double exposing ``stream`` like AsyncLLMAdapter."""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    async def stream(self, messages, **kwargs):
+        self.calls += 1
+        for chunk in _chunks(self.text):
+            yield chunk
+
+
+class TestGenerateStream:
+    async def test_tokens_then_validated_result(self):
+        from maris.query.generator import ResponseGenerator
+
+        gen = ResponseGenerator(llm=MagicMock(), async_llm=_FakeStreamingLLM(LLM_JSON))
+        events = [e async for e in gen.generate_stream("Value?", GRAPH_CONTEXT, "site_valuation")]
+        kinds = [kind for kind, _ in events]
+        assert kinds[-1] == "result" and set(kinds[:-1]) == {"token"}
+        streamed = "".join(value for kind, value in events if kind == "token")
+        assert streamed.startswith("Cabo Pulmo is valued at")
+        assert "confidence_breakdown" in events[-1][1]
+
+    async def test_empty_context_skips_llm(self):
+        from maris.query.generator import ResponseGenerator
+
+        llm = _FakeStreamingLLM(LLM_JSON)
+        gen = ResponseGenerator(llm=MagicMock(), async_llm=llm)
+        events = [e async for e in gen.generate_stream("Value?", {"results": []}, "site_valuation")]
+        assert [kind for kind, _ in events] == ["result"]
+        assert llm.calls == 0
+
+
+class TestAdapterStream:
+    async def test_async_stream_writes_and_replays_cache(self):
+        from maris.llm.adapter import AsyncLLMAdapter
+
+        config = MagicMock(
+            llm_provider="deepseek", llm_api_key="k", llm_base_url="http://localhost",
+            llm_model="m", llm_max_tokens=64, llm_timeout=5,
+        )
+
+        async def _provider_stream():
+            for text in ("Hel", "lo"):
+                yield MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+
+        with patch("maris.llm.adapter.AsyncOpenAI") as mock_openai:
+            adapter = AsyncLLMAdapter(config, cache=CompletionCache())
+
+        async def _create(**kwargs):
+            assert kwargs["stream"] is True
+            return _provider_stream()
+
+        create = MagicMock(side_effect=_create)
+        mock_openai.return_value.chat.completions.create = create
+        messages = [{"role": "user", "content": "hi"}]
+        first = [c async for c in adapter.stream(messages, temperature=0.0)]
+        second = [c async for c in adapter.stream(messages, temperature=0.0)]
+        assert first == ["Hel", "lo"]
+        assert second == ["Hello"]
+        assert create.call_count == 1
+
+
+class TestStreamEndpoint:
+    def _post(self, qmod, generator):
+        import maris.config
+        from fastapi.testclient import TestClient
+        from maris.api.main import create_app
+
+        classifier = MagicMock()
+        classifier.classify.return_value = {
+            "category": "site_valuation",
+            "site": "Cabo Pulmo National Park",
+            "metrics": [],
+            "confidence": 0.9,
+            "caveats": [],
+        }
+        executor = MagicMock()
+        executor.execute_with_strategy.return_value = GRAPH_CONTEXT
+        executor.get_provenance_edges.return_value = [{
+            "from_node": "BA-001", "from_type": "BridgeAxiom", "relationship": "APPLIES_TO",
+            "to_node": "Cabo Pulmo National Park", "to_type": "MPA",
+        }]
+        qmod._llm = MagicMock()
+        qmod._classifier = classifier
+        qmod._executor = executor
+        qmod._generator = generator
+        trace = ([{"axiom_id": "BA-001", "input_fact": "a", "output_fact": "b"}], "1. BA-001", [])
+
+        maris.config._config = None
+        client = TestClient(create_app())
+        with (
+            patch.object(qmod, "_init_components"),
+            patch.object(qmod, "_build_inference_trace", return_value=trace),
+        ):
+            return client.post(
+                "/api/query/stream",
+                json={"question": "What is Cabo Pulmo worth?"},
+                headers={"Authorization": "Bearer test-api-key"},
+            )
+
+    def test_grounding_tokens_then_final(self):
+        import maris.api.routes.query as qmod
+        from maris.query.generator import ResponseGenerator
+
+        generator = ResponseGenerator(llm=MagicMock(), async_llm=_FakeStreamingLLM(LLM_JSON))
+        response = self._post(qmod, generator)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.text)
+        names = [name for name, _ in events]
+        assert names[0] == "grounding"
+        assert names[-1] == "final"
+        assert names.count("token") > 1
+
+        grounding = events[0][1]
+        assert grounding["axioms_used"] == ["BA-001"]
+        assert grounding["evidence"][0]["doi"] == "10.1371/journal.pone.0023601"
+        assert 0.0 < grounding["confidence"] <= 1.0
+
+        final = events[-1][1]
+        assert final["axioms_used"] == ["BA-001"]
+        assert final["query_metadata"]["cache_status"] == "bypass"
+        assert any(edge["relationship"] == "INFERRED_AS" for edge in final["graph_path"])
+
+    def test_sync_generator_falls_back_to_single_token(self):
+        import maris.api.routes.query as qmod
+
+        generator = MagicMock()
+        generator.generate.return_value = {
+            "answer": "Cabo Pulmo is valued at $29.27M/yr.",
+            "confidence": 0.8,
+            "evidence": [],
+            "axioms_used": ["BA-001"],
+            "graph_path": [],
+            "caveats": [],
+        }
+        response = self._post(qmod, generator)
+        names = [name for name, _ in _parse_sse(response.text)]
+        assert names == ["grounding", "token", "final"]
+
+    def test_generation_failure_emits_error_event(self):
+        import maris.api.routes.query as qmod
+
+        generator = MagicMock()
+        generator.generate.side_effect = RuntimeError("provider down")
+        response = self._post(qmod, generator)
+        events = _parse_sse(response.text)
+        assert [name for name, _ in events] == ["grounding", "error"]
+        assert events[-1][1]["status_code"] == 500
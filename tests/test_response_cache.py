@@ -0,0 +1,251 @@
+"""Tests for the /api/query response cache and graph epoch helpers."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from maris.query.response_cache import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_STALE,
+    ResponseCache,
+    make_cache_key,
+    normalize_question,
+)
+
+
+class TestCacheKey:
+    def test_normalization_collapses_trivial_variants(self):
+        assert normalize_question("  What is  Cabo Pulmo worth?? ") == "what is cabo pulmo worth"
+        a = make_cache_key("What is Cabo Pulmo worth?", "Cabo Pulmo National Park", "site_valuation", 3)
+        b = make_cache_key("what is cabo pulmo WORTH", "cabo pulmo national park", "site_valuation", 3)
+        assert a == b
+
+    def test_epoch_and_options_change_key(self):
+        base = make_cache_key("q", None, "open_domain", 1, include_graph_path=True)
+        assert base != make_cache_key("q", None, "open_domain", 2, include_graph_path=True)
+        assert base != make_cache_key("q", None, "open_domain", 1, include_graph_path=False)
+
+
+class TestResponseCache:
+    def test_miss_then_hit(self):
+        cache = ResponseCache()
+        assert cache.lookup("k") == (CACHE_MISS, None)
+        cache.store("k", {"answer": "a"}, epoch=1)
+        assert cache.lookup("k") == (CACHE_HIT, {"answer": "a"})
+        assert cache.stats()["hits"] == 1
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.store("a", {"v": 1}, 1)
+        cache.store("b", {"v": 2}, 1)
+        cache.lookup("a")
+        cache.store("c", {"v": 3}, 1)
+        assert cache.lookup("b")[0] == CACHE_MISS
+        assert cache.lookup("a")[0] == CACHE_HIT
+
+    def test_stale_then_expired(self):
+        cache = ResponseCache(ttl_seconds=10, stale_seconds=10)
+        cache.store("k", {"v": 1}, 1)
+        with patch("maris.query.response_cache.time.time", return_value=time.time() + 15):
+            assert cache.lookup("k")[0] == CACHE_STALE
+        with patch("maris.query.response_cache.time.time", return_value=time.time() + 25):
+            assert cache.lookup("k")[0] == CACHE_MISS
+
+    async def test_revalidate_deduplicates_and_refreshes(self):
+        cache = ResponseCache()
+        cache.store("k", {"v": 1}, 1)
+        release = asyncio.Event()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return {"v": 2}
+
+        assert cache.revalidate_async("k", 1, compute) is True
+        assert cache.revalidate_async("k", 1, compute) is False
+        release.set()
+        while cache.stats()["refreshing"]:
+            await asyncio.sleep(0.01)
+        assert len(calls) == 1
+        assert cache.lookup("k") == (CACHE_HIT, {"v": 2})
+
+    def test_newer_epoch_purges_older_entries(self):
+        cache = ResponseCache()
+        cache.store("old", {"v": 1}, 1)
+        cache.store("new", {"v": 2}, 2)
+        assert cache.lookup("old")[0] == CACHE_MISS
+        assert cache.lookup("new")[0] == CACHE_HIT
+
+    def test_sqlite_persistence_survives_restart(self, tmp_path):
+        db = tmp_path / "cache" / "responses.db"
+        cache = ResponseCache(db_path=db)
+        cache.store("k", {"answer": "persisted"}, 4)
+        cache.close()
+
+        reopened = ResponseCache(db_path=db)
+        assert reopened.lookup("k") == (CACHE_HIT, {"answer": "persisted"})
+        reopened.close()
+
+
+class TestGraphEpoch:
+    def test_epoch_read_is_cached_and_failures_bypass(self):
+        import maris.graph.epoch as emod
+
+        emod.invalidate_graph_epoch_cache()
+        with patch.object(emod, "read_graph_epoch", return_value=7) as mock_read:
+            assert emod.get_graph_epoch() == 7
+            assert emod.get_graph_epoch() == 7
+        assert mock_read.call_count == 1
+
+        emod.invalidate_graph_epoch_cache()
+        with patch.object(emod, "read_graph_epoch", side_effect=RuntimeError("down")):
+            assert emod.get_graph_epoch() is None
+        emod.invalidate_graph_epoch_cache()
+
+    def test_bump_with_session_updates_local_cache(self):
+        import maris.graph.epoch as emod
+
+        session = MagicMock()
+        session.run.return_value.single.return_value = {"epoch": 12}
+        assert emod.bump_graph_epoch(session) == 12
+        with patch.object(emod, "read_graph_epoch") as mock_read:
+            assert emod.get_graph_epoch() == 12
+        mock_read.assert_not_called()
+        emod.invalidate_graph_epoch_cache()
+
+
+class TestDegradedGeneration:
+    CONTEXT = {"results": [{"site": "Cabo Pulmo National Park", "total_esv": 29270000}]}
+
+    def test_llm_failure_is_flagged(self):
+        from maris.query.generator import ResponseGenerator
+
+        llm = MagicMock()
+        llm.complete_json.side_effect = RuntimeError("provider down")
+        result = ResponseGenerator(llm=llm, context_token_budget=0).generate("q", self.CONTEXT, "site_valuation")
+        assert result["degraded"] is True
+
+    def test_empty_answer_is_flagged(self):
+        from maris.query.generator import ResponseGenerator
+
+        llm = MagicMock()
+        llm.complete_json.return_value = {"answer": "", "evidence": []}
+        result = ResponseGenerator(llm=llm, context_token_budget=0).generate("q", self.CONTEXT, "open_domain")
+        assert result["degraded"] is True
+
+
+@pytest.fixture
+def query_module():
+    import maris.api.routes.query as qmod
+
+    mock_cls = MagicMock()
+    mock_cls.classify.return_value = {
+        "category": "open_domain",
+        "site": None,
+        "metrics": [],
+        "confidence": 0.6,
+        "caveats": [],
+    }
+    mock_exec = MagicMock()
+    mock_exec.execute_with_strategy.return_value = {
+        "error": "No results for demo query.",
+        "error_type": "no_results",
+        "results": [],
+        "record_count": 0,
+    }
+    qmod._llm = MagicMock()
+    qmod._classifier = mock_cls
+    qmod._executor = mock_exec
+    qmod._generator = MagicMock()
+    previous = qmod._response_cache
+    qmod._response_cache = ResponseCache()
+    try:
+        yield qmod
+    finally:
+        qmod._response_cache = previous
+
+
+class TestQueryEndpointCache:
+    def _client(self):
+        import maris.config
+        from fastapi.testclient import TestClient
+        from maris.api.main import create_app
+
+        maris.config._config = None
+        return TestClient(create_app())
+
+    def test_second_request_is_cache_hit(self, query_module):
+        client = self._client()
+        headers = {"Authorization": "Bearer test-api-key"}
+        body = {"question": "Tell me about reef carbon"}
+        with (
+            patch.object(query_module, "_init_components"),
+            patch.object(query_module, "get_graph_epoch", return_value=1),
+        ):
+            first = client.post("/api/query", json=body, headers=headers)
+            second = client.post("/api/query", json=body, headers=headers)
+
+        assert first.status_code == 200 and second.status_code == 200
+        assert first.json()["query_metadata"]["cache_status"] == "miss"
+        assert second.json()["query_metadata"]["cache_status"] == "hit"
+        assert second.json()["answer"] == first.json()["answer"]
+        assert query_module._executor.execute_with_strategy.call_count == 1
+
+    def test_epoch_change_invalidates(self, query_module):
+        client = self._client()
+        headers = {"Authorization": "Bearer test-api-key"}
+        body = {"question": "Tell me about reef carbon"}
+        with patch.object(query_module, "_init_components"):
+            with patch.object(query_module, "get_graph_epoch", return_value=1):
+                client.post("/api/query", json=body, headers=headers)
+            with patch.object(query_module, "get_graph_epoch", return_value=2):
+                response = client.post("/api/query", json=body, headers=headers)
+
+        assert response.json()["query_metadata"]["cache_status"] == "miss"
+        assert query_module._executor.execute_with_strategy.call_count == 2
+
+    def test_unknown_epoch_bypasses_cache(self, query_module):
+        client = self._client()
+        headers = {"Authorization": "Bearer test-api-key"}
+        with (
+            patch.object(query_module, "_init_components"),
+            patch.object(query_module, "get_graph_epoch", return_value=None),
+        ):
+            response = client.post(
+                "/api/query", json={"question": "Tell me about reef carbon"}, headers=headers,
+            )
+
+        assert response.json()["query_metadata"]["cache_status"] == "bypass"
+        assert query_module._response_cache.stats()["entries"] == 0
+
+    def test_degraded_answer_is_not_cached(self, query_module):
+        query_module._executor.execute_with_strategy.return_value = {
+            "results": [{"site": "Cabo Pulmo National Park", "total_esv": 29270000}],
+            "record_count": 1,
+            "strategy": "deterministic_template",
+        }
+        query_module._generator.generate.return_value = {
+            "answer": "Insufficient data in the knowledge graph to answer this question.",
+            "confidence": 0.0,
+            "evidence": [],
+            "axioms_used": [],
+            "graph_path": [],
+            "caveats": [],
+            "degraded": True,
+        }
+        client = self._client()
+        headers = {"Authorization": "Bearer test-api-key"}
+        with (
+            patch.object(query_module, "_init_components"),
+            patch.object(query_module, "get_graph_epoch", return_value=1),
+        ):
+            first = client.post("/api/query", json={"question": "Tell me about reef carbon"}, headers=headers)
+            second = client.post("/api/query", json={"question": "Tell me about reef carbon"}, headers=headers)
+
+        assert first.json()["query_metadata"]["degraded"] is True
+        assert second.json()["query_metadata"]["cache_status"] == "miss"
+        assert query_module._response_cache.stats()["entries"] == 0
@@ -0,0 +1,86 @@
+"""Tests for the process-wide compiled rule base and memoized inference traces."""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from maris.reasoning.rule_base import CompiledRuleBase, get_rule_base, reset_rule_base
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES = _PROJECT_ROOT / "schemas" / "bridge_axiom_templates.json"
+
+
+@pytest.fixture
+def templates(tmp_path):
+    path = tmp_path / "bridge_axiom_templates.json"
+    shutil.copy(TEMPLATES, path)
+    reset_rule_base()
+    yield path
+    reset_rule_base()
+
+
+class TestRuleBase:
+    def test_compiled_once_while_sources_unchanged(self, templates):
+        with patch.object(CompiledRuleBase, "load", wraps=CompiledRuleBase.load) as load:
+            first = get_rule_base(templates)
+            second = get_rule_base(templates)
+        assert first is second
+        assert load.call_count == 1
+        assert len(first.rules) == first.registry.count()
+
+    def test_rebuilds_when_templates_change(self, templates):
+        first = get_rule_base(templates)
+        data = json.loads(templates.read_text())
+        data["axioms"] = data["axioms"][:5]
+        templates.write_text(json.dumps(data))
+        stat = templates.stat()
+        os.utime(templates, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = get_rule_base(templates)
+        assert second is not first
+        assert len(second.rules) == 5
+        assert second.version != first.version
+
+    def test_engine_for_reuses_compiled_rules(self, templates):
+        rule_base = get_rule_base(templates)
+        axioms = [rule_base.registry.get("BA-001"), rule_base.registry.get("BA-002")]
+        with patch("maris.reasoning.rule_compiler.compile_axiom") as compile_axiom:
+            engine = rule_base.engine_for(axioms)
+        compile_axiom.assert_not_called()
+        assert engine.rule_count == 2
+        assert engine.get_rule("rule:BA-001") is rule_base.rules["rule:BA-001"]
+
+    def test_memoize_trace_returns_copies(self, templates):
+        rule_base = get_rule_base(templates)
+        compute = MagicMock(return_value=([{"axiom_id": "BA-001"}], "chain", []))
+        first = rule_base.memoize_trace(("Site", frozenset({"BA-001"})), compute)
+        first[0].clear()
+        second = rule_base.memoize_trace(("Site", frozenset({"BA-001"})), compute)
+        assert compute.call_count == 1
+        assert second[0] == [{"axiom_id": "BA-001"}]
+        assert rule_base.stats()["trace_hits"] == 1
+
+
+class TestQueryInferenceTrace:
+    def test_trace_memoized_and_matches_fresh_engine(self, templates):
+        import maris.api.routes.query as qmod
+        from maris.reasoning.inference_engine import InferenceEngine
+
+        rule_base = get_rule_base(templates)
+        with patch.object(qmod, "_rule_base", return_value=rule_base):
+            first = qmod._build_inference_trace({"BA-001", "BA-002"}, "Cabo Pulmo National Park")
+            second = qmod._build_inference_trace({"BA-002", "BA-001"}, "Cabo Pulmo National Park")
+
+        assert first == second
+        assert rule_base.stats()["trace_hits"] == 1
+
+        # Same steps as the previous per-request engine construction
+        engine = InferenceEngine()
+        engine.register_axioms([rule_base.registry.get("BA-001"), rule_base.registry.get("BA-002")])
+        start_domain = rule_base.registry.get("BA-001").input_domain
+        steps = engine.forward_chain({start_domain: {"site": "Cabo Pulmo National Park"}}, max_steps=2)
+        assert [s["axiom_id"] for s in first[0]] == [s.axiom_id for s in steps]
@@ -0,0 +1,126 @@
+"""Tests for the scalable site mention index (trie + trigram fuzzy index)."""
+
+from maris.query.classifier import (
+    QueryClassifier,
+    get_all_canonical_sites,
+    register_dynamic_sites,
+)
+from maris.query.site_index import SiteIndex, site_aliases
+
+
+class TestSiteAliases:
+    def test_full_short_and_first_word(self):
+        aliases = site_aliases("Raja Ampat Marine Park")
+        assert aliases == [
+            ("raja", "ampat", "marine", "park"),
+            ("raja", "ampat"),
+            ("raja",),
+        ]
+
+    def test_short_first_word_not_aliased(self):
+        aliases = site_aliases("Ras Mohammed National Park")
+        assert ("ras",) not in aliases
+
+    def test_diacritics_are_stripped(self):
+        aliases = site_aliases("Papahānaumokuākea Marine National Monument")
+        assert aliases[0][0] == "papahanaumokuakea"
+
+
+class TestExactMentions:
+    def test_finds_full_and_alias_mentions(self):
+        index = SiteIndex()
+        index.add_many(["Raja Ampat Marine Park", "Sundarbans Reserve Forest"])
+        assert index.find_mentions("compare raja ampat with the sundarbans") == [
+            "Raja Ampat Marine Park",
+            "Sundarbans Reserve Forest",
+        ]
+
+    def test_requires_whole_tokens(self):
+        index = SiteIndex()
+        index.add("Raja Ampat Marine Park")
+        assert index.find_mentions("the rajas of old") == []
+
+    def test_matches_reported_in_registration_order(self):
+        index = SiteIndex()
+        index.add_many(["Beta Reef Park", "Alpha Reef Park"])
+        assert index.find_mentions("alpha reef and beta reef") == [
+            "Beta Reef Park",
+            "Alpha Reef Park",
+        ]
+
+    def test_remove_unlinks_aliases(self):
+        index = SiteIndex()
+        index.add_many(["Raja Ampat Marine Park", "Raja Lake Reserve"])
+        assert index.remove("Raja Ampat Marine Park")
+        assert index.find_mentions("raja ampat") == ["Raja Lake Reserve"]
+        assert not index.remove("Raja Ampat Marine Park")
+        assert "Raja Ampat Marine Park" not in index
+
+    def test_scales_to_thousands_of_sites(self):
+        index = SiteIndex()
+        names = [f"Site{i:04d} Marine Protected Area" for i in range(5000)]
+        index.add_many(names)
+        assert len(index) == 5000
+        assert index.find_mentions("what is site4321 worth?") == ["Site4321 Marine Protected Area"]
+
+
+class TestFuzzyMatching:
+    def test_typo_matches(self):
+        index = SiteIndex()
+        index.add_many(["Tubbataha Reefs Natural Park", "Aldabra Atoll"])
+        match = index.fuzzy_match("tubataha reefs natural park")
+        assert match is not None
+        assert match[0] == "Tubbataha Reefs Natural Park"
+        assert match[1] >= 0.6
+
+    def test_below_cutoff_returns_none(self):
+        index = SiteIndex()
+        index.add("Aldabra Atoll")
+        assert index.fuzzy_match("completely unrelated words") is None
+
+    def test_candidate_set_is_bounded(self):
+        index = SiteIndex(max_candidates=5)
+        index.add_many([f"Coral Garden {i:04d} Marine Park" for i in range(2000)])
+        candidates = index.fuzzy_candidates("coral garden 0042 marine park")
+        assert len(candidates) <= 5
+        assert "Coral Garden 0042 Marine Park" in candidates
+
+    def test_fuzzy_match_among_many_sites(self):
+        index = SiteIndex()
+        index.add_many([f"Coral Garden {i:04d} Marine Park" for i in range(2000)])
+        index.add("Tubbataha Reefs Natural Park")
+        match = index.fuzzy_match("tubbataha reef natural park")
+        assert match is not None
+        assert match[0] == "Tubbataha Reefs Natural Park"
+
+
+class TestClassifierIntegration:
+    def test_incremental_registration(self):
+        try:
+            assert register_dynamic_sites(["Raja Ampat Marine Park"]) == 1
+            assert register_dynamic_sites(["Raja Ampat Marine Park", "Aldabra Atoll"]) == 2
+            assert register_dynamic_sites(["Aldabra Atoll"]) == 1
+            assert "Raja Ampat Marine Park" not in get_all_canonical_sites()
+            result = QueryClassifier().classify("What is Aldabra worth?")
+            assert result["site"] == "Aldabra Atoll"
+        finally:
+            register_dynamic_sites([])
+
+    def test_empty_names_are_ignored(self):
+        try:
+            assert register_dynamic_sites(["", "  ", "Aldabra Atoll"]) == 1
+        finally:
+            register_dynamic_sites([])
+
+    def test_large_registry_multi_site_detection(self):
+        names = [f"Site{i:04d} Marine Protected Area" for i in range(3000)]
+        try:
+            register_dynamic_sites(names)
+            result = QueryClassifier().classify("Compare Site0007 and Site2999")
+            assert result["category"] == "comparison"
+            assert result["sites"] == [
+                "Site0007 Marine Protected Area",
+                "Site2999 Marine Protected Area",
+            ]
+        finally:
+            register_dynamic_sites([])
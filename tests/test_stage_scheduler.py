@@ -0,0 +1,215 @@
+"""Tests for the dependency-aware query stage scheduler."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from maris.query.scheduler import Stage, StageScheduler, StageTimeoutError
+
+
+def _sleeper(value, delay, log=None):
+    async def _run(deps):
+        if log is not None:
+            log.append(("start", value))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", value))
+        return value
+    return _run
+
+
+class TestStageScheduler:
+    async def test_independent_stages_run_concurrently(self):
+        stages = [
+            Stage("a", _sleeper("A", 0.1)),
+            Stage("b", _sleeper("B", 0.1)),
+            Stage("c", _sleeper("C", 0.1)),
+        ]
+        started = time.monotonic()
+        result = await StageScheduler(max_concurrency=3).run(stages)
+        elapsed = time.monotonic() - started
+        assert result.results == {"a": "A", "b": "B", "c": "C"}
+        assert elapsed < 0.25
+
+    async def test_dependencies_receive_upstream_results(self):
+        async def combine(deps):
+            return deps["a"] + deps["b"]
+
+        stages = [
+            Stage("sum", combine, depends_on=("a", "b")),
+            Stage("a", _sleeper(1, 0.01)),
+            Stage("b", _sleeper(2, 0.02)),
+        ]
+        result = await StageScheduler().run(stages)
+        assert result["sum"] == 3
+        assert set(result.durations_ms) == {"a", "b", "sum"}
+
+    async def test_concurrency_bound(self):
+        log: list = []
+        stages = [Stage(str(i), _sleeper(i, 0.02, log)) for i in range(4)]
+        await StageScheduler(max_concurrency=1).run(stages)
+        # With a single slot every stage ends before the next starts
+        assert [kind for kind, _ in log] == ["start", "end"] * 4
+
+    async def test_required_stage_timeout_raises(self):
+        stages = [Stage("slow", _sleeper("x", 1.0), timeout=0.05)]
+        with pytest.raises(StageTimeoutError) as info:
+            await StageScheduler().run(stages)
+        assert info.value.stage == "slow"
+
+    async def test_optional_stage_degrades_to_default(self):
+        stages = [
+            Stage("fast", _sleeper("ok", 0.01)),
+            Stage("slow", _sleeper("late", 1.0), timeout=0.05, optional=True, default=[]),
+        ]
+        result = await StageScheduler().run(stages)
+        assert result["slow"] == []
+        assert result.degraded == ["slow"]
+
+    async def test_failure_cancels_siblings(self):
+        cancelled = asyncio.Event()
+
+        async def long_stage(deps):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def failing(deps):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await StageScheduler().run([Stage("long", long_stage), Stage("bad", failing)])
+        await asyncio.sleep(0)
+        assert cancelled.is_set()
+
+    async def test_invalid_graphs_rejected(self):
+        noop = _sleeper(None, 0)
+        with pytest.raises(ValueError):
+            await StageScheduler().run([Stage("a", noop, depends_on=("missing",))])
+        with pytest.raises(ValueError):
+            await StageScheduler().run([
+                Stage("a", noop, depends_on=("b",)),
+                Stage("b", noop, depends_on=("a",)),
+            ])
+
+
+class TestQueryPipelineFanOut:
+    def _client(self):
+        import maris.config
+        from fastapi.testclient import TestClient
+        from maris.api.main import create_app
+
+        maris.config._config = None
+        return TestClient(create_app())
+
+    def _setup(self, qmod, executor):
+        classifier = MagicMock()
+        classifier.classify.return_value = {
+            "category": "site_valuation",
+            "site": "Cabo Pulmo National Park",
+            "metrics": [],
+            "confidence": 0.9,
+            "caveats": [],
+        }
+        generator = MagicMock()
+        generator.generate.return_value = {
+            "answer": "Cabo Pulmo is valued at $29.27M/yr.",
+            "confidence": 0.8,
+            "evidence": [],
+            "axioms_used": ["BA-001"],
+            "graph_path": [],
+            "caveats": [],
+        }
+        qmod._llm = MagicMock()
+        qmod._classifier = classifier
+        qmod._executor = executor
+        qmod._generator = generator
+
+    def test_graph_and_provenance_overlap(self):
+        import maris.api.routes.query as qmod
+
+        loop_threads = []
+
+        async def slow_graph(*args, **kwargs):
+            loop_threads.append(threading.current_thread())
+            await asyncio.sleep(0.2)
+            return {"results": [{"axiom_id": "BA-001"}], "record_count": 1, "strategy": "deterministic_template"}
+
+        async def slow_edges(*args, **kwargs):
+            await asyncio.sleep(0.2)
+            return [{"from_node": "BA-001", "from_type": "BridgeAxiom", "relationship": "APPLIES_TO",
+                     "to_node": "Cabo Pulmo National Park", "to_type": "MPA"}]
+
+        executor = MagicMock()
+        executor.execute_with_strategy_async = AsyncMock(side_effect=slow_graph)
+        executor.get_provenance_edges_async = AsyncMock(side_effect=slow_edges)
+        self._setup(qmod, executor)
+        trace = ([{"axiom_id": "BA-001", "input_fact": "a", "output_fact": "b"}], "chain", [])
+        inference_threads = []
+        init_threads = []
+
+        def build_trace(*args):
+            inference_threads.append(threading.current_thread())
+            return trace
+
+        previous_cache = qmod._response_cache
+        qmod._response_cache = None
+        try:
+            client = self._client()
+            with (
+                patch.object(qmod, "_init_components", side_effect=lambda: init_threads.append(
+                    threading.current_thread())),
+                patch.object(qmod, "_build_inference_trace", side_effect=build_trace),
+            ):
+                started = time.monotonic()
+                response = client.post(
+                    "/api/query",
+                    json={"question": "What is Cabo Pulmo worth?"},
+                    headers={"Authorization": "Bearer test-api-key"},
+                )
+                elapsed = time.monotonic() - started
+        finally:
+            qmod._response_cache = previous_cache
+
+        assert response.status_code == 200
+        assert elapsed < 0.38  # sequential would be >= 0.4s
+        # Component setup and inference (cache files, rule-base load, DOI checks)
+        # run in worker threads, not on the loop
+        assert inference_threads and inference_threads[0] is not loop_threads[0]
+        assert init_threads and init_threads[0] is not loop_threads[0]
+
+    def test_graph_deadline_returns_504(self):
+        import maris.api.routes.query as qmod
+
+        async def hung(*args, **kwargs):
+            await asyncio.sleep(2)
+
+        executor = MagicMock()
+        executor.execute_with_strategy_async = AsyncMock(side_effect=hung)
+        executor.get_provenance_edges_async = AsyncMock(return_value=[])
+        self._setup(qmod, executor)
+
+        previous_cache = qmod._response_cache
+        qmod._response_cache = None
+        try:
+            client = self._client()
+            cfg = qmod.get_config()
+            with (
+                patch.object(qmod, "_init_components"),
+                patch.object(cfg, "query_graph_timeout_seconds", 0.05),
+            ):
+                response = client.post(
+                    "/api/query",
+                    json={"question": "What is Cabo Pulmo worth?"},
+                    headers={"Authorization": "Bearer test-api-key"},
+                )
+        finally:
+            qmod._response_cache = previous_cache
+
+        assert response.status_code == 504
+        assert "graph" in response.json()["detail"]
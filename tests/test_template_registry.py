@@ -0,0 +1,106 @@
+"""Tests for pre-rendered Cypher template variants and EXPLAIN validation."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+from maris.query import template_registry as registry_module
+from maris.query.cypher_templates import HOP_PLACEHOLDER, MAX_HOPS, MIN_HOPS, TEMPLATES
+from maris.query.executor import QueryExecutor
+from maris.query.template_registry import TemplateRegistry, validate_templates
+
+
+def _client_error(code, message="error"):
+    """A ClientError carrying a server status code."""
+    class _Coded(ClientError):
+        @property
+        def code(self):
+            return code
+
+    return _Coded(message)
+
+
+@pytest.fixture
+def registry():
+    fresh = TemplateRegistry()
+    with patch.object(registry_module, "_registry", fresh):
+        yield fresh
+
+
+class TestVariants:
+    def test_one_variant_per_hop_depth(self, registry):
+        hop_templates = [n for n, t in TEMPLATES.items() if HOP_PLACEHOLDER in t["cypher"]]
+        assert {"graph_traverse", "graph_neighborhood"} <= set(hop_templates)
+        depths = MAX_HOPS - MIN_HOPS + 1
+        assert len(registry) == len(TEMPLATES) + len(hop_templates) * (depths - 1)
+        for variant in registry.variants():
+            assert HOP_PLACEHOLDER not in variant.cypher
+        assert "[*1..4]" in registry.variant("graph_traverse", 4).cypher
+        assert registry.variant("graph_traverse", MAX_HOPS + 1) is None
+        assert registry.variant("site_valuation").hops is None
+
+    def test_executor_dispatches_to_the_same_statement(self, registry):
+        executor = QueryExecutor(epoch_provider=lambda: None)
+        with patch("maris.query.executor.run_query", return_value=[{"node_list": []}]) as mock_run:
+            for _ in range(2):
+                executor.execute("graph_traverse", {"start_name": "Cabo Pulmo", "max_hops": 2})
+            executor.execute("graph_traverse", {"start_name": "Cabo Pulmo"})
+        first, second, default = (c.args for c in mock_run.call_args_list)
+        assert first[0] is second[0] is registry.variant("graph_traverse", 2).cypher
+        assert "max_hops" not in first[1]
+        assert default[0] is registry.variant("graph_traverse", 3).cypher
+
+    def test_out_of_range_hops_rejected(self, registry):
+        with patch("maris.query.executor.run_query") as mock_run:
+            result = QueryExecutor(epoch_provider=lambda: None).execute(
+                "graph_traverse", {"start_name": "X", "max_hops": MAX_HOPS + 1},
+            )
+        assert result["error"] == f"max_hops must be between {MIN_HOPS} and {MAX_HOPS}"
+        mock_run.assert_not_called()
+
+
+class TestValidation:
+    def test_explain_failures_disable_variant(self, registry):
+        broken = registry.variant("graph_traverse", 5).cypher
+
+        def run(cypher, *args, **kwargs):
+            if cypher == f"EXPLAIN {broken}":
+                raise _client_error("Neo.ClientError.Statement.SyntaxError", "Invalid input")
+            return MagicMock()
+
+        session = MagicMock()
+        session.run.side_effect = run
+        invalid = registry.validate(session)
+
+        assert session.run.call_count == len(registry)
+        assert all(c.args[0].startswith("EXPLAIN ") for c in session.run.call_args_list)
+        assert list(invalid) == [("graph_traverse", 5)]
+        assert registry.validated
+
+        with patch("maris.query.executor.run_query") as mock_run:
+            result = QueryExecutor(epoch_provider=lambda: None).execute(
+                "graph_traverse", {"start_name": "X", "max_hops": 5},
+            )
+        assert result["error_type"] == "invalid_template"
+        mock_run.assert_not_called()
+
+    def test_unreachable_database_leaves_variants_usable(self, registry):
+        driver = MagicMock()
+        driver.session.return_value.__enter__.return_value.run.side_effect = ServiceUnavailable("down")
+        with patch("maris.graph.connection.get_driver", return_value=driver):
+            assert validate_templates() is None
+        assert not registry.validated
+        assert registry.invalid_reason("graph_traverse", 3) is None
+
+    @pytest.mark.parametrize("code", [
+        "Neo.ClientError.Security.Unauthorized",
+        "Neo.ClientError.Database.DatabaseNotFound",
+    ])
+    def test_non_statement_client_errors_leave_variants_unvalidated(self, registry, code):
+        driver = MagicMock()
+        driver.session.return_value.__enter__.return_value.run.side_effect = _client_error(code)
+        with patch("maris.graph.connection.get_driver", return_value=driver):
+            assert validate_templates() is None
+        assert not registry.validated
+        assert registry.invalid_reason("graph_traverse", 3) is None
@@ -0,0 +1,231 @@
+"""Tests for span tracing, exporters and pipeline instrumentation."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from openai import APITimeoutError
+
+from maris.observability.tracing import (
+    InMemorySpanExporter,
+    JSONLSpanExporter,
+    OTLPJSONSpanExporter,
+    configure_tracing,
+    current_span,
+    span,
+    traced,
+)
+
+
+@pytest.fixture
+def memory():
+    exporter = InMemorySpanExporter()
+    configure_tracing([exporter])
+    yield exporter
+    configure_tracing([])
+
+
+class TestSpans:
+    def test_nesting_attributes_and_errors(self, memory):
+        with span("outer", site="Cabo Pulmo") as outer:
+            with span("inner") as inner:
+                inner.set_attribute("rows", 3)
+            with pytest.raises(ValueError), span("failing"):
+                raise ValueError("boom")
+
+        spans = {s.name: s for s in memory.spans()}
+        assert spans["inner"].parent_id == outer.span_id
+        assert spans["inner"].trace_id == outer.trace_id
+        assert spans["outer"].parent_id is None
+        assert spans["outer"].attributes == {"site": "Cabo Pulmo"}
+        assert spans["inner"].attributes == {"rows": 3}
+        assert spans["failing"].status == "error"
+        assert spans["failing"].events[0]["attributes"]["type"] == "ValueError"
+        assert spans["outer"].duration_ms >= spans["inner"].duration_ms
+
+    def test_disabled_tracing_is_noop(self):
+        configure_tracing([])
+        with span("ignored", a=1) as s:
+            s.set_attribute("b", 2)
+            assert not s.recording
+            assert current_span() is s
+
+    async def test_context_crosses_tasks_and_threads(self, memory):
+        @traced("worker.async")
+        async def _async_work():
+            await asyncio.sleep(0)
+
+        @traced("worker.thread")
+        def _thread_work():
+            current_span().set_attribute("thread", True)
+
+        with span("root") as root:
+            await asyncio.gather(_async_work(), asyncio.to_thread(_thread_work))
+
+        children = {s.name: s for s in memory.spans() if s.parent_id == root.span_id}
+        assert set(children) == {"worker.async", "worker.thread"}
+        assert children["worker.thread"].attributes == {"thread": True}
+
+    def test_ring_buffer_is_bounded(self):
+        exporter = InMemorySpanExporter(max_spans=3)
+        configure_tracing([exporter])
+        try:
+            for i in range(5):
+                with span(f"s{i}"):
+                    pass
+        finally:
+            configure_tracing([])
+        assert [s.name for s in exporter.spans()] == ["s2", "s3", "s4"]
+        assert len(exporter.traces()) == 3
+
+
+class TestExporters:
+    def test_jsonl_one_line_per_span(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        configure_tracing([JSONLSpanExporter(path)])
+        with span("root"), span("child", template="site_valuation"):
+            pass
+        configure_tracing([])
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["name"] for r in rows] == ["child", "root"]
+        assert rows[0]["parent_id"] == rows[1]["span_id"]
+        assert rows[0]["attributes"]["template"] == "site_valuation"
+
+    def test_otlp_payload_flushed_per_trace(self):
+        payloads = []
+        configure_tracing([OTLPJSONSpanExporter(sink=payloads.append, service_name="svc")])
+        try:
+            with span("root", rows=2, ratio=0.5, ok=True):
+                with span("child"):
+                    pass
+                assert payloads == []
+        finally:
+            configure_tracing([])
+
+        assert len(payloads) == 1
+        resource = payloads[0]["resourceSpans"][0]
+        assert resource["resource"]["attributes"][0] == {"key": "service.name", "value": {"stringValue": "svc"}}
+        child, root = resource["scopeSpans"][0]["spans"]
+        assert child["parentSpanId"] == root["spanId"] and "parentSpanId" not in root
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert {a["key"]: a["value"] for a in root["attributes"]} == {
+            "rows": {"intValue": "2"}, "ratio": {"doubleValue": 0.5}, "ok": {"boolValue": True},
+        }
+        assert root["status"] == {"code": 1}
+
+    def test_failing_exporter_does_not_break_spans(self, memory):
+        broken = MagicMock()
+        broken.export.side_effect = OSError("disk full")
+        configure_tracing([broken, memory])
+        with span("still-exported"):
+            pass
+        assert [s.name for s in memory.spans()] == ["still-exported"]
+
+
+class TestInstrumentation:
+    def test_neo4j_span_records_rows_and_retries(self, memory):
+        from neo4j.exceptions import TransientError
+
+        from maris.graph import connection
+
+        session = MagicMock()
+        session.run.side_effect = [TransientError("deadlock"), [MagicMock(data=lambda: {"n": 1})]]
+        driver = MagicMock()
+        driver.session.return_value.__enter__.return_value = session
+        with patch.object(connection, "get_driver", return_value=driver), \
+                patch.object(connection, "time") as fake_time:
+            assert connection.run_query("MATCH (n)\n  RETURN n", {"site_name": "x"}) == [{"n": 1}]
+        fake_time.sleep.assert_called_once()
+
+        (neo4j_span,) = memory.spans("neo4j.query")
+        assert neo4j_span.attributes["db.statement"] == "MATCH (n) RETURN n"
+        assert neo4j_span.attributes["db.parameters"] == ["site_name"]
+        assert neo4j_span.attributes["db.rows"] == 1
+        assert [e["name"] for e in neo4j_span.events] == ["retry"]
+
+    def test_executor_template_span(self, memory):
+        from maris.query.executor import QueryExecutor
+
+        rows = [{"site": "Cabo Pulmo National Park"}]
+        with patch("maris.query.executor.run_query", return_value=rows):
+            QueryExecutor().execute("site_valuation", {"site_name": "Cabo Pulmo National Park"})
+        (template_span,) = memory.spans("cypher.template")
+        assert template_span.attributes["cypher.template"] == "site_valuation"
+        assert template_span.attributes["db.rows"] == 1
+
+    def test_llm_span_tokens_and_retry_events(self, memory):
+        from maris.llm.adapter import LLMAdapter
+
+        config = MagicMock(
+            llm_provider="deepseek", llm_api_key="k", llm_base_url="http://localhost",
+            llm_model="test-model", llm_max_tokens=256, llm_timeout=10, llm_cache_enabled=False,
+        )
+        with patch("maris.llm.adapter.OpenAI") as mock_openai:
+            adapter = LLMAdapter(config, cache=None)
+        ok = MagicMock(usage=MagicMock(prompt_tokens=120, completion_tokens=30, total_tokens=150))
+        ok.choices = [MagicMock(message=MagicMock(content="answer"))]
+        timeout = APITimeoutError(request=httpx.Request("POST", "http://localhost"))
+        mock_openai.return_value.chat.completions.create.side_effect = [timeout, ok]
+
+        with patch("maris.llm.adapter.time"):
+            assert adapter.complete([{"role": "user", "content": "q"}]) == "answer"
+
+        (llm_span,) = memory.spans("llm.complete")
+        assert llm_span.attributes["llm.model"] == "test-model"
+        assert llm_span.attributes["llm.prompt_tokens"] == 120
+        assert llm_span.attributes["llm.completion_tokens"] == 30
+        retry = llm_span.events[0]
+        assert retry["name"] == "retry" and retry["attributes"]["error"] == "timeout"
+
+    def test_query_request_trace(self, memory):
+        import maris.api.routes.query as qmod
+        import maris.config
+        from fastapi.testclient import TestClient
+
+        from maris.api.main import create_app
+
+        classifier = MagicMock()
+        classifier.classify.return_value = {
+            "category": "site_valuation", "site": "Cabo Pulmo National Park", "confidence": 0.9, "caveats": [],
+        }
+        executor = MagicMock()
+        executor.execute_with_strategy.return_value = {
+            "results": [{"site": "Cabo Pulmo National Park", "axiom_id": "BA-001"}],
+            "strategy": "deterministic_template",
+        }
+        executor.get_provenance_edges.return_value = [{
+            "from_node": "BA-001", "from_type": "BridgeAxiom", "relationship": "APPLIES_TO",
+            "to_node": "Cabo Pulmo National Park", "to_type": "MPA",
+        }]
+        generator = MagicMock()
+        generator.generate.return_value = {"answer": "ok", "confidence": 0.5, "evidence": [], "caveats": []}
+        trace = ([{"axiom_id": "BA-001", "input_fact": "a", "output_fact": "b"}], "chain", [])
+
+        previous_cache = qmod._response_cache
+        qmod._classifier, qmod._executor, qmod._generator = classifier, executor, generator
+        qmod._response_cache = None
+        maris.config._config = None
+        try:
+            with (
+                patch.object(qmod, "_init_components"),
+                patch.object(qmod, "_build_inference_trace", return_value=trace),
+            ):
+                response = TestClient(create_app()).post(
+                    "/api/query",
+                    json={"question": "What is Cabo Pulmo worth?"},
+                    headers={"Authorization": "Bearer test-api-key"},
+                )
+        finally:
+            qmod._response_cache = previous_cache
+        assert response.status_code == 200
+
+        (root,) = memory.spans("http.request")
+        assert root.attributes["http.route"] == "/api/query"
+        assert root.attributes["http.status_code"] == 200
+        assert root.attributes["query.template"] == "site_valuation:deterministic_template"
+        assert root.attributes["http.request_id"] == response.headers["X-Request-ID"]
+        stage_spans = [s for s in memory.spans() if s.name.startswith("query.")]
+        assert {s.name for s in stage_spans} >= {"query.classify", "query.cypher", "query.provenance"}
+        assert all(s.trace_id == root.trace_id for s in stage_spans)
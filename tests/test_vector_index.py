@@ -0,0 +1,136 @@
+"""Tests for the Neo4j document vector index, batched writes and vector retrieval."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from maris.embeddings import EMBEDDING_DIM, HashingEmbedder
+from maris.graph.schema import DOCUMENT_VECTOR_INDEX, OPTIONAL_STATEMENTS, SCHEMA_STATEMENTS, ensure_schema
+from maris.reasoning.hybrid_retriever import HybridRetriever
+
+
+class TestSchema:
+    def test_vector_index_declared(self):
+        vector = [s for s in SCHEMA_STATEMENTS if "VECTOR INDEX" in s]
+        assert len(vector) == 1
+        assert DOCUMENT_VECTOR_INDEX in vector[0]
+        assert f"`vector.dimensions`: {EMBEDDING_DIM}" in vector[0]
+        assert "'cosine'" in vector[0]
+        assert set(vector) == OPTIONAL_STATEMENTS
+
+    def test_unsupported_vector_index_does_not_abort_schema(self):
+        session = MagicMock()
+
+        def run(stmt):
+            if "VECTOR INDEX" in stmt:
+                raise Exception("Invalid input 'VECTOR'")
+
+        session.run.side_effect = run
+        driver = MagicMock()
+        driver.session.return_value.__enter__.return_value = session
+        with patch("maris.graph.schema.get_driver", return_value=driver), \
+                patch("maris.graph.schema.get_config", return_value=MagicMock()):
+            ensure_schema()
+        assert session.run.call_count == len(SCHEMA_STATEMENTS)
+
+
+class TestExecutorVectorSearch:
+    def test_queries_vector_index(self):
+        from maris.query.executor import QueryExecutor
+
+        rows = [{"doi": "10.1/x", "title": "Reef tourism", "year": 2020, "tier": "T1", "score": 0.9}]
+        with patch("maris.query.executor.run_query", return_value=rows) as run_query:
+            result = QueryExecutor().vector_search_documents([0.1] * EMBEDDING_DIM, DOCUMENT_VECTOR_INDEX, top_k=5)
+        assert result == rows
+        cypher, params = run_query.call_args.args
+        assert "db.index.vector.queryNodes" in cypher
+        assert params["index_name"] == DOCUMENT_VECTOR_INDEX
+        assert params["top_k"] == 5
+
+    def test_missing_index_disables_search(self):
+        from maris.query.executor import QueryExecutor
+
+        executor = QueryExecutor()
+        error = Exception("There is no such vector schema index: document_embedding")
+        with patch("maris.query.executor.run_query", side_effect=error) as run_query:
+            assert executor.vector_search_documents([0.1], DOCUMENT_VECTOR_INDEX) == []
+            assert executor.vector_search_documents([0.1], DOCUMENT_VECTOR_INDEX) == []
+        assert run_query.call_count == 1
+
+
+class TestRetrieverVectorMode:
+    def test_vector_hits_fused_without_mutating_cached_context(self):
+        executor = MagicMock()
+        executor.execute.return_value = {"results": [{
+            "site": "Cabo Pulmo National Park",
+            "services": [{"service": "Tourism"}],
+        }]}
+        executor.vector_search_documents.return_value = [
+            {"doi": "10.1/reef", "title": "Reef tourism economics", "year": 2020, "tier": "T1", "score": 0.91},
+        ]
+        retriever = HybridRetriever(
+            executor=executor,
+            embedder=HashingEmbedder(),
+            epoch_provider=lambda: 1,
+            vector_index=DOCUMENT_VECTOR_INDEX,
+        )
+        first = retriever.retrieve("reef tourism economics", site_name="Cabo Pulmo National Park")
+        assert first.retrieval_modes["vector"] == 1
+        assert "doc:10.1/reef" in {n["node_id"] for n in first.ranked_nodes}
+        embedding, index_name = executor.vector_search_documents.call_args.args
+        assert len(embedding) == EMBEDDING_DIM and index_name == DOCUMENT_VECTOR_INDEX
+
+        executor.vector_search_documents.return_value = []
+        second = retriever.retrieve("tourism", site_name="Cabo Pulmo National Park")
+        assert second.context.get_node("doc:10.1/reef") is None
+
+    def test_no_vector_mode_without_index(self):
+        executor = MagicMock()
+        executor.execute.return_value = {"results": []}
+        result = HybridRetriever(executor=executor, embedder=HashingEmbedder()).retrieve("carbon", site_name="X")
+        executor.vector_search_documents.assert_not_called()
+        assert "vector" not in result.retrieval_modes
+
+
+class TestBatchedEmbeddingWrites:
+    @pytest.fixture(autouse=True)
+    def _ingestion_deps(self):
+        pytest.importorskip("fitz")
+
+    def test_unwind_batches(self):
+        from maris.ingestion import embedding_generator
+
+        pages = [
+            [{"doi": f"10.1/{i}", "title": f"Doc {i}", "abstract": None} for i in range(3)],
+            [{"doi": "10.1/3", "title": None, "abstract": "Kelp forests"}],
+            [],
+        ]
+        session = MagicMock()
+        session.run.side_effect = [[MagicMock(data=MagicMock(return_value=d)) for d in page] for page in pages]
+        driver = MagicMock()
+        driver.session.return_value.__enter__.return_value = session
+
+        with patch.object(embedding_generator, "get_driver", return_value=driver), \
+                patch.object(embedding_generator, "get_config", return_value=MagicMock()), \
+                patch.object(embedding_generator, "run_write") as run_write:
+            count = embedding_generator.update_document_embeddings(batch_size=3)
+
+        assert count == 4
+        assert run_write.call_count == 2
+        cypher, params = run_write.call_args_list[0].args
+        assert cypher.strip().startswith("UNWIND $rows")
+        assert [row["doi"] for row in params["rows"]] == ["10.1/0", "10.1/1", "10.1/2"]
+        assert all(len(row["embedding"]) == EMBEDDING_DIM for row in params["rows"])
+
+    def test_max_documents_caps_work(self):
+        from maris.ingestion import embedding_generator
+
+        session = MagicMock()
+        session.run.return_value = [MagicMock(data=MagicMock(return_value={"doi": "10.1/a", "title": "A"}))]
+        driver = MagicMock()
+        driver.session.return_value.__enter__.return_value = session
+        with patch.object(embedding_generator, "get_driver", return_value=driver), \
+                patch.object(embedding_generator, "get_config", return_value=MagicMock()), \
+                patch.object(embedding_generator, "run_write"):
+            assert embedding_generator.update_document_embeddings(batch_size=1, max_documents=2) == 2
+        assert session.run.call_args.args[1] == {"limit": 1}